@@ -345,13 +345,16 @@ def profile_view(request):
 
     # Recompute workload live rather than trusting the Task-post_save-signal
     # cache: tasks assigned via bulk operations (seeders, imports, sandbox
-    # clones) never trigger that signal, so current_workload_hours can sit
-    # stale (often at its 0 default) indefinitely. Recalculating here — using
-    # the same logic the signal uses — guarantees the number on this page is
-    # always accurate regardless of how the underlying tasks were assigned.
+    # clones) never trigger that signal, so the per-board workload counters —
+    # and current_workload_hours with them — can sit stale (often at the 0
+    # default) until the hourly reconciliation. Reconciling this user's
+    # counters first guarantees the number on this page is always accurate
+    # regardless of how the underlying tasks were assigned.
     # This also mutates `profile` in place (same cached instance), so
     # profile.utilization_percentage below reflects the fresh value.
     from kanban.signals import _recalc_user_workload
+    from kanban.utils.workload_counters import reconcile_workload_counters
+    reconcile_workload_counters(user_ids=[request.user.pk])
     _recalc_user_workload(request.user)
 
     # ------------------------------------------------------------------
@@ -964,6 +967,9 @@ def update_presence_preference(request):
 
     profile.show_last_seen = show
     profile.save(update_fields=['show_last_seen'])
+    # Room rosters cache each member's show_last_seen.
+    from messaging import presence
+    presence.invalidate_user_rosters(request.user.id)
 
     return JsonResponse({'status': 'ok', 'show_last_seen': show})
 
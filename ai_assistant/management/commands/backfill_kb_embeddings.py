@@ -78,3 +78,9 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(
             f'Done. Embedded {ok}/{total} rows. Skipped {skipped}.'
         ))
+
+        # The .update() writes above bypass the auto-embed signal, so refresh
+        # the semantic search index in one pass.
+        if ok:
+            from django.core.management import call_command
+            call_command('rebuild_kb_embedding_index', stdout=self.stdout)
@@ -0,0 +1,47 @@
+"""
+Rebuild the per-organization KB embedding index from the database.
+
+The index is normally kept up to date by the KB auto-embed signal; run this
+after bulk ``.update()`` writes (which bypass signals), after restoring a
+database, or if the on-disk files were lost.
+
+Usage:
+    python manage.py rebuild_kb_embedding_index              # every organization
+    python manage.py rebuild_kb_embedding_index --org 7      # one organization
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the NumPy embedding index used by Knowledge Base semantic search.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--org', type=int, default=None,
+                            help='Only rebuild this organization id.')
+
+    def handle(self, *args, **opts):
+        from ai_assistant.models import ProjectKnowledgeBase
+        from ai_assistant.utils.embedding_index import embedding_index
+
+        if not embedding_index.enabled:
+            self.stdout.write(self.style.WARNING(
+                'Embedding index disabled (NumPy missing or KB_EMBEDDING_INDEX_ENABLED=false).'
+            ))
+            return
+
+        if opts['org'] is not None:
+            org_ids = [opts['org']]
+        else:
+            org_ids = sorted(
+                set(ProjectKnowledgeBase.objects.filter(
+                    is_active=True, embedding__isnull=False,
+                ).values_list('board__organization_id', flat=True)),
+                key=lambda org_id: (org_id is None, org_id or 0),
+            )
+
+        for org_id in org_ids:
+            index = embedding_index.build(org_id)
+            self.stdout.write(f'  org={org_id}: {len(index)} rows')
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(org_ids)} embedding index(es).'
+        ))
@@ -2,7 +2,9 @@
 Spectra signals:
 
 1. Auto-embed ProjectKnowledgeBase rows on save (so semantic search has a
-   vector to work with). Failures are logged but don't break the save.
+   vector to work with), and keep the per-organization embedding index
+   (ai_assistant/utils/embedding_index.py) in step. Failures are logged but
+   don't break the save.
 
 2. Invalidate the per-board Spectra summary cache when board-level data
    changes (Task / Column / Board / AccessRequest / BoardStatusReport /
@@ -38,6 +40,7 @@ def auto_embed_kb_entry(sender, instance, created, update_fields=None, **kwargs)
     if _is_embedding_only_update(update_fields):
         return
     if not getattr(instance, 'is_active', True):
+        _remove_from_embedding_index(instance)
         return
 
     def _do_embed():
@@ -61,10 +64,49 @@ def auto_embed_kb_entry(sender, instance, created, update_fields=None, **kwargs)
             )
         except Exception as e:
             logger.warning(f'KB auto-embed failed for id={instance.pk}: {e}')
+            return
+
+        try:
+            from ai_assistant.utils.embedding_index import embedding_index
+            embedding_index.upsert(
+                _kb_organization_id(instance), instance.pk, instance.board_id, vec,
+            )
+        except Exception as e:
+            logger.warning(f'KB embedding index update failed for id={instance.pk}: {e}')
 
     transaction.on_commit(_do_embed)
 
 
+@receiver(post_delete, sender='ai_assistant.ProjectKnowledgeBase')
+def remove_kb_entry_from_index(sender, instance, **kwargs):
+    """Drop a deleted KB row from the embedding index."""
+    _remove_from_embedding_index(instance)
+
+
+def _kb_organization_id(instance):
+    from kanban.models import Board
+    return (
+        Board.objects.filter(pk=instance.board_id)
+        .values_list('organization_id', flat=True).first()
+    )
+
+
+def _remove_from_embedding_index(instance):
+    """Remove a KB row from its organization's embedding index after commit."""
+    if not instance.pk:
+        return
+    organization_id = _kb_organization_id(instance)
+
+    def _do_remove():
+        try:
+            from ai_assistant.utils.embedding_index import embedding_index
+            embedding_index.remove(organization_id, instance.pk)
+        except Exception as e:
+            logger.warning(f'KB embedding index removal failed for id={instance.pk}: {e}')
+
+    transaction.on_commit(_do_remove)
+
+
 # ── Spectra summary cache invalidation ──────────────────────────────────
 
 
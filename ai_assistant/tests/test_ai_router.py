@@ -695,3 +695,104 @@ class TestGeminiThreadSafety(SimpleTestCase):
         # Both keys must have been configured (not one silently dropped)
         self.assertIn("key-user-1", configure_calls)
         self.assertIn("key-user-2", configure_calls)
+
+
+# ===========================================================================
+# Streaming tests
+# ===========================================================================
+
+class _FakeGeminiStream:
+    """Iterable of chunks that, once drained, looks like the resolved response."""
+
+    def __init__(self, pieces):
+        self._chunks = []
+        for piece in pieces:
+            chunk = MagicMock()
+            chunk.candidates = [MagicMock()]
+            chunk.candidates[0].content.parts = [MagicMock()]
+            chunk.text = piece
+            self._chunks.append(chunk)
+        self.candidates = [MagicMock()]
+        self.candidates[0].content.parts = [MagicMock()]
+        self.candidates[0].finish_reason = None
+        self.text = "".join(pieces)
+        self.usage_metadata = MagicMock(prompt_token_count=5, candidates_token_count=7)
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+
+def _openai_chunk(content=None, model="gpt-4o", total_tokens=None):
+    chunk = MagicMock()
+    chunk.model = model
+    if content is None:
+        chunk.choices = []
+    else:
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = content
+    chunk.usage = MagicMock(total_tokens=total_tokens) if total_tokens else None
+    return chunk
+
+
+class TestStream(SimpleTestCase):
+    """AIRouter.stream() forwards deltas and returns the same dict as complete()."""
+
+    def setUp(self):
+        self.router = AIRouter()
+        self.deltas = []
+
+    def test_openai_deltas_and_usage(self):
+        chunks = [_openai_chunk("Hel"), _openai_chunk(""), _openai_chunk("lo!"),
+                  _openai_chunk(None, total_tokens=12)]
+        with patch("openai.OpenAI") as mock_cls:
+            create = mock_cls.return_value.chat.completions.create
+            create.return_value = iter(chunks)
+            with patch.object(self.router, "_resolve_provider",
+                              return_value=("openai", "sk-test", True, None)):
+                result = self.router.stream("Say hello", self.deltas.append)
+
+        self.assertEqual(self.deltas, ["Hel", "lo!"])
+        self.assertEqual(result["text"], "Hello!")
+        self.assertEqual(result["provider"], "openai")
+        self.assertEqual(result["tokens_used"], 12)
+        self.assertTrue(result["used_byok"])
+        self.assertTrue(create.call_args.kwargs["stream"])
+
+    def test_anthropic_deltas_and_final_message(self):
+        with patch("anthropic.Anthropic") as mock_cls:
+            stream = mock_cls.return_value.messages.stream.return_value.__enter__.return_value
+            stream.text_stream = iter(["Hi", " there"])
+            stream.get_final_message.return_value = _mock_anthropic_response(text="Hi there")
+            result = self.router._call_anthropic("Say hello", "sk-ant", "Be brief.",
+                                                 on_delta=self.deltas.append)
+
+        self.assertEqual(self.deltas, ["Hi", " there"])
+        self.assertEqual(result["text"], "Hi there")
+        self.assertEqual(result["tokens_used"], 30)
+        self.assertEqual(mock_cls.return_value.messages.stream.call_args.kwargs["system"], "Be brief.")
+        mock_cls.return_value.messages.create.assert_not_called()
+
+    def test_gemini_deltas(self):
+        with patch("google.generativeai.configure"):
+            with patch("google.generativeai.GenerativeModel") as mock_model_cls:
+                generate = mock_model_cls.return_value.generate_content
+                generate.return_value = _FakeGeminiStream(["Good ", "morning"])
+                result = self.router._call_gemini("Hello", api_key="g-key",
+                                                  on_delta=self.deltas.append)
+
+        self.assertEqual(self.deltas, ["Good ", "morning"])
+        self.assertEqual(result["text"], "Good morning")
+        self.assertEqual(result["tokens_used"], 12)
+        self.assertTrue(generate.call_args.kwargs["stream"])
+
+    def test_failed_stream_raises_provider_error(self):
+        def broken(*args, **kwargs):
+            kwargs["on_delta"]("partial")
+            raise RuntimeError("connection reset")
+
+        with patch.object(self.router, "_resolve_provider",
+                          return_value=("gemini", "g-key", False, None)):
+            with patch.object(self.router, "_call_gemini", side_effect=broken):
+                with self.assertRaises(AIProviderError):
+                    self.router.stream("Hello", self.deltas.append)
+        self.assertEqual(self.deltas, ["partial"])
@@ -0,0 +1,130 @@
+"""
+test_context_registry_concurrency.py — Concurrent fan-out of Spectra context providers.
+
+With SPECTRA_CONTEXT_PARALLEL on, ContextProviderRegistry runs providers on a
+bounded thread pool. Output order must not change, and a provider that misses
+its deadline must degrade to the same "data temporarily unavailable" line a
+crashed provider produces.
+
+Run with:
+    python manage.py test ai_assistant.tests.test_context_registry_concurrency
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from ai_assistant.utils.context_providers import ContextProviderRegistry
+from ai_assistant.utils.context_providers.base import BaseContextProvider
+
+
+class _FakeProvider(BaseContextProvider):
+    def __init__(self, name, delay=0.0, fail=False):
+        self.PROVIDER_NAME = name
+        self.delay = delay
+        self.fail = fail
+        self.threads = []
+
+    def _get_summary_impl(self, board, user, is_demo_mode=False):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('boom')
+        return f'{self.PROVIDER_NAME} summary'
+
+    def _get_detail_impl(self, board, user, query='', is_demo_mode=False):
+        time.sleep(self.delay)
+        return f'{self.PROVIDER_NAME} detail for {query}'
+
+
+USER = SimpleNamespace(is_authenticated=True, id=1)
+
+PARALLEL = dict(
+    SPECTRA_CONTEXT_PARALLEL=True,
+    SPECTRA_CONTEXT_MAX_WORKERS=4,
+    SPECTRA_CONTEXT_PROVIDER_TIMEOUT=0.5,
+    SPECTRA_CONTEXT_BUDGET=2.0,
+)
+
+
+@override_settings(**PARALLEL)
+class ParallelContextRegistryTests(SimpleTestCase):
+    def _registry(self, *providers):
+        registry = ContextProviderRegistry()
+        for provider in providers:
+            registry.register(provider)
+        return registry
+
+    def test_runs_concurrently_and_preserves_order(self):
+        providers = [_FakeProvider(f'P{n}', delay=0.2) for n in range(4)]
+        registry = self._registry(*providers)
+
+        started = time.monotonic()
+        timings = {}
+        text = registry.get_all_summaries(None, USER, timings=timings)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)  # sequential would take 0.8 s
+        self.assertEqual(
+            [line for line in text.splitlines()[1:]],
+            ['P0 summary', 'P1 summary', 'P2 summary', 'P3 summary'],
+        )
+        self.assertTrue(all(p.threads[0].startswith('spectra-ctx') for p in providers))
+        self.assertEqual({t['status'] for t in timings.values()}, {'ok'})
+        self.assertEqual(set(timings), {'P0', 'P1', 'P2', 'P3'})
+
+    def test_slow_provider_degrades_to_unavailable_line(self):
+        registry = self._registry(_FakeProvider('Fast'), _FakeProvider('Slow', delay=1.5))
+
+        timings = {}
+        text = registry.get_all_summaries(None, USER, timings=timings)
+
+        self.assertIn('Fast summary', text)
+        self.assertIn('Slow data temporarily unavailable (timed out)', text)
+        self.assertEqual(timings['Slow']['status'], 'timeout')
+        self.assertEqual(timings['Fast']['status'], 'ok')
+
+    def test_crash_still_reported_as_provider_error(self):
+        registry = self._registry(_FakeProvider('Good'), _FakeProvider('Bad', fail=True))
+
+        text = registry.get_all_summaries(None, USER)
+
+        self.assertIn('Good summary', text)
+        self.assertIn('Bad data temporarily unavailable (provider error)', text)
+
+    @override_settings(SPECTRA_CONTEXT_PROVIDER_TIMEOUT=5.0, SPECTRA_CONTEXT_BUDGET=0.3,
+                       SPECTRA_CONTEXT_MAX_WORKERS=1)
+    def test_global_budget_skips_queued_providers(self):
+        registry = self._registry(
+            _FakeProvider('First', delay=0.5), _FakeProvider('Queued'),
+        )
+
+        timings = {}
+        text = registry.get_all_summaries(None, USER, timings=timings)
+
+        self.assertIn('First data temporarily unavailable (timed out)', text)
+        self.assertIn('Queued data temporarily unavailable (timed out)', text)
+        self.assertEqual(timings['Queued']['status'], 'skipped')
+
+    def test_details_only_for_requested_providers(self):
+        registry = self._registry(_FakeProvider('A'), _FakeProvider('B'), _FakeProvider('C'))
+
+        text = registry.get_relevant_details(None, USER, 'q', ['C', 'A', 'Missing'])
+
+        self.assertEqual(text, 'C detail for q\n\nA detail for q\n')
+
+
+@override_settings(SPECTRA_CONTEXT_PARALLEL=False)
+class SequentialContextRegistryTests(SimpleTestCase):
+    def test_sequential_mode_runs_in_calling_thread(self):
+        provider = _FakeProvider('Only')
+        registry = ContextProviderRegistry()
+        registry.register(provider)
+        other = _FakeProvider('Other')
+        registry.register(other)
+
+        registry.get_all_summaries(None, USER)
+
+        self.assertEqual(provider.threads, [threading.current_thread().name])
@@ -0,0 +1,182 @@
+"""
+test_kb_embedding_index.py — NumPy embedding index behind KB hybrid search.
+
+The index must return the same ranking as the pure-Python cosine loop, stay in
+step with incremental upserts/removals, survive a round-trip through the
+memory-mapped files, and let Spectra find the best semantic match anywhere in
+the RBAC-scoped KB rather than in an arbitrary 30-row sample.
+
+Run with:
+    python manage.py test ai_assistant.tests.test_kb_embedding_index
+"""
+
+import os
+import random
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ai_assistant.utils.ai_clients import GEMINI_EMBEDDING_DIM, cosine_similarity
+from ai_assistant.utils.embedding_index import (
+    EmbeddingIndexManager, OrgEmbeddingIndex, embedding_index,
+)
+
+
+def _vec(rng, dim=16):
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+class OrgEmbeddingIndexTests(SimpleTestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.rows = [(n + 1, 100 + n % 3, _vec(rng)) for n in range(60)]
+        self.index = OrgEmbeddingIndex.from_rows(self.rows, dim=16)
+        self.query = _vec(rng)
+
+    def _brute_force(self, rows, k):
+        scored = sorted(rows, key=lambda r: -cosine_similarity(self.query, r[2]))
+        return [r[0] for r in scored[:k]]
+
+    def test_search_matches_python_cosine_ranking(self):
+        hits = self.index.search(self.query, k=5)
+        self.assertEqual([kb_id for kb_id, _ in hits], self._brute_force(self.rows, 5))
+        best_id, best_score = hits[0]
+        expected = cosine_similarity(self.query, dict((r[0], r[2]) for r in self.rows)[best_id])
+        self.assertAlmostEqual(best_score, expected, places=5)
+
+    def test_board_filter_and_exclusions(self):
+        hits = self.index.search(self.query, k=100, board_ids={101}, exclude_ids=[2])
+        allowed = [r for r in self.rows if r[1] == 101 and r[0] != 2]
+        self.assertEqual([kb_id for kb_id, _ in hits], self._brute_force(allowed, 100))
+        self.assertEqual(self.index.search(self.query, k=5, board_ids={999}), [])
+
+    def test_upsert_and_remove(self):
+        self.assertTrue(self.index.upsert(500, 100, self.query))
+        self.assertEqual(self.index.search(self.query, k=1)[0][0], 500)
+        self.assertTrue(self.index.upsert(500, 100, [-x for x in self.query]))
+        self.assertNotEqual(self.index.search(self.query, k=1)[0][0], 500)
+        self.assertTrue(self.index.remove(500))
+        self.assertNotIn(500, self.index)
+        self.assertFalse(self.index.upsert(501, 100, [1.0, 2.0]))  # wrong width
+
+    def test_scores_for_known_rows(self):
+        scores = self.index.scores_for(self.query, [1, 2, 9999])
+        self.assertEqual(set(scores), {1, 2})
+        self.assertAlmostEqual(scores[1], cosine_similarity(self.query, self.rows[0][2]), places=5)
+
+
+class EmbeddingIndexPersistenceTests(SimpleTestCase):
+    def test_round_trip_through_memory_mapped_files(self):
+        rng = random.Random(5)
+        rows = [(n + 1, 7, _vec(rng)) for n in range(10)]
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(KB_EMBEDDING_INDEX_DIR=directory):
+            writer = EmbeddingIndexManager()
+            index = OrgEmbeddingIndex.from_rows(rows, dim=16)
+            writer._save(3, index)
+            writer._indexes[3] = index
+
+            reader = EmbeddingIndexManager()
+            loaded = reader.get(3)
+            self.assertFalse(loaded.vectors.flags.writeable)  # mmap'd
+            self.assertEqual(loaded.search(rows[4][2], k=1)[0][0], 5)
+
+            # An upsert in one process is picked up by the other on next access.
+            writer.upsert(3, 42, 7, rows[4][2])
+            self.assertIn(42, reader.get(3))
+
+    def test_interleaved_writers_keep_each_others_rows(self):
+        rng = random.Random(6)
+        rows = [(n + 1, 7, _vec(rng)) for n in range(10)]
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(KB_EMBEDDING_INDEX_DIR=directory):
+            first, second = EmbeddingIndexManager(), EmbeddingIndexManager()
+            index = OrgEmbeddingIndex.from_rows(rows, dim=16)
+            first._save(3, index)
+            first._indexes[3] = index
+            second.get(3)
+
+            # Each writer holds a copy without the other's row; neither
+            # write may be lost.
+            first.upsert(3, 41, 7, _vec(rng))
+            second.upsert(3, 42, 7, _vec(rng))
+            second.remove(3, 1)
+            fresh = EmbeddingIndexManager().get(3)
+            self.assertIn(41, fresh)
+            self.assertIn(42, fresh)
+            self.assertNotIn(1, fresh)
+            self.assertIn(42, first.get(3))
+
+    def test_upserts_append_to_journal_until_compaction(self):
+        rng = random.Random(7)
+        rows = [(n + 1, 7, _vec(rng)) for n in range(4)]
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(KB_EMBEDDING_INDEX_DIR=directory):
+            manager = EmbeddingIndexManager()
+            index = OrgEmbeddingIndex.from_rows(rows, dim=16)
+            manager._save(3, index)
+            manager._indexes[3] = index
+            vectors_path = manager._paths(3)[1]
+            saved_mtime = os.stat(vectors_path).st_mtime_ns
+
+            with patch('ai_assistant.utils.embedding_index.JOURNAL_COMPACT_MIN_RECORDS', 4):
+                for kb_id in range(100, 104):
+                    manager.upsert(3, kb_id, 7, _vec(rng))
+                self.assertEqual(os.stat(vectors_path).st_mtime_ns, saved_mtime)
+                self.assertGreater(manager._journal_size(3), 0)
+
+                manager.upsert(3, 104, 7, _vec(rng))
+                self.assertEqual(manager._journal_size(3), 0)
+
+            fresh = EmbeddingIndexManager().get(3)
+            self.assertEqual(len(fresh), 9)
+            self.assertFalse(fresh.vectors.flags.writeable)
+
+
+class KnowledgeBaseHybridSearchTests(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Board, Workspace
+
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+        embedding_index.invalidate()
+        self.addCleanup(embedding_index.invalidate)
+
+        self.user = User.objects.create_user('kb_owner', password='x')
+        org = Organization.objects.create(name='KB Org', created_by=self.user)
+        ws = Workspace.objects.create(name='KB WS', organization=org, created_by=self.user)
+        self.board = Board.objects.create(
+            name='KB Board', created_by=self.user, owner=self.user,
+            organization=org, workspace=ws,
+        )
+
+    def test_semantic_match_found_beyond_old_30_row_sample(self):
+        from ai_assistant.models import ProjectKnowledgeBase
+        from ai_assistant.utils.chatbot_service import TaskFlowChatbotService
+
+        rng = random.Random(11)
+        query_vec = [rng.uniform(-1, 1) for _ in range(GEMINI_EMBEDDING_DIM)]
+        # Oldest row, no keyword overlap with the query: the old hybrid search
+        # only looked at the 30 most recent embedded rows and never saw it.
+        ProjectKnowledgeBase.objects.create(
+            board=self.board, content_type='documentation',
+            title='Vendor escalation playbook', content='Who to call when vendors slip.',
+            embedding=[x * 2 for x in query_vec],
+        )
+        for n in range(40):
+            ProjectKnowledgeBase.objects.create(
+                board=self.board, content_type='documentation',
+                title=f'Filler note {n}', content='Unrelated filler text.',
+                embedding=[rng.uniform(-1, 1) for _ in range(GEMINI_EMBEDDING_DIM)],
+            )
+
+        service = TaskFlowChatbotService(user=self.user, board=self.board)
+        with patch('ai_assistant.utils.ai_clients.embed_text', return_value=query_vec):
+            context = service.get_knowledge_base_context('supplier delays guidance')
+
+        hits = [line for line in context.splitlines() if line.startswith('- ')]
+        self.assertIn('Vendor escalation playbook', hits[0])
@@ -135,6 +135,45 @@ class AIRouter:
             ImproperlyConfigured: If AI_KEY_ENCRYPTION_KEY is missing and a
                 BYOK key needs to be decrypted.
         """
+        return self._dispatch(prompt, user, system_prompt, conversation_history,
+                              complexity, feature)
+
+    def stream(self, prompt: str, on_delta, user=None, system_prompt: str = None,
+               conversation_history: list = None, complexity: str = 'simple',
+               feature: str = None) -> dict:
+        """
+        Like complete(), but uses the provider's streaming API and calls
+        ``on_delta(text)`` with each text fragment as it arrives.
+
+        Provider resolution, error handling and the returned dictionary are
+        exactly those of complete(): the return value is the normalised
+        response for the fully assembled text, so callers persist it the same
+        way.  ``on_delta`` runs on the calling thread between network reads —
+        keep it cheap (buffer and forward, see kanban/tasks/ai_streaming_tasks.py).
+        An exception raised by ``on_delta`` aborts the stream and propagates
+        as AIProviderError.
+
+        Args:
+            prompt, user, system_prompt, conversation_history, complexity,
+            feature: As for complete().
+            on_delta (callable): Receives each non-empty text fragment.
+
+        Returns:
+            dict: Normalised response — see _normalise_response() for keys.
+
+        Raises:
+            AIProviderError: If the provider call fails for any reason.
+        """
+        return self._dispatch(prompt, user, system_prompt, conversation_history,
+                              complexity, feature, on_delta=on_delta)
+
+    def _dispatch(self, prompt, user, system_prompt, conversation_history,
+                  complexity, feature, on_delta=None) -> dict:
+        """Shared body of complete() and stream()."""
+        # Only streaming calls pass on_delta to the provider methods, so the
+        # blocking call signature is unchanged.
+        stream_kwargs = {'on_delta': on_delta} if on_delta is not None else {}
+
         # Emergency rollback switch — if AI_ROUTER_ENABLED is False in settings,
         # bypass all provider resolution and call Gemini directly.  This is an
         # operator-level kill-switch for production incidents.
@@ -142,17 +181,18 @@ class AIRouter:
             logger.warning(
                 "AIRouter: AI_ROUTER_ENABLED=False — bypassing router, calling Gemini directly."
             )
-            return self._emergency_gemini_fallback(prompt, system_prompt, conversation_history, complexity)
+            return self._emergency_gemini_fallback(prompt, system_prompt, conversation_history, complexity,
+                                                   **stream_kwargs)
 
         provider, api_key, is_byok, byok_model = self._resolve_provider(user)
 
         try:
             if provider == 'gemini':
-                raw = self._call_gemini(prompt, api_key, system_prompt, conversation_history, complexity, model_override=byok_model)
+                raw = self._call_gemini(prompt, api_key, system_prompt, conversation_history, complexity, model_override=byok_model, **stream_kwargs)
             elif provider == 'openai':
-                raw = self._call_openai(prompt, api_key, system_prompt, conversation_history, complexity, model_override=byok_model)
+                raw = self._call_openai(prompt, api_key, system_prompt, conversation_history, complexity, model_override=byok_model, **stream_kwargs)
             elif provider == 'anthropic':
-                raw = self._call_anthropic(prompt, api_key, system_prompt, conversation_history, complexity, model_override=byok_model)
+                raw = self._call_anthropic(prompt, api_key, system_prompt, conversation_history, complexity, model_override=byok_model, **stream_kwargs)
             else:
                 raise AIProviderError(provider, ValueError(f"Unknown provider: '{provider}'"))
 
@@ -546,7 +586,7 @@ class AIRouter:
 
     def _emergency_gemini_fallback(self, prompt: str, system_prompt: str = None,
                                     conversation_history: list = None,
-                                    complexity: str = 'simple') -> dict:
+                                    complexity: str = 'simple', on_delta=None) -> dict:
         """
         Emergency fallback path invoked when AI_ROUTER_ENABLED=False.
 
@@ -558,7 +598,11 @@ class AIRouter:
         AI_ROUTER_ENABLED=false in production during an incident.
         """
         api_key = self._platform_key('gemini')
-        raw = self._call_gemini(prompt, api_key, system_prompt, conversation_history, complexity)
+        if on_delta is not None:
+            raw = self._call_gemini(prompt, api_key, system_prompt, conversation_history, complexity,
+                                    on_delta=on_delta)
+        else:
+            raw = self._call_gemini(prompt, api_key, system_prompt, conversation_history, complexity)
         return self._normalise_response(
             text=raw.get('text', ''),
             provider='gemini',
@@ -569,7 +613,7 @@ class AIRouter:
 
     def _call_gemini(self, prompt: str, api_key: str, system_prompt: str = None,
                      conversation_history: list = None, complexity: str = 'simple',
-                     model_override: str = None) -> dict:
+                     model_override: str = None, on_delta=None) -> dict:
         """
         Call Google Gemini and return a raw response dictionary.
 
@@ -591,6 +635,8 @@ class AIRouter:
                               (both default to gemini-3.1-flash-lite);
                               'premium' → GEMINI_MODEL_PREMIUM (gemini-2.5-flash,
                               the large-document escape hatch).
+            on_delta (callable, optional): When given, the response is
+                streamed and each text chunk is passed to it.
 
         Returns:
             dict: {'text': str, 'model': str, 'tokens_used': int | None}
@@ -676,22 +722,34 @@ class AIRouter:
                 safety_settings=safety_settings,
             )
 
+        def _generate(model):
+            if on_delta is None:
+                return model.generate_content(
+                    full_prompt,
+                    request_options={"timeout": 120},
+                )
+            response = model.generate_content(
+                full_prompt,
+                stream=True,
+                request_options={"timeout": 120},
+            )
+            # Iterating resolves the streamed response; afterwards .text,
+            # .candidates and .usage_metadata describe the whole answer.
+            for chunk in response:
+                if chunk.candidates and chunk.candidates[0].content.parts:
+                    on_delta(chunk.text)
+            return response
+
         if is_byok:
             # Hold the lock for the entire call; key must not change mid-request.
             with _GEMINI_CONFIGURE_LOCK:
                 model = _build_model()
-                response = model.generate_content(
-                    full_prompt,
-                    request_options={"timeout": 120},
-                )
+                response = _generate(model)
         else:
             # Platform key never changes — release lock before the slow network call.
             with _GEMINI_CONFIGURE_LOCK:
                 model = _build_model()
-            response = model.generate_content(
-                full_prompt,
-                request_options={"timeout": 120},
-            )
+            response = _generate(model)
 
         # Guard against empty / safety-blocked responses
         if (
@@ -739,7 +797,7 @@ class AIRouter:
 
     def _call_openai(self, prompt: str, api_key: str, system_prompt: str = None,
                      conversation_history: list = None, complexity: str = 'simple',
-                     model_override: str = None) -> dict:
+                     model_override: str = None, on_delta=None) -> dict:
         """
         Call OpenAI GPT and return a raw response dictionary.
 
@@ -750,6 +808,8 @@ class AIRouter:
             conversation_history (list, optional): Prior turns.
             complexity (str): 'simple' → OPENAI_MODEL_SIMPLE (gpt-5.6-terra);
                               'complex'/'premium' → OPENAI_MODEL_COMPLEX/PREMIUM (gpt-5.6-sol).
+            on_delta (callable, optional): When given, the response is
+                streamed and each content delta is passed to it.
 
         Returns:
             dict: {'text': str, 'model': str, 'tokens_used': int | None}
@@ -801,6 +861,17 @@ class AIRouter:
         try:
             # Instantiate per-call — thread-safe, each BYOK user gets their own client.
             client = openai.OpenAI(api_key=api_key)
+            if on_delta is not None:
+                # Consumed inside the try: errors can surface mid-stream too.
+                return self._read_openai_stream(
+                    client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                    ),
+                    model, on_delta,
+                )
             response = client.chat.completions.create(
                 model=model,
                 messages=messages,
@@ -842,9 +913,32 @@ class AIRouter:
 
         return {'text': text, 'model': model_used, 'tokens_used': tokens_used}
 
+    @staticmethod
+    def _read_openai_stream(stream, model: str, on_delta) -> dict:
+        """
+        Drain an OpenAI chat-completions stream, forwarding content deltas.
+
+        With ``include_usage`` the final chunk has no choices and carries the
+        token usage for the whole response.
+        """
+        parts = []
+        model_used = model
+        tokens_used = None
+        for chunk in stream:
+            model_used = getattr(chunk, 'model', None) or model_used
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
+            usage = getattr(chunk, 'usage', None)
+            if usage is not None and getattr(usage, 'total_tokens', None) is not None:
+                tokens_used = int(usage.total_tokens)
+        return {'text': ''.join(parts), 'model': model_used, 'tokens_used': tokens_used}
+
     def _call_anthropic(self, prompt: str, api_key: str, system_prompt: str = None,
                         conversation_history: list = None, complexity: str = 'simple',
-                        model_override: str = None) -> dict:
+                        model_override: str = None, on_delta=None) -> dict:
         """
         Call Anthropic Claude and return a raw response dictionary.
 
@@ -855,6 +949,8 @@ class AIRouter:
             conversation_history (list, optional): Prior turns.
             complexity (str): 'simple' → ANTHROPIC_MODEL_SIMPLE (claude-sonnet-5);
                               'complex'/'premium' → ANTHROPIC_MODEL_COMPLEX/PREMIUM (claude-opus-4-8).
+            on_delta (callable, optional): When given, the response is
+                streamed and each text delta is passed to it.
 
         Returns:
             dict: {'text': str, 'model': str, 'tokens_used': int | None}
@@ -923,7 +1019,14 @@ class AIRouter:
             # system is an optional top-level param; omit it if not provided.
             if system_prompt:
                 create_kwargs['system'] = system_prompt
-            response = client.messages.create(**create_kwargs)
+            if on_delta is not None:
+                with client.messages.stream(**create_kwargs) as stream:
+                    for delta in stream.text_stream:
+                        if delta:
+                            on_delta(delta)
+                    response = stream.get_final_message()
+            else:
+                response = client.messages.create(**create_kwargs)
         except anthropic.AuthenticationError as exc:
             raise AIProviderError(
                 'anthropic',
@@ -588,6 +588,7 @@ class TaskFlowChatbotService:
             qs = ProjectKnowledgeBase.objects.filter(is_active=True)
             if self.board:
                 qs = qs.filter(board=self.board)
+                scope_boards = [(self.board.id, self.board.organization_id)]
             else:
                 # Cross-board mode — scope to boards this user can access so KB
                 # content from boards the user is not a member of cannot leak.
@@ -602,6 +603,7 @@ class TaskFlowChatbotService:
                     self.user, is_demo_mode=self.is_demo_mode, organization=org,
                 )
                 qs = qs.filter(board__in=accessible)
+                scope_boards = list(accessible.values_list('id', 'organization_id'))
             if type_hint:
                 typed_qs = qs.filter(content_type=type_hint)
                 if typed_qs.exists():
@@ -621,29 +623,62 @@ class TaskFlowChatbotService:
                 'updated_at', 'embedding',
             )[:50])
 
-            # Hybrid step: if many candidates have embeddings, also embed the
-            # query so vector matches can outrank shallow keyword hits.
+            # Per-organization embedding matrix (see embedding_index.py).
+            # None when NumPy is unavailable or the index is disabled, in
+            # which case we fall back to the Python cosine loop below.
+            from ai_assistant.utils.embedding_index import embedding_index
+            org_ids = {org_id for _board_id, org_id in scope_boards}
+            index_has_rows = False
+            if embedding_index.enabled:
+                try:
+                    index_has_rows = any(
+                        len(embedding_index.get(org_id) or ()) for org_id in org_ids
+                    )
+                except Exception:
+                    logger.warning('KB embedding index unavailable', exc_info=True)
+
+            # Hybrid step: if candidates (or the index) have embeddings, also
+            # embed the query so vector matches can outrank shallow keyword hits.
             query_vec = None
-            if entries and any(getattr(e, 'embedding', None) for e in entries):
+            if index_has_rows or (entries and any(getattr(e, 'embedding', None) for e in entries)):
                 try:
                     from ai_assistant.utils.ai_clients import embed_text
                     query_vec = embed_text(query, task_type='RETRIEVAL_QUERY')
                 except Exception:
                     query_vec = None
 
-            # Also pull a small set of embedding-only candidates (rows that
-            # don't keyword-match but might be semantically close). Cap to
-            # 30 to keep the Python similarity loop trivial.
+            # Also pull embedding-only candidates (rows that don't keyword-match
+            # but are semantically close). With the index this is a true top-k
+            # over the whole scoped KB; rows are re-fetched through ``qs`` so
+            # RBAC, is_active and the content-type hint still apply.
+            index_scores = {}
             if query_vec is not None:
-                semantic_candidates = list(
-                    qs.exclude(id__in=[e.id for e in entries])
-                      .exclude(embedding__isnull=True)
-                      .only(
-                          'id', 'title', 'summary', 'content', 'content_type',
-                          'updated_at', 'embedding',
-                      )[:30]
-                )
-                entries.extend(semantic_candidates)
+                if index_has_rows:
+                    semantic_k = getattr(settings, 'KB_SEMANTIC_CANDIDATES', 30)
+                    hits = embedding_index.search(
+                        query_vec, scope_boards, k=semantic_k,
+                        exclude_ids=[e.id for e in entries],
+                    )
+                    index_scores = dict(hits)
+                    if hits:
+                        entries.extend(qs.filter(id__in=list(index_scores)).only(
+                            'id', 'title', 'summary', 'content', 'content_type',
+                            'updated_at',
+                        ))
+                    index_scores.update(embedding_index.scores_for(
+                        query_vec, org_ids, [e.id for e in entries if e.id not in index_scores],
+                    ))
+                else:
+                    # Cap to 30 to keep the Python similarity loop trivial.
+                    semantic_candidates = list(
+                        qs.exclude(id__in=[e.id for e in entries])
+                          .exclude(embedding__isnull=True)
+                          .only(
+                              'id', 'title', 'summary', 'content', 'content_type',
+                              'updated_at', 'embedding',
+                          )[:30]
+                    )
+                    entries.extend(semantic_candidates)
 
             if not entries:
                 return ''
@@ -655,6 +690,10 @@ class TaskFlowChatbotService:
             def cosine_score(entry):
                 if query_vec is None:
                     return 0.0
+                if entry.id in index_scores:
+                    return index_scores[entry.id]
+                if 'embedding' in entry.get_deferred_fields():
+                    return 0.0
                 emb = getattr(entry, 'embedding', None)
                 if not emb:
                     return 0.0
@@ -3989,7 +4028,35 @@ IMPORTANT — READ-ONLY MODE (v1.0):
 You are operating in read-only mode. You can answer questions about project data, board status, task details, team workload, risks, milestones, wiki pages, meeting transcripts, the organizational hierarchy (Goals, Missions, Strategies), the text of any document the user has attached to this chat (see rule 11c), and any feature whose data appears in your context (comments, file attachments, activity history, decisions, conflicts, automations, time tracking, budget, stakeholders, requirements, discovery ideas, retrospectives, knowledge base, etc.). **READING and reporting this information is always allowed and is NEVER a "v2.0 action"** — only declining write actions is. You cannot create, update, or delete any data. If a user asks you to create a task, log time, send a message, create a board, schedule an event, or take any other write action, politely decline and explain that action commands are coming in Spectra v2.0. Never attempt to call a write tool. Never invent or guess at data not present in your context.
 When answering questions about organizational goals, missions, or strategies, use the data in the organizational_hierarchy section of your context. If that section is empty, tell the user that no goals have been configured in their workspace yet."""
     
-    def get_response(self, prompt, use_cache=True, file_context=None):
+    def _stream_response(self, prompt, system_prompt, task_complexity, on_delta):
+        """
+        Generate the final answer through AIRouter.stream(), forwarding deltas.
+
+        Returns the same shape as GeminiClient.get_response() plus 'provider'.
+        If the stream fails, falls back to the blocking Gemini call; deltas
+        already sent are superseded by the final result the caller delivers.
+        """
+        from django.core.exceptions import ImproperlyConfigured
+        from ai_assistant.utils.ai_router import AIRouter, AIProviderError
+
+        try:
+            result = AIRouter().stream(
+                prompt, on_delta, user=self.user,
+                system_prompt=system_prompt, complexity=task_complexity,
+            )
+        except (AIProviderError, ImproperlyConfigured) as exc:
+            logger.warning(f"Streaming failed, falling back to blocking call: {exc}")
+            return self.gemini_client.get_response(
+                prompt, system_prompt, task_complexity=task_complexity)
+        return {
+            'content': result['text'],
+            'error': None,
+            'tokens': result.get('tokens_used') or 0,
+            'model_used': result.get('model'),
+            'provider': result['provider'],
+        }
+
+    def get_response(self, prompt, use_cache=True, file_context=None, on_delta=None):
         """
         Get response from chatbot using Gemini in STATELESS mode.
         Each request is completely independent to prevent token accumulation.
@@ -4002,6 +4069,9 @@ When answering questions about organizational goals, missions, or strategies, us
             file_context (str|None): Pre-extracted text from an attached file (session-scoped).
                 When provided it is injected as the first context block so Gemini can
                 answer questions about the document in addition to the project data.
+            on_delta (callable|None): When given, the answer is generated with
+                AIRouter.stream() and each text fragment is passed to it as it
+                arrives. The returned dict is the same either way.
             
         Returns:
             dict: Response with content, source, and metadata
@@ -4278,8 +4348,11 @@ When answering questions about organizational goals, missions, or strategies, us
             # Escape hatch: when a genuinely large document is in context for this turn,
             # route just this message to the premium long-context model (gemini-2.5-flash).
             task_complexity = 'premium' if (file_context and len(file_context) > 9_500) else 'simple'
-            response = self.gemini_client.get_response(
-                prompt, system_prompt, temperature=temperature, task_complexity=task_complexity)
+            if on_delta is not None:
+                response = self._stream_response(prompt, system_prompt, task_complexity, on_delta)
+            else:
+                response = self.gemini_client.get_response(
+                    prompt, system_prompt, temperature=temperature, task_complexity=task_complexity)
 
             # ── Debug telemetry for the admin debug view ──
             import hashlib
@@ -4330,7 +4403,7 @@ When answering questions about organizational goals, missions, or strategies, us
 
             return {
                 'response': response['content'],
-                'source': 'gemini',
+                'source': response.get('provider', 'gemini'),
                 'tokens': response.get('tokens', 0),
                 'error': response.get('error'),
                 'used_web_search': used_web_search,
@@ -15,6 +15,11 @@ Created: April 16, 2026
 """
 
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.db import connections
+
 from .base import BaseContextProvider
 
 logger = logging.getLogger(__name__)
@@ -57,7 +62,7 @@ class ContextProviderRegistry:
 
     # ── Main API ────────────────────────────────────────────────────────
 
-    def get_all_summaries(self, board, user, is_demo_mode=False):
+    def get_all_summaries(self, board, user, is_demo_mode=False, timings=None):
         """
         Collect compact summaries from ALL registered providers.
 
@@ -66,12 +71,17 @@ class ContextProviderRegistry:
         caught in ``BaseContextProvider.get_summary`` and converted into an
         explicit "data temporarily unavailable" line; the registry trusts
         that contract and just concatenates the returned strings.
+
+        Providers run concurrently when enabled (see ``_run_providers``).
+        Pass a dict as ``timings`` to receive per-provider timing.
         """
-        parts = []
-        for provider in self._providers.values():
-            summary = provider.get_summary(board, user, is_demo_mode)
-            if summary and summary.strip():
-                parts.append(summary.strip())
+        calls = [
+            (name, provider,
+             lambda p=provider: p.get_summary(board, user, is_demo_mode))
+            for name, provider in self._providers.items()
+        ]
+        results = self._run_providers(calls, detail=False, timings=timings)
+        parts = [r.strip() for r in results if r and r.strip()]
         if not parts:
             return ''
         return (
@@ -81,7 +91,8 @@ class ContextProviderRegistry:
         )
 
     def get_relevant_details(
-        self, board, user, query, provider_names, is_demo_mode=False
+        self, board, user, query, provider_names, is_demo_mode=False,
+        timings=None,
     ):
         """
         Collect detailed context from the specified providers.
@@ -90,19 +101,168 @@ class ContextProviderRegistry:
         context router.  Only those providers are queried for full detail.
         Provider errors are handled at the base-class level.
         """
-        parts = []
+        calls = []
         for name in provider_names:
             provider = self._providers.get(name)
             if not provider:
                 logger.warning('Router requested unknown provider: %s', name)
                 continue
-            detail = provider.get_detail(board, user, query, is_demo_mode)
-            if detail and detail.strip():
-                parts.append(detail.strip())
+            calls.append((
+                name, provider,
+                lambda p=provider: p.get_detail(board, user, query, is_demo_mode),
+            ))
+        results = self._run_providers(calls, detail=True, timings=timings)
+        parts = [r.strip() for r in results if r and r.strip()]
         if not parts:
             return ''
         return '\n\n'.join(parts) + '\n'
 
+    # ── Execution ───────────────────────────────────────────────────────
+
+    def _run_providers(self, calls, detail, timings=None):
+        """
+        Run ``(name, provider, fn)`` calls and return their results in order.
+
+        Sequential unless ``SPECTRA_CONTEXT_PARALLEL`` is on, there is more
+        than one call, and we are not inside a transaction (worker threads
+        use their own DB connections and would not see uncommitted rows).
+        """
+        from django.conf import settings
+        from django.db import connection
+
+        if timings is None:
+            timings = {}
+        parallel = (
+            getattr(settings, 'SPECTRA_CONTEXT_PARALLEL', False)
+            and len(calls) > 1
+            and not connection.in_atomic_block
+        )
+        if parallel:
+            results = self._run_concurrently(calls, detail, timings, settings)
+        else:
+            results = []
+            for name, _provider, fn in calls:
+                started = time.monotonic()
+                results.append(fn())
+                timings[name] = {
+                    'ms': round((time.monotonic() - started) * 1000, 1),
+                    'status': 'ok',
+                }
+        self._report_timings(timings, detail)
+        return results
+
+    def _run_concurrently(self, calls, detail, timings, settings):
+        """
+        Fan ``calls`` out over a bounded thread pool.
+
+        Each provider gets ``SPECTRA_CONTEXT_PROVIDER_TIMEOUT`` seconds from
+        the moment it starts running, and the whole fan-out is capped at
+        ``SPECTRA_CONTEXT_BUDGET`` seconds.  A provider that misses either
+        deadline (or never gets a worker before the budget runs out) degrades
+        to its "data temporarily unavailable" line.  Threads cannot be
+        interrupted, so a late provider finishes in the background and its
+        result is discarded.
+        """
+        max_workers = max(1, int(getattr(settings, 'SPECTRA_CONTEXT_MAX_WORKERS', 8)))
+        provider_timeout = float(getattr(settings, 'SPECTRA_CONTEXT_PROVIDER_TIMEOUT', 3.0))
+        budget = float(getattr(settings, 'SPECTRA_CONTEXT_BUDGET', 8.0))
+
+        started_at = {}
+
+        def _invoke(index, fn):
+            started_at[index] = time.monotonic()
+            try:
+                return fn()
+            finally:
+                # Worker threads open their own DB connections; close them so
+                # they are not leaked when the pool is torn down.
+                connections.close_all()
+
+        results = [None] * len(calls)
+        begin = time.monotonic()
+        deadline = begin + budget
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_workers, len(calls)),
+            thread_name_prefix='spectra-ctx',
+        )
+        try:
+            futures = {
+                executor.submit(_invoke, index, fn): index
+                for index, (_name, _provider, fn) in enumerate(calls)
+            }
+            pending = set(futures)
+            while pending:
+                now = time.monotonic()
+                # Next moment something can expire: the global budget, or
+                # the earliest per-provider deadline among running calls.
+                next_expiry = deadline
+                for future in pending:
+                    index = futures[future]
+                    if index in started_at:
+                        next_expiry = min(next_expiry, started_at[index] + provider_timeout)
+                done, pending = wait(
+                    pending, timeout=max(0.0, next_expiry - now),
+                    return_when=FIRST_COMPLETED,
+                )
+                now = time.monotonic()
+                for future in done:
+                    index = futures[future]
+                    name, provider, _fn = calls[index]
+                    try:
+                        results[index] = future.result()
+                        status = 'ok'
+                    except Exception:
+                        # get_summary/get_detail already trap provider errors;
+                        # this only guards against failures in the gate itself.
+                        logger.error('Context provider %s crashed', name, exc_info=True)
+                        results[index] = provider.unavailable_line(detail=detail)
+                        status = 'error'
+                    timings[name] = {
+                        'ms': round((now - started_at.get(index, now)) * 1000, 1),
+                        'status': status,
+                    }
+                for future in list(pending):
+                    index = futures[future]
+                    running_since = started_at.get(index)
+                    expired = now >= deadline or (
+                        running_since is not None
+                        and now - running_since >= provider_timeout
+                    )
+                    if not expired:
+                        continue
+                    pending.discard(future)
+                    future.cancel()
+                    name, provider, _fn = calls[index]
+                    results[index] = provider.unavailable_line(
+                        detail=detail, reason='timed out',
+                    )
+                    timings[name] = {
+                        'ms': round((now - (running_since or now)) * 1000, 1),
+                        'status': 'timeout' if running_since is not None else 'skipped',
+                    }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def _report_timings(self, timings, detail):
+        """Log per-provider timing; providers that were slow or timed out are warned about."""
+        if not timings:
+            return
+        from django.conf import settings
+        slow_ms = float(getattr(settings, 'SPECTRA_CONTEXT_SLOW_PROVIDER_MS', 500))
+        kind = 'detail' if detail else 'summary'
+        for name, timing in timings.items():
+            if timing['status'] != 'ok' or timing['ms'] >= slow_ms:
+                logger.warning(
+                    'Context provider %s %s: %s after %.0f ms',
+                    name, kind, timing['status'], timing['ms'],
+                )
+        slowest = sorted(timings.items(), key=lambda item: -item[1]['ms'])[:5]
+        logger.debug(
+            'Context provider %s timings (slowest first): %s', kind,
+            ', '.join(f"{name}={timing['ms']:.0f}ms" for name, timing in slowest),
+        )
+
 
 # ── Module-level singleton ──────────────────────────────────────────────────
 registry = ContextProviderRegistry()
@@ -68,11 +68,7 @@ class BaseContextProvider(ABC):
                 'Context provider %s summary crashed',
                 self.PROVIDER_NAME, exc_info=True,
             )
-            return (
-                f'⚠️ {self.PROVIDER_NAME} data temporarily unavailable '
-                f'(provider error). Do not answer questions about this feature '
-                f'from memory.\n'
-            )
+            return self.unavailable_line()
 
     def get_detail(self, board, user, query='', is_demo_mode=False):
         """
@@ -91,11 +87,21 @@ class BaseContextProvider(ABC):
                 'Context provider %s detail crashed',
                 self.PROVIDER_NAME, exc_info=True,
             )
-            return (
-                f'⚠️ {self.PROVIDER_NAME} detailed data temporarily unavailable '
-                f'(provider error). Do not answer questions about this feature '
-                f'from memory.\n'
-            )
+            return self.unavailable_line(detail=True)
+
+    def unavailable_line(self, detail=False, reason='provider error'):
+        """
+        Return the "data temporarily unavailable" warning for this provider.
+
+        Used when the provider crashed, and by the registry when a provider
+        misses its deadline in concurrent mode (``reason='timed out'``).
+        """
+        kind = 'detailed data' if detail else 'data'
+        return (
+            f'⚠️ {self.PROVIDER_NAME} {kind} temporarily unavailable '
+            f'({reason}). Do not answer questions about this feature '
+            f'from memory.\n'
+        )
 
     # ── Security layer (RBAC + sandbox) ─────────────────────────────────
 
@@ -0,0 +1,510 @@
+"""
+Per-organization embedding index for Knowledge Base semantic search.
+
+``ProjectKnowledgeBase.embedding`` is stored as a JSON list so we can stay on
+SQLite, which makes scoring in the database impossible and scoring in a
+Python loop slow.  This module keeps, per organization, a float32 matrix of
+pre-normalized KB vectors alongside their row and board ids, so a query is a
+single matrix-vector product plus a top-k partition.
+
+Layout
+~~~~~~
+::
+
+    <KB_EMBEDDING_INDEX_DIR>/org_<id>.npz      ids (int64), board_ids (int64)
+    <KB_EMBEDDING_INDEX_DIR>/org_<id>.npy      vectors (float32, n × dim), mmap'd
+    <KB_EMBEDDING_INDEX_DIR>/org_<id>.journal  upserts/removals since the .npy
+    <KB_EMBEDDING_INDEX_DIR>/org_<id>.lock     cross-process write lock
+
+Rows from boards without an organization live in ``org_none``.  When
+``KB_EMBEDDING_INDEX_DIR`` is ``None`` the index is kept in memory only.
+
+Maintenance
+~~~~~~~~~~~
+- Built lazily from the database the first time an organization is queried.
+- Updated incrementally by the KB embedding hook in ``ai_assistant/signals.py``
+  (``upsert`` after a vector is written, ``remove`` on delete/deactivate).
+  An update appends one fixed-size record to the journal instead of
+  rewriting the matrix; the journal is folded back into the .npz/.npy pair
+  once it outgrows ``JOURNAL_COMPACT_MIN_RECORDS`` and half the index.
+- Every read-modify-write of the files happens under an exclusive lock on
+  the .lock file, so concurrent workers can't lose each other's rows.
+- Other processes notice a newer .npy (mtime check) and reload, or a longer
+  journal and replay just its new records.
+- ``python manage.py rebuild_kb_embedding_index`` rebuilds from scratch.
+
+Access control is NOT enforced here: ``search`` only narrows by the board ids
+the caller passes in, and callers must re-fetch the returned ids through their
+RBAC-scoped queryset.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_UPSERT = 1
+JOURNAL_REMOVE = 2
+# Compact once the journal holds more records than this and than half the
+# index, so rewrites stay amortised O(1) per update.
+JOURNAL_COMPACT_MIN_RECORDS = 256
+
+
+def _org_key(organization_id):
+    return f'org_{organization_id if organization_id is not None else "none"}'
+
+
+def _journal_dtype(dim):
+    return np.dtype([
+        ('op', '<i1'), ('id', '<i8'), ('board_id', '<i8'), ('vector', '<f4', (dim,)),
+    ])
+
+
+def _lock_file(fh):
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(fh):
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class OrgEmbeddingIndex:
+    """Embedding matrix for one organization's active KB rows."""
+
+    def __init__(self, ids=None, board_ids=None, vectors=None, dim=None):
+        if vectors is None:
+            dim = dim or 0
+            vectors = np.zeros((0, dim), dtype=np.float32)
+        self.ids = np.asarray(ids if ids is not None else [], dtype=np.int64)
+        self.board_ids = np.asarray(board_ids if board_ids is not None else [], dtype=np.int64)
+        self.vectors = vectors
+        self._positions = {int(kb_id): pos for pos, kb_id in enumerate(self.ids)}
+        # Appends go into spare capacity (doubled when full) instead of
+        # re-stacking the whole matrix; ids/board_ids/vectors are views into it.
+        self._spare = None
+        self.mtime = None
+        self.journal_offset = 0
+
+    @classmethod
+    def from_rows(cls, rows, dim):
+        """Build from ``(kb_id, board_id, embedding_list)`` tuples of width ``dim``."""
+        rows = [r for r in rows if r[2] and len(r[2]) == dim]
+        if not rows:
+            return cls(dim=dim)
+        vectors = np.asarray([r[2] for r in rows], dtype=np.float32)
+        return cls(
+            ids=[r[0] for r in rows],
+            board_ids=[r[1] for r in rows],
+            vectors=_normalize_rows(vectors),
+            dim=dim,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    def __contains__(self, kb_id):
+        return int(kb_id) in self._positions
+
+    # ── Incremental maintenance ─────────────────────────────────────────
+
+    def upsert(self, kb_id, board_id, vector):
+        """Insert or replace one row.  Returns False if the width doesn't match."""
+        vec = np.asarray(vector, dtype=np.float32)
+        if vec.ndim != 1 or (len(self) and vec.shape[0] != self.dim):
+            return False
+        norm = float(np.linalg.norm(vec))
+        if norm > 0:
+            vec = vec / norm
+        pos = self._positions.get(int(kb_id))
+        if pos is not None:
+            if not self.vectors.flags.writeable:
+                self.vectors = np.array(self.vectors)  # detach from the mmap
+            self.vectors[pos] = vec
+            self.board_ids[pos] = board_id
+            return True
+        n = len(self)
+        if self._spare is None or n == len(self._spare[0]):
+            capacity = max(16, 2 * n)
+            ids = np.empty(capacity, dtype=np.int64)
+            board_ids = np.empty(capacity, dtype=np.int64)
+            vectors = np.empty((capacity, vec.shape[0]), dtype=np.float32)
+            ids[:n], board_ids[:n], vectors[:n] = self.ids, self.board_ids, self.vectors
+            self._spare = (ids, board_ids, vectors)
+        ids, board_ids, vectors = self._spare
+        ids[n], board_ids[n], vectors[n] = kb_id, board_id, vec
+        self.ids, self.board_ids, self.vectors = ids[:n + 1], board_ids[:n + 1], vectors[:n + 1]
+        self._positions[int(kb_id)] = n
+        return True
+
+    def remove(self, kb_id):
+        """Drop one row.  Returns True if it was present."""
+        pos = self._positions.get(int(kb_id))
+        if pos is None:
+            return False
+        keep = np.ones(len(self), dtype=bool)
+        keep[pos] = False
+        self.ids = self.ids[keep]
+        self.board_ids = self.board_ids[keep]
+        self.vectors = np.array(self.vectors[keep])
+        self._positions = {int(i): p for p, i in enumerate(self.ids)}
+        self._spare = None
+        return True
+
+    def apply_journal(self, records):
+        """Replay journal records (see ``_journal_dtype``) in order."""
+        for record in records:
+            if record['op'] == JOURNAL_UPSERT:
+                self.upsert(int(record['id']), int(record['board_id']), record['vector'])
+            elif record['op'] == JOURNAL_REMOVE:
+                self.remove(int(record['id']))
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def _query_vector(self, query_vec):
+        q = np.asarray(query_vec, dtype=np.float32)
+        if q.ndim != 1 or not len(self) or q.shape[0] != self.dim:
+            return None
+        norm = float(np.linalg.norm(q))
+        if norm <= 0:
+            return None
+        return q / norm
+
+    def search(self, query_vec, k=10, board_ids=None, exclude_ids=None):
+        """
+        Return up to ``k`` ``(kb_id, cosine)`` pairs, best first.
+
+        ``board_ids`` restricts the candidates to rows on those boards;
+        ``exclude_ids`` drops specific rows (e.g. keyword hits already found).
+        """
+        q = self._query_vector(query_vec)
+        if q is None or k <= 0:
+            return []
+        mask = None
+        if board_ids is not None:
+            mask = np.isin(self.board_ids, np.fromiter(board_ids, dtype=np.int64))
+        if exclude_ids:
+            excluded = np.isin(self.ids, np.fromiter(exclude_ids, dtype=np.int64))
+            mask = ~excluded if mask is None else mask & ~excluded
+        if mask is None:
+            ids, scores = self.ids, self.vectors @ q
+        else:
+            if not mask.any():
+                return []
+            ids, scores = self.ids[mask], self.vectors[mask] @ q
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def scores_for(self, query_vec, kb_ids):
+        """Return ``{kb_id: cosine}`` for the given rows that are indexed."""
+        q = self._query_vector(query_vec)
+        if q is None:
+            return {}
+        positions = [(kb_id, self._positions[int(kb_id)]) for kb_id in kb_ids
+                     if int(kb_id) in self._positions]
+        if not positions:
+            return {}
+        rows = np.fromiter((p for _, p in positions), dtype=np.int64)
+        scores = self.vectors[rows] @ q
+        return {kb_id: float(s) for (kb_id, _), s in zip(positions, scores)}
+
+
+class EmbeddingIndexManager:
+    """
+    Process-local registry of ``OrgEmbeddingIndex`` objects, with disk persistence.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return NUMPY_AVAILABLE and getattr(settings, 'KB_EMBEDDING_INDEX_ENABLED', True)
+
+    def _directory(self):
+        return getattr(settings, 'KB_EMBEDDING_INDEX_DIR', None)
+
+    def _paths(self, organization_id):
+        base = os.path.join(self._directory(), _org_key(organization_id))
+        return base + '.npz', base + '.npy'
+
+    def _journal_path(self, organization_id):
+        return os.path.join(self._directory(), _org_key(organization_id) + '.journal')
+
+    def _lock(self, organization_id):
+        with self._registry_lock:
+            return self._locks.setdefault(organization_id, threading.RLock())
+
+    @contextmanager
+    def _file_lock(self, organization_id):
+        """Exclusive cross-process lock on one organization's files."""
+        directory = self._directory()
+        if not directory:
+            yield
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, _org_key(organization_id) + '.lock')
+        with open(path, 'a+b') as fh:
+            _lock_file(fh)
+            try:
+                yield
+            finally:
+                _unlock_file(fh)
+
+    # ── Loading / building ──────────────────────────────────────────────
+
+    def _disk_mtime(self, organization_id):
+        if not self._directory():
+            return None
+        try:
+            return os.stat(self._paths(organization_id)[1]).st_mtime_ns
+        except OSError:
+            return None
+
+    def _journal_size(self, organization_id):
+        try:
+            return os.stat(self._journal_path(organization_id)).st_size
+        except OSError:
+            return 0
+
+    def _replay(self, organization_id, index):
+        """Apply journal records written since ``index.journal_offset``."""
+        dtype = _journal_dtype(index.dim)
+        try:
+            with open(self._journal_path(organization_id), 'rb') as fh:
+                fh.seek(index.journal_offset)
+                data = fh.read()
+        except OSError:
+            return
+        whole = len(data) - len(data) % dtype.itemsize
+        if whole:
+            index.apply_journal(np.frombuffer(data[:whole], dtype=dtype))
+            index.journal_offset += whole
+
+    def _sync(self, organization_id, index):
+        """
+        Bring ``index`` up to date with the files and return the current
+        index.  Caller holds the file lock.
+        """
+        if self._disk_mtime(organization_id) is None:
+            return index
+        if index is None or index.mtime != self._disk_mtime(organization_id):
+            index = self._load(organization_id)
+        self._replay(organization_id, index)
+        self._indexes[organization_id] = index
+        return index
+
+    def _append(self, organization_id, index, op, kb_id, board_id, vector=None):
+        """Journal one update, or compact when the journal has grown enough."""
+        dtype = _journal_dtype(index.dim)
+        records = index.journal_offset // dtype.itemsize
+        if records >= max(JOURNAL_COMPACT_MIN_RECORDS, len(index) // 2):
+            self._save(organization_id, index)
+            return
+        record = np.zeros(1, dtype=dtype)
+        record['op'], record['id'], record['board_id'] = op, kb_id, board_id
+        if vector is not None:
+            record['vector'] = vector
+        with open(self._journal_path(organization_id), 'ab') as fh:
+            fh.write(record.tobytes())
+        index.journal_offset += dtype.itemsize
+
+    def _load(self, organization_id):
+        meta_path, vectors_path = self._paths(organization_id)
+        with np.load(meta_path) as meta:
+            index = OrgEmbeddingIndex(
+                ids=meta['ids'], board_ids=meta['board_ids'],
+                vectors=np.load(vectors_path, mmap_mode='r'),
+            )
+        index.mtime = self._disk_mtime(organization_id)
+        index.journal_offset = 0
+        return index
+
+    def _save(self, organization_id, index):
+        directory = self._directory()
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        meta_path, vectors_path = self._paths(organization_id)
+        # Write to temp files and rename so readers never see a torn file.
+        # Metadata goes first: a reader that sees the new vectors file
+        # (whose mtime is the reload trigger) always finds matching ids.
+        fd, tmp_meta = tempfile.mkstemp(dir=directory, suffix='.npz')
+        with os.fdopen(fd, 'wb') as fh:
+            np.savez(fh, ids=index.ids, board_ids=index.board_ids)
+        os.replace(tmp_meta, meta_path)
+        fd, tmp_vectors = tempfile.mkstemp(dir=directory, suffix='.npy')
+        with os.fdopen(fd, 'wb') as fh:
+            np.save(fh, np.ascontiguousarray(index.vectors, dtype=np.float32))
+        os.replace(tmp_vectors, vectors_path)
+        # The new files contain every journalled update.
+        open(self._journal_path(organization_id), 'wb').close()
+        index.mtime = self._disk_mtime(organization_id)
+        index.journal_offset = 0
+
+    def build(self, organization_id):
+        """Rebuild one organization's index from the database and persist it."""
+        from ai_assistant.models import ProjectKnowledgeBase
+        from ai_assistant.utils.ai_clients import GEMINI_EMBEDDING_DIM
+
+        rows = ProjectKnowledgeBase.objects.filter(
+            is_active=True, embedding__isnull=False,
+            board__organization_id=organization_id,
+        ).values_list('id', 'board_id', 'embedding')
+        index = OrgEmbeddingIndex.from_rows(rows.iterator(), GEMINI_EMBEDDING_DIM)
+        with self._lock(organization_id), self._file_lock(organization_id):
+            self._save(organization_id, index)
+            self._indexes[organization_id] = index
+        logger.info('Built KB embedding index for %s: %d rows',
+                    _org_key(organization_id), len(index))
+        return index
+
+    def get(self, organization_id):
+        """Return the current index for an organization, loading or building it."""
+        if not self.enabled:
+            return None
+        with self._lock(organization_id):
+            index = self._indexes.get(organization_id)
+            disk_mtime = self._disk_mtime(organization_id)
+            if index is not None and (
+                disk_mtime is None
+                or (disk_mtime == index.mtime
+                    and self._journal_size(organization_id) == index.journal_offset)
+            ):
+                return index
+            if disk_mtime is not None:
+                try:
+                    with self._file_lock(organization_id):
+                        return self._sync(organization_id, index)
+                except Exception:
+                    logger.warning('Could not load KB embedding index for %s; rebuilding',
+                                   _org_key(organization_id), exc_info=True)
+        return self.build(organization_id)
+
+    def invalidate(self, organization_id=None):
+        """Forget in-memory copies (all organizations when ``None`` is passed)."""
+        with self._registry_lock:
+            if organization_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(organization_id, None)
+
+    # ── Incremental updates (called from ai_assistant/signals.py) ───────
+
+    def upsert(self, organization_id, kb_id, board_id, vector):
+        if not self.enabled:
+            return
+        with self._lock(organization_id):
+            index = self.get(organization_id)
+            if index is None:
+                return
+            with self._file_lock(organization_id):
+                index = self._sync(organization_id, index)
+                was_empty = len(index) == 0
+                if not index.upsert(kb_id, board_id, vector):
+                    return
+                if not self._directory():
+                    return
+                if was_empty:
+                    # The journal's record width comes from the saved matrix.
+                    self._save(organization_id, index)
+                else:
+                    self._append(organization_id, index, JOURNAL_UPSERT, kb_id, board_id,
+                                 np.asarray(vector, dtype=np.float32))
+
+    def remove(self, organization_id, kb_id):
+        if not self.enabled:
+            return
+        with self._lock(organization_id):
+            # Nothing built yet means nothing to remove; a later build reads
+            # the database, which no longer has the row.
+            if (organization_id not in self._indexes
+                    and self._disk_mtime(organization_id) is None):
+                return
+            index = self.get(organization_id)
+            if index is None:
+                return
+            with self._file_lock(organization_id):
+                index = self._sync(organization_id, index)
+                if index.remove(kb_id) and self._directory():
+                    self._append(organization_id, index, JOURNAL_REMOVE, kb_id, 0)
+
+    # ── Search across organizations ─────────────────────────────────────
+
+    def search(self, query_vec, board_org_ids, k=10, exclude_ids=None):
+        """
+        Top-k over every organization that owns one of the candidate boards.
+
+        ``board_org_ids`` is an iterable of ``(board_id, organization_id)``
+        pairs for the boards the caller is allowed to read.
+        """
+        if not self.enabled:
+            return []
+        boards_by_org = {}
+        for board_id, organization_id in board_org_ids:
+            boards_by_org.setdefault(organization_id, set()).add(board_id)
+        hits = []
+        for organization_id, board_ids in boards_by_org.items():
+            index = self.get(organization_id)
+            if index is None:
+                continue
+            hits.extend(index.search(
+                query_vec, k=k, board_ids=board_ids, exclude_ids=exclude_ids,
+            ))
+        hits.sort(key=lambda hit: -hit[1])
+        return hits[:k]
+
+    def scores_for(self, query_vec, organization_ids, kb_ids):
+        """Return ``{kb_id: cosine}`` for indexed rows across the given organizations."""
+        if not self.enabled:
+            return {}
+        scores = {}
+        for organization_id in set(organization_ids):
+            index = self.get(organization_id)
+            if index is not None:
+                scores.update(index.scores_for(query_vec, kb_ids))
+        return scores
+
+
+embedding_index = EmbeddingIndexManager()
@@ -5,7 +5,10 @@ AI-powered task priority classification with explainability
 import logging
 import pickle
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from django.conf import settings
 from django.utils import timezone
 from django.db.models import Count, Q
 
@@ -19,6 +22,43 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Process-local LRU of unpickled estimators: (PriorityModel.pk, model_version)
+# -> (board_id, estimator). A retrained model is a new row, so it never hits a
+# stale entry; invalidate_priority_models() just frees the old board entries.
+_model_cache_lock = threading.Lock()
+_model_cache = OrderedDict()
+
+
+def load_priority_model(model_obj):
+    """
+    Return the unpickled estimator for ``model_obj``, from the cache when possible.
+
+    PriorityModel.get_active_model() defers ``model_file``, so on a cache hit
+    the pickled blob is never read from the database at all.
+    """
+    key = (model_obj.pk, model_obj.model_version)
+    with _model_cache_lock:
+        entry = _model_cache.get(key)
+        if entry is not None:
+            _model_cache.move_to_end(key)
+            return entry[1]
+
+    estimator = pickle.loads(model_obj.model_file)
+    with _model_cache_lock:
+        _model_cache[key] = (model_obj.board_id, estimator)
+        _model_cache.move_to_end(key)
+        while len(_model_cache) > getattr(settings, 'PRIORITY_MODEL_CACHE_SIZE', 32):
+            _model_cache.popitem(last=False)
+    return estimator
+
+
+def invalidate_priority_models(board_id=None):
+    """Drop cached estimators for ``board_id`` (or every board when None)."""
+    with _model_cache_lock:
+        for key in [k for k, (b, _) in _model_cache.items() if board_id is None or b == board_id]:
+            del _model_cache[key]
+
+
 class PrioritySuggestionService:
     """
     Service for suggesting task priorities using machine learning
@@ -74,13 +114,7 @@ class PrioritySuggestionService:
         """
         from kanban.priority_models import PriorityModel
         
-        # Get board (handle unsaved tasks)
-        board = None
-        if task.pk and task.column:
-            board = task.column.board
-        elif hasattr(task, '_board'):
-            board = task._board
-        
+        board = self._task_board(task)
         if not board:
             logger.warning("No board found for task, using rule-based fallback")
             return self._rule_based_suggestion(task)
@@ -94,7 +128,7 @@ class PrioritySuggestionService:
         
         # Load model
         try:
-            self.model = pickle.loads(model_obj.model_file)
+            self.model = load_priority_model(model_obj)
             self.feature_importance = model_obj.feature_importance
         except Exception as e:
             logger.error(f"Error loading model: {e}")
@@ -105,46 +139,65 @@ class PrioritySuggestionService:
         
         # Make prediction
         try:
-            prediction_proba = self.model.predict_proba([features])[0]
-            predicted_class = self.model.predict([features])[0]
-            
-            # Get class labels
-            classes = self.model.classes_
-            
-            # Map prediction to priority
-            suggested_priority = classes[predicted_class]
-            confidence = prediction_proba[predicted_class]
-            
-            # Get alternative priorities
-            alternatives = []
-            for i, cls in enumerate(classes):
-                if cls != suggested_priority:
-                    alternatives.append({
-                        'priority': cls,
-                        'confidence': float(prediction_proba[i])
-                    })
-            
-            # Sort alternatives by confidence
-            alternatives.sort(key=lambda x: x['confidence'], reverse=True)
-            
-            # Generate reasoning
-            reasoning = self._generate_reasoning(features, suggested_priority, confidence, task)
-            
-            # Log suggestion
-            self._log_suggestion(task, model_obj, suggested_priority, confidence, reasoning, features, user)
-            
-            return {
-                'suggested_priority': suggested_priority,
-                'confidence': float(confidence),
-                'reasoning': reasoning,
-                'alternatives': alternatives[:2],  # Top 2 alternatives
-                'model_version': model_obj.model_version,
-                'is_ml_based': True
-            }
-        
+            probabilities = self.model.predict_proba([features])[0]
+            suggestion = self._ml_suggestion(task, model_obj, features, probabilities)
         except Exception as e:
             logger.error(f"Error making prediction: {e}")
             return self._rule_based_suggestion(task)
+        
+        # Log suggestion
+        self._log_suggestion(
+            task, model_obj, suggestion['suggested_priority'], suggestion['confidence'],
+            suggestion['reasoning'], features, user
+        )
+        return suggestion
+    
+    def _ml_suggestion(self, task, model_obj, features, probabilities):
+        """Build the suggestion dict from one row of predict_proba output"""
+        classes = self.model.classes_
+        
+        # predict() is argmax over predict_proba; take it from the row we have
+        best = max(range(len(classes)), key=lambda i: probabilities[i])
+        suggested_priority = str(classes[best])
+        confidence = float(probabilities[best])
+        
+        # Get alternative priorities
+        alternatives = []
+        for i, cls in enumerate(classes):
+            if i != best:
+                alternatives.append({
+                    'priority': str(cls),
+                    'confidence': float(probabilities[i])
+                })
+        
+        # Sort alternatives by confidence
+        alternatives.sort(key=lambda x: x['confidence'], reverse=True)
+        
+        # Generate reasoning
+        reasoning = self._generate_reasoning(features, suggested_priority, confidence, task)
+        
+        return {
+            'suggested_priority': suggested_priority,
+            'confidence': confidence,
+            'reasoning': reasoning,
+            'alternatives': alternatives[:2],  # Top 2 alternatives
+            'model_version': model_obj.model_version,
+            'is_ml_based': True
+        }
+    
+    def _task_board(self, task):
+        """Board of a task (handles unsaved tasks carrying ``_board``)"""
+        board = None
+        if task.pk:
+            try:
+                if task.column:
+                    board = task.column.board
+            except Exception:
+                pass
+        
+        if not board and hasattr(task, '_board'):
+            board = task._board
+        return board
     
     def _extract_features(self, task):
         """
@@ -153,8 +206,97 @@ class PrioritySuggestionService:
         Returns:
             list: Feature values in correct order
         """
+        return self._extract_features_batch([task], self._task_board(task))[0]
+    
+    @staticmethod
+    def _grouped_counts(queryset, key):
+        """``{key value: row count}`` for ``queryset`` in one GROUP BY query"""
+        return dict(queryset.values(key).annotate(n=Count('pk')).values_list(key, 'n'))
+    
+    def _extract_features_batch(self, tasks, board):
+        """
+        Extract feature vectors for tasks on one board
+        
+        Dependency, subtask and label counts, assignee workloads and team
+        capacity are each fetched with one grouped query for the whole batch.
+        
+        Returns:
+            list: one feature list per task, in input order
+        """
         from kanban.models import Task
         
+        # Per-task relation counts (saved tasks only), one grouped query per
+        # relation: annotating all four at once would join them into a
+        # dependencies x dependents x subtasks x labels row product per task.
+        saved_ids = [task.pk for task in tasks if task.pk]
+        blocking = blocked_by = subtasks = labels = {}
+        if saved_ids:
+            deps = Task.dependencies.through.objects
+            blocking = self._grouped_counts(deps.filter(from_task_id__in=saved_ids), 'from_task_id')
+            blocked_by = self._grouped_counts(deps.filter(to_task_id__in=saved_ids), 'to_task_id')
+            subtasks = self._grouped_counts(
+                Task.objects.filter(parent_task_id__in=saved_ids), 'parent_task_id'
+            )
+            labels = self._grouped_counts(
+                Task.labels.through.objects.filter(task_id__in=saved_ids), 'task_id'
+            )
+        
+        # Get assignee workload
+        workloads = {}
+        assignee_ids = {task.assigned_to_id for task in tasks if task.assigned_to_id}
+        if assignee_ids:
+            workloads = dict(
+                Task.objects.filter(
+                    assigned_to_id__in=assignee_ids,
+                    progress__lt=100
+                ).exclude(
+                    column__name__icontains='done'
+                ).values('assigned_to_id').annotate(n=Count('id')).values_list('assigned_to_id', 'n')
+            )
+        
+        # Get team capacity
+        team_tasks_per_member = 0
+        if board:
+            team_size = board.memberships.count()
+            if team_size > 0:
+                total_open_tasks = Task.objects.filter(
+                    column__board=board,
+                    progress__lt=100
+                ).exclude(
+                    column__name__icontains='done'
+                ).count()
+                team_tasks_per_member = total_open_tasks / team_size
+        
+        rows = []
+        for task in tasks:
+            days_until_due, is_overdue = self._due_features(task)
+            blocking_count = blocking.get(task.pk, 0)
+            blocked_by_count = blocked_by.get(task.pk, 0)
+            subtask_count = subtasks.get(task.pk, 0)
+            label_count = labels.get(task.pk, 0)
+            
+            # Build feature vector
+            rows.append([
+                days_until_due,
+                1 if is_overdue else 0,
+                task.complexity_score,
+                blocking_count,
+                blocked_by_count,
+                workloads.get(task.assigned_to_id, 0) if task.assigned_to_id else 0,
+                team_tasks_per_member,
+                1 if task.description else 0,
+                len(task.description or ''),
+                1 if task.collaboration_required else 0,
+                task.risk_score or 0,
+                1 if subtask_count else 0,
+                1 if task.parent_task_id is not None else 0,
+                label_count
+            ])
+        
+        return rows
+    
+    def _due_features(self, task):
+        """(days_until_due, is_overdue) for the feature vector"""
         # Calculate days until due
         days_until_due = 999  # Default for no due date
         is_overdue = False
@@ -163,7 +305,6 @@ class PrioritySuggestionService:
             due_date = task.due_date
             # Normalise date → datetime (date objects lack utcoffset / hour)
             if not hasattr(due_date, 'hour'):
-                from datetime import datetime
                 due_date = datetime.combine(due_date, datetime.min.time())
             if timezone.is_naive(due_date):
                 due_date = timezone.make_aware(due_date)
@@ -181,7 +322,6 @@ class PrioritySuggestionService:
                 sd = start_date
                 # Normalise to datetime
                 if not hasattr(sd, 'hour'):
-                    from datetime import datetime
                     sd = datetime.combine(sd, datetime.min.time())
                 if timezone.is_naive(sd):
                     sd = timezone.make_aware(sd)
@@ -190,82 +330,7 @@ class PrioritySuggestionService:
                     if work_window > 0:
                         days_until_due = work_window
         
-        # Count dependencies
-        blocking_count = 0
-        blocked_by_count = 0
-        if task.pk:
-            blocking_count = task.dependencies.count()
-            blocked_by_count = task.dependent_tasks.count()
-        
-        # Get assignee workload
-        assignee_workload = 0
-        if task.assigned_to:
-            assignee_workload = Task.objects.filter(
-                assigned_to=task.assigned_to,
-                progress__lt=100
-            ).exclude(
-                column__name__icontains='done'
-            ).count()
-        
-        # Get team capacity
-        team_tasks_per_member = 0
-        board = None
-        
-        # Safely get board
-        if task.pk:
-            try:
-                if task.column:
-                    board = task.column.board
-            except:
-                pass
-        
-        if not board and hasattr(task, '_board'):
-            board = task._board
-        
-        if board:
-            team_size = board.memberships.count()
-            if team_size > 0:
-                total_open_tasks = Task.objects.filter(
-                    column__board=board,
-                    progress__lt=100
-                ).exclude(
-                    column__name__icontains='done'
-                ).count()
-                team_tasks_per_member = total_open_tasks / team_size
-        
-        # Risk score
-        risk_score = task.risk_score or 0
-        
-        # Subtasks
-        has_subtasks = False
-        is_subtask = task.parent_task is not None
-        if task.pk:
-            has_subtasks = task.subtasks.exists()
-        
-        # Labels
-        label_count = 0
-        if task.pk:
-            label_count = task.labels.count()
-        
-        # Build feature vector
-        features = [
-            days_until_due,
-            1 if is_overdue else 0,
-            task.complexity_score,
-            blocking_count,
-            blocked_by_count,
-            assignee_workload,
-            team_tasks_per_member,
-            1 if task.description else 0,
-            len(task.description or ''),
-            1 if task.collaboration_required else 0,
-            risk_score,
-            1 if has_subtasks else 0,
-            1 if is_subtask else 0,
-            label_count
-        ]
-        
-        return features
+        return days_until_due, is_overdue
     
     def _generate_reasoning(self, features, priority, confidence, task):
         """
@@ -914,6 +979,9 @@ class PriorityModelTrainer:
             is_active=True
         )
         
+        # Free this process's estimators for the superseded versions
+        invalidate_priority_models(self.board.id)
+        
         logger.info(f"Trained priority model v{new_version} for board {self.board.id} - Accuracy: {accuracy:.2%}")
         
         return {
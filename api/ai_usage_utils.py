@@ -206,16 +206,19 @@ def require_ai_quota(feature_name, request_type=''):
                 response = view_func(request, *args, **kwargs)
                 response_time_ms = int((time.time() - start_time) * 1000)
                 
-                # Track successful request
-                board_id = kwargs.get('board_id')
-                track_ai_request(
-                    user=request.user,
-                    feature=feature_name,
-                    request_type=request_type,
-                    board_id=board_id,
-                    success=True,
-                    response_time_ms=response_time_ms
-                )
+                # Track successful request, unless the view answered from a
+                # stored result without calling the model
+                # (it sets request.ai_request_made = False).
+                if getattr(request, 'ai_request_made', True):
+                    board_id = kwargs.get('board_id')
+                    track_ai_request(
+                        user=request.user,
+                        feature=feature_name,
+                        request_type=request_type,
+                        board_id=board_id,
+                        success=True,
+                        response_time_ms=response_time_ms
+                    )
                 
                 return response
                 
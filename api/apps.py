@@ -8,3 +8,7 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'API & Integrations'
+
+    def ready(self):
+        """Import signal handlers when the app is ready"""
+        import api.signals  # noqa
@@ -0,0 +1,33 @@
+"""
+Signal handlers for the API app
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.models import APIToken
+from api.token_usage import invalidate_token, invalidate_user_tokens
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def drop_cached_api_token(sender, instance, **kwargs):
+    """Revocation, rotation and deletion take effect on the next request."""
+    invalidate_token(instance)
+
+
+@receiver(pre_save, sender=User)
+def track_user_activation(sender, instance, update_fields=None, **kwargs):
+    """Note whether this save flips ``is_active`` (cached tokens carry the user)."""
+    instance._api_active_changed = False
+    if not instance.pk or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    old = sender.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+    instance._api_active_changed = old is not None and old != instance.is_active
+
+
+@receiver(post_save, sender=User)
+def drop_cached_api_tokens_of_user(sender, instance, **kwargs):
+    """A deactivated user's tokens stop authenticating on the next request."""
+    if getattr(instance, '_api_active_changed', False):
+        invalidate_user_tokens(instance.pk)
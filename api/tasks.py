@@ -0,0 +1,19 @@
+"""
+Celery tasks for the API app
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='api.flush_token_usage')
+def flush_token_usage():
+    """Write cached API token request counts and last_used to the DB."""
+    from api.token_usage import flush_usage
+
+    flushed = flush_usage()
+    if flushed:
+        logger.debug("Flushed usage for %d API tokens", flushed)
+    return flushed
@@ -0,0 +1,272 @@
+"""
+Cache-backed API token lookup, rate limiting and usage accounting.
+
+``APITokenAuthentication`` used to SELECT the token on every request, then
+``check_rate_limit()`` could ``save()`` a counter reset and
+``increment_request_count()`` always saved the row — one write per API call
+on the single SQLite writer, and a read-modify-write race that lost counts
+under concurrent requests (Zapier polling being most of the traffic).
+
+Instead:
+
+* ``get_token(key)`` serves the token (with its user) from a short-TTL cache
+  entry keyed by a hash of the token string.  ``api.signals`` drops the entry
+  whenever the token is saved or deleted, and all of a user's entries when
+  the user is activated or deactivated, so revocation is immediate.
+* ``consume(token)`` counts the request with atomic ``cache.incr`` calls:
+  an hourly sliding-window counter (the current and previous fixed hours,
+  the previous one weighted by how much of it still overlaps the window)
+  and a calendar-month counter.  A request over the hourly limit is
+  un-counted and rejected.
+* ``flush_usage()`` (``api.flush_token_usage``, every minute) writes the
+  counts and ``last_used`` of tokens used since the last flush back to the
+  DB in one ``bulk_update``.  The values written are absolute, so a missed
+  or repeated flush loses nothing.
+
+Token copies, counters and ``last_used`` live in the shared cache
+(``kanban_board.cache.shared_cache``): the default cache is per-process in
+DEBUG, where a revocation seen by one web process, or counts kept by another,
+would be invisible to the rest and to the flush worker.
+
+Counters are seeded from the DB row the first time a window is touched, so a
+cache flush or restart costs at most the requests since the last flush.  If
+there is no shared cache (no ``ai_cache`` alias, or
+``API_TOKEN_USAGE_IN_CACHE = False`` when running without Redis and beat) or
+it is unreachable, tokens are read from the DB on every request and
+``consume`` returns None so the caller falls back to the model's per-request
+DB accounting.
+"""
+import hashlib
+import logging
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.utils import timezone
+
+from kanban_board.cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_PREFIX = 'api_token'
+TOKEN_CACHE_TIMEOUT = 60
+USAGE_PREFIX = 'api_usage'
+HOUR = 3600
+# Keep a window's counter past its end: the next hour still reads it as the
+# previous window, and the flush reads it after the fact.
+HOUR_COUNTER_TIMEOUT = 3 * HOUR
+MONTH_COUNTER_TIMEOUT = 33 * 24 * HOUR
+LAST_USED_TIMEOUT = 2 * 24 * HOUR
+
+
+def _store():
+    """The shared cache, or None when usage has to be kept on the row."""
+    if not getattr(settings, 'API_TOKEN_USAGE_IN_CACHE', True) or 'ai_cache' not in settings.CACHES:
+        return None
+    return shared_cache()
+
+
+def _token_cache_key(key):
+    return f'{TOKEN_CACHE_PREFIX}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def get_token(key):
+    """
+    The active-or-not ``APIToken`` for ``key``, with ``user`` loaded, from
+    cache when possible.  Raises ``APIToken.DoesNotExist`` for unknown keys.
+    """
+    from api.models import APIToken
+
+    store = _store()
+    cache_key = _token_cache_key(key)
+    token = None
+    if store is not None:
+        try:
+            token = store.get(cache_key)
+        except Exception as e:
+            logger.warning("API token cache unavailable, reading the DB: %s", e)
+            store = None
+    if token is None:
+        token = APIToken.objects.select_related('user').get(token=key)
+        if store is not None:
+            try:
+                store.set(cache_key, token, TOKEN_CACHE_TIMEOUT)
+            except Exception:
+                pass
+    return token
+
+
+def invalidate_token(token):
+    """Drop ``token``'s cached copy (after it was saved or deleted)."""
+    store = _store()
+    if store is None:
+        return
+    try:
+        store.delete(_token_cache_key(token.token))
+    except Exception as e:
+        logger.warning("Could not drop cached API token %s: %s", token.pk, e)
+
+
+def invalidate_user_tokens(user_id):
+    """Drop the cached copies of all of ``user_id``'s tokens (their ``user`` changed)."""
+    from api.models import APIToken
+
+    store = _store()
+    if store is None:
+        return
+    keys = [
+        _token_cache_key(key)
+        for key in APIToken.objects.filter(user_id=user_id).values_list('token', flat=True)
+    ]
+    if not keys:
+        return
+    try:
+        store.delete_many(keys)
+    except Exception as e:
+        logger.warning("Could not drop cached API tokens of user %s: %s", user_id, e)
+
+
+def _hour_window(now):
+    start = now.replace(minute=0, second=0, microsecond=0)
+    return start, int(start.timestamp()) // HOUR
+
+
+def _month_start(now):
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _hour_key(token_id, window):
+    return f'{USAGE_PREFIX}:{token_id}:h:{window}'
+
+
+def _month_key(token_id, month_start):
+    return f'{USAGE_PREFIX}:{token_id}:m:{month_start:%Y%m}'
+
+
+def _last_used_key(token_id):
+    return f'{USAGE_PREFIX}:{token_id}:last_used'
+
+
+def _incr(store, key, seed, timeout, delta=1):
+    """Atomic increment, seeding a missing counter first."""
+    store.add(key, seed, timeout)
+    try:
+        return store.incr(key, delta)
+    except ValueError:
+        # Evicted between add() and incr().
+        store.add(key, seed, timeout)
+        return store.incr(key, delta)
+
+
+def _sliding_count(current, previous, now, window_start):
+    """Requests in the trailing hour, weighting the previous window by overlap."""
+    overlap = 1 - (now - window_start).total_seconds() / HOUR
+    return current + previous * overlap
+
+
+def _db_seeds(token, window_start, month_start):
+    """Counter start values from the DB row, for windows it still covers."""
+    hour_seed = 0
+    if token.rate_limit_reset_at and token.rate_limit_reset_at > window_start:
+        hour_seed = token.request_count_current_hour
+    month_seed = 0
+    if token.monthly_reset_at and token.monthly_reset_at > month_start:
+        month_seed = token.request_count_current_month
+    return hour_seed, month_seed
+
+
+def consume(token, now=None):
+    """
+    Count one request for ``token``.
+
+    Returns True if it is within the hourly limit, False if it was rejected
+    (and not counted), or None if there is no usable shared cache.
+    """
+    store = _store()
+    if store is None:
+        return None
+    now = now or timezone.now()
+    window_start, window = _hour_window(now)
+    month_start = _month_start(now)
+    hour_seed, month_seed = _db_seeds(token, window_start, month_start)
+    try:
+        current = _incr(store, _hour_key(token.pk, window), hour_seed, HOUR_COUNTER_TIMEOUT)
+        if current is None:
+            # IGNORE_EXCEPTIONS turns Redis errors into None.
+            return None
+        previous = store.get(_hour_key(token.pk, window - 1)) or 0
+        count = _sliding_count(current, previous, now, window_start)
+        if count > token.rate_limit_per_hour:
+            store.decr(_hour_key(token.pk, window))
+            return False
+        month_count = _incr(store, _month_key(token.pk, month_start), month_seed, MONTH_COUNTER_TIMEOUT)
+        store.set(_last_used_key(token.pk), now, LAST_USED_TIMEOUT)
+    except Exception as e:
+        logger.warning("API usage cache unavailable, counting in the DB: %s", e)
+        return None
+
+    # For anything reading request.api_token later in the request.
+    token.request_count_current_hour = round(count)
+    token.request_count_current_month = month_count
+    token.last_used = now
+    return True
+
+
+def flush_usage(now=None):
+    """
+    Write cached counts and ``last_used`` of recently used tokens to the DB.
+    Returns the number of tokens updated.
+    """
+    from api.models import APIToken
+
+    store = _store()
+    if store is None:
+        return 0
+    now = now or timezone.now()
+    window_start, window = _hour_window(now)
+    month_start = _month_start(now)
+
+    token_ids = list(APIToken.objects.filter(is_active=True).values_list('id', flat=True))
+    try:
+        last_used = store.get_many([_last_used_key(token_id) for token_id in token_ids])
+        seen = {
+            token_id: last_used[_last_used_key(token_id)]
+            for token_id in token_ids if _last_used_key(token_id) in last_used
+        }
+        if not seen:
+            return 0
+
+        keys = []
+        for token_id in seen:
+            keys += [_hour_key(token_id, window), _hour_key(token_id, window - 1),
+                     _month_key(token_id, month_start)]
+        counts = store.get_many(keys)
+    except Exception as e:
+        logger.warning("API usage cache unavailable, nothing flushed: %s", e)
+        return 0
+
+    tokens = []
+    for token in APIToken.objects.filter(id__in=seen).only(
+        'id', 'last_used', 'request_count_current_hour', 'rate_limit_reset_at',
+        'request_count_current_month', 'monthly_reset_at',
+    ):
+        if token.last_used and token.last_used >= seen[token.pk]:
+            continue
+        token.last_used = seen[token.pk]
+        token.request_count_current_hour = round(_sliding_count(
+            counts.get(_hour_key(token.pk, window), 0),
+            counts.get(_hour_key(token.pk, window - 1), 0),
+            now, window_start,
+        ))
+        token.rate_limit_reset_at = window_start + timedelta(seconds=HOUR)
+        month_key = _month_key(token.pk, month_start)
+        if month_key in counts:
+            token.request_count_current_month = counts[month_key]
+            token.monthly_reset_at = month_start + relativedelta(months=1)
+        tokens.append(token)
+
+    APIToken.objects.bulk_update(tokens, [
+        'last_used', 'request_count_current_hour', 'rate_limit_reset_at',
+        'request_count_current_month', 'monthly_reset_at',
+    ], batch_size=500)
+    return len(tokens)
@@ -5,6 +5,7 @@ from rest_framework import authentication, exceptions, permissions
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from api.models import APIToken
+from api import token_usage
 
 
 class APITokenAuthentication(authentication.BaseAuthentication):
@@ -42,13 +43,18 @@ class APITokenAuthentication(authentication.BaseAuthentication):
         Validate the token and return user.
         """
         try:
-            token = APIToken.objects.select_related('user').get(token=key)
+            token = token_usage.get_token(key)
         except APIToken.DoesNotExist:
             raise exceptions.AuthenticationFailed(_('Invalid API token.'))
         
         # Check if token is active
         if not token.is_active:
             raise exceptions.AuthenticationFailed(_('API token is inactive.'))
+
+        # Check if the owner is active (api.signals drops cached copies of
+        # their tokens when that changes)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
         
         # Check if token is expired
         if token.is_expired():
@@ -62,15 +68,19 @@ class APITokenAuthentication(authentication.BaseAuthentication):
                     _('API requests from this IP address are not allowed.')
                 )
         
-        # Check rate limit
-        if not token.check_rate_limit():
+        # Check rate limit and count the request in the cache; the counts
+        # reach the DB in batches (api.flush_token_usage). Without a shared cache,
+        # count on the row as before.
+        allowed = token_usage.consume(token)
+        if allowed is None:
+            allowed = token.check_rate_limit()
+            if allowed:
+                token.increment_request_count()
+        if not allowed:
             raise exceptions.AuthenticationFailed(
                 _('Rate limit exceeded. Please try again later.')
             )
         
-        # Increment request count
-        token.increment_request_count()
-        
         # Store token in request for later use
         request.api_token = token
         
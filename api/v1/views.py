@@ -385,6 +385,9 @@ def global_search(request):
     GET /api/v1/search/global/?q=<query>
 
     Returns up to 20 task results and 5 board results, grouped by type.
+    Tasks are ranked by the full-text index (kanban/utils/search_index.py)
+    and carry a highlighted ``snippet``; without it they are ``icontains``
+    matches by recency with ``snippet`` = None.
     RBAC-safe: results are scoped through get_user_boards().
     """
     query = request.GET.get('q', '').strip()
@@ -398,15 +401,21 @@ def global_search(request):
         name__icontains=query
     ).values('id', 'name')[:5]
 
-    # Task matches across all accessible boards (max 20)
-    matching_tasks = Task.objects.filter(
+    # Task matches across all accessible boards (max 20), by relevance when
+    # the full-text index is available.
+    from kanban.utils import search_index
+    tasks_in_scope = Task.objects.filter(
         column__board__in=accessible_boards,
         item_type='task',
-    ).filter(
-        Q(title__icontains=query) | Q(description__icontains=query)
-    ).select_related(
-        'column', 'column__board', 'assigned_to'
-    ).order_by('-updated_at')[:20]
+    ).select_related('column', 'column__board', 'assigned_to')
+    matching_tasks = search_index.ranked_objects(
+        tasks_in_scope, query, 'task', limit=20,
+        board_ids=accessible_boards.values('id'),
+    )
+    if matching_tasks is None:
+        matching_tasks = tasks_in_scope.filter(
+            Q(title__icontains=query) | Q(description__icontains=query)
+        ).order_by('-updated_at')[:20]
 
     from django.urls import reverse
 
@@ -425,6 +434,7 @@ def global_search(request):
             'priority': task.priority,
             'assignee': task.assigned_to.get_full_name() or task.assigned_to.username if task.assigned_to else None,
             'url': url,
+            'snippet': getattr(task, 'search_snippet', None),
         })
 
     board_results = [
@@ -0,0 +1,501 @@
+"""
+Board-centric Decision Center collection.
+
+Collection used to loop over every active user and re-scan each of their
+boards, so a board with twenty members had its conflicts, overdue tasks,
+alerts and budget queried twenty times every morning, and every item was an
+individual SELECT + INSERT/UPDATE.  Here the work is inverted:
+
+* ``board_findings(board, now)`` computes everything about a board that does
+  not depend on who is looking — once.  Findings that depend on a member's
+  ``DecisionCenterSettings`` (overdue / stale age, deadline window, budget
+  threshold) keep the raw, sorted data so each member's threshold is applied
+  in memory.
+* ``member_items(findings, user_id, settings)`` turns the findings into the
+  item rows one member should have.
+* ``upsert_board_items(board, items_by_user)`` reconciles those rows with the
+  existing DecisionItems of every member in one read, one ``bulk_create`` and
+  one ``bulk_update``, keeping the old ``_ensure_item`` rules: pending items
+  are refreshed, snoozed/resolved/dismissed items are left alone, and new
+  findings create pending items.
+* ``collect_boards(board_ids)`` runs the above for a chunk of boards and
+  reports how long each board took.  ``decision_center.tasks`` splits the
+  eligible boards into chunks and fans them out across Celery workers.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Boards per Celery chunk: large enough to amortise the per-chunk member and
+# settings lookups, small enough to spread a morning run across workers.
+CHUNK_SIZE = 50
+
+# Same tie-break as the old per-item lookup: active items win over archived
+# ones, then the most recent.
+_STATUS_RANK = {'pending': 0, 'snoozed': 1, 'resolved': 2, 'dismissed': 3}
+
+CONTENT_FIELDS = [
+    'priority_level', 'title', 'description', 'suggested_action',
+    'estimated_minutes', 'context_data',
+]
+
+PREMORTEM_SCENARIOS = 5
+MAX_TASK_IDS = 50
+
+
+def eligible_boards():
+    """
+    Every board that can carry DecisionItems: real boards (never demo
+    templates or Spectra-generated boards) and sandbox copies with an owner.
+    The per-user equivalent is ``decision_center.tasks._all_user_boards``.
+    """
+    from kanban.models import Board
+
+    real = Q(is_official_demo_board=False, is_sandbox_copy=False) & ~Q(
+        created_by_session__startswith='spectra_demo_'
+    )
+    sandbox = Q(is_sandbox_copy=True, owner__isnull=False)
+    return Board.objects.filter(real | sandbox)
+
+
+def board_members(boards):
+    """
+    ``{board_id: {user_id, ...}}`` of the users who see each board in the
+    Decision Center: creator, owner and members of real boards, and only the
+    owner of sandbox copies.  Two queries for any number of boards.
+    """
+    from kanban.models import BoardMembership
+
+    members = {}
+    real_ids = []
+    for board in boards:
+        ids = members.setdefault(board.pk, set())
+        if board.owner_id:
+            ids.add(board.owner_id)
+        if not board.is_sandbox_copy:
+            real_ids.append(board.pk)
+            if board.created_by_id:
+                ids.add(board.created_by_id)
+    for board_id, user_id in BoardMembership.objects.filter(
+        board_id__in=real_ids,
+    ).values_list('board_id', 'user_id'):
+        members[board_id].add(user_id)
+    return members
+
+
+def load_settings(user_ids):
+    """``{user_id: DecisionCenterSettings}``, creating missing rows in bulk."""
+    from decision_center.models import DecisionCenterSettings
+
+    found = {
+        s.user_id: s
+        for s in DecisionCenterSettings.objects.filter(user_id__in=user_ids)
+    }
+    missing = [DecisionCenterSettings(user_id=uid) for uid in user_ids if uid not in found]
+    if missing:
+        DecisionCenterSettings.objects.bulk_create(missing, ignore_conflicts=True)
+        found.update((s.user_id, s) for s in missing)
+    return found
+
+
+def _plural(count, singular='', plural='s'):
+    return singular if count == 1 else plural
+
+
+def _item(item_type, priority_level, title, *, description='', suggested_action='',
+          estimated_minutes=2, context_data=None, source=None):
+    return {
+        'item_type': item_type,
+        'priority_level': priority_level,
+        'title': title,
+        'description': description,
+        'suggested_action': suggested_action,
+        'estimated_minutes': estimated_minutes,
+        'context_data': context_data or {},
+        # (content_type_id, object_id) of the record that raised the item.
+        'source': source,
+    }
+
+
+def _source(obj):
+    return (ContentType.objects.get_for_model(obj).pk, obj.pk)
+
+
+class BoardFindings:
+    """Everything ``member_items`` needs to know about one board."""
+
+    def __init__(self, board, now):
+        self.board = board
+        self.now = now
+        # Items every member gets verbatim.
+        self.shared = []
+        # (pm, {user_id: acknowledged scenario count}) for the latest
+        # high-risk pre-mortem, or None.
+        self.premortem = None
+        # Open tasks as (id, timestamp), oldest first, so a member's
+        # threshold is a prefix of the list.
+        self.overdue = []
+        self.stale = []
+        self.days_to_deadline = None
+        self.budget_pct = None
+
+
+def board_findings(board, now=None):
+    """
+    Compute ``board``'s findings once, whatever the number of members.
+    Each section fails independently, as the per-user scan did.
+    """
+    from kanban.budget_models import ProjectBudget
+    from kanban.conflict_models import ConflictDetection
+    from kanban.models import ScopeCreepAlert, Task, TeamCapacityAlert
+    from kanban.premortem_models import PreMortemAnalysis, PreMortemScenarioAcknowledgment
+
+    now = now or timezone.now()
+    today = now.date()
+    findings = BoardFindings(board, now)
+    open_tasks = Task.objects.filter(column__board=board, item_type='task').exclude(progress=100)
+
+    # 1. Unresolved conflicts — deduplicated by title so duplicate
+    #    ConflictDetection records don't spawn duplicate items.
+    try:
+        seen_titles = set()
+        for conflict in ConflictDetection.objects.filter(
+            status='active', board=board,
+        ).order_by('-severity', '-detected_at'):
+            if conflict.title in seen_titles:
+                continue
+            seen_titles.add(conflict.title)
+            findings.shared.append(_item(
+                'conflict', 'action_required',
+                f"Conflict on {board.name}: {conflict.title}",
+                description=conflict.description[:500],
+                suggested_action='Review conflict and select a resolution strategy',
+                estimated_minutes=3,
+                source=_source(conflict),
+            ))
+    except Exception:
+        logger.exception("board_findings: conflicts failed for board %s", board.pk)
+
+    # 2. Latest high-risk Pre-Mortem, with every user's acknowledgement count.
+    try:
+        pm = (
+            PreMortemAnalysis.objects
+            .filter(overall_risk_level='high', board=board)
+            .order_by('-created_at')
+            .first()
+        )
+        if pm is not None:
+            acked = dict(
+                PreMortemScenarioAcknowledgment.objects
+                .filter(pre_mortem=pm, acknowledged_by__isnull=False)
+                .values('acknowledged_by').annotate(n=Count('id'))
+                .values_list('acknowledged_by', 'n')
+            )
+            findings.premortem = (pm, acked)
+    except Exception:
+        logger.exception("board_findings: premortem failed for board %s", board.pk)
+
+    # 3. Overdue tasks — everything past due; members' min_overdue_days
+    #    trims the front of the list.
+    try:
+        findings.overdue = list(
+            open_tasks.filter(due_date__lt=now).order_by('due_date', 'id')
+            .values_list('id', 'due_date')
+        )
+    except Exception:
+        logger.exception("board_findings: overdue tasks failed for board %s", board.pk)
+
+    # 4. Over-allocated team members
+    try:
+        for alert in TeamCapacityAlert.objects.filter(
+            status='active', board=board,
+        ).select_related('resource_user'):
+            member_name = (
+                alert.resource_user.get_full_name()
+                or alert.resource_user.username
+            ) if alert.resource_user else 'Team'
+            findings.shared.append(_item(
+                'overallocated', 'action_required',
+                f"{member_name} is over-allocated on {board.name}",
+                description=alert.message[:500],
+                suggested_action='Review and reassign tasks to balance workload',
+                estimated_minutes=4,
+                context_data={'workload_percentage': alert.workload_percentage},
+                source=_source(alert),
+            ))
+    except Exception:
+        logger.exception("board_findings: capacity alerts failed for board %s", board.pk)
+
+    # 5. Unacknowledged scope creep alerts
+    try:
+        for alert in ScopeCreepAlert.objects.filter(status='active', board=board):
+            findings.shared.append(_item(
+                'scope_change', 'action_required',
+                f"Scope change on {board.name} (+{alert.scope_increase_percentage:.0f}%)",
+                description=alert.ai_summary[:500] if alert.ai_summary else '',
+                suggested_action='Acknowledge scope change or adjust timeline',
+                estimated_minutes=3,
+                source=_source(alert),
+            ))
+    except Exception:
+        logger.exception("board_findings: scope alerts failed for board %s", board.pk)
+
+    # 6. Deadline — members' deadline_warning_days decides whether it's close.
+    if board.project_deadline and board.project_deadline > today:
+        findings.days_to_deadline = (board.project_deadline - today).days
+
+    # 7. Budget utilisation — compared with each member's threshold.
+    try:
+        budget = ProjectBudget.objects.filter(board=board).first()
+        if budget is not None:
+            findings.budget_pct = budget.get_budget_utilization_percent()
+    except Exception:
+        logger.exception("board_findings: budget failed for board %s", board.pk)
+
+    # 8. New auto-captured knowledge memories (since yesterday)
+    try:
+        from knowledge_graph.models import MemoryNode
+        new_count = MemoryNode.objects.filter(
+            board=board, is_auto_captured=True, created_at__gte=now - timedelta(days=1),
+        ).count()
+        if new_count:
+            findings.shared.append(_item(
+                'memory_captured', 'awareness',
+                f"{new_count} new memor{_plural(new_count, 'y', 'ies')} captured on {board.name}",
+                estimated_minutes=1,
+                context_data={'count': new_count},
+            ))
+    except Exception:
+        logger.exception("board_findings: memory nodes failed for board %s", board.pk)
+
+    # 9. Tasks with no assignee
+    try:
+        unassigned = list(
+            open_tasks.filter(assigned_to__isnull=True).order_by('id').values_list('id', flat=True)
+        )
+        if unassigned:
+            count = len(unassigned)
+            findings.shared.append(_item(
+                'unassigned_task', 'quick_win',
+                f"{count} unassigned task{_plural(count)} on {board.name}",
+                suggested_action='Assign owners to these tasks',
+                estimated_minutes=1,
+                context_data={'task_ids': unassigned[:MAX_TASK_IDS]},
+            ))
+    except Exception:
+        logger.exception("board_findings: unassigned tasks failed for board %s", board.pk)
+
+    # 10. Stale tasks — stuck in the SAME column, measured via
+    #     column_entered_at rather than updated_at (a comment or metadata edit
+    #     bumps updated_at and used to hide genuinely stuck work).  Members'
+    #     min_stale_days trims the front of the list.
+    try:
+        findings.stale = list(
+            open_tasks.filter(column_entered_at__lt=now)
+            .order_by('column_entered_at', 'id')
+            .values_list('id', 'column_entered_at')
+        )
+    except Exception:
+        logger.exception("board_findings: stale tasks failed for board %s", board.pk)
+
+    return findings
+
+
+def _older_than(rows, threshold):
+    """Prefix of the oldest-first ``(id, timestamp)`` rows before ``threshold``."""
+    for i, (_, ts) in enumerate(rows):
+        if ts >= threshold:
+            return rows[:i]
+    return rows
+
+
+def member_items(findings, user_id, settings):
+    """The item dicts ``user_id`` should have for ``findings.board``."""
+    board, now = findings.board, findings.now
+    items = list(findings.shared)
+
+    if findings.premortem is not None:
+        pm, acked_by = findings.premortem
+        acked = acked_by.get(user_id, 0)
+        if acked < PREMORTEM_SCENARIOS:
+            items.append(_item(
+                'premortem_risk', 'action_required',
+                f"High-risk Pre-Mortem unreviewed on {board.name}",
+                description=(
+                    f"{PREMORTEM_SCENARIOS - acked} of {PREMORTEM_SCENARIOS} "
+                    f"scenarios still need acknowledgement"
+                ),
+                suggested_action='Acknowledge or address high-risk scenarios before work continues',
+                estimated_minutes=5,
+                source=_source(pm),
+            ))
+
+    overdue = _older_than(findings.overdue, now - timedelta(days=settings.min_overdue_days))
+    if overdue:
+        count = len(overdue)
+        most_overdue = (now - overdue[0][1]).days
+        items.append(_item(
+            'overdue_task', 'action_required',
+            f"{count} overdue task{_plural(count)} on {board.name}",
+            description=f"Most overdue: {most_overdue} days past deadline",
+            suggested_action='Review and update overdue tasks or adjust deadlines',
+            estimated_minutes=min(2 * count, 10),
+            context_data={
+                'task_ids': [task_id for task_id, _ in overdue[:MAX_TASK_IDS]],
+                'most_overdue_days': most_overdue,
+            },
+        ))
+
+    days_left = findings.days_to_deadline
+    if days_left is not None and days_left <= settings.deadline_warning_days:
+        items.append(_item(
+            'deadline_approaching', 'awareness',
+            f"{board.name} deadline in {days_left} day{_plural(days_left)}",
+            estimated_minutes=1,
+            context_data={'days_left': days_left},
+        ))
+
+    pct = findings.budget_pct
+    if pct is not None and pct >= settings.budget_alert_threshold:
+        items.append(_item(
+            'budget_threshold', 'awareness',
+            f"{board.name} budget at {pct:.0f}%",
+            estimated_minutes=1,
+            context_data={'utilization_percent': round(pct, 1)},
+        ))
+
+    stale = _older_than(findings.stale, now - timedelta(days=settings.min_stale_days))
+    if stale:
+        count = len(stale)
+        days_stuck = (now - stale[0][1]).days
+        items.append(_item(
+            'stale_task', 'quick_win',
+            f"{count} stalled task{_plural(count)} on "
+            f"{board.name} — stuck {days_stuck}+ days with no column movement",
+            suggested_action='Unblock or reassign stalled work',
+            estimated_minutes=2,
+            context_data={
+                'task_ids': [task_id for task_id, _ in stale[:MAX_TASK_IDS]],
+                'oldest_days': days_stuck,
+            },
+        ))
+
+    return items
+
+
+def _item_key(user_id, item_type, source):
+    # Source-backed items are unique per source object (the board is content);
+    # board-level items are unique per board.
+    return (user_id, item_type) + (source or (None, None))
+
+
+def upsert_board_items(board, items_by_user):
+    """
+    Reconcile ``{user_id: [item, ...]}`` for ``board`` with the stored
+    DecisionItems.  Returns ``(created, updated)``.
+    """
+    from decision_center.models import DecisionItem
+
+    wanted = {}
+    sources = {}
+    for user_id, items in items_by_user.items():
+        for item in items:
+            wanted[_item_key(user_id, item['item_type'], item['source'])] = item
+            if item['source']:
+                ct_id, obj_id = item['source']
+                sources.setdefault(ct_id, set()).add(obj_id)
+    if not wanted:
+        return 0, 0
+
+    match = Q(board=board, source_content_type__isnull=True, source_object_id__isnull=True)
+    for ct_id, obj_ids in sources.items():
+        match |= Q(source_content_type_id=ct_id, source_object_id__in=obj_ids)
+    existing = {}
+    for item in DecisionItem.objects.filter(
+        match,
+        created_for_id__in=items_by_user,
+        item_type__in={key[1] for key in wanted},
+    ).only('id', 'status', 'created_for_id', 'item_type', 'board_id',
+           'source_content_type_id', 'source_object_id', *CONTENT_FIELDS):
+        key = (item.created_for_id, item.item_type,
+               item.source_content_type_id, item.source_object_id)
+        best = existing.get(key)
+        rank = (_STATUS_RANK.get(item.status, 4), -item.pk)
+        if best is None or rank < (_STATUS_RANK.get(best.status, 4), -best.pk):
+            existing[key] = item
+
+    to_create, to_update = [], []
+    for key, data in wanted.items():
+        content = {field: data[field] for field in CONTENT_FIELDS}
+        item = existing.get(key)
+        if item is None:
+            to_create.append(DecisionItem(
+                created_for_id=key[0], board=board, item_type=key[1],
+                source_content_type_id=key[2], source_object_id=key[3],
+                status='pending', **content,
+            ))
+        elif item.status == 'pending':
+            if data['source']:
+                content['board_id'] = board.pk
+            if any(getattr(item, field) != value for field, value in content.items()):
+                for field, value in content.items():
+                    setattr(item, field, value)
+                to_update.append(item)
+        # snoozed / resolved / dismissed → leave the item exactly as-is.
+
+    if to_create:
+        DecisionItem.objects.bulk_create(to_create, batch_size=500)
+    if to_update:
+        DecisionItem.objects.bulk_update(to_update, CONTENT_FIELDS + ['board'], batch_size=500)
+    return len(to_create), len(to_update)
+
+
+def collect_boards(board_ids, now=None):
+    """
+    Collect DecisionItems for ``board_ids`` and every active member of each.
+
+    Returns ``{'boards', 'items_created', 'items_updated', 'pruned',
+    'timings_ms': {board_id: ms}}``.  A failing board is logged and skipped.
+    """
+    from decision_center.models import DecisionItem
+
+    now = now or timezone.now()
+    boards = list(eligible_boards().filter(pk__in=board_ids))
+    members = board_members(boards)
+    all_members = set().union(*members.values())
+    active = set(User.objects.filter(pk__in=all_members, is_active=True).values_list('pk', flat=True))
+    settings = load_settings(active)
+
+    stats = {'boards': 0, 'items_created': 0, 'items_updated': 0, 'pruned': 0, 'timings_ms': {}}
+    for board in boards:
+        started = time.perf_counter()
+        try:
+            findings = board_findings(board, now)
+            created, updated = upsert_board_items(board, {
+                user_id: member_items(findings, user_id, settings[user_id])
+                for user_id in members[board.pk] & active
+            })
+            # Pending items of users who lost access to the board.
+            pruned, _ = DecisionItem.objects.filter(
+                board=board, status='pending',
+            ).exclude(created_for_id__in=members[board.pk]).delete()
+        except Exception:
+            logger.exception("collect_boards: board %s failed", board.pk)
+            continue
+        stats['boards'] += 1
+        stats['items_created'] += created
+        stats['items_updated'] += updated
+        stats['pruned'] += pruned
+        stats['timings_ms'][board.pk] = round((time.perf_counter() - started) * 1000, 1)
+    return stats
+
+
+def chunked(ids, size=CHUNK_SIZE):
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
@@ -1,18 +1,17 @@
 """
 Celery tasks for the Decision Center.
-- collect_decision_items: morning scan that creates DecisionItem records
+- collect_decision_items: morning scan that creates DecisionItem records,
+  fanned out in board chunks to collect_decision_items_chunk
+  (see decision_center/collection.py)
 - generate_decision_briefing: AI summary of the day's decision queue
 - send_daily_digest_emails: send digest emails at each user's preferred time
 """
 import json
 import logging
 from collections import Counter
-from datetime import timedelta
 
-from celery import shared_task
+from celery import group, shared_task
 from django.contrib.auth.models import User
-from django.contrib.contenttypes.models import ContentType
-from django.db import models
 from django.db.models import Q
 from django.utils import timezone
 
@@ -67,369 +66,28 @@ def _all_user_boards(user):
     return (real_boards | sandbox_boards).distinct()
 
 
-def _ensure_item(*, user, board, item_type, priority_level, title,
-                 description='', suggested_action='', estimated_minutes=2,
-                 source_obj=None, context_data=None):
-    """
-    Create or update a DecisionItem, avoiding duplicates.
-
-    Looks up items WITHOUT filtering on status so that snoozed or archived
-    items are found and never duplicated back into the inbox.
-
-    Behaviour by status of the found item:
-    - pending:  update content fields (title, description, etc.)
-    - snoozed:  leave it alone — it will wake up naturally
-    - resolved/dismissed: do nothing — the user already actioned it
-    - no item:  create a new pending item
-    """
-    from decision_center.models import DecisionItem
-
-    content_fields = {
-        'priority_level': priority_level,
-        'title': title,
-        'description': description,
-        'suggested_action': suggested_action,
-        'estimated_minutes': estimated_minutes,
-        'context_data': context_data or {},
-    }
-    # Uniqueness lookup — intentionally excludes 'status' so we find items
-    # regardless of whether they are pending, snoozed, resolved, or dismissed.
-    lookup = {
-        'created_for': user,
-        'item_type': item_type,
-    }
-
-    if source_obj is not None:
-        ct = ContentType.objects.get_for_model(source_obj)
-        lookup['source_content_type'] = ct
-        lookup['source_object_id'] = source_obj.pk
-        content_fields['board'] = board
-    else:
-        lookup['board'] = board
-        lookup['source_content_type'] = None
-        lookup['source_object_id'] = None
-
-    # Prioritise active items (pending > snoozed) when duplicates exist from
-    # the old code, then fall back to the most recent record.
-    existing = (
-        DecisionItem.objects.filter(**lookup)
-        .order_by(
-            # pending=0, snoozed=1, resolved=2, dismissed=3
-            models.Case(
-                models.When(status='pending', then=0),
-                models.When(status='snoozed', then=1),
-                models.When(status='resolved', then=2),
-                models.When(status='dismissed', then=3),
-                default=4,
-                output_field=models.IntegerField(),
-            ),
-            '-id',
-        )
-        .first()
-    )
-
-    if existing is None:
-        # No item exists at all — create a fresh pending one.
-        DecisionItem.objects.create(**lookup, **content_fields, status='pending')
-    elif existing.status == 'pending':
-        # Update content fields to reflect the latest scan; leave status alone.
-        for key, val in content_fields.items():
-            setattr(existing, key, val)
-        existing.save(update_fields=list(content_fields.keys()))
-    # snoozed / resolved / dismissed → leave the item exactly as-is.
-
-
 def collect_for_user(user):
     """
     Scan all boards for a single user and create/update DecisionItem records.
-    Can be called synchronously (e.g. after demo reset) or from the batch task.
+    Can be called synchronously (e.g. after demo reset); the daily run goes
+    board by board instead (``collect_decision_items``).
     """
-    now = timezone.now()
-    today = now.date()
+    from decision_center.collection import board_findings, member_items, upsert_board_items
 
+    now = timezone.now()
     boards = _all_user_boards(user)
     if not boards.exists():
         return
 
     settings = _get_or_create_settings(user)
-
-    # ACTION REQUIRED
-
-    # 1. Unresolved conflicts — deduplicate by (board, title) so that
-    #    duplicate ConflictDetection records don't spawn duplicate items.
-    try:
-        from kanban.conflict_models import ConflictDetection
-        seen_conflicts = set()  # (board_id, conflict_title)
-        for conflict in ConflictDetection.objects.filter(
-            status='active', board__in=boards,
-        ).select_related('board').order_by('-severity', '-detected_at'):
-            key = (conflict.board_id, conflict.title)
-            if key in seen_conflicts:
-                continue
-            seen_conflicts.add(key)
-            _ensure_item(
-                user=user,
-                board=conflict.board,
-                item_type='conflict',
-                priority_level='action_required',
-                title=f"Conflict on {conflict.board.name}: {conflict.title}",
-                description=conflict.description[:500],
-                suggested_action='Review conflict and select a resolution strategy',
-                estimated_minutes=3,
-                source_obj=conflict,
-            )
-    except Exception:
-        logger.exception("collect_for_user: conflicts failed for user %s", user.pk)
-
-    # 2. Unacknowledged high-risk Pre-Mortem analyses (latest per board only)
-    try:
-        from kanban.premortem_models import (
-            PreMortemAnalysis,
-            PreMortemScenarioAcknowledgment,
-        )
-        # Only consider the latest PreMortemAnalysis per board to avoid
-        # duplicate decision items when multiple analyses exist.
-        all_high_risk = (
-            PreMortemAnalysis.objects
-            .filter(overall_risk_level='high', board__in=boards)
-            .select_related('board')
-            .order_by('board_id', '-created_at')
-        )
-        seen_boards = set()
-        latest_per_board = []
-        for pm in all_high_risk:
-            if pm.board_id not in seen_boards:
-                seen_boards.add(pm.board_id)
-                latest_per_board.append(pm)
-
-        for pm in latest_per_board:
-            total_scenarios = 5
-            acked = PreMortemScenarioAcknowledgment.objects.filter(
-                pre_mortem=pm, acknowledged_by=user,
-            ).count()
-            if acked < total_scenarios:
-                _ensure_item(
-                    user=user,
-                    board=pm.board,
-                    item_type='premortem_risk',
-                    priority_level='action_required',
-                    title=f"High-risk Pre-Mortem unreviewed on {pm.board.name}",
-                    description=(
-                        f"{total_scenarios - acked} of {total_scenarios} "
-                        f"scenarios still need acknowledgement"
-                    ),
-                    suggested_action=(
-                        'Acknowledge or address high-risk scenarios '
-                        'before work continues'
-                    ),
-                    estimated_minutes=5,
-                    source_obj=pm,
-                )
-    except Exception:
-        logger.exception("collect_for_user: premortem failed for user %s", user.pk)
-
-    # 3. Overdue tasks (grouped by board)
-    try:
-        from kanban.models import Task
-        threshold = now - timedelta(days=settings.min_overdue_days)
-        for board in boards:
-            overdue_tasks = Task.objects.filter(
-                column__board=board,
-                due_date__lt=threshold,
-                item_type='task',
-            ).exclude(progress=100)
-            count = overdue_tasks.count()
-            if count > 0:
-                task_ids = list(overdue_tasks.values_list('id', flat=True)[:50])
-                most_overdue = (now - overdue_tasks.order_by('due_date').first().due_date).days
-                _ensure_item(
-                    user=user,
-                    board=board,
-                    item_type='overdue_task',
-                    priority_level='action_required',
-                    title=f"{count} overdue task{'s' if count != 1 else ''} on {board.name}",
-                    description=f"Most overdue: {most_overdue} days past deadline",
-                    suggested_action='Review and update overdue tasks or adjust deadlines',
-                    estimated_minutes=min(2 * count, 10),
-                    context_data={'task_ids': task_ids, 'most_overdue_days': most_overdue},
-                )
-    except Exception:
-        logger.exception("collect_for_user: overdue tasks failed for user %s", user.pk)
-
-    # 4. Over-allocated team members
-    try:
-        from kanban.models import TeamCapacityAlert
-        for alert in TeamCapacityAlert.objects.filter(
-            status='active', board__in=boards,
-        ).select_related('board', 'resource_user'):
-            member_name = (
-                alert.resource_user.get_full_name()
-                or alert.resource_user.username
-            ) if alert.resource_user else 'Team'
-            _ensure_item(
-                user=user,
-                board=alert.board,
-                item_type='overallocated',
-                priority_level='action_required',
-                title=f"{member_name} is over-allocated on {alert.board.name}",
-                description=alert.message[:500],
-                suggested_action='Review and reassign tasks to balance workload',
-                estimated_minutes=4,
-                source_obj=alert,
-                context_data={'workload_percentage': alert.workload_percentage},
-            )
-    except Exception:
-        logger.exception("collect_for_user: capacity alerts failed for user %s", user.pk)
-
-    # 5. Unacknowledged scope creep alerts
-    try:
-        from kanban.models import ScopeCreepAlert
-        for alert in ScopeCreepAlert.objects.filter(
-            status='active', board__in=boards,
-        ).select_related('board'):
-            _ensure_item(
-                user=user,
-                board=alert.board,
-                item_type='scope_change',
-                priority_level='action_required',
-                title=f"Scope change on {alert.board.name} (+{alert.scope_increase_percentage:.0f}%)",
-                description=alert.ai_summary[:500] if alert.ai_summary else '',
-                suggested_action='Acknowledge scope change or adjust timeline',
-                estimated_minutes=3,
-                source_obj=alert,
-            )
-    except Exception:
-        logger.exception("collect_for_user: scope alerts failed for user %s", user.pk)
-
-    # AWARENESS
-
-    # 6. Deadlines approaching
-    try:
-        deadline_threshold = today + timedelta(days=settings.deadline_warning_days)
-        for board in boards.filter(
-            project_deadline__isnull=False,
-            project_deadline__gt=today,
-            project_deadline__lte=deadline_threshold,
-        ):
-            days_left = (board.project_deadline - today).days
-            _ensure_item(
-                user=user,
-                board=board,
-                item_type='deadline_approaching',
-                priority_level='awareness',
-                title=f"{board.name} deadline in {days_left} day{'s' if days_left != 1 else ''}",
-                estimated_minutes=1,
-                context_data={'days_left': days_left},
+    for board in boards:
+        try:
+            findings = board_findings(board, now)
+            upsert_board_items(board, {user.pk: member_items(findings, user.pk, settings)})
+        except Exception:
+            logger.exception(
+                "collect_for_user: board %s failed for user %s", board.pk, user.pk,
             )
-    except Exception:
-        logger.exception("collect_for_user: deadlines failed for user %s", user.pk)
-
-    # 7. Budget threshold crossed
-    try:
-        from kanban.budget_models import ProjectBudget
-        for budget in ProjectBudget.objects.filter(
-            board__in=boards,
-        ).select_related('board'):
-            pct = budget.get_budget_utilization_percent()
-            if pct >= settings.budget_alert_threshold:
-                _ensure_item(
-                    user=user,
-                    board=budget.board,
-                    item_type='budget_threshold',
-                    priority_level='awareness',
-                    title=f"{budget.board.name} budget at {pct:.0f}%",
-                    estimated_minutes=1,
-                    context_data={'utilization_percent': round(pct, 1)},
-                )
-    except Exception:
-        logger.exception("collect_for_user: budget failed for user %s", user.pk)
-
-    # 8. New auto-captured knowledge memories (since yesterday)
-    try:
-        from knowledge_graph.models import MemoryNode
-        yesterday = now - timedelta(days=1)
-        for board in boards:
-            new_count = MemoryNode.objects.filter(
-                board=board,
-                is_auto_captured=True,
-                created_at__gte=yesterday,
-            ).count()
-            if new_count > 0:
-                _ensure_item(
-                    user=user,
-                    board=board,
-                    item_type='memory_captured',
-                    priority_level='awareness',
-                    title=f"{new_count} new memor{'ies' if new_count != 1 else 'y'} captured on {board.name}",
-                    estimated_minutes=1,
-                    context_data={'count': new_count},
-                )
-    except Exception:
-        logger.exception("collect_for_user: memory nodes failed for user %s", user.pk)
-
-    # QUICK WINS
-
-    # 9. Tasks with no assignee (grouped by board)
-    try:
-        from kanban.models import Task
-        for board in boards:
-            unassigned = Task.objects.filter(
-                column__board=board,
-                assigned_to__isnull=True,
-                item_type='task',
-            ).exclude(progress=100)
-            count = unassigned.count()
-            if count > 0:
-                task_ids = list(unassigned.values_list('id', flat=True)[:50])
-                _ensure_item(
-                    user=user,
-                    board=board,
-                    item_type='unassigned_task',
-                    priority_level='quick_win',
-                    title=f"{count} unassigned task{'s' if count != 1 else ''} on {board.name}",
-                    suggested_action='Assign owners to these tasks',
-                    estimated_minutes=1,
-                    context_data={'task_ids': task_ids},
-                )
-    except Exception:
-        logger.exception("collect_for_user: unassigned tasks failed for user %s", user.pk)
-
-    # 10. Stale tasks (grouped by board)
-    # "Stale" = stuck in the SAME column for >= min_stale_days, measured via
-    # column_entered_at (the task-aging signal — see kanban/models.py aging_state).
-    # We deliberately use column dwell, not updated_at: a comment or metadata edit
-    # bumps updated_at and used to hide genuinely stuck work. Honors the user's
-    # min_stale_days setting (not the board's per-column badge thresholds).
-    try:
-        from kanban.models import Task
-        stale_threshold = now - timedelta(days=settings.min_stale_days)
-        for board in boards:
-            stale = Task.objects.filter(
-                column__board=board,
-                column_entered_at__lt=stale_threshold,
-                column_entered_at__isnull=False,
-                item_type='task',
-            ).exclude(progress=100).select_related('column')
-            count = stale.count()
-            if count > 0:
-                task_ids = list(stale.values_list('id', flat=True)[:50])
-                oldest = stale.order_by('column_entered_at').first()
-                days_stuck = (now - oldest.column_entered_at).days
-                _ensure_item(
-                    user=user,
-                    board=board,
-                    item_type='stale_task',
-                    priority_level='quick_win',
-                    title=(
-                        f"{count} stalled task{'s' if count != 1 else ''} on "
-                        f"{board.name} — stuck {days_stuck}+ days with no column movement"
-                    ),
-                    suggested_action='Unblock or reassign stalled work',
-                    estimated_minutes=2,
-                    context_data={'task_ids': task_ids, 'oldest_days': days_stuck},
-                )
-    except Exception:
-        logger.exception("collect_for_user: stale tasks failed for user %s", user.pk)
 
     # ── Housekeeping: prune stale pending items ──────────────────────────
     # Items left over from old sandbox boards, template boards, or deleted
@@ -541,35 +199,71 @@ def generate_briefing_for_user_task(user_id):
 @shared_task(name='decision_center.collect_decision_items')
 def collect_decision_items():
     """
-    Scan all active boards for every active user and create DecisionItem
-    records for anything that needs attention.  Runs once each morning.
+    Dispatcher: scan every eligible board once and fan its findings out to
+    the board's members.  Boards are split into chunks of
+    ``collection.CHUNK_SIZE`` and each chunk runs as its own
+    ``collect_decision_items_chunk`` task, so a large tenant spreads across
+    workers.  Runs once each morning.
     """
+    from decision_center.collection import chunked, eligible_boards
+    from decision_center.models import DecisionItem
+
     now = timezone.now()
-    today = now.date()
 
     # ── Un-snooze expired items ──────────────────────────────────────
-    from decision_center.models import DecisionItem
     DecisionItem.objects.filter(
         status='snoozed',
         snoozed_until__lte=now,
     ).update(status='pending', snoozed_until=None)
 
-    # ── Per-user collection ──────────────────────────────────────────
-    active_users = User.objects.filter(is_active=True)
-    stats = {'users': 0, 'items_created': 0}
+    # ── Prune pending items on boards that no longer qualify ─────────
+    # (demo templates, deleted sandbox owners, Spectra boards).  Items of
+    # users who merely lost access are pruned per board by the chunks.
+    pruned, _ = DecisionItem.objects.filter(
+        status='pending', board__isnull=False,
+    ).exclude(board__in=eligible_boards()).delete()
 
-    for user in active_users.iterator():
-        boards = _all_user_boards(user)
-        if not boards.exists():
-            continue
+    board_ids = list(eligible_boards().order_by('pk').values_list('pk', flat=True))
+    chunks = chunked(board_ids)
+    try:
+        if chunks:
+            group(collect_decision_items_chunk.s(ids) for ids in chunks).apply_async()
+    except Exception:
+        # Broker unavailable — collect in-process rather than skip the day.
+        logger.warning(
+            "collect_decision_items: dispatch failed, collecting %d boards inline",
+            len(board_ids), exc_info=True,
+        )
+        for ids in chunks:
+            collect_decision_items_chunk(ids)
 
-        stats['users'] += 1
-        collect_for_user(user)
+    logger.info(
+        "collect_decision_items: %d boards in %d chunks dispatched, %d items pruned",
+        len(board_ids), len(chunks), pruned,
+    )
+    return {'boards': len(board_ids), 'chunks': len(chunks), 'pruned': pruned}
+
+
+@shared_task(name='decision_center.collect_decision_items_chunk')
+def collect_decision_items_chunk(board_ids):
+    """
+    Collect DecisionItems for one chunk of boards and log per-board timing.
+    Returns the chunk's stats (see ``collection.collect_boards``).
+    """
+    from decision_center.collection import collect_boards
 
+    stats = collect_boards(board_ids)
+    timings = stats['timings_ms']
+    slowest = sorted(timings.items(), key=lambda kv: kv[1], reverse=True)[:5]
     logger.info(
-        "collect_decision_items complete: %d users scanned",
-        stats['users'],
+        "collect_decision_items_chunk: %d/%d boards in %.0f ms "
+        "(%d created, %d updated, %d pruned); slowest %s",
+        stats['boards'], len(board_ids), sum(timings.values()),
+        stats['items_created'], stats['items_updated'], stats['pruned'],
+        ', '.join(f"board {pk}={ms:.0f}ms" for pk, ms in slowest) or '-',
     )
+    for board_id, ms in timings.items():
+        logger.debug("collect_decision_items_chunk: board %s took %.1f ms", board_id, ms)
     return stats
 
 
@@ -1,9 +1,14 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.utils import timezone
 
-from accounts.models import UserProfile
-from decision_center.models import DecisionCenterBriefing
+from accounts.models import Organization, UserProfile
+from decision_center.collection import collect_boards
+from decision_center.models import DecisionCenterBriefing, DecisionCenterSettings, DecisionItem
+from decision_center.tasks import collect_for_user
+from kanban.models import Board, BoardMembership, Column, Task, Workspace
 from kanban.utils.demo_protection import user_is_demo
 
 User = get_user_model()
@@ -59,3 +64,57 @@ class BriefingWorkspaceIsolationTests(TestCase):
         self.assertTrue(user_is_demo(self.user))
         self.assertEqual(self._headline_for_mode(user_is_demo(self.user)),
                          'DEMO headline')
+
+
+class BoardCentricCollectionTests(TestCase):
+    """collect_boards computes a board once and fans items out to its members."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='dc_owner', password='pw')
+        self.member = User.objects.create_user(username='dc_member', password='pw')
+        org = Organization.objects.create(name='DC Org', created_by=self.owner)
+        ws = Workspace.objects.create(name='DC WS', organization=org, created_by=self.owner)
+        self.board = Board.objects.create(
+            name='Shared', organization=org, workspace=ws, created_by=self.owner,
+        )
+        BoardMembership.objects.create(board=self.board, user=self.member)
+        column = Column.objects.create(board=self.board, name='To Do', position=0)
+        now = timezone.now()
+        for days in (3, 5):
+            Task.objects.create(column=column, title=f'Late {days}', created_by=self.owner,
+                                assigned_to=self.owner, due_date=now - timedelta(days=days))
+        self.column = column
+
+    def _overdue(self, user):
+        return DecisionItem.objects.filter(
+            created_for=user, board=self.board, item_type='overdue_task',
+        )
+
+    def test_fans_out_to_members_and_updates_in_place(self):
+        stats = collect_boards([self.board.pk])
+        self.assertEqual(stats['boards'], 1)
+        self.assertIn(self.board.pk, stats['timings_ms'])
+        for user in (self.owner, self.member):
+            self.assertEqual(self._overdue(user).get().context_data['most_overdue_days'], 5)
+
+        Task.objects.create(column=self.column, title='Later', created_by=self.owner,
+                            assigned_to=self.owner,
+                            due_date=timezone.now() - timedelta(days=9))
+        stats = collect_boards([self.board.pk])
+        self.assertEqual(stats['items_created'], 0)
+        item = self._overdue(self.member).get()
+        self.assertTrue(item.title.startswith('3 overdue tasks'))
+
+    def test_member_thresholds_and_resolved_items(self):
+        DecisionCenterSettings.objects.create(user=self.member, min_overdue_days=10)
+        collect_boards([self.board.pk])
+        self.assertFalse(self._overdue(self.member).exists())
+
+        self._overdue(self.owner).update(status='resolved')
+        collect_boards([self.board.pk])
+        self.assertEqual(self._overdue(self.owner).get().status, 'resolved')
+
+    def test_collect_for_user_uses_the_same_engine(self):
+        collect_for_user(self.member)
+        self.assertTrue(self._overdue(self.member).exists())
+        self.assertFalse(self._overdue(self.owner).exists())
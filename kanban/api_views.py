@@ -46,7 +46,6 @@ from kanban.utils.ai_utils import (
     generate_and_save_mission_summary,
     suggest_optimal_assignee,
     classify_board_project_type,
-    generate_board_analytics_narrative,
     generate_portfolio_analytics_narrative,
     generate_proxy_metrics,
 )
@@ -626,6 +625,21 @@ def summarize_board_analytics_api(request, board_id):
                 'quota_exceeded': True
             }, status=429)
 
+        # Serve the last good summary at cache speed; a stale one is refreshed
+        # in the background (kanban/utils/ai_artefacts.py). ?refresh=1 forces
+        # a fresh generation.
+        from kanban.utils.ai_artefacts import get_board_artefact, store_board_artefact
+        if not request.GET.get('refresh'):
+            artefact = get_board_artefact(board, 'analytics_summary')
+            if artefact['value'] is not None:
+                return JsonResponse({
+                    'sync': True,
+                    'summary': artefact['value'],
+                    'stale': artefact['stale'],
+                    'refreshing': artefact['refreshing'],
+                    'generated_at': artefact['generated_at'].isoformat(),
+                })
+
         # Async mode: enqueue Celery task and return task_id for WebSocket streaming
         if request.headers.get('X-Request-Async'):
             from kanban.tasks.ai_streaming_tasks import summarize_board_analytics_task
@@ -633,137 +647,8 @@ def summarize_board_analytics_api(request, board_id):
             return JsonResponse({'task_id': result.id, 'status': 'queued'})
         
         # Gather analytics data (same as in board_analytics view)
-        from django.db.models import Count, Q
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Get all tasks for this board (exclude milestones to match metric cards)
-        all_tasks = Task.objects.filter(column__board=board, item_type='task')
-        total_tasks = all_tasks.count()
-        
-        # Completed tasks (based on progress = 100%)
-        completed_count = Task.objects.filter(
-            column__board=board,
-            item_type='task',
-            progress=100
-        ).count()
-        
-        # Calculate productivity (completion rate - same as displayed on the page)
-        # This is the percentage of tasks that are fully completed
-        productivity = 0
-        if total_tasks > 0:
-            productivity = (completed_count / total_tasks) * 100
-        
-        # Overdue and upcoming tasks
-        today = timezone.now().date()
-        overdue_tasks = Task.objects.filter(
-            column__board=board,
-            item_type='task',
-            due_date__isnull=False,
-            due_date__date__lt=today
-        ).exclude(progress=100)
-
-        upcoming_tasks = Task.objects.filter(
-            column__board=board,
-            item_type='task',
-            due_date__isnull=False,
-            due_date__date__gte=today,
-            due_date__date__lte=today + timedelta(days=7)
-        ).exclude(
-            progress=100
-        )
-
-        # Lean Six Sigma metrics
-        value_added_count = Task.objects.filter(
-            column__board=board,
-            labels__name='Value-Added',
-            labels__category='lean'
-        ).count()
-
-        necessary_nva_count = Task.objects.filter(
-            column__board=board,
-            labels__name='Necessary NVA',
-            labels__category='lean'
-        ).count()
-
-        waste_count = Task.objects.filter(
-            column__board=board,
-            labels__name='Waste/Eliminate',
-            labels__category='lean'
-        ).count()
-
-        total_categorized = value_added_count + necessary_nva_count + waste_count
-        value_added_percentage = 0
-        if total_categorized > 0:
-            value_added_percentage = (value_added_count / total_categorized) * 100
-
-        # Task distribution by column
-        columns = Column.objects.filter(board=board)
-        tasks_by_column = []
-        for column in columns:
-            count = Task.objects.filter(column=column, item_type='task').count()
-            tasks_by_column.append({'name': column.name, 'count': count})
-        
-        # Task distribution by priority
-        priority_queryset = Task.objects.filter(column__board=board, item_type='task').values('priority').annotate(
-            count=Count('id')
-        ).order_by('priority')
-        
-        tasks_by_priority = []
-        for item in priority_queryset:
-            priority_name = dict(Task.PRIORITY_CHOICES).get(item['priority'], item['priority'])
-            tasks_by_priority.append({'priority': priority_name, 'count': item['count']})
-        
-        # Task distribution by user
-        user_queryset = Task.objects.filter(column__board=board, item_type='task').values(
-            'assigned_to__username'
-        ).annotate(count=Count('id')).order_by('-count')
-        
-        tasks_by_user = []
-        for item in user_queryset:
-            username = item['assigned_to__username'] or 'Unassigned'
-            completed_user_tasks = Task.objects.filter(
-                column__board=board,
-                item_type='task',
-                assigned_to__username=item['assigned_to__username'],
-                progress=100
-            ).count()
-            
-            user_completion_rate = 0
-            if item['count'] > 0:
-                user_completion_rate = (completed_user_tasks / item['count']) * 100
-                
-            tasks_by_user.append({
-                'username': username,
-                'count': item['count'],
-                'completion_rate': int(user_completion_rate)
-            })
-        
-        # Prepare analytics data for AI
-        analytics_data = {
-            'total_tasks': total_tasks,
-            'completed_count': completed_count,
-            'productivity': round(productivity, 1),
-            'overdue_count': overdue_tasks.count(),
-            'upcoming_count': upcoming_tasks.count(),
-            'value_added_percentage': round(value_added_percentage, 1),
-            'total_categorized': total_categorized,
-            'tasks_by_lean_category': [
-                {'name': 'Value-Added', 'count': value_added_count},
-                {'name': 'Necessary NVA', 'count': necessary_nva_count},
-                {'name': 'Waste/Eliminate', 'count': waste_count}
-            ],
-            'tasks_by_column': tasks_by_column,
-            'tasks_by_priority': tasks_by_priority,
-            'tasks_by_user': tasks_by_user,
-            'board_name': board.name,
-            'project_type': board.project_type or 'general',
-        }
-
-        # Augment with type-specific chart series + headline card metrics so the
-        # AI references the same numbers shown on the analytics cards.
-        from kanban.utils.analytics_helpers import get_ai_summary_augmentation
-        analytics_data.update(get_ai_summary_augmentation(board))
+        from kanban.utils.analytics_helpers import get_board_analytics_summary_data
+        analytics_data = get_board_analytics_summary_data(board)
 
         # Generate analytics summary
         summary = summarize_board_analytics(analytics_data)
@@ -783,6 +668,8 @@ def summarize_board_analytics_api(request, board_id):
                 'error': 'Failed to generate AI summary. This may be due to API quota limits. Please try again in a few moments.'
             }, status=500)
         
+        store_board_artefact(board, 'analytics_summary', summary)
+
         # Track successful request
         response_time_ms = int((time.time() - start_time) * 1000)
         track_ai_request(
@@ -3256,6 +3143,81 @@ def get_board_dependency_graph_api(request, board_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+def board_critical_path_api(request, board_id):
+    """
+    Critical Path Method schedule for a board: earliest/latest start and
+    finish, slack and the critical path, computed in memory from the task
+    dates and dependencies (kanban/utils/dependency_dag.py).
+
+    With ``?explain=1`` the AI narrates the result (``analyze_critical_path``);
+    the numbers in its analysis are the computed ones, never the model's.
+    """
+    start_time = time.time()
+    try:
+        from kanban.utils.dependency_dag import DependencyCycleError, DependencyGraph
+
+        board = get_object_or_404(Board, id=board_id)
+
+        # RBAC: user must have view permission on the board
+        if not request.user.has_perm('prizmai.view_board', board):
+            return JsonResponse({'error': 'Permission denied'}, status=403)
+
+        try:
+            cpm = DependencyGraph.for_board(board).critical_path()
+        except DependencyCycleError as e:
+            return JsonResponse(
+                {'error': 'Dependency cycle detected', 'task_ids': e.task_ids},
+                status=400,
+            )
+
+        response = {'success': True, 'schedule': cpm}
+
+        if request.GET.get('explain'):
+            has_quota, quota, remaining = check_ai_quota(request.user)
+            if not has_quota:
+                return JsonResponse({
+                    'error': 'AI usage quota exceeded. Please upgrade or wait for quota reset.',
+                    'quota_exceeded': True
+                }, status=429)
+
+            tasks = Task.objects.filter(
+                id__in=list(cpm['tasks']),
+            ).select_related('assigned_to', 'column')
+            board_data = {
+                'tasks': [
+                    {
+                        'id': t.id,
+                        'title': t.title,
+                        'due_date': t.due_date.date().isoformat() if t.due_date else 'Not set',
+                        'progress': t.progress,
+                        'assigned_to': t.assigned_to.username if t.assigned_to else 'Unassigned',
+                        'column_name': t.column.name,
+                        'priority': t.priority,
+                    }
+                    for t in tasks
+                ],
+                'cpm': cpm,
+            }
+            analysis = analyze_critical_path(board_data)
+            track_ai_request(
+                user=request.user,
+                feature='critical_path',
+                request_type='analyze',
+                board_id=board.id,
+                success=analysis is not None,
+                response_time_ms=int((time.time() - start_time) * 1000),
+            )
+            response['analysis'] = analysis
+
+        return JsonResponse(response)
+
+    except Exception as e:
+        logger.error(f"Error in board_critical_path_api: {str(e)}")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 @login_required
 @require_http_methods(["POST"])
 def update_task_dates_api(request):
@@ -3464,10 +3426,9 @@ def cascade_reschedule_task_api(request, task_id):
         src_start_str = body.get('start_date')
         src_due_str = body.get('due_date')
 
-        updated = {}
         with transaction.atomic():
             # Re-apply the authoritative source dates inside the transaction so the
-            # fixpoint below reads the intended due date, not whatever was committed
+            # cascade below reads the intended due date, not whatever was committed
             # (or not) by an earlier request. Lock the row to avoid a lost update.
             locked = Task.objects.select_for_update().get(id=task.id)
             src_changed = False
@@ -3487,63 +3448,27 @@ def cascade_reschedule_task_api(request, task_id):
                 locked.save(update_fields=['start_date', 'due_date'])
             task = locked
 
-            # Collect every transitive dependent of the dragged task (BFS over the
-            # reverse dependency edge). We only ever move tasks reachable from here.
-            descendants = {}
-            queue = [task]
-            seen = {task.id}
-            while queue:
-                current = queue.pop(0)
-                for dep in current.dependent_tasks.all():
-                    if dep.id not in seen:
-                        seen.add(dep.id)
-                        descendants[dep.id] = dep
-                        queue.append(dep)
-
-            if not descendants:
-                return JsonResponse({'success': True, 'updated': []})
-
-            # Forward-pass fixpoint. A task with multiple predecessors must start
-            # after ALL of them finish, and a predecessor may itself shift during
-            # this pass, so we repeat until nothing changes. Bounded by the chain
-            # length as a safety cap against any unexpected cycle.
-            for _ in range(len(descendants) + 1):
-                changed = False
-                for dep in descendants.values():
-                    if not dep.start_date or not dep.due_date:
-                        continue
-                    # Re-read predecessors each pass so updated predecessor due
-                    # dates (saved below) are reflected.
-                    pred_dues = [
-                        p.due_date.date()
-                        for p in dep.dependencies.all()
-                        if p.due_date
-                    ]
-                    if not pred_dues:
-                        continue
-                    required_start = max(pred_dues)
-                    if dep.start_date < required_start:
-                        duration_days = (dep.due_date.date() - dep.start_date).days
-                        new_start = required_start
-                        new_due = new_start + timedelta(days=max(duration_days, 0))
-                        dep.start_date = new_start
-                        # Preserve the original due_date's time component + timezone.
-                        dep.due_date = dep.due_date.replace(
-                            year=new_due.year, month=new_due.month, day=new_due.day
-                        )
-                        dep.save(update_fields=['start_date', 'due_date'])
-                        updated[dep.id] = dep
-                        changed = True
-                if not changed:
-                    break
-
-            for dep in updated.values():
-                TaskActivity.objects.create(
+            # Load the board's dependency DAG once (two queries) and push every
+            # transitive dependent forward in topological order; moved tasks are
+            # written back with one bulk_update (kanban/utils/dependency_dag.py).
+            from kanban.utils.dependency_dag import DependencyCycleError, DependencyGraph
+            try:
+                moved = DependencyGraph.for_board(board).cascade(task.id)
+            except DependencyCycleError as e:
+                return JsonResponse(
+                    {'error': 'Dependency cycle detected', 'task_ids': e.task_ids},
+                    status=400,
+                )
+
+            TaskActivity.objects.bulk_create([
+                TaskActivity(
                     task=dep,
                     user=request.user,
                     activity_type='updated',
                     description='Auto-rescheduled by dependency cascade from Gantt drag',
                 )
+                for dep in moved
+            ])
 
         return JsonResponse({
             'success': True,
@@ -3554,7 +3479,7 @@ def cascade_reschedule_task_api(request, task_id):
                     'start_date': d.start_date.isoformat() if d.start_date else None,
                     'due_date': d.due_date.date().isoformat() if d.due_date else None,
                 }
-                for d in updated.values()
+                for d in moved
             ],
         })
 
@@ -5441,10 +5366,12 @@ def generate_board_summary_api(request, board_id):
         else:
             status = 'already_queued'
 
+        from kanban.utils.ai_artefacts import artefact_state
         return JsonResponse({
             'status': status,
             'summary': board.ai_summary,
             'generated_at': board.ai_summary_generated_at.isoformat() if board.ai_summary_generated_at else None,
+            'stale': artefact_state(board, 'board_summary')['stale'],
         })
     except Exception as e:
         logger.error(f"generate_board_summary_api error: {e}")
@@ -5984,7 +5911,7 @@ def portfolio_analytics_api(request, record_type, record_id):
 @require_ai_quota('analytics_narrative', 'generate')
 def generate_board_narrative_api(request, board_id):
     """Generate a 2-sentence analytics narrative for a board."""
-    from kanban.utils.analytics_helpers import get_promoted_metrics
+    from kanban.utils.ai_artefacts import get_board_artefact, produce_analytics_narrative
 
     board = get_object_or_404(Board, id=board_id)
 
@@ -5992,25 +5919,26 @@ def generate_board_narrative_api(request, board_id):
     if not request.user.has_perm('prizmai.view_board', board):
         return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
 
-    metrics = get_promoted_metrics(board)
-    narrative = generate_board_analytics_narrative(board, metrics)
-    if narrative is None:
+    # Stale-while-revalidate: an existing narrative is returned at once (and
+    # refreshed in the background when stale); ?force=1 regenerates inline.
+    if request.GET.get('force'):
+        narrative = produce_analytics_narrative(board)
+        artefact = {'value': narrative, 'generated_at': board.analytics_narrative_generated_at,
+                    'stale': False, 'refreshing': False, 'produced': True}
+    else:
+        artefact = get_board_artefact(board, 'analytics_narrative', produce_on_miss=True)
+    # Only an inline generation counts against the AI quota; a stored
+    # narrative (and its throttled background refresh) does not.
+    request.ai_request_made = artefact['produced']
+    if artefact['value'] is None:
         return JsonResponse({'success': False, 'error': 'Narrative generation failed.'}, status=500)
 
-    board.analytics_narrative = narrative
-    board.analytics_narrative_generated_at = timezone.now()
-    board.analytics_narrative_metric_snapshot = {
-        k: v for k, v in metrics.items() if isinstance(v, (str, int, float))
-    }
-    board.save(update_fields=[
-        'analytics_narrative', 'analytics_narrative_generated_at',
-        'analytics_narrative_metric_snapshot',
-    ])
-
     return JsonResponse({
         'success': True,
-        'narrative': narrative,
-        'generated_at': board.analytics_narrative_generated_at.isoformat(),
+        'narrative': artefact['value'],
+        'generated_at': artefact['generated_at'].isoformat(),
+        'stale': artefact['stale'],
+        'refreshing': artefact['refreshing'],
     })
 
 
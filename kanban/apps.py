@@ -35,3 +35,23 @@ class KanbanConfig(AppConfig):
                 connection.cursor().execute('PRAGMA wal_autocheckpoint=100;')
 
         connection_created.connect(_enable_wal)
+
+        # SQLite rebuilds a table for most ALTERs and refuses to while a
+        # trigger on another table names it — drop the search index sync
+        # triggers before migrating and reinstall them (with a reindex) after.
+        from django.db.models.signals import post_migrate, pre_migrate
+
+        def _drop_search_index_triggers(sender, using, plan=None, **kwargs):
+            if not plan:
+                return
+            from django.db import connections
+            from kanban.utils import search_index
+            search_index.drop_triggers(connections[using])
+
+        def _ensure_search_index(sender, using, **kwargs):
+            from django.db import connections
+            from kanban.utils import search_index
+            search_index.ensure_installed(connections[using])
+
+        pre_migrate.connect(_drop_search_index_triggers, sender=self)
+        post_migrate.connect(_ensure_search_index, sender=self)
@@ -0,0 +1,207 @@
+"""
+Per-board automation rule index for run_board_automations.
+
+Every Task save used to query BoardAutomation and AutomationRule for the board
+and run _check_trigger over every active rule — even a description edit on a
+board whose rules all watch column moves. This module keeps, per process, an
+index of each board's active save-time rules grouped by trigger type, plus a
+static map of which save facts can make each trigger fire. A save that cannot
+match any indexed trigger returns before rule evaluation and the AutomationLog
+dedupe checks.
+
+Versioning: each board has a version token in the shared cache
+(kanban_board.cache.shared_cache — the default cache is per-process in
+DEBUG). Rule and board writes replace it (immediately, and again on commit so
+another process can't cache a pre-commit read); a process rebuilds its copy
+of the index when the token it holds no longer matches. Counter-only writes (run_count,
+last_run_at via queryset ``.update()``) don't change trigger matching and so
+don't invalidate; code that changes other rule fields with ``.update()``
+must call ``invalidate_board`` itself. When the shared cache is unreachable
+every lookup rebuilds.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from kanban_board.cache import bump_version_token, get_version_token
+
+VERSION_KEY = 'automation_rule_index_v:{board_id}'
+
+# Save facts (see save_events) that can make _check_trigger return True for a
+# trigger type. ``None`` means "any save" — task_overdue matches whenever an
+# overdue task is saved. Trigger types not listed are treated as ``None`` so an
+# unknown or newly added trigger is never skipped by mistake.
+TRIGGER_EVENTS = {
+    'task_moved_to_column': {'column'},
+    'moved_to_column': {'column'},
+    'task_status_changed': {'column'},
+    'parent_status_changed': {'column'},
+    'task_overdue': None,
+    'task_created': {'created'},
+    'task_completed': {'completed'},
+    'subtask_completed': {'completed'},
+    'all_subtasks_completed': {'completed'},
+    'dependency_completed': {'completed'},
+    'task_priority_changed': {'priority'},
+    'priority_changed': {'priority'},
+    'task_assigned': {'assignment'},
+    'task_unassigned': {'assignment'},
+    'task_completion_threshold': {'progress'},
+    'task_completion_reached': {'progress'},
+    'task_progress_changed': {'field:progress'},
+    'task_description_updated': {'field:description'},
+    'task_due_date_changed': {'field:due_date'},
+    'risk_level_changed': {'field:risk_level'},
+    'risk_level_critical': {'field:risk_level'},
+    'complexity_increased': {'field:complexity_score'},
+    'schedule_status_changed': {'field:progress', 'field:due_date'},
+    'milestone_reached': {'completed', 'created', 'field:item_type', 'field:progress'},
+}
+
+# Triggers fired by Celery sweeps or other receivers — never by Task post_save.
+# They are left out of the index altogether.
+NON_SAVE_TRIGGERS = frozenset({
+    'due_date_approaching', 'task_idle', 'task_start_date_reached',
+    'task_label_added', 'predicted_late', 'dependency_overdue',
+    'checklist_completed', 'checklist_item_added',
+    'coach_suggestion_created', 'conflict_detected',
+    'discovery_idea_scored', 'discovery_idea_submitted',
+    'immunity_score_dropped', 'hospice_risk_triggered',
+    'scope_creep_detected', 'prediction_confidence_dropped',
+    'retrospective_finalized',
+    'comment_added', 'mention_received', 'attachment_added',
+    'task_thread_message',
+})
+
+
+def save_events(task, created, column_changed, priority_changed, just_completed,
+                assignment_changed):
+    """The set of save facts the pre_save receivers recorded for this save."""
+    events = {'field:' + name for name in (getattr(task, '_field_changes', None) or {})}
+    if created:
+        events.add('created')
+    if column_changed:
+        events.add('column')
+    if priority_changed:
+        events.add('priority')
+    if just_completed:
+        events.add('completed')
+    if assignment_changed:
+        events.add('assignment')
+    if getattr(task, '_old_progress', 0) != (task.progress or 0):
+        events.add('progress')
+    return events
+
+
+class BoardRuleIndex:
+    """A board's active save-time rules, grouped by trigger type."""
+
+    def __init__(self, legacy_rules, rules):
+        self.legacy = self._group(legacy_rules)
+        self.rules = self._group(rules)
+        self.always = {
+            t for t in set(self.legacy) | set(self.rules) if TRIGGER_EVENTS.get(t) is None
+        }
+
+    @staticmethod
+    def _group(rules):
+        grouped = {}
+        for position, rule in enumerate(rules):
+            if rule.trigger_type in NON_SAVE_TRIGGERS:
+                continue
+            grouped.setdefault(rule.trigger_type, []).append((position, rule))
+        return grouped
+
+    def __bool__(self):
+        return bool(self.legacy or self.rules)
+
+    def _candidates(self, grouped, events):
+        picked = []
+        for trigger_type, entries in grouped.items():
+            wanted = TRIGGER_EVENTS.get(trigger_type)
+            if wanted is None or wanted & events:
+                picked.extend(entries)
+        # Keep the queryset order (-created_at) the un-indexed loop used.
+        return [rule for _, rule in sorted(picked, key=lambda entry: entry[0])]
+
+    def candidates(self, events):
+        """(legacy_rules, rules) whose trigger could match a save with ``events``."""
+        return self._candidates(self.legacy, events), self._candidates(self.rules, events)
+
+
+_lock = threading.Lock()
+_indexes = OrderedDict()   # board_id -> (version, BoardRuleIndex)
+
+
+def _max_boards():
+    return getattr(settings, 'AUTOMATION_RULE_INDEX_MAX_BOARDS', 512)
+
+
+def _current_version(board_id):
+    return get_version_token(VERSION_KEY.format(board_id=board_id))
+
+
+def _build(board_id):
+    from kanban.automation_models import AutomationRule, BoardAutomation
+
+    legacy = list(BoardAutomation.objects.filter(board_id=board_id, is_active=True))
+    rules = list(
+        AutomationRule.objects.filter(board_id=board_id, is_active=True)
+        .exclude(trigger_type__startswith='scheduled_')
+    )
+    return BoardRuleIndex(legacy, rules)
+
+
+def get_board_index(board_id):
+    """Return the current BoardRuleIndex for ``board_id``, rebuilding if stale."""
+    version = _current_version(board_id)
+    with _lock:
+        entry = _indexes.get(board_id)
+        if entry is not None and version is not None and entry[0] == version:
+            _indexes.move_to_end(board_id)
+            return entry[1]
+
+    index = _build(board_id)
+    if version is None:
+        return index
+    with _lock:
+        _indexes[board_id] = (version, index)
+        _indexes.move_to_end(board_id)
+        while len(_indexes) > _max_boards():
+            _indexes.popitem(last=False)
+    return index
+
+
+def invalidate_board(board_id):
+    """Drop every process's cached index for ``board_id``."""
+    if not board_id:
+        return
+
+    def _bump():
+        bump_version_token(VERSION_KEY.format(board_id=board_id))
+        with _lock:
+            _indexes.pop(board_id, None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+@receiver(post_save, sender='kanban.AutomationRule')
+@receiver(post_delete, sender='kanban.AutomationRule')
+@receiver(post_save, sender='kanban.BoardAutomation')
+@receiver(post_delete, sender='kanban.BoardAutomation')
+def invalidate_on_rule_change(sender, instance, **kwargs):
+    invalidate_board(instance.board_id)
+
+
+@receiver(post_save, sender='kanban.Board')
+@receiver(post_delete, sender='kanban.Board')
+def invalidate_on_board_change(sender, instance, created=False, **kwargs):
+    # Only creation and deletion matter: they guard against a recycled board
+    # id picking up a dead board's cached rules.
+    if created or kwargs.get('signal') is post_delete:
+        invalidate_board(instance.pk)
@@ -0,0 +1,107 @@
+"""
+Materialized per-board, per-day analytics facts.
+
+One ``BoardDailyMetrics`` row per (board, day), maintained by
+kanban/utils/board_metrics.py: Task/Column/TaskCost signals mark the current
+row stale, readers refresh stale rows on demand, and the nightly
+``kanban.refresh_board_metrics`` job rolls every board over to the new day.
+The analytics helpers and the portfolio API read these rows instead of
+aggregating Task live.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+
+
+class BoardDailyMetrics(models.Model):
+    """
+    Analytics facts for one board on one day.
+
+    Flow fields count what happened *on* ``date`` (tasks created, tasks
+    completed and whether they met their deadline). They are rewritten for
+    the whole trailing window on every refresh, so back-dated completions
+    and re-opened tasks land on the right day.
+
+    Snapshot fields describe the board *as of* the last refresh that day
+    (``snapshot_at``). Past days keep the snapshot they ended with; rows
+    created only to hold flow counts have ``snapshot_at`` = NULL.
+
+    All task counts exclude milestones and other non-task items, matching the
+    analytics cards; milestones are counted separately.
+    """
+    board = models.ForeignKey('kanban.Board', on_delete=models.CASCADE, related_name='daily_metrics')
+    date = models.DateField()
+
+    # --- Flow (events on this day) -----------------------------------------
+    tasks_created = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    completed_on_time = models.IntegerField(default=0, help_text="Completions on or before the due date")
+    completed_late = models.IntegerField(default=0, help_text="Completions after the due date")
+
+    # --- Snapshot (state of the board at snapshot_at) ------------------------
+    tasks_total = models.IntegerField(default=0)
+    tasks_done = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
+    at_risk_count = models.IntegerField(
+        default=0, help_text="Open urgent tasks, or high-priority tasks at 0% progress",
+    )
+    in_review_count = models.IntegerField(
+        null=True, blank=True, help_text="Open tasks in 'review' columns; NULL when the board has none",
+    )
+    tasks_with_due = models.IntegerField(default=0)
+    done_with_due = models.IntegerField(default=0)
+    done_on_time = models.IntegerField(default=0)
+    milestones_total = models.IntegerField(default=0)
+    milestones_done = models.IntegerField(default=0)
+
+    # Rolling flow totals ending on this day, so a single row answers the
+    # "last 7 / 30 days" cards.
+    completed_last_7d = models.IntegerField(default=0)
+    completed_last_30d = models.IntegerField(default=0)
+    created_last_30d = models.IntegerField(default=0)
+
+    # Cycle time (creation → completion) over every completed task.
+    cycle_time_days_sum = models.FloatField(default=0.0)
+    cycle_time_count = models.IntegerField(default=0)
+    cycle_time_buckets = models.JSONField(
+        default=list, blank=True,
+        help_text="Completed-task counts for ≤1, 2-3, 4-7, 8-14 and 15+ days",
+    )
+
+    wip_by_column = models.JSONField(
+        default=list, blank=True,
+        help_text="[{'id', 'name', 'position', 'count'}, ...] in board order",
+    )
+    workload = models.JSONField(
+        default=list, blank=True,
+        help_text="[{'username', 'count', 'active'}, ...]; username is None for unassigned",
+    )
+
+    estimated_cost = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    actual_cost = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0.00'),
+        help_text="Direct + resource + labour cost, as ProjectBudget.get_spent_amount",
+    )
+
+    snapshot_at = models.DateTimeField(null=True, blank=True)
+    is_stale = models.BooleanField(
+        default=False, help_text="A task changed since snapshot_at; refresh before trusting",
+    )
+
+    class Meta:
+        unique_together = ('board', 'date')
+        indexes = [
+            models.Index(fields=['date', 'is_stale']),
+        ]
+        verbose_name = 'Board Daily Metrics'
+        verbose_name_plural = 'Board Daily Metrics'
+
+    def __str__(self):
+        return f"board {self.board_id} @ {self.date}"
+
+    @property
+    def avg_cycle_time_days(self):
+        if not self.cycle_time_count:
+            return None
+        return self.cycle_time_days_sum / self.cycle_time_count
@@ -8,6 +8,7 @@ Prediction, Workflow Optimization, AI Chat).
 Protocol:
   Client connects to ws://.../ws/ai-task/<task_id>/
   Server sends: {type: "ai_status_update", message: "...", progress: 0-100}
+  Server sends: {type: "ai_delta", text: "...", seq: n}   (AI Chat, streamed answer text)
   Server sends: {type: "ai_result", data: {...}}
   Server sends: {type: "ai_error", message: "..."}
 """
@@ -51,6 +52,14 @@ class AITaskConsumer(AsyncWebsocketConsumer):
             'progress': event.get('progress', 0),
         }))
 
+    async def ai_delta(self, event):
+        """Forward a batch of streamed answer text to the client."""
+        await self.send(text_data=json.dumps({
+            'type': 'ai_delta',
+            'text': event.get('text', ''),
+            'seq': event.get('seq', 0),
+        }))
+
     async def ai_result(self, event):
         """Forward the final AI result and close the connection."""
         await self.send(text_data=json.dumps({
@@ -0,0 +1,26 @@
+"""
+Per-board record of the demo date refresh.
+
+Seed demo dates are rewritten relative to "today" by
+kanban/utils/demo_date_refresh.py. ``DemoDateRefresh.refreshed_on`` records
+the day a board was last rewritten, so the refresh can skip boards that were
+already done today (by provisioning, the nightly job or an earlier run).
+The stored dates are still the only source of truth; nothing is shifted at
+read time.
+"""
+
+from django.db import models
+
+
+class DemoDateRefresh(models.Model):
+    """The last day a demo board's seed dates were refreshed."""
+    board = models.OneToOneField('kanban.Board', on_delete=models.CASCADE, related_name='demo_date_refresh')
+    refreshed_on = models.DateField(db_index=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Demo Date Refresh'
+        verbose_name_plural = 'Demo Date Refreshes'
+
+    def __str__(self):
+        return f"{self.board_id} @ {self.refreshed_on}"
@@ -22,7 +22,7 @@ from datetime import timedelta
 from decimal import Decimal
 import random
 from kanban.models import Board, Task, Column, Organization, TaskLabel
-from messaging.models import ChatRoom, ChatMessage
+from messaging.models import ChatRoom, ChatMessage, ChatReadState
 from kanban.conflict_models import ConflictDetection
 from wiki.models import WikiPage
 from kanban.utils.demo_permissions import DemoPermissions
@@ -856,10 +856,7 @@ def demo_dashboard(request):
         )
         
         # Count unread messages across all these rooms
-        message_count = 0
-        for room in user_chat_rooms:
-            room_unread = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
-            message_count += room_unread
+        message_count = ChatReadState.total_unread(request.user, user_chat_rooms)
     else:
         # For anonymous demo users, show total message count as fallback
         message_count = ChatMessage.objects.filter(
@@ -2392,10 +2389,7 @@ def demo_feature_counts_api(request):
             )
             
             # Count unread messages across all these rooms
-            message_count = 0
-            for room in user_chat_rooms:
-                room_unread = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
-                message_count += room_unread
+            message_count = ChatReadState.total_unread(request.user, user_chat_rooms)
         else:
             # For anonymous demo users, show total message count as fallback
             message_count = ChatMessage.objects.filter(
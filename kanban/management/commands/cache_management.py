@@ -146,6 +146,11 @@ class Command(BaseCommand):
             self.stdout.write(f"  Cache Misses: {stats.get('misses', 0)}")
             self.stdout.write(f"  Cache Errors: {stats.get('errors', 0)}")
             self.stdout.write(f"  API Calls Saved: {stats.get('api_calls_saved', 0)}")
+            self.stdout.write(
+                f"  Coalesced Calls: {stats.get('coalesced', 0)} local, "
+                f"{stats.get('coalesced_remote', 0)} cross-process "
+                f"({stats.get('single_flight_timeouts', 0)} wait timeouts)"
+            )
             self.stdout.write(f"  Estimated Cost Saved: ${stats.get('estimated_cost_saved', 0):.4f}")
             self.stdout.write(f"  Hit Rate: {stats.get('hit_rate', '0.00%')}")
             self.stdout.write(f"  Stats Since: {stats.get('since', 'Unknown')}")
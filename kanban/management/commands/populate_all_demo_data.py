@@ -406,6 +406,7 @@ class Command(BaseCommand):
           3. Set ``is_active=False`` so they can't log in.
           4. Tag profile.is_demo_account=False so demo-only queries skip them.
         """
+        from kanban.automation_index import invalidate_board
         from kanban.models import BoardMembership, WorkspaceMembership, Board, Workspace
         from accounts.models import UserProfile
 
@@ -434,6 +435,10 @@ class Command(BaseCommand):
 
         # 3. Deactivate accounts (prevents login + removes from active dropdowns)
         legacy_qs.update(is_active=False)
+        # Rules authored by these accounts stay in the per-board rule index;
+        # a queryset update sends no signals, so rebuild it explicitly.
+        for board_id in demo_board_ids:
+            invalidate_board(board_id)
 
         # 4. Untag as demo accounts so demo-only filters exclude them
         UserProfile.objects.filter(user_id__in=legacy_ids).update(is_demo_account=False)
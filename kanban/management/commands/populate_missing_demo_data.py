@@ -458,6 +458,7 @@ class Command(BaseCommand):
     #  3. BOARD AUTOMATIONS
     # -----------------------------------------------------------------
     def _create_board_automations(self):
+        from kanban.automation_index import invalidate_board
         from kanban.automation_models import BoardAutomation
 
         self.stdout.write(self.style.NOTICE('\n Creating Board Automations...'))
@@ -539,6 +540,7 @@ class Command(BaseCommand):
                     last_run_at=self.now - timedelta(days=1),
                 )
             count += 1
+        invalidate_board(self.board.pk)
 
         self.stdout.write(f'   [OK] Created {count} board automations')
         return count
@@ -0,0 +1,37 @@
+"""
+Recreate the full-text search index (kanban/utils/search_index.py).
+
+Drops and recreates the FTS5 table and its sync triggers, then re-indexes
+every task, wiki page, chat message and memory node. Safe to re-run; use it
+after restoring a database or bulk-loading rows with the triggers absent.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the SQLite FTS5 search index and its triggers'
+
+    def handle(self, *args, **options):
+        from kanban.utils import search_index
+
+        if connection.vendor != 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                f'Search index is SQLite-only; {connection.vendor} keeps icontains search.'
+            ))
+            return
+
+        started = time.perf_counter()
+        counts = search_index.install()
+        elapsed = time.perf_counter() - started
+
+        for kind, count in counts.items():
+            self.stdout.write(f'   - {kind}: {count} rows')
+        self.stdout.write(self.style.SUCCESS(
+            f'[OK] Search index rebuilt ({sum(counts.values())} rows in {elapsed:.1f}s)'
+        ))
@@ -42,7 +42,7 @@ class Command(BaseCommand):
 
         # Perform the refresh
         try:
-            stats = refresh_all_demo_dates()
+            stats = refresh_all_demo_dates(force=options['force'])
             
             # Print summary
             self.stdout.write('')
@@ -234,11 +234,14 @@ class Command(BaseCommand):
             self._ok(f"   rule '{name}' (id={rule.id}) {'created' if created else 'updated'} [PAUSED]")
 
     def _pause_existing(self, ctx):
+        from kanban.automation_index import invalidate_board
         from kanban.automation_models import AutomationRule
         qs = AutomationRule.objects.filter(board=ctx['board'], is_active=True).exclude(
             name__startswith=RULE_PREFIX)
         names = list(qs.values_list('name', flat=True))
         count = qs.update(is_active=False)
+        # Queryset updates send no signals; drop the cached rule index.
+        invalidate_board(ctx['board'].pk)
         if count:
             self._warn(f'   paused {count} stray active rule(s): {", ".join(names)}')
         else:
@@ -283,12 +286,14 @@ class Command(BaseCommand):
                 self.stdout.write('   (no logs yet)')
 
     def _teardown(self, ctx, revert_membership):
+        from kanban.automation_index import invalidate_board
         from kanban.automation_models import AutomationRule
         from kanban.models import BoardMembership
 
         count = AutomationRule.objects.filter(
             board=ctx['board'], name__startswith=RULE_PREFIX, is_active=True,
         ).update(is_active=False)
+        invalidate_board(ctx['board'].pk)
         self._ok(f'   paused {count} active TIER2A rule(s)')
 
         if revert_membership:
@@ -12,6 +12,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Held while a middleware-triggered demo date refresh is queued or running.
+DEMO_DATE_REFRESH_LOCK_KEY = 'demo_data_refresh_dispatched'
+DEMO_DATE_REFRESH_LOCK_TIMEOUT = 60 * 10
+
 
 class DemoSessionMiddleware:
     """
@@ -41,15 +45,35 @@ class DemoSessionMiddleware:
         """
         Check if demo data dates need to be refreshed and refresh them.
         This runs once per day to keep demo data timelines dynamic.
+
+        The refresh is queued on Celery rather than run inside the request;
+        it is run inline only when the task cannot be dispatched.  A short
+        cache lock keeps concurrent first-of-the-day requests from starting
+        it more than once.
+
+        Because the refresh is queued, the request that triggers it, and any
+        other request served before the worker finishes, still reads the
+        previous day's dates: relative deadlines are one day off until then
+        (typically a few seconds).  Demo visitors between midnight and the
+        3 AM ``refresh-demo-dates-daily`` beat run are the ones who hit it.
         """
         try:
+            from django.core.cache import cache
             from kanban.utils.demo_date_refresh import (
                 should_refresh_demo_dates,
                 refresh_all_demo_dates
             )
-            
-            if should_refresh_demo_dates():
-                logger.info("Refreshing demo data dates (daily automatic refresh)")
+
+            if not should_refresh_demo_dates():
+                return
+            if not cache.add(DEMO_DATE_REFRESH_LOCK_KEY, True, DEMO_DATE_REFRESH_LOCK_TIMEOUT):
+                return
+            try:
+                from kanban.tasks.demo_tasks import refresh_demo_dates_task
+                refresh_demo_dates_task.delay()
+                logger.info("Queued demo data date refresh (daily automatic refresh)")
+            except Exception:
+                logger.info("Refreshing demo data dates inline (daily automatic refresh)")
                 stats = refresh_all_demo_dates()
                 logger.info(f"Demo dates refreshed successfully: {stats}")
         except Exception as e:
@@ -0,0 +1,56 @@
+"""Add the per-(user, board) open-task counter behind current_workload_hours.
+
+The counters are seeded from the live tasks with one grouped query, using the
+same rule _recalc_user_workload used (assigned, column name contains neither
+"done" nor "complete"). From here on the Task signals keep them current and
+the reconciliation job repairs drift.
+"""
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def seed_counters(apps, schema_editor):
+    Task = apps.get_model('kanban', 'Task')
+    UserBoardWorkload = apps.get_model('kanban', 'UserBoardWorkload')
+
+    rows = (
+        Task.objects.filter(assigned_to__isnull=False)
+        .exclude(Q(column__name__icontains='done') | Q(column__name__icontains='complete'))
+        .values('assigned_to_id', 'column__board_id')
+        .annotate(n=Count('id'))
+    )
+    UserBoardWorkload.objects.bulk_create(
+        [
+            UserBoardWorkload(user_id=r['assigned_to_id'], board_id=r['column__board_id'],
+                              active_tasks=r['n'])
+            for r in rows.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0166_customfielddefinition_sandbox_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBoardWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active_tasks', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workload_counters', to='kanban.board')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='board_workloads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'board')},
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+"""Add the per-(board, day) analytics fact table.
+
+No data migration: rows are produced on first read of a board's analytics
+and by the nightly kanban.refresh_board_metrics job.
+"""
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0167_userboardworkload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('completed_on_time', models.IntegerField(default=0, help_text='Completions on or before the due date')),
+                ('completed_late', models.IntegerField(default=0, help_text='Completions after the due date')),
+                ('tasks_total', models.IntegerField(default=0)),
+                ('tasks_done', models.IntegerField(default=0)),
+                ('overdue_count', models.IntegerField(default=0)),
+                ('at_risk_count', models.IntegerField(default=0, help_text='Open urgent tasks, or high-priority tasks at 0% progress')),
+                ('in_review_count', models.IntegerField(blank=True, help_text="Open tasks in 'review' columns; NULL when the board has none", null=True)),
+                ('tasks_with_due', models.IntegerField(default=0)),
+                ('done_with_due', models.IntegerField(default=0)),
+                ('done_on_time', models.IntegerField(default=0)),
+                ('milestones_total', models.IntegerField(default=0)),
+                ('milestones_done', models.IntegerField(default=0)),
+                ('completed_last_7d', models.IntegerField(default=0)),
+                ('completed_last_30d', models.IntegerField(default=0)),
+                ('created_last_30d', models.IntegerField(default=0)),
+                ('cycle_time_days_sum', models.FloatField(default=0.0)),
+                ('cycle_time_count', models.IntegerField(default=0)),
+                ('cycle_time_buckets', models.JSONField(blank=True, default=list, help_text='Completed-task counts for ≤1, 2-3, 4-7, 8-14 and 15+ days')),
+                ('wip_by_column', models.JSONField(blank=True, default=list, help_text="[{'id', 'name', 'position', 'count'}, ...] in board order")),
+                ('workload', models.JSONField(blank=True, default=list, help_text="[{'username', 'count', 'active'}, ...]; username is None for unassigned")),
+                ('estimated_cost', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('actual_cost', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Direct + resource + labour cost, as ProjectBudget.get_spent_amount', max_digits=14)),
+                ('snapshot_at', models.DateTimeField(blank=True, null=True)),
+                ('is_stale', models.BooleanField(default=False, help_text='A task changed since snapshot_at; refresh before trusting')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='kanban.board')),
+            ],
+            options={
+                'verbose_name': 'Board Daily Metrics',
+                'verbose_name_plural': 'Board Daily Metrics',
+                'indexes': [models.Index(fields=['date', 'is_stale'], name='kanban_boar_date_87f7b4_idx')],
+                'unique_together': {('board', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+"""Record the day each demo board's dates were last refreshed.
+
+No data migration: boards without a record are refreshed by the next demo
+date refresh, which creates their records.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0168_boarddailymetrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemoDateRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refreshed_on', models.DateField(db_index=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='demo_date_refresh', to='kanban.board')),
+            ],
+            options={
+                'verbose_name': 'Demo Date Refresh',
+                'verbose_name_plural': 'Demo Date Refreshes',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+"""Create the SQLite FTS5 search index.
+
+Indexes every existing task, wiki page, chat message and memory node. The
+sync triggers are installed by the post_migrate hook in kanban/apps.py, so
+later migrations in the same run can still rebuild the tables they read. On
+other backends this is a no-op and search keeps using icontains.
+"""
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from kanban.utils import search_index
+    search_index.install(schema_editor.connection, triggers=False)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from kanban.utils import search_index
+    search_index.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0169_demodaterefresh'),
+        ('wiki', '0016_wikidocumentationanalysis_wikidocumentationtask_and_more'),
+        ('messaging', '0010_chatreadstate'),
+        ('knowledge_graph', '0007_alter_memorynode_is_org_wide'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
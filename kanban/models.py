@@ -19,7 +19,8 @@ from kanban.coach_models import CoachingSuggestion, CoachingFeedback, PMMetrics,
 from kanban.resource_leveling_models import (
     UserPerformanceProfile,
     TaskAssignmentHistory,
-    ResourceLevelingSuggestion
+    ResourceLevelingSuggestion,
+    UserBoardWorkload,
 )
 
 # Import conflict detection models
@@ -54,6 +55,12 @@ from kanban.prizmbrief_models import SavedBrief
 # Import PrizmDiscovery models
 from kanban.discovery_models import DiscoveryIdea, IdeaComment, IdeaPromotion
 
+# Import materialized analytics facts
+from kanban.board_metrics_models import BoardDailyMetrics
+
+# Import demo date refresh records
+from kanban.demo_refresh_models import DemoDateRefresh
+
 
 # ---------------------------------------------------------------------------
 # WORKSPACE — the isolation boundary for multi-workspace support.
@@ -1839,8 +1846,41 @@ class Task(models.Model):
                     )
                 })
 
+    def get_previous_state(self):
+        """
+        Return this task's row as currently stored, i.e. before the save in
+        progress, or None for a new task.
+
+        Loaded at most once per ``save()`` (with ``assigned_to`` and ``column``
+        joined) and shared by every pre_save receiver that needs old values —
+        assignment, priority/progress, column entry, tracked fields, due date,
+        webhooks and memory capture — so a drag-and-drop costs one SELECT.
+        """
+        if not self.pk:
+            return None
+        if '_previous_state' not in self.__dict__:
+            try:
+                self._previous_state = Task.objects.select_related(
+                    'assigned_to', 'column',
+                ).get(pk=self.pk)
+            except Task.DoesNotExist:
+                self._previous_state = None
+        return self._previous_state
+
     def save(self, *args, **kwargs):
         """Override save to track completion and update predictions"""
+        # Drop the previous save's snapshot so get_previous_state() re-reads
+        # the row for this one.
+        self.__dict__.pop('_previous_state', None)
+        self.apply_derived_fields()
+        super().save(*args, **kwargs)
+
+    def apply_derived_fields(self):
+        """
+        Sanitize the description and keep completed_at/actual_duration_days
+        in step with progress. Runs on every save(); bulk writers that bypass
+        save() (kanban/utils/bulk_import.py) call it per row.
+        """
         # Sanitize rich-text HTML description to prevent XSS before persisting
         if self.description:
             from kanban.utils.sanitize import sanitize_html
@@ -1863,8 +1903,6 @@ class Task(models.Model):
         elif self.progress < 100 and self.completed_at:
             self.completed_at = None
             self.actual_duration_days = None
-        
-        super().save(*args, **kwargs)
     
     def get_velocity_factor(self):
         """Calculate team member's velocity factor based on historical data"""
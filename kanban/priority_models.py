@@ -355,8 +355,13 @@ class PriorityModel(models.Model):
     
     @classmethod
     def get_active_model(cls, board):
-        """Get the active priority model for a board"""
-        return cls.objects.filter(board=board, is_active=True).first()
+        """
+        Get the active priority model for a board
+
+        ``model_file`` is deferred; load the estimator through
+        ai_assistant.utils.priority_service.load_priority_model, which caches it.
+        """
+        return cls.objects.filter(board=board, is_active=True).defer('model_file').first()
 
 
 class PrioritySuggestionLog(models.Model):
@@ -15,6 +15,7 @@ from kanban.resource_leveling_models import (
     TaskAssignmentHistory,
     ResourceLevelingSuggestion
 )
+from kanban.utils.assignment_optimizer import OPTIMIZER_AVAILABLE, np
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,17 @@ class ResourceLevelingService:
     # history, so anything under this threshold carries essentially no evidence.
     MIN_DISPLAY_CONFIDENCE = 40.0
 
+    # Hard cap on suggestions targeting one user in a single generation run.
+    MAX_SUGGESTIONS_PER_USER = 3
+
+    # Diversity penalty grows linearly per prior suggestion targeting a given
+    # user. 20 points per hit is large enough to overcome the typical 20–25
+    # point availability advantage a single low-utilization person enjoys
+    # over peers on a busy board, so suggestion #2 picks someone else when
+    # any other credible candidate exists. The hard cap (3 per user) still
+    # bounds the worst case if no alternative qualifies.
+    DIVERSITY_PENALTY_PER_HIT = 20.0
+
     def __init__(self, workspace=None, organization=None):
         # Workspace is the tenant scope now. ``organization`` is accepted but
         # ignored — kept only so legacy call sites don't break.
@@ -713,7 +725,6 @@ class ResourceLevelingService:
             'missing_due_date': not has_due_date,
             'no_peer_history': not has_peer_history,
         }
-        missing_count = sum(1 for v in data_quality_flags.values() if v)
         # --- End of data-quality capture ---
 
         analysis = self.analyze_task_assignment(
@@ -730,12 +741,23 @@ class ResourceLevelingService:
         if not analysis['should_reassign'] and not force_analysis:
             return None
         
+        return self._persist_suggestion(task, analysis, data_quality_flags)
+
+    def _persist_suggestion(self, task, analysis, data_quality_flags, profiles=None, users=None):
+        """
+        Store the analysis' top recommendation as a ResourceLevelingSuggestion.
+
+        ``profiles`` / ``users`` ({user_id: ...}) let bulk callers reuse the
+        profiles and users they already loaded instead of re-fetching them.
+        """
+        missing_count = sum(1 for v in data_quality_flags.values() if v)
+
         top = analysis['top_recommendation']
         if not top:
             return None
         
         current_assignee = task.assigned_to
-        suggested_user = User.objects.get(id=top['user_id'])
+        suggested_user = (users or {}).get(top['user_id']) or User.objects.get(id=top['user_id'])
         
         # Calculate time savings
         current_analysis = None
@@ -747,8 +769,11 @@ class ResourceLevelingService:
             )
         
         # Check if EACH user individually has work history for accurate explainability
-        suggested_profile = self.get_or_create_profile(suggested_user)
-        current_profile = self.get_or_create_profile(current_assignee) if current_assignee else None
+        profiles = profiles or {}
+        suggested_profile = profiles.get(suggested_user.id) or self.get_or_create_profile(suggested_user)
+        current_profile = None
+        if current_assignee:
+            current_profile = profiles.get(current_assignee.id) or self.get_or_create_profile(current_assignee)
         suggested_has_history = suggested_profile.total_tasks_completed > 0
         current_has_history = current_profile and current_profile.total_tasks_completed > 0
         
@@ -790,7 +815,9 @@ class ResourceLevelingService:
         workload_impact = self._determine_workload_impact(top, current_analysis)
 
         # Calculate actual AI confidence in this suggestion (not user suitability)
-        ai_confidence = self._calculate_suggestion_confidence(top, current_analysis, workload_impact)
+        ai_confidence = self._calculate_suggestion_confidence(
+            top, current_analysis, workload_impact, profiles=profiles or None,
+        )
 
         # Apply data-quality penalty: every missing input (time log, due date,
         # peer history) docks ~15 points. Floor at 25 — anything below that we
@@ -845,7 +872,7 @@ class ResourceLevelingService:
         
         return suggestion
     
-    def _calculate_suggestion_confidence(self, recommended, current, workload_impact):
+    def _calculate_suggestion_confidence(self, recommended, current, workload_impact, profiles=None):
         """
         Calculate AI's confidence in this suggestion (0-100).
 
@@ -865,8 +892,12 @@ class ResourceLevelingService:
         The two components multiply, not add. This is why every suggestion no
         longer pegs at 92% — the ceiling itself moves with the data.
         """
-        recommended_profile = UserPerformanceProfile.objects.filter(user_id=recommended['user_id']).first()
-        current_profile = UserPerformanceProfile.objects.filter(user_id=current['user_id']).first() if current else None
+        if profiles is not None:
+            recommended_profile = profiles.get(recommended['user_id'])
+            current_profile = profiles.get(current['user_id']) if current else None
+        else:
+            recommended_profile = UserPerformanceProfile.objects.filter(user_id=recommended['user_id']).first()
+            current_profile = UserPerformanceProfile.objects.filter(user_id=current['user_id']).first() if current else None
 
         recommended_has_history = recommended_profile and recommended_profile.total_tasks_completed > 0
         current_has_history = current_profile and current_profile.total_tasks_completed > 0
@@ -1052,6 +1083,9 @@ class ResourceLevelingService:
         """
         Analyze all tasks on a board and return top optimization opportunities
         Always regenerates suggestions with current workload data to ensure relevance
+
+        Uses the matrix optimizer (_optimized_board_suggestions) when numpy and
+        scipy are installed, and the task-by-task greedy pass otherwise.
         
         Args:
             board: Board object
@@ -1087,13 +1121,269 @@ class ResourceLevelingService:
             column__name__icontains='done'
         ).select_related('assigned_to', 'column')
         
+        suggestions = None
+        if OPTIMIZER_AVAILABLE:
+            try:
+                suggestions = self._optimized_board_suggestions(board, tasks)
+            except Exception as e:
+                logger.error(f"Assignment optimizer failed for board {board.id}, falling back to greedy pass: {e}", exc_info=True)
+        if suggestions is None:
+            suggestions = self._greedy_board_suggestions(tasks, requesting_user)
+
+        return self._finalize_board_suggestions(board, suggestions, limit)
+
+    # Utilization points given up by a giver and taken on by a receiver are
+    # worth this much score in the optimizer objective (the availability
+    # weight in _analyze_candidate), so relief moves compete with skill gains.
+    BALANCE_WEIGHT = 0.25
+
+    def _optimized_board_suggestions(self, board, tasks):
+        """
+        Whole-board reassignment via a min-cost assignment.
+
+        Scores every open task against every member at once with the same
+        formula as _analyze_candidate (skill match from a task × member
+        matrix, workload from one aggregate count), then lets
+        kanban.utils.assignment_optimizer pick the best set of moves:
+
+        * Members above the team's mean utilization are givers, qualified
+          members at or below it are receivers, so nobody both gives and
+          receives (the coherence rule of the greedy pass).
+        * Each receiver has MAX_SUGGESTIONS_PER_USER slots; slot k sees the
+          projected state after k earlier moves (+15% utilization each, one
+          more active task) and the matching diversity penalty.
+        * A giver loses at most enough tasks to come down to the mean.
+        * A move must pass the same gates as analyze_task_assignment: the
+          5/15-point improvement threshold, the >90% relief override, the
+          balance guard and, for unassigned tasks, the 90% load ceiling.
+
+        Returns:
+            list of persisted ResourceLevelingSuggestion objects (unranked)
+        """
+        from kanban.models import Task
+        from kanban.budget_models import TimeEntry
+        from kanban.utils.assignment_optimizer import skill_match_matrix, solve_slot_assignment
+
+        now = timezone.now()
+        # Same one-hour age gate as create_suggestion.
+        tasks = [
+            t for t in tasks
+            if not (t.created_at and timedelta(0) <= now - t.created_at < timedelta(hours=1))
+        ]
+        if not tasks:
+            return []
+
+        members = list(User.objects.filter(board_memberships__board=board).distinct())
+        users = {u.id: u for u in members}
+        member_ids = set(users)
+        for t in tasks:
+            if t.assigned_to_id and t.assigned_to_id not in users:
+                users[t.assigned_to_id] = t.assigned_to
+        uids = list(users)
+        index = {uid: i for i, uid in enumerate(uids)}
+        profiles = {uid: self.get_or_create_profile(users[uid], board=board) for uid in uids}
+        P = [profiles[uid] for uid in uids]
+
+        # One aggregate replaces the per-candidate count() in _analyze_candidate.
+        active_counts = dict(
+            Task.objects.filter(
+                column__board=board,
+                item_type='task',
+                completed_at__isnull=True,
+                assigned_to_id__in=uids,
+            ).exclude(column__name__icontains='done')
+            .values_list('assigned_to').annotate(n=Count('id'))
+        )
+
+        # --- Per-member vectors ---
+        util = np.array([p.utilization_percentage for p in P], dtype=float)
+        count = np.array([active_counts.get(uid, 0) for uid in uids], dtype=float)
+        completed = np.array([p.total_tasks_completed for p in P])
+        has_history = completed > 0
+        has_skills = np.array([bool(p.skill_keywords) for p in P])
+        velocity = np.where(
+            completed >= 5, np.minimum([p.velocity_score * 50 for p in P], 100), 50.0,
+        )
+        reliability = np.where(has_history, [p.on_time_completion_rate for p in P], 50.0)
+        quality = np.array([p.quality_score / 5.0 * 100 for p in P], dtype=float)
+        confidence = np.where(has_history, 1.0, np.where(has_skills, 0.75, 0.60))
+        base_time = np.array(
+            [max(4.0, min(abs(p.avg_completion_time_hours or 8.0), 40.0)) for p in P]
+        )
+        is_member = np.array([uid in member_ids for uid in uids])
+        qualified = np.array([self._is_qualified_candidate(p) for p in P])
+
+        # --- Per-task vectors ---
+        n_tasks = len(tasks)
+        skill = skill_match_matrix(
+            [f"{t.title} {t.description or ''}" for t in tasks],
+            [p.skill_keywords for p in P],
+        )
+        complexity = np.array([t.complexity_score / 5 if t.complexity_score else 1.0 for t in tasks])
+        has_due = np.zeros(n_tasks, dtype=bool)
+        days_to_due = np.zeros(n_tasks)
+        for i, t in enumerate(tasks):
+            if t.due_date:
+                due = timezone.make_aware(t.due_date) if timezone.is_naive(t.due_date) else t.due_date
+                has_due[i] = True
+                days_to_due[i] = (due - now).total_seconds() / 86400
+
+        def projected(k):
+            """Scores with k extra projected tasks for every member (slot k)."""
+            adj_util = np.maximum(util + 15 * k, 0)
+            availability = np.maximum(100 - adj_util, 0)
+            member_part = availability * 0.25 + velocity * 0.20 + reliability * 0.15 + quality * 0.10
+            overall = (skill * 0.30 + member_part[None, :]) * confidence[None, :]
+            overall = np.maximum(overall - self.DIVERSITY_PENALTY_PER_HIT * k, 0)
+            total = count + k
+            workload = np.where(total > 0, 1.0 + total * 0.08, 1.0)
+            hours = complexity[:, None] * (base_time * workload)[None, :]
+            gap = np.where(has_due[:, None], hours / 24 - days_to_due[:, None], 0.0)
+            overall = np.maximum(overall - np.where(gap > 0, np.minimum(25.0, gap * 5.0), 0.0), 0)
+            return {
+                'k': k, 'overall': overall, 'availability': availability,
+                'hours': hours, 'gap': gap, 'util': adj_util, 'total': total,
+            }
+
+        states = [projected(k) for k in range(self.MAX_SUGGESTIONS_PER_USER)]
+        now_state = states[0]
+
+        # --- Givers / receivers ---
+        mean_util = util[is_member].mean() if is_member.any() else util.mean()
+        is_giver = util > mean_util
+        receivers = [i for i in range(len(uids)) if is_member[i] and qualified[i] and not is_giver[i]]
+        giver_caps = {
+            i: max(1, int(np.ceil((util[i] - mean_util) / 15)))
+            for i in np.flatnonzero(is_giver)
+        }
+
+        rows = np.arange(n_tasks)
+        cur = np.array([index.get(t.assigned_to_id, -1) if t.assigned_to_id else -1 for t in tasks])
+        assigned = cur >= 0
+        cur_safe = np.where(assigned, cur, 0)
+        cur_score = np.where(assigned, now_state['overall'][rows, cur_safe], 0.0)
+        cur_util = np.where(assigned, util[cur_safe], 0.0)
+        cur_skill = np.where(assigned, skill[rows, cur_safe], 0.0)
+        movable = ~assigned | is_giver[cur_safe]
+        threshold = np.where(cur_util > 90, 5.0, 15.0)
+
+        slots, gain_rows, feasible_rows = [], [], []
+        for state in states:
+            for r in receivers:
+                score = state['overall'][:, r]
+                r_util = state['util'][r]
+                improvement = score - cur_score
+                relief = (cur_util > 90) & (r_util < 85) & (cur_util - r_util > 15)
+                worse_balance = (r_util > cur_util + 5) & (
+                    (skill[:, r] - cur_skill < 25) | (r_util > 90)
+                )
+                ok_reassign = relief | (~worse_balance & (improvement > threshold))
+                ok_initial = (util[r] <= 90) & (r_util <= 90)
+                slots.append((r, state['k']))
+                feasible_rows.append(
+                    movable & (cur != r) & np.where(assigned, ok_reassign, ok_initial)
+                )
+                gain_rows.append(np.where(
+                    assigned,
+                    improvement + self.BALANCE_WEIGHT * (cur_util - r_util),
+                    score,
+                ))
+        if not slots:
+            return []
+
+        chosen = solve_slot_assignment(
+            np.vstack(gain_rows), np.vstack(feasible_rows),
+            task_giver=np.where(assigned & is_giver[cur_safe], cur, -1),
+            giver_caps=giver_caps,
+        )
+        if not chosen:
+            return []
+
+        def candidate(t_i, u_i, state):
+            profile = P[u_i]
+            user = users[uids[u_i]]
+            hours = float(state['hours'][t_i, u_i])
+            gap = float(state['gap'][t_i, u_i])
+            return {
+                'user_id': user.id,
+                'username': user.username,
+                'display_name': user.get_full_name() or user.username,
+                'overall_score': round(float(state['overall'][t_i, u_i]), 1),
+                'skill_match': round(float(skill[t_i, u_i]), 1),
+                'availability': round(float(state['availability'][u_i]), 1),
+                'velocity': round(float(velocity[u_i]), 1),
+                'reliability': round(float(reliability[u_i]), 1),
+                'quality': round(float(quality[u_i]), 1),
+                'estimated_hours': round(hours, 1),
+                'estimated_completion': (now + timedelta(hours=hours)).isoformat(),
+                'total_completed': profile.total_tasks_completed,
+                'meets_deadline': bool(gap <= 0) if has_due[t_i] else None,
+                'deadline_gap_days': round(gap, 1) if has_due[t_i] else None,
+                'current_workload': int(state['total'][u_i]),
+                'utilization': round(float(state['util'][u_i]), 1),
+                'actual_workload': int(count[u_i]),
+                'actual_utilization': round(float(util[u_i]), 1),
+            }
+
+        chosen_ids = [tasks[t_i].id for _slot, t_i in chosen]
+        time_logged = set(
+            TimeEntry.objects.filter(task_id__in=chosen_ids).values_list('task_id', flat=True)
+        )
+        experienced = {uid for uid in member_ids if profiles[uid].total_tasks_completed > 0}
+        comparison = [i for i in range(len(uids)) if is_member[i] and qualified[i]]
+
+        suggestions = []
+        for slot, t_i in chosen:
+            r, k = slots[slot]
+            task = tasks[t_i]
+            top = candidate(t_i, r, states[k])
+            all_candidates = [top] + [
+                candidate(t_i, i, now_state) for i in comparison if i != r
+            ]
+            if assigned[t_i]:
+                current = next((c for c in all_candidates if c['user_id'] == task.assigned_to_id), None)
+                if current is None:
+                    current = candidate(t_i, cur[t_i], now_state)
+                    all_candidates.append(current)
+                reasoning = self._generate_reassignment_reasoning(
+                    top, current, top['overall_score'] - current['overall_score'],
+                )
+            else:
+                reasoning = self._generate_initial_assignment_reasoning(top)
+            all_candidates.sort(key=lambda c: c['overall_score'], reverse=True)
+
+            analysis = {
+                'task_id': task.id,
+                'task_title': task.title,
+                'top_recommendation': top,
+                'all_candidates': all_candidates,
+                'should_reassign': True,
+                'reasoning': reasoning,
+            }
+            data_quality_flags = {
+                'missing_time_log': task.id not in time_logged,
+                'missing_due_date': not task.due_date,
+                'no_peer_history': not (experienced - {task.assigned_to_id}),
+            }
+            suggestion = self._persist_suggestion(
+                task, analysis, data_quality_flags, profiles=profiles, users=users,
+            )
+            if suggestion:
+                suggestions.append(suggestion)
+        return suggestions
+
+    def _greedy_board_suggestions(self, tasks, requesting_user=None):
+        """
+        Task-by-task suggestion pass: each task is analysed against the
+        projected state left by the suggestions accepted before it.
+        """
         suggestions = []
 
         # Track how many suggestions target each user to avoid flooding one person.
         # Used both to enforce a hard per-user cap and to drive the diversity penalty
         # so that subsequent suggestions in the same run consider other candidates.
         suggestion_counts_per_user = {}
-        max_suggestions_per_user = 3
+        max_suggestions_per_user = self.MAX_SUGGESTIONS_PER_USER
 
         # Cascading projected state across the run. After each suggestion is accepted
         # into the result list, we mutate this dict so the NEXT analysis sees the
@@ -1123,17 +1413,9 @@ class ResourceLevelingService:
             if current_assignee_id is not None:
                 source_user_ids.add(current_assignee_id)
 
-        # Diversity penalty grows linearly per prior suggestion targeting a given
-        # user. 20 points per hit is large enough to overcome the typical 20–25
-        # point availability advantage a single low-utilization person enjoys
-        # over peers on a busy board, so suggestion #2 picks someone else when
-        # any other credible candidate exists. The hard cap (3 per user) still
-        # bounds the worst case if no alternative qualifies.
-        DIVERSITY_PENALTY_PER_HIT = 20.0
-
         def _build_diversity_penalties():
             return {
-                uid: DIVERSITY_PENALTY_PER_HIT * count
+                uid: self.DIVERSITY_PENALTY_PER_HIT * count
                 for uid, count in suggestion_counts_per_user.items()
                 if count > 0
             }
@@ -1243,6 +1525,10 @@ class ResourceLevelingService:
                                     )
                                 break  # Use first valid alternative
 
+        return suggestions
+
+    def _finalize_board_suggestions(self, board, suggestions, limit):
+        """Apply the confidence floor, rank, cap at ``limit`` and expire the rest."""
         # Drop very-low-confidence suggestions. Below this floor a recommendation
         # is essentially a guess (no time logs / no peer history pushes confidence
         # down to its 25–38 floor), and surfacing it with a prominent Accept button
@@ -1261,8 +1547,8 @@ class ResourceLevelingService:
 
         final = suggestions[:limit]
 
-        # CRITICAL: persistence must match what the user sees. Every create_suggestion
-        # call above persists a pending row, but we then drop some from the *returned*
+        # CRITICAL: persistence must match what the user sees. Every suggestion the
+        # greedy or optimizer pass built persists a pending row, but we then drop some from the *returned*
         # list — below the confidence floor, or beyond `limit`. "Accept All" acts on
         # ALL pending rows for the board (see accept_all_suggestions), so any pending
         # row we are NOT returning would be applied as a reassignment the user never
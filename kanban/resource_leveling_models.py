@@ -270,6 +270,28 @@ class UserPerformanceProfile(models.Model):
         return max(100 - self.utilization_percentage, 0)
 
 
+class UserBoardWorkload(models.Model):
+    """
+    Open-task counter per (user, board), maintained incrementally by the Task
+    signals in kanban/signals.py and repaired by the periodic reconciliation
+    job (kanban.reconcile_workload_counters).
+
+    A task counts when it is assigned and its column name contains neither
+    "done" nor "complete" — the same rule UserProfile.current_workload_hours
+    has always used.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='board_workloads')
+    board = models.ForeignKey('kanban.Board', on_delete=models.CASCADE, related_name='workload_counters')
+    active_tasks = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'board')
+
+    def __str__(self):
+        return f"{self.user.username} @ board {self.board_id}: {self.active_tasks} active"
+
+
 class TaskAssignmentHistory(models.Model):
     """
     Tracks assignment changes for learning and optimization
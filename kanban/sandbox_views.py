@@ -113,7 +113,7 @@ def _duplicate_board(template_board, user):
     - Set is_official_demo_board = False on all copies
     - Do NOT copy BoardMembership records — create a fresh owner membership
     """
-    from kanban.models import Board, BoardMembership, Column, TaskLabel, Task, Comment
+    from kanban.models import Board, BoardMembership, Task
 
     # --- Board ---
     # Build a fresh board from the template's field values, leaving M2M until after save
@@ -165,150 +165,13 @@ def _duplicate_board(template_board, user):
     # for why (cross-tenant leak) and [[project_persona_membership_bleed]].
     sync_persona_memberships_to_owner(user)
 
-    # --- TaskLabels (board FK) ---
-    label_map = {}  # old label pk → new label instance
-    for label in template_board.labels.all():
-        new_label = TaskLabel(
-            name=label.name,
-            color=label.color,
-            board=new_board,
-            category=label.category,
-        )
-        new_label.save()
-        label_map[label.pk] = new_label
-
-    # --- Columns ---
-    from kanban.models import column_name_disables_aging
-    column_map = {}  # old column pk → new column instance
-    for col in template_board.columns.order_by('position'):
-        # Carry over the template's aging config; fall back to the name-based
-        # default so Done/Backlog columns stay disabled even if the template
-        # column predates the aging feature / wasn't backfilled.
-        aging_mode = col.aging_mode
-        if aging_mode == 'inherit' and column_name_disables_aging(col.name):
-            aging_mode = 'disabled'
-        new_col = Column(
-            name=col.name,
-            board=new_board,
-            position=col.position,
-            wip_limit=col.wip_limit,
-            aging_mode=aging_mode,
-            aging_warning_days=col.aging_warning_days,
-            aging_critical_days=col.aging_critical_days,
-        )
-        new_col.save()
-        column_map[col.pk] = new_col
-
-    # --- Tasks ---
-    task_map = {}  # old task pk → new task instance
-    task_template_dates = {}  # new task pk → template task updated_at
-    for task in (
-        Task.objects
-        .filter(column__board=template_board)
-        .select_related('column', 'assigned_to')
-        .order_by('column__position', 'position')
-    ):
-        new_col = column_map.get(task.column.pk)
-        if new_col is None:
-            continue
-
-        new_task = Task(
-            title=task.title,
-            description=task.description,
-            column=new_col,
-            position=task.position,
-            priority=task.priority,
-            progress=task.progress,
-            due_date=task.due_date,
-            start_date=task.start_date,
-            completed_at=task.completed_at,
-            phase=task.phase,
-            item_type=task.item_type,
-            milestone_status=task.milestone_status,
-            created_by=user,
-            # Keep original demo persona assignment (alex/sam/jordan)
-            assigned_to=task.assigned_to,
-            risk_level=task.risk_level,
-            risk_likelihood=task.risk_likelihood,
-            risk_impact=task.risk_impact,
-            complexity_score=task.complexity_score,
-            # Clear AI and personal operational data
-            ai_summary=None,
-            ai_summary_generated_at=None,
-            ai_risk_score=None,
-            ai_recommendations=None,
-        )
-        new_task.save()
-        # Preserve created_at (auto_now_add bypass) so the per-user copy keeps the
-        # template's real task age — analytics (cycle-time, backlog-age) depend on it.
-        Task.objects.filter(pk=new_task.pk).update(created_at=task.created_at)
-        task_map[task.pk] = new_task
-        task_template_dates[new_task.pk] = task.updated_at
-
-        # Re-assign labels via new label instances
-        for old_label in task.labels.all():
-            new_lab = label_map.get(old_label.pk)
-            if new_lab:
-                new_task.labels.add(new_lab)
-
-    # --- Comments (keep demo comments for realism) ---
-    for task in Task.objects.filter(column__board=template_board).select_related('column'):
-        new_task = task_map.get(task.pk)
-        if new_task is None:
-            continue
-        for comment in task.comments.order_by('created_at'):
-            Comment.objects.create(
-                task=new_task,
-                user=user,
-                content=comment.content,
-            )
-
-    # --- ChecklistItems ---
-    from kanban.models import ChecklistItem
-    for old_task in Task.objects.filter(column__board=template_board):
-        new_task = task_map.get(old_task.pk)
-        if new_task is None:
-            continue
-        for item in old_task.checklist_items.order_by('position'):
-            ChecklistItem.objects.create(
-                task=new_task,
-                title=item.title,
-                description=item.description,
-                is_completed=item.is_completed,
-                completed_at=item.completed_at,
-                position=item.position,
-                estimated_effort=item.estimated_effort,
-                priority=item.priority,
-                source=item.source,
-            )
-
-    # --- Task-to-Task Relationships (parent_task, dependencies, related, milestones) ---
-    for old_pk, new_task in task_map.items():
-        old_task = Task.objects.get(pk=old_pk)
-        updated = False
-
-        # Parent-child relationships (subtasks)
-        if old_task.parent_task_id and old_task.parent_task_id in task_map:
-            new_task.parent_task = task_map[old_task.parent_task_id]
-            updated = True
-
-        # Milestone positioning (position_after_task)
-        if old_task.position_after_task_id and old_task.position_after_task_id in task_map:
-            new_task.position_after_task = task_map[old_task.position_after_task_id]
-            updated = True
-
-        if updated:
-            new_task.save(update_fields=['parent_task', 'position_after_task'])
-
-        # Gantt chart dependencies (M2M)
-        for dep in old_task.dependencies.all():
-            if dep.pk in task_map:
-                new_task.dependencies.add(task_map[dep.pk])
-
-        # Related tasks (M2M)
-        for related in old_task.related_tasks.all():
-            if related.pk in task_map:
-                new_task.related_tasks.add(task_map[related.pk])
+    # --- Labels, columns, tasks, task links, comments, checklist items ---
+    # Replayed from the template's cached clone plan with one bulk insert per
+    # table (no per-row saves or Task signals) — see kanban/utils/board_clone.py.
+    from kanban.utils.board_clone import board_clone_plan, replay_board_clone_plan
+    _, _, task_map = replay_board_clone_plan(  # old task pk → new task instance
+        board_clone_plan(template_board), new_board, user,
+    )
 
     # --- Budget + TaskCost (for CPI calculation) ---
     try:
@@ -1292,7 +1155,7 @@ def _duplicate_board(template_board, user):
 
     # --- Messaging (ChatRoom + ChatMessage + TaskThreadComment) ---
     try:
-        from messaging.models import ChatRoom, ChatMessage, TaskThreadComment
+        from messaging.models import ChatRoom, ChatMessage, ChatReadState, TaskThreadComment
 
         chatroom_map = {}
         for cr in ChatRoom.objects.filter(board=template_board):
@@ -1311,6 +1174,7 @@ def _duplicate_board(template_board, user):
             # alongside them.
             new_cr.members.set(list(cr.members.all()) + [user])
 
+        message_map = {}
         for cm in ChatMessage.objects.filter(chat_room__board=template_board).order_by('created_at'):
             new_room = chatroom_map.get(cm.chat_room_id)
             if new_room:
@@ -1322,8 +1186,24 @@ def _duplicate_board(template_board, user):
                     read_at=cm.read_at,
                 )
                 ChatMessage.objects.filter(pk=new_cm.pk).update(created_at=cm.created_at)
-                new_cm.read_by.set(cm.read_by.all())
                 new_cm.mentioned_users.set(cm.mentioned_users.all())
+                message_map[cm.pk] = (cm.chat_room_id, new_cm.pk)
+
+        # Read watermarks: carry each one over to the clone of the newest
+        # template message it covered.
+        cloned_states = []
+        for rs in ChatReadState.objects.filter(chat_room__board=template_board):
+            covered = [
+                old_id for old_id, (room_id, _) in message_map.items()
+                if room_id == rs.chat_room_id and old_id <= rs.last_read_message_id
+            ]
+            if covered and rs.chat_room_id in chatroom_map:
+                cloned_states.append(ChatReadState(
+                    chat_room=chatroom_map[rs.chat_room_id],
+                    user_id=rs.user_id,
+                    last_read_message_id=message_map[max(covered)][1],
+                ))
+        ChatReadState.objects.bulk_create(cloned_states, ignore_conflicts=True)
 
         for ttc in TaskThreadComment.objects.filter(task__column__board=template_board):
             new_task = task_map.get(ttc.task_id)
@@ -1414,12 +1294,6 @@ def _duplicate_board(template_board, user):
     except Exception:
         pass
 
-    # --- Preserve template timestamps (bypass auto_now via .update()) ---
-    # Without this, all sandbox tasks get updated_at=now which causes the
-    # Completion Velocity chart to show a single spike on today's date.
-    for new_pk, template_updated_at in task_template_dates.items():
-        Task.objects.filter(pk=new_pk).update(updated_at=template_updated_at)
-
     # --- Requirements Analysis (categories, objectives, requirements) ---
     try:
         from requirements.models import RequirementCategory, ProjectObjective, Requirement
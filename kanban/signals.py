@@ -2,11 +2,13 @@
 Signal handlers for automatic workload and performance profile updates
 """
 from django.db.models.signals import post_save, pre_save
-from django.db.models import Q
+from django.db.models import F, Q
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from kanban.models import Task, TaskActivity
 from kanban.resource_leveling_models import UserPerformanceProfile, TaskAssignmentHistory
+from kanban.utils.bulk_import import board_imported
+from kanban.utils.side_effects import coalesce_side_effects, defer, side_effect
 
 # Phase 1a refactor: condition and action evaluation now lives in dedicated
 # registry modules. The dispatchers below delegate to them. Import side-effects
@@ -18,6 +20,8 @@ from kanban.automation_actions import _ActionNoOp, _ActionSkip  # re-exported
 
 # Custom-field change handlers — registered for their side effects.
 from kanban import custom_field_signals as _cfs  # noqa: F401
+# Rule-index invalidation receivers — registered for their side effects.
+from kanban import automation_index as _ai
 
 import threading
 from contextlib import contextmanager
@@ -44,11 +48,15 @@ def _in_automation():
 @contextmanager
 def _automation_guard():
     """Mark the current thread as 'inside automation' for the duration of the
-    block so nested model writes don't re-trigger automation receivers."""
+    block so nested model writes don't re-trigger automation receivers.
+
+    The block also coalesces deferred side effects: a rule that saves several
+    tasks (subtasks, dependents) recomputes each user's workload once."""
     previous = getattr(_automation_state, 'active', False)
     _automation_state.active = True
     try:
-        yield
+        with coalesce_side_effects():
+            yield
     finally:
         _automation_state.active = previous
 
@@ -112,11 +120,11 @@ def track_task_assignment_change(sender, instance, **kwargs):
     Store the old assignee in a temporary attribute for post_save processing
     """
     if instance.pk:  # Only for existing tasks (updates)
-        try:
-            old_task = Task.objects.get(pk=instance.pk)
+        old_task = instance.get_previous_state()
+        if old_task is not None:
             instance._old_assigned_to = old_task.assigned_to
             instance._assignment_changed = (old_task.assigned_to != instance.assigned_to)
-        except Task.DoesNotExist:
+        else:
             instance._old_assigned_to = None
             instance._assignment_changed = False
     else:  # New task
@@ -130,32 +138,26 @@ def track_priority_and_progress_change(sender, instance, **kwargs):
     Track priority and progress changes before task is saved so automation
     signals can fire on 'priority_changed' and 'task_completed' triggers.
     """
-    if instance.pk:
-        try:
-            old_task = Task.objects.get(pk=instance.pk)
-            instance._old_priority = old_task.priority
-            instance._priority_changed = (old_task.priority != instance.priority)
-            instance._old_progress = old_task.progress
-
-            # Also detect when a task is being moved to a Done/Complete column.
-            # auto_update_progress_for_done_column runs as a later pre_save signal
-            # and will set instance.progress = 100, but at this point instance.progress
-            # still holds the old value, so we must detect the column change here.
-            moving_to_done_column = (
-                instance.column is not None
-                and instance.column.is_done()
-                and old_task.progress < 100
-                and old_task.column_id != instance.column_id
-            )
-            instance._just_completed = (
-                (old_task.progress < 100 and instance.progress >= 100)
-                or moving_to_done_column
-            )
-        except Task.DoesNotExist:
-            instance._old_priority = None
-            instance._priority_changed = False
-            instance._old_progress = 0
-            instance._just_completed = False
+    old_task = instance.get_previous_state()
+    if old_task is not None:
+        instance._old_priority = old_task.priority
+        instance._priority_changed = (old_task.priority != instance.priority)
+        instance._old_progress = old_task.progress
+
+        # Also detect when a task is being moved to a Done/Complete column.
+        # auto_update_progress_for_done_column runs as a later pre_save signal
+        # and will set instance.progress = 100, but at this point instance.progress
+        # still holds the old value, so we must detect the column change here.
+        moving_to_done_column = (
+            instance.column is not None
+            and instance.column.is_done()
+            and old_task.progress < 100
+            and old_task.column_id != instance.column_id
+        )
+        instance._just_completed = (
+            (old_task.progress < 100 and instance.progress >= 100)
+            or moving_to_done_column
+        )
     else:
         instance._old_priority = None
         instance._priority_changed = False
@@ -172,12 +174,12 @@ def track_column_entry_time(sender, instance, **kwargs):
     """
     from django.utils import timezone
     if instance.pk:
-        try:
-            old_task = Task.objects.get(pk=instance.pk)
+        old_task = instance.get_previous_state()
+        if old_task is not None:
             instance._old_column_id = old_task.column_id
             if old_task.column_id != instance.column_id:
                 instance.column_entered_at = timezone.now()
-        except Task.DoesNotExist:
+        else:
             instance._old_column_id = None
             if not instance.column_entered_at:
                 instance.column_entered_at = timezone.now()
@@ -197,12 +199,8 @@ def track_field_changes(sender, instance, **kwargs):
 
     Phase 1a writes the snapshot; Phase 1b is the first consumer.
     """
-    if not instance.pk:
-        instance._field_changes = {}
-        return
-    try:
-        old = Task.objects.only(*TRACKED_FIELDS).get(pk=instance.pk)
-    except Task.DoesNotExist:
+    old = instance.get_previous_state()
+    if old is None:
         instance._field_changes = {}
         return
 
@@ -241,7 +239,8 @@ def _datetime_equal(a, b):
 def run_board_automations(sender, instance, created, **kwargs):
     """
     Fire active automation rules after a task is saved.
-    Queries both legacy BoardAutomation and new AutomationRule models.
+    Covers both legacy BoardAutomation and new AutomationRule models, read
+    through the cached per-board rule index (kanban/automation_index.py).
     """
     # Re-entrancy guard: a Task created/saved by another rule's action (e.g.
     # add_subtask) must not re-trigger automation rules.
@@ -252,36 +251,45 @@ def run_board_automations(sender, instance, created, **kwargs):
         from kanban.automation_models import BoardAutomation, AutomationRule, AutomationLog
         from kanban.models import TaskLabel
 
-        board = instance.column.board if instance.column_id else None
-        if not board:
+        if not instance.column_id:
             return
 
-        now = tz.now()
         old_column_id = getattr(instance, '_old_column_id', None)
         column_changed = (not created) and (old_column_id != instance.column_id)
         priority_changed = getattr(instance, '_priority_changed', False)
         just_completed   = getattr(instance, '_just_completed', False)
         assignment_changed = getattr(instance, '_assignment_changed', False)
 
+        # Only rules whose trigger this save could possibly satisfy are
+        # evaluated; when there are none, skip evaluation and the dedupe
+        # queries below entirely.
+        index = _ai.get_board_index(instance.column.board_id)
+        if not index:
+            return
+        legacy_rules, new_rules = index.candidates(_ai.save_events(
+            instance, created, column_changed, priority_changed,
+            just_completed, assignment_changed,
+        ))
+        if not legacy_rules and not new_rules:
+            return
+
+        board = instance.column.board
+        now = tz.now()
+
         # ── Fire legacy BoardAutomation rules ──
-        legacy_rules = BoardAutomation.objects.filter(board=board, is_active=True)
         for rule in legacy_rules:
             fired = _check_trigger(rule, instance, created, column_changed,
                                    priority_changed, just_completed, assignment_changed, now)
             if fired:
                 with _automation_guard():
                     _apply_automation_action(instance, rule)
-                rule.run_count += 1
-                rule.last_run_at = now
+                # F() — the indexed rule object is shared and its run_count stale.
                 BoardAutomation.objects.filter(pk=rule.pk).update(
-                    run_count=rule.run_count,
-                    last_run_at=rule.last_run_at,
+                    run_count=F('run_count') + 1,
+                    last_run_at=now,
                 )
 
         # ── Fire new AutomationRule rules ──
-        new_rules = AutomationRule.objects.filter(board=board, is_active=True).exclude(
-            trigger_type__startswith='scheduled_',
-        )
         # Per-request dedupe: track which rules have already fired for this
         # in-memory Task instance so a second .save() in the same request (e.g.,
         # via update_task_prediction, refresh_from_db + save) does not re-fire
@@ -400,7 +408,7 @@ def run_board_automations(sender, instance, created, **kwargs):
                     outcome = 'failed'
 
             AutomationRule.objects.filter(pk=rule.pk).update(
-                run_count=rule.run_count + 1,
+                run_count=F('run_count') + 1,
                 last_run_at=now,
                 last_execution_result=outcome,
             )
@@ -1237,10 +1245,7 @@ def update_workload_on_assignment_change(sender, instance, created, **kwargs):
     
     # Update old assignee's workload (if they had this task)
     if old_assignee and old_assignee != new_assignee:
-        profile, _ = UserPerformanceProfile.objects.get_or_create(
-            user=old_assignee
-        )
-        profile.update_current_workload()
+        defer('performance_workload', old_assignee.pk)
         
         # Create assignment history record if not already created by AI suggestion
         if not hasattr(instance, '_ai_suggestion_accepted'):
@@ -1254,10 +1259,7 @@ def update_workload_on_assignment_change(sender, instance, created, **kwargs):
     
     # Update new assignee's workload (if task now has an assignee)
     if new_assignee:
-        profile, _ = UserPerformanceProfile.objects.get_or_create(
-            user=new_assignee
-        )
-        profile.update_current_workload()
+        defer('performance_workload', new_assignee.pk)
         
         # Create assignment history for new tasks with assignees
         if created and new_assignee:
@@ -1322,31 +1324,45 @@ def _invalidate_related_suggestions(task, old_assignee, new_assignee):
         status='pending'
     ).update(status='expired')
     
-    # Expire suggestions recommending the new assignee if they're now overloaded
+    # The per-user checks read utilization, so they are deferred behind the
+    # 'performance_workload' refresh queued by the caller.
     if new_assignee:
-        profile = UserPerformanceProfile.objects.filter(
-            user=new_assignee
-        ).first()
-        
-        if profile and profile.utilization_percentage > 85:
-            # This user is now overloaded, expire all pending suggestions recommending them
-            ResourceLevelingSuggestion.objects.filter(
-                suggested_assignee=new_assignee,
-                status='pending'
-            ).update(status='expired')
-    
-    # Also check if old assignee is now underutilized and could take more work
+        defer('expire_suggestions_for_overloaded', new_assignee.pk)
     if old_assignee:
-        old_profile = UserPerformanceProfile.objects.filter(
-            user=old_assignee
-        ).first()
-        
-        if old_profile and old_profile.utilization_percentage < 60:
-            # Old assignee now has capacity - expire suggestions moving work AWAY from them
-            ResourceLevelingSuggestion.objects.filter(
-                current_assignee=old_assignee,
-                status='pending'
-            ).update(status='expired')
+        defer('expire_suggestions_from_underloaded', old_assignee.pk)
+
+
+@side_effect('performance_workload')
+def _refresh_performance_workload(user_id):
+    """Recompute UserPerformanceProfile workload for one user."""
+    profile, _ = UserPerformanceProfile.objects.get_or_create(user_id=user_id)
+    profile.update_current_workload()
+
+
+@side_effect('expire_suggestions_for_overloaded')
+def _expire_suggestions_for_overloaded(user_id):
+    """Expire pending suggestions recommending a user who is now overloaded."""
+    from kanban.resource_leveling_models import ResourceLevelingSuggestion
+
+    profile = UserPerformanceProfile.objects.filter(user_id=user_id).first()
+    if profile and profile.utilization_percentage > 85:
+        ResourceLevelingSuggestion.objects.filter(
+            suggested_assignee_id=user_id,
+            status='pending'
+        ).update(status='expired')
+
+
+@side_effect('expire_suggestions_from_underloaded')
+def _expire_suggestions_from_underloaded(user_id):
+    """Expire pending suggestions moving work away from a user who now has capacity."""
+    from kanban.resource_leveling_models import ResourceLevelingSuggestion
+
+    profile = UserPerformanceProfile.objects.filter(user_id=user_id).first()
+    if profile and profile.utilization_percentage < 60:
+        ResourceLevelingSuggestion.objects.filter(
+            current_assignee_id=user_id,
+            status='pending'
+        ).update(status='expired')
 
 
 @receiver(post_save, sender=Task)
@@ -1359,13 +1375,9 @@ def update_profile_on_task_completion(sender, instance, **kwargs):
         if not instance.column or not instance.column.board:
             return
         
-        # Update the assignee's performance profile
-        profile, _ = UserPerformanceProfile.objects.get_or_create(
-            user=instance.assigned_to
-        )
-        
-        # Update metrics (completion rate, velocity, etc.)
-        profile.update_metrics()
+        # Update metrics (completion rate, velocity, etc.) on the assignee's
+        # performance profile
+        defer('performance_metrics', instance.assigned_to_id)
         
         # Update assignment history with actual completion data
         latest_assignment = TaskAssignmentHistory.objects.filter(
@@ -1377,6 +1389,13 @@ def update_profile_on_task_completion(sender, instance, **kwargs):
             latest_assignment.calculate_actual_metrics()
 
 
+@side_effect('performance_metrics')
+def _refresh_performance_metrics(user_id):
+    """Recompute completion rate, velocity etc. for one user."""
+    profile, _ = UserPerformanceProfile.objects.get_or_create(user_id=user_id)
+    profile.update_metrics()
+
+
 # ---------------------------------------------------------------------------
 # AI summary debounce trigger
 # ---------------------------------------------------------------------------
@@ -1489,7 +1508,6 @@ def trigger_branch_recalculation_on_task_completion(sender, instance, created, *
         return
     
     try:
-        from kanban.tasks.shadow_branch_tasks import recalculate_branches_for_board
         board_id = instance.column.board_id
         task_title = instance.title or 'Unknown task'
 
@@ -1502,10 +1520,11 @@ def trigger_branch_recalculation_on_task_completion(sender, instance, created, *
         # apparent two-stage updates (cosmetic +1, then real recalc).
         # Shortened countdown from 5s → 2s to keep the perceived latency
         # close to the old nudge-then-recalc UX without polluting history.
-        recalculate_branches_for_board.apply_async(
-            args=[board_id],
-            kwargs={'trigger_event': f'Task "{task_title}" completed'},
-            countdown=2,
+        # Keyed on the board alone: a bulk completion queues one recalc,
+        # labelled with the first completed task.
+        defer(
+            'branch_recalculation', board_id, f'Task "{task_title}" completed',
+            key=(board_id,),
         )
     except Exception as e:
         import logging
@@ -1516,6 +1535,16 @@ def trigger_branch_recalculation_on_task_completion(sender, instance, created, *
         )
 
 
+@side_effect('branch_recalculation')
+def _queue_branch_recalculation(board_id, trigger_event):
+    from kanban.tasks.shadow_branch_tasks import recalculate_branches_for_board
+    recalculate_branches_for_board.apply_async(
+        args=[board_id],
+        kwargs={'trigger_event': trigger_event},
+        countdown=2,
+    )
+
+
 @receiver(pre_save, sender='kanban.Board')
 def trigger_branch_recalculation_on_deadline_change(sender, instance, **kwargs):
     """
@@ -1663,6 +1692,32 @@ def record_project_signal_on_task_save(sender, instance, created, **kwargs):
         )
 
 
+@receiver(board_imported)
+def record_project_signal_on_board_import(sender, board, user, stats, **kwargs):
+    """
+    Bulk imports skip the per-task 'task_added' signals above; record one
+    signal for the whole batch instead.
+    """
+    if not stats.get('tasks'):
+        return
+    try:
+        from kanban.project_confidence_service import ProjectConfidenceService
+        ProjectConfidenceService.record_signal(
+            board=board,
+            signal_type='task_added',
+            strength=-0.05,
+            description=f'{stats["tasks"]} tasks imported to the board.',
+            user=user,
+            ai_generated=True,
+        )
+    except Exception:
+        import logging
+        logging.getLogger(__name__).warning(
+            'record_project_signal_on_board_import: unexpected error',
+            exc_info=True,
+        )
+
+
 # ---------------------------------------------------------------------------
 # Auto-assign color to new columns based on common naming conventions
 # ---------------------------------------------------------------------------
@@ -1786,46 +1841,159 @@ def create_board_preset_for_board(sender, instance, created, **kwargs):
 # ---------------------------------------------------------------------------
 # Workload tracking — keep UserProfile.current_workload_hours up to date
 # ---------------------------------------------------------------------------
+# Backed by per-(user, board) counters (kanban/utils/workload_counters.py): a
+# save only touches them when the assignee or the column's done-state changes.
+
+@side_effect('user_workload')
+def _recalc_user_workload_by_id(user_id):
+    """Deferred-effect entry point for _recalc_user_workload."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        _recalc_user_workload(user)
+
 
 def _recalc_user_workload(user):
     """Recalculate and persist current_workload_hours for a user's profile."""
-    from django.db.models import Q as _Q
     from kanban.utils.demo_protection import get_user_boards
+    from kanban.utils.workload_counters import WORKLOAD_HOURS_PER_TASK, active_task_count
     try:
         profile = user.profile
     except Exception:
         return
-    active_count = user.assigned_tasks.filter(
-        column__board__in=get_user_boards(user)
-    ).exclude(
-        _Q(column__name__icontains='done') | _Q(column__name__icontains='complete')
-    ).count()
-    profile.current_workload_hours = active_count * 8
+    active_count = active_task_count(user, get_user_boards(user))
+    profile.current_workload_hours = active_count * WORKLOAD_HOURS_PER_TASK
     profile.save(update_fields=['current_workload_hours'])
 
 
+@receiver(pre_save, sender=Task)
+def track_workload_key(sender, instance, **kwargs):
+    """Remember which workload counter the task counted towards before this save."""
+    from kanban.utils.workload_counters import workload_key
+    old = instance.get_previous_state()
+    instance._old_workload_key = (
+        workload_key(old.assigned_to_id, old.column) if old is not None else None
+    )
+
+
 @receiver(post_save, sender=Task)
 def update_assignee_workload(sender, instance, created, **kwargs):
     """Keep UserProfile.current_workload_hours current when tasks are assigned or column changes."""
-    from django.contrib.auth import get_user_model as _get_user_model
-    AuthUser = _get_user_model()
-
-    if instance.assigned_to_id:
-        _recalc_user_workload(instance.assigned_to)
-
-    old_id = getattr(instance, '_old_assigned_to_id', None)
-    if old_id and old_id != instance.assigned_to_id:
-        try:
-            _recalc_user_workload(AuthUser.objects.get(pk=old_id))
-        except AuthUser.DoesNotExist:
-            pass
+    from kanban.utils import workload_counters
+    new_key = workload_counters.workload_key(
+        instance.assigned_to_id, instance.column if instance.column_id else None,
+    )
+    for user_id in workload_counters.move(getattr(instance, '_old_workload_key', None), new_key):
+        defer('user_workload', user_id)
 
 
 @receiver(post_delete, sender=Task)
 def update_assignee_workload_on_delete(sender, instance, **kwargs):
     """Recalculate workload when a task is deleted."""
-    if instance.assigned_to:
-        _recalc_user_workload(instance.assigned_to)
+    from kanban.utils import workload_counters
+    if not instance.assigned_to_id:
+        return
+    try:
+        column = instance.column
+    except Exception:
+        return  # Column already gone (board cascade) — its counters go with it.
+    for user_id in workload_counters.move(
+        workload_counters.workload_key(instance.assigned_to_id, column), None,
+    ):
+        defer('user_workload', user_id)
+
+
+@receiver(pre_save, sender='kanban.Column')
+def track_column_workload_state(sender, instance, update_fields=None, **kwargs):
+    """Note whether a renamed column stops or starts counting as open work."""
+    instance._workload_state_changed = False
+    if not instance.pk or (update_fields is not None and 'name' not in update_fields):
+        return
+    from kanban.utils.workload_counters import is_workload_column
+    old_name = sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    if old_name is None:
+        return
+    instance._workload_state_changed = (
+        is_workload_column(sender(name=old_name)) != is_workload_column(instance)
+    )
+
+
+@receiver(post_save, sender='kanban.Column')
+def update_workload_on_column_rename(sender, instance, created, **kwargs):
+    """Move every assigned task in a column renamed into/out of "Done"/"Complete"."""
+    if not getattr(instance, '_workload_state_changed', False):
+        return
+    from django.db.models import Count as _Count
+    from kanban.utils.workload_counters import bump, is_workload_column
+    sign = 1 if is_workload_column(instance) else -1
+    per_user = (
+        Task.objects.filter(column=instance, assigned_to__isnull=False)
+        .values('assigned_to_id').annotate(n=_Count('id'))
+    )
+    for row in per_user:
+        bump(row['assigned_to_id'], instance.board_id, sign * row['n'])
+        defer('user_workload', row['assigned_to_id'])
+
+
+# ---------------------------------------------------------------------------
+# Board analytics facts — flag BoardDailyMetrics rows stale on change
+# ---------------------------------------------------------------------------
+# One cheap UPDATE per affected board; the next analytics read (or the nightly
+# kanban.refresh_board_metrics job) recomputes the row. See
+# kanban/utils/board_metrics.py.
+
+@side_effect('board_metrics_stale')
+def _mark_board_metrics_stale(board_id):
+    from kanban.utils.board_metrics import mark_board_metrics_stale
+    mark_board_metrics_stale(board_id)
+
+
+def _task_board_id(task):
+    try:
+        return task.column.board_id if task.column_id else None
+    except Exception:
+        return None  # Column already gone (board cascade).
+
+
+@receiver(post_save, sender=Task)
+def mark_board_metrics_on_task_save(sender, instance, created, **kwargs):
+    board_id = _task_board_id(instance)
+    if board_id:
+        defer('board_metrics_stale', board_id)
+    # A task moved to another board changes that board's numbers too. The
+    # pre_save receivers above have already loaded the previous row.
+    old = None if created else instance.__dict__.get('_previous_state')
+    old_board_id = _task_board_id(old) if old is not None else None
+    if old_board_id and old_board_id != board_id:
+        defer('board_metrics_stale', old_board_id)
+
+
+@receiver(post_delete, sender=Task)
+def mark_board_metrics_on_task_delete(sender, instance, **kwargs):
+    board_id = _task_board_id(instance)
+    if board_id:
+        defer('board_metrics_stale', board_id)
+
+
+@receiver(post_save, sender='kanban.Column')
+@receiver(post_delete, sender='kanban.Column')
+def mark_board_metrics_on_column_change(sender, instance, **kwargs):
+    """Column renames, moves and deletes change the per-column breakdowns."""
+    if instance.board_id:
+        defer('board_metrics_stale', instance.board_id)
+
+
+@receiver(post_save, sender='kanban.TaskCost')
+@receiver(post_delete, sender='kanban.TaskCost')
+@receiver(post_save, sender='kanban.TimeEntry')
+@receiver(post_delete, sender='kanban.TimeEntry')
+def mark_board_metrics_on_cost_change(sender, instance, **kwargs):
+    """Costs and logged hours feed the board's spend figures."""
+    try:
+        board_id = _task_board_id(instance.task)
+    except Exception:
+        return
+    if board_id:
+        defer('board_metrics_stale', board_id)
 
 
 # ---------------------------------------------------------------------------
@@ -1837,14 +2005,10 @@ def track_due_date_change(sender, instance, **kwargs):
     """
     Store old due_date and assigned_to_id so post_save signals can react to changes.
     """
-    if instance.pk:
-        try:
-            old = Task.objects.get(pk=instance.pk)
-            instance._old_due_date = old.due_date
-            instance._old_assigned_to_id = old.assigned_to_id
-        except Task.DoesNotExist:
-            instance._old_due_date = None
-            instance._old_assigned_to_id = None
+    old = instance.get_previous_state()
+    if old is not None:
+        instance._old_due_date = old.due_date
+        instance._old_assigned_to_id = old.assigned_to_id
     else:
         instance._old_due_date = None
         instance._old_assigned_to_id = None
@@ -1889,37 +2053,10 @@ def sync_due_date_to_google_calendar(sender, instance, created, **kwargs):
     )
 
     try:
-        from accounts.models import GoogleCalendarToken
-        has_current_token = (
-            instance.assigned_to_id and
-            GoogleCalendarToken.objects.filter(
-                user_id=instance.assigned_to_id, sync_enabled=True
-            ).exists()
+        defer(
+            'google_calendar_sync', instance.pk, instance.assigned_to_id,
+            old_assignee_id_for_cleanup, old_event_id,
         )
-        if not has_current_token and not old_assignee_id_for_cleanup:
-            return
-
-        from accounts.tasks import sync_task_to_calendar
-        try:
-            # Dispatch asynchronously when a Celery worker is running.
-            sync_task_to_calendar.delay(
-                instance.pk,
-                old_assignee_id=old_assignee_id_for_cleanup,
-                old_event_id=old_event_id,
-            )
-        except Exception as celery_exc:
-            # Celery / Redis not reachable — run synchronously so the calendar
-            # event is created immediately (Daphne-only / no-worker setup).
-            import logging
-            logging.getLogger(__name__).info(
-                f"sync_due_date_to_google_calendar: Celery unavailable "
-                f"({celery_exc}), running synchronously for task {instance.pk}."
-            )
-            sync_task_to_calendar(
-                instance.pk,
-                old_assignee_id=old_assignee_id_for_cleanup,
-                old_event_id=old_event_id,
-            )
     except Exception as exc:
         import logging
         logging.getLogger(__name__).warning(
@@ -1927,6 +2064,42 @@ def sync_due_date_to_google_calendar(sender, instance, created, **kwargs):
         )
 
 
+@side_effect('google_calendar_sync')
+def _sync_task_to_google_calendar(task_id, assigned_to_id, old_assignee_id, old_event_id):
+    """Queue (or run) the calendar sync for one task if anyone has sync enabled."""
+    from accounts.models import GoogleCalendarToken
+    has_current_token = (
+        assigned_to_id and
+        GoogleCalendarToken.objects.filter(
+            user_id=assigned_to_id, sync_enabled=True
+        ).exists()
+    )
+    if not has_current_token and not old_assignee_id:
+        return
+
+    from accounts.tasks import sync_task_to_calendar
+    try:
+        # Dispatch asynchronously when a Celery worker is running.
+        sync_task_to_calendar.delay(
+            task_id,
+            old_assignee_id=old_assignee_id,
+            old_event_id=old_event_id,
+        )
+    except Exception as celery_exc:
+        # Celery / Redis not reachable — run synchronously so the calendar
+        # event is created immediately (Daphne-only / no-worker setup).
+        import logging
+        logging.getLogger(__name__).info(
+            f"sync_due_date_to_google_calendar: Celery unavailable "
+            f"({celery_exc}), running synchronously for task {task_id}."
+        )
+        sync_task_to_calendar(
+            task_id,
+            old_assignee_id=old_assignee_id,
+            old_event_id=old_event_id,
+        )
+
+
 @receiver(post_delete, sender=Task)
 def delete_google_calendar_event_on_task_delete(sender, instance, **kwargs):
     """
@@ -79,10 +79,26 @@ from kanban.tasks.ai_streaming_tasks import (
     send_ai_message_task,
 )
 
+from kanban.tasks.ai_artefact_tasks import (
+    refresh_board_artefact_task,
+)
+
 from kanban.tasks.migration_tasks import (
     run_source_migration,
 )
 
+from kanban.tasks.side_effect_tasks import (
+    run_side_effect_batch,
+)
+
+from kanban.tasks.workload_tasks import (
+    reconcile_workload_counters_task,
+)
+
+from kanban.tasks.board_metrics_tasks import (
+    refresh_board_metrics_task,
+)
+
 __all__ = [
     # Conflict tasks
     'detect_conflicts_task',
@@ -132,4 +148,12 @@ __all__ = [
     'predict_deadline_task',
     'analyze_workflow_task',
     'send_ai_message_task',
+    # Stale-while-revalidate AI artefacts
+    'refresh_board_artefact_task',
+    # Coalesced Task side effects
+    'run_side_effect_batch',
+    # Workload counter reconciliation
+    'reconcile_workload_counters_task',
+    # Board analytics fact table
+    'refresh_board_metrics_task',
 ]
@@ -0,0 +1,30 @@
+"""
+Background refresh of stale AI board artefacts.
+
+Queued by kanban/utils/ai_artefacts.py when a page served a stale board
+summary, analytics summary or narrative; routed to the ``ai_tasks`` queue.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name='kanban.ai_artefacts.refresh_board_artefact',
+    queue='ai_tasks',
+    time_limit=150,
+    soft_time_limit=130,
+)
+def refresh_board_artefact_task(self, board_id, name):
+    """Regenerate one AI artefact for a board."""
+    from kanban.utils.ai_artefacts import refresh_board_artefact
+
+    try:
+        value = refresh_board_artefact(board_id, name)
+    except Exception as exc:
+        logger.error(f"Refreshing {name} for board {board_id} failed: {exc}")
+        return {'board_id': board_id, 'artefact': name, 'refreshed': False}
+    return {'board_id': board_id, 'artefact': name, 'refreshed': value is not None}
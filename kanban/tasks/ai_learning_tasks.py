@@ -224,6 +224,7 @@ def _train_board_priority_model(board):
     """
     from kanban.priority_models import PriorityDecision, PriorityModel
     import pickle
+    from ai_assistant.utils.priority_service import invalidate_priority_models
     
     try:
         from sklearn.ensemble import RandomForestClassifier
@@ -325,6 +326,8 @@ def _train_board_priority_model(board):
         confusion_matrix=cm,
         is_active=True,
     )
+    # Free this process's estimators for the superseded versions
+    invalidate_priority_models(board.id)
     
     logger.info(
         f"Trained priority model v{next_version} for {board.name}: "
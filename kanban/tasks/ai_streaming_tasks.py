@@ -7,6 +7,10 @@ Each task:
   3. Sends the final result (or error) over the WebSocket
   4. Tracks AI usage via track_ai_request()
 
+The AI chat task additionally streams the answer text itself: AIRouter.stream()
+deltas are batched by _DeltaFramer into 'ai_delta' frames, and the assembled
+message is still saved and sent as the final 'ai_result'.
+
 Usage from a Django view:
   result = run_premortem_task.delay(board_id, user_id)
   return JsonResponse({'task_id': result.id, 'status': 'queued'})
@@ -53,6 +57,66 @@ def _send_result(task_id, data):
         logger.warning('Failed to send AI result for task %s: %s', task_id, exc)
 
 
+def _send_delta(task_id, text, seq):
+    """Send a batch of streamed answer text to the AI task WebSocket group."""
+    try:
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f'ai_task_{task_id}',
+            {
+                'type': 'ai_delta',
+                'text': text,
+                'seq': seq,
+            },
+        )
+    except Exception as exc:
+        logger.warning('Failed to send AI delta for task %s: %s', task_id, exc)
+
+
+class _DeltaFramer:
+    """
+    Buffer streamed deltas and forward them as few, small frames.
+
+    A frame is sent once AI_STREAM_FRAME_CHARS characters are pending or
+    AI_STREAM_FRAME_SECONDS have passed since the last frame; flush() sends
+    the remainder. Frames carry an increasing ``seq`` so the client can
+    detect drops.
+    """
+
+    def __init__(self, task_id, max_chars=None, max_interval=None, clock=time.monotonic):
+        from django.conf import settings
+
+        self.task_id = task_id
+        self.max_chars = max_chars or getattr(settings, 'AI_STREAM_FRAME_CHARS', 48)
+        self.max_interval = (
+            max_interval if max_interval is not None
+            else getattr(settings, 'AI_STREAM_FRAME_SECONDS', 0.1)
+        )
+        self.clock = clock
+        self.seq = 0
+        self._pending = []
+        self._pending_chars = 0
+        self._last_sent = clock()
+
+    def __call__(self, text):
+        if not text:
+            return
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if (self._pending_chars >= self.max_chars
+                or self.clock() - self._last_sent >= self.max_interval):
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        _send_delta(self.task_id, ''.join(self._pending), self.seq)
+        self.seq += 1
+        self._pending = []
+        self._pending_chars = 0
+        self._last_sent = self.clock()
+
+
 def _send_error(task_id, message):
     """Send an error message to the AI task WebSocket group."""
     try:
@@ -298,6 +362,9 @@ def summarize_board_analytics_task(self, board_id, user_id):
             _send_error(task_id, 'Failed to generate AI summary. Please try again.')
             return {'error': 'Failed to generate analytics summary'}
 
+        from kanban.utils.ai_artefacts import store_board_artefact
+        store_board_artefact(board, 'analytics_summary', summary)
+
         _send_status(task_id, 'Summary complete!', 100)
 
         response_time_ms = int((time.time() - start_time) * 1000)
@@ -609,11 +676,14 @@ def send_ai_message_task(self, message_text, session_id, user_id, board_id=None,
             user=user, board=board, session_id=session.id,
             is_demo_mode=is_demo_mode,
         )
+        framer = _DeltaFramer(task_id)
         response = chatbot.get_response(
             message_text,
             use_cache=not refresh_data,
             file_context=file_context,
+            on_delta=framer,
         )
+        framer.flush()
 
         _send_status(task_id, 'Saving response…', 85)
 
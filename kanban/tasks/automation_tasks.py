@@ -8,10 +8,13 @@ from celery import shared_task
 from django.utils import timezone
 import logging
 
+from kanban.utils.side_effects import coalesce_side_effects
+
 logger = logging.getLogger(__name__)
 
 
 @shared_task(name='kanban.run_due_date_approaching_automations')
+@coalesce_side_effects()
 def run_due_date_approaching_automations():
     """
     Checks all active 'due_date_approaching' AutomationRule records and fires
@@ -113,6 +116,7 @@ def run_due_date_approaching_automations():
 
 
 @shared_task(name='kanban.run_overdue_task_automations')
+@coalesce_side_effects()
 def run_overdue_task_automations():
     """
     Checks all active 'task_overdue' AutomationRule records and fires actions
@@ -209,6 +213,7 @@ def run_overdue_task_automations():
 # ---------------------------------------------------------------------------
 
 @shared_task(name='kanban.tasks.automation_tasks.run_scheduled_automation')
+@coalesce_side_effects()
 def run_scheduled_automation(scheduled_automation_id):
     """
     Execute a ScheduledAutomation when its Celery Beat schedule fires.
@@ -406,6 +411,7 @@ def _notify_automation_disabled(sa):
 # ---------------------------------------------------------------------------
 
 @shared_task(name='kanban.tasks.automation_tasks.run_automation_rule')
+@coalesce_side_effects()
 def run_automation_rule(rule_id):
     """
     Execute an AutomationRule when its Celery Beat schedule fires.
@@ -555,6 +561,7 @@ def _notify_rule_disabled(rule):
 # ─── Phase 1b — new periodic tasks ───────────────────────────────────────────
 
 
+@coalesce_side_effects()
 def _run_scheduled_task_scan(trigger_type, task_queryset_for_rule_fn):
     """Shared driver for periodic scans modelled on run_overdue_task_automations.
 
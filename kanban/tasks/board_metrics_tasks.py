@@ -0,0 +1,22 @@
+"""
+Celery task that rolls the BoardDailyMetrics fact table over to a new day.
+See kanban/utils/board_metrics.py.
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='kanban.refresh_board_metrics')
+def refresh_board_metrics_task():
+    """
+    Nightly task: write today's BoardDailyMetrics row for every active board
+    so date-based counts (overdue, rolling 7/30-day totals) roll over and
+    writes that bypassed the Task signals are picked up.
+    """
+    from kanban.utils.board_metrics import refresh_all_board_metrics
+
+    refreshed = refresh_all_board_metrics()
+    logger.info(f"refresh_board_metrics: {refreshed} board(s) refreshed")
+    return {'boards_refreshed': refreshed}
@@ -207,19 +207,21 @@ def _format_ai_recommendation(ai_result):
     return '\n'.join(parts).strip()
 
 
-def compute_baseline_velocity(board):
+def compute_baseline_velocity(board, baseline=None):
     """
     Snapshot the board's current tasks/week velocity at branch-creation time.
 
     Uses the same logic as WhatIfEngine._capture_baseline so the velocity
-    health comparison stays self-consistent.
+    health comparison stays self-consistent.  Pass an already-captured
+    ``baseline`` to avoid reading the board again.
 
     Returns:
         float (tasks/week) or 0.0 if no velocity data available yet.
     """
     from kanban.utils.whatif_engine import WhatIfEngine
     try:
-        baseline = WhatIfEngine(board)._capture_baseline()
+        if baseline is None:
+            baseline = WhatIfEngine(board)._capture_baseline()
         raw = float(baseline.get('velocity_per_week') or 0.0)
         # Floor the baseline when the engine reports a real but tiny value
         # so velocity_health = actual / baseline can't explode to 20x-50x.
@@ -458,6 +460,17 @@ def run_branch_recalc_sync(board_id, trigger_event='Manual recalculation',
     # against the velocity captured at branch creation.
     actual_7d_velocity = compute_actual_7d_velocity(board)
 
+    # The board baseline is captured once and every branch's scenario is
+    # simulated in one batch (one Monte Carlo pass for all branches) instead
+    # of re-reading the board per branch.
+    engine = WhatIfEngine(board)
+    try:
+        board_baseline = engine._capture_baseline()
+    except Exception as baseline_err:
+        logger.error(f'Baseline capture failed for board {board_id}: {baseline_err}', exc_info=True)
+        board_baseline = None
+
+    branch_params = []
     for branch in active_branches:
         try:
             params = extract_branch_params(branch)
@@ -468,7 +481,8 @@ def run_branch_recalc_sync(board_id, trigger_event='Manual recalculation',
             # have something to compare against, and treat this run as neutral.
             if not branch.baseline_velocity_per_week:
                 lazy_baseline = (
-                    compute_baseline_velocity(board) or actual_7d_velocity or 0.0
+                    compute_baseline_velocity(board, baseline=board_baseline)
+                    or actual_7d_velocity or 0.0
                 )
                 if lazy_baseline > 0:
                     lazy_baseline = max(lazy_baseline, MIN_BASELINE_VELOCITY)
@@ -481,10 +495,20 @@ def run_branch_recalc_sync(board_id, trigger_event='Manual recalculation',
                 )
             else:
                 params['velocity_health'] = 1.0
+            branch_params.append((branch, params))
+        except Exception as branch_err:
+            logger.error(f'Error preparing branch {branch.id} for recalculation: {branch_err}', exc_info=True)
 
-            engine = WhatIfEngine(board)
-            results = engine.simulate(params)
+    try:
+        batch_results = engine.simulate_many(
+            [params for _branch, params in branch_params], baseline=board_baseline,
+        )
+    except Exception as sim_err:
+        logger.error(f'Batch simulation failed for board {board_id}: {sim_err}', exc_info=True)
+        batch_results = [None] * len(branch_params)
 
+    for (branch, params), results in zip(branch_params, batch_results):
+        try:
             if not results:
                 logger.warning(f'Simulate returned empty results for branch {branch.id}')
                 continue
@@ -0,0 +1,19 @@
+"""
+Celery task that runs a coalesced batch of Task post-save side effects.
+See kanban/utils/side_effects.py.
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='kanban.run_side_effect_batch')
+def run_side_effect_batch(batch):
+    """Run ``[[name, args], ...]`` collected by coalesce_side_effects()."""
+    # The effects are registered when kanban.signals is imported (app ready).
+    from kanban.utils.side_effects import run_batch
+
+    done = run_batch(batch)
+    logger.info(f"run_side_effect_batch: {done}/{len(batch)} side effects ran")
+    return {'ran': done, 'total': len(batch)}
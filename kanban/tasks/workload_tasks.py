@@ -0,0 +1,30 @@
+"""
+Celery task that repairs drift in the incremental workload counters.
+See kanban/utils/workload_counters.py.
+"""
+from celery import shared_task
+from django.contrib.auth.models import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='kanban.reconcile_workload_counters')
+def reconcile_workload_counters_task():
+    """
+    Periodic task: recount open tasks per (user, board), fix any counter that
+    drifted (queryset .update()/bulk_create writes bypass the Task signals)
+    and refresh current_workload_hours for the affected users.
+    """
+    from kanban.signals import _recalc_user_workload
+    from kanban.utils.workload_counters import reconcile_workload_counters
+
+    drifted = reconcile_workload_counters()
+    for user in User.objects.filter(pk__in=drifted).select_related('profile'):
+        try:
+            _recalc_user_workload(user)
+        except Exception as exc:
+            logger.warning(f"reconcile_workload_counters: could not refresh user {user.pk}: {exc}")
+
+    logger.info(f"reconcile_workload_counters: {len(drifted)} user(s) repaired")
+    return {'users_repaired': len(drifted)}
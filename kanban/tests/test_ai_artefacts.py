@@ -0,0 +1,150 @@
+"""
+Stale-while-revalidate AI board artefacts (kanban/utils/ai_artefacts.py).
+
+A stale value is served immediately with ``stale=True`` and one background
+refresh is queued per board and artefact within the throttle window; fresh
+values queue nothing. Producers are replaced with fakes so no LLM (or
+ai_utils import) is involved.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from kanban.utils import ai_artefacts
+
+
+@override_settings(AI_SWR_REFRESH_THROTTLE=300)
+class AIArtefactTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Board
+
+        for alias in ('default', 'ai_cache'):
+            caches[alias].clear()
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+
+        self.user = User.objects.create_user(username='swr', password='pw')
+        self.org = Organization.objects.create(name='SWR Org', created_by=self.user)
+        self.board = Board.objects.create(
+            name='SWR Board', organization=self.org, created_by=self.user,
+        )
+
+        self.produced = []
+
+        def produce(board):
+            self.produced.append(board.pk)
+            board.ai_summary = 'fresh summary'
+            board.ai_summary_generated_at = timezone.now()
+            board.save(update_fields=['ai_summary', 'ai_summary_generated_at'])
+            return board.ai_summary
+
+        original = ai_artefacts.ARTEFACTS['board_summary']
+        self.addCleanup(ai_artefacts.ARTEFACTS.__setitem__, 'board_summary', original)
+        ai_artefacts.register('board_summary', original.load, produce, fresh_for=3600)
+
+        queue_patcher = patch(
+            'kanban.tasks.ai_artefact_tasks.refresh_board_artefact_task.apply_async'
+        )
+        self.apply_async = queue_patcher.start()
+        self.addCleanup(queue_patcher.stop)
+
+    def _set_summary(self, age):
+        self.board.ai_summary = 'old summary'
+        self.board.ai_summary_generated_at = timezone.now() - age
+        self.board.save(update_fields=['ai_summary', 'ai_summary_generated_at'])
+
+    def test_stale_value_served_and_one_refresh_queued(self):
+        self._set_summary(timedelta(hours=2))
+
+        first = ai_artefacts.get_board_artefact(self.board, 'board_summary')
+        self.assertEqual(first['value'], 'old summary')
+        self.assertTrue(first['stale'])
+        self.assertTrue(first['refreshing'])
+
+        second = ai_artefacts.get_board_artefact(self.board, 'board_summary')
+        self.assertEqual(second['value'], 'old summary')
+        self.assertFalse(second['refreshing'])
+
+        self.apply_async.assert_called_once_with(args=[self.board.pk, 'board_summary'])
+        self.assertEqual(self.produced, [])
+
+    def test_fresh_value_is_not_refreshed(self):
+        self._set_summary(timedelta(minutes=5))
+
+        state = ai_artefacts.get_board_artefact(self.board, 'board_summary')
+        self.assertFalse(state['stale'])
+        self.assertFalse(state['refreshing'])
+        self.apply_async.assert_not_called()
+
+    def test_failed_enqueue_releases_the_claim(self):
+        self._set_summary(timedelta(hours=2))
+        self.apply_async.side_effect = [ConnectionError('broker down'), None]
+
+        self.assertFalse(ai_artefacts.get_board_artefact(self.board, 'board_summary')['refreshing'])
+        self.assertTrue(ai_artefacts.get_board_artefact(self.board, 'board_summary')['refreshing'])
+
+    def test_miss_produces_inline_only_when_asked(self):
+        state = ai_artefacts.get_board_artefact(self.board, 'board_summary')
+        self.assertIsNone(state['value'])
+        self.assertEqual(self.produced, [])
+        self.apply_async.assert_not_called()
+
+        state = ai_artefacts.get_board_artefact(self.board, 'board_summary', produce_on_miss=True)
+        self.assertEqual(state['value'], 'fresh summary')
+        self.assertFalse(state['stale'])
+        self.assertEqual(self.produced, [self.board.pk])
+
+    def test_refresh_task_runs_producer(self):
+        from kanban.tasks.ai_artefact_tasks import refresh_board_artefact_task
+
+        result = refresh_board_artefact_task.run(self.board.pk, 'board_summary')
+        self.assertTrue(result['refreshed'])
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.ai_summary, 'fresh summary')
+
+    def test_analytics_summary_round_trips_through_cache(self):
+        ai_artefacts.store_board_artefact(self.board, 'analytics_summary', {'text': 'ok'})
+
+        state = ai_artefacts.artefact_state(self.board, 'analytics_summary')
+        self.assertEqual(state['value'], {'text': 'ok'})
+        self.assertFalse(state['stale'])
+        self.assertLess((timezone.now() - state['generated_at']).total_seconds(), 5)
+
+    def test_narrative_api_only_charges_quota_for_inline_generation(self):
+        from api.ai_usage_models import AIRequestLog
+        from kanban.models import BoardMembership
+
+        BoardMembership.objects.create(board=self.board, user=self.user, role='owner')
+
+        def produce(board):
+            board.analytics_narrative = 'Velocity is up.'
+            board.analytics_narrative_generated_at = timezone.now()
+            board.save(update_fields=['analytics_narrative', 'analytics_narrative_generated_at'])
+            return board.analytics_narrative
+
+        original = ai_artefacts.ARTEFACTS['analytics_narrative']
+        self.addCleanup(ai_artefacts.ARTEFACTS.__setitem__, 'analytics_narrative', original)
+        ai_artefacts.register('analytics_narrative', original.load, produce, fresh_for=3600)
+
+        self.client.force_login(self.user)
+        url = reverse('generate_board_narrative_api', args=[self.board.pk])
+        logs = AIRequestLog.objects.filter(user=self.user, feature='analytics_narrative')
+
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(logs.count(), 1)
+
+        # Stored narrative, fresh and then stale: served without an AI call.
+        self.assertFalse(self.client.post(url).json()['refreshing'])
+        self.board.analytics_narrative_generated_at = timezone.now() - timedelta(hours=2)
+        self.board.save(update_fields=['analytics_narrative_generated_at'])
+        data = self.client.post(url).json()
+        self.assertTrue(data['stale'])
+        self.assertTrue(data['refreshing'])
+        self.assertEqual(logs.count(), 1)
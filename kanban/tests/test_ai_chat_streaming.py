@@ -0,0 +1,114 @@
+"""
+Token streaming for the AI chat task (send_ai_message_task).
+
+The answer is generated with AIRouter.stream(); deltas reach the AI task
+WebSocket group as batched 'ai_delta' frames, and the assembled message is
+still saved as an AIAssistantMessage and delivered as the final 'ai_result'.
+The provider is a local fake, so no API key or network is needed.
+"""
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+TOKENS = ['The ', 'board ', 'has ', 'three ', 'open ', 'tasks', '.']
+
+
+def _fake_openai(router, prompt, api_key, system_prompt=None, conversation_history=None,
+                 complexity='simple', model_override=None, on_delta=None):
+    """Stands in for AIRouter._call_openai: emits one delta per token."""
+    for token in TOKENS:
+        on_delta(token)
+    return {'text': ''.join(TOKENS), 'model': 'fake-model', 'tokens_used': len(TOKENS)}
+
+
+def _drain(channel):
+    layer = get_channel_layer()
+    messages = []
+    while True:
+        try:
+            messages.append(async_to_sync(layer.receive)(channel))
+        except Exception:
+            return messages
+        if messages[-1]['type'] in ('ai_result', 'ai_error'):
+            return messages
+
+
+class DeltaFramerTest(TestCase):
+    def test_frames_by_size_and_interval(self):
+        from kanban.tasks.ai_streaming_tasks import _DeltaFramer
+
+        now = [0.0]
+        sent = []
+        with patch('kanban.tasks.ai_streaming_tasks._send_delta',
+                   side_effect=lambda task_id, text, seq: sent.append((seq, text))):
+            framer = _DeltaFramer('t1', max_chars=8, max_interval=1.0, clock=lambda: now[0])
+            framer('abc')
+            framer('defgh')      # 8 chars pending -> frame
+            framer('ij')
+            now[0] = 2.0
+            framer('k')          # interval elapsed -> frame
+            framer('')
+            framer('lm')
+            framer.flush()
+            framer.flush()       # nothing pending
+
+        self.assertEqual(sent, [(0, 'abcdefgh'), (1, 'ijk'), (2, 'lm')])
+
+
+@override_settings(AI_STREAM_FRAME_CHARS=10, AI_STREAM_FRAME_SECONDS=60)
+class SendAIMessageStreamingTest(TestCase):
+    def setUp(self):
+        from ai_assistant.models import AIAssistantSession
+
+        self.user = User.objects.create_user(username='streamer', password='pw')
+        self.session = AIAssistantSession.objects.create(user=self.user, title='Chat')
+
+    def _run(self, task_id='stream-task'):
+        from kanban.tasks.ai_streaming_tasks import send_ai_message_task
+        from ai_assistant.utils.ai_router import AIRouter
+
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f'ai_task_{task_id}', channel)
+        with patch.object(AIRouter, '_resolve_provider',
+                          return_value=('openai', 'sk-fake', False, None)), \
+                patch.object(AIRouter, '_call_openai', _fake_openai):
+            result = send_ai_message_task.apply(
+                args=('How many open tasks?', self.session.id, self.user.id),
+                task_id=task_id,
+            ).get()
+        return result, _drain(channel)
+
+    def test_deltas_are_batched_and_final_message_persisted(self):
+        from ai_assistant.models import AIAssistantMessage
+
+        result, messages = self._run()
+
+        deltas = [m for m in messages if m['type'] == 'ai_delta']
+        self.assertEqual(''.join(d['text'] for d in deltas), ''.join(TOKENS))
+        self.assertEqual([d['seq'] for d in deltas], list(range(len(deltas))))
+        self.assertLess(len(deltas), len(TOKENS))
+        self.assertTrue(all(len(d['text']) >= 10 for d in deltas[:-1]))
+
+        self.assertEqual(messages[-1]['type'], 'ai_result')
+        self.assertEqual(messages[-1]['data']['response'], ''.join(TOKENS))
+        self.assertEqual(result['source'], 'openai')
+        saved = AIAssistantMessage.objects.get(pk=result['message_id'])
+        self.assertEqual(saved.content, ''.join(TOKENS))
+        self.assertEqual(saved.tokens_used, len(TOKENS))
+
+    def test_failed_stream_falls_back_to_blocking_call(self):
+        from ai_assistant.utils.ai_clients import GeminiClient
+        from ai_assistant.utils.ai_router import AIRouter, AIProviderError
+
+        with patch.object(AIRouter, 'stream', side_effect=AIProviderError('openai', RuntimeError('down'))), \
+                patch.object(GeminiClient, 'get_response',
+                             return_value={'content': 'Blocking answer', 'tokens': 3, 'error': None}):
+            result, messages = self._run(task_id='fallback-task')
+
+        self.assertEqual(result['response'], 'Blocking answer')
+        self.assertEqual(result['source'], 'gemini')
+        self.assertFalse([m for m in messages if m['type'] == 'ai_delta'])
@@ -0,0 +1,123 @@
+"""
+Single-flight de-duplication in AICacheManager (kanban_board/ai_cache.py).
+
+Concurrent misses for the same key make one AI call: followers in the same
+process wait for the leader's result, followers in another process (simulated
+by a held cache lock) poll the cache for it. Waits are bounded.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from kanban_board.ai_cache import AICacheManager, cache_ai_call
+
+
+class SingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        self.manager = AICacheManager()
+        self._cache().clear()
+
+    def _cache(self):
+        return AICacheManager()._get_cache()
+
+    def _concurrent(self, n, target):
+        results = [None] * n
+        threads = [
+            threading.Thread(target=lambda i=i: results.__setitem__(i, target()))
+            for i in range(n)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_make_one_call(self):
+        calls = []
+        gate = threading.Event()
+
+        def slow_model():
+            calls.append(1)
+            gate.wait(5)
+            return 'summary'
+
+        def request():
+            return self.manager.get_or_call('same prompt', slow_model, 'analytics', 'board_1')
+
+        timer = threading.Timer(0.2, gate.set)
+        timer.start()
+        results = self._concurrent(8, request)
+
+        self.assertEqual(results, ['summary'] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.manager.get_stats()['coalesced'], 7)
+        # Different keys are not coalesced.
+        self.manager.get_or_call('other prompt', lambda: 'x', 'analytics', 'board_1')
+        self.assertEqual(len(calls), 1)
+
+    def test_leader_exception_reaches_local_followers(self):
+        gate = threading.Event()
+
+        @cache_ai_call(operation='analytics')
+        def failing(board_id):
+            gate.wait(5)
+            raise ValueError('quota')
+
+        def request():
+            try:
+                failing(7)
+            except ValueError as exc:
+                return str(exc)
+
+        threading.Timer(0.2, gate.set).start()
+        self.assertEqual(self._concurrent(3, request), ['quota'] * 3)
+
+    def test_follower_reads_result_stored_by_other_process(self):
+        key = self.manager._generate_cache_key('prompt', 'analytics', None)
+        cache = self._cache()
+        cache.add(key + AICacheManager.LOCK_SUFFIX, 'other-process', 30)
+
+        def other_process_finishes():
+            cache.set(key, 'remote result', 60)
+            cache.delete(key + AICacheManager.LOCK_SUFFIX)
+
+        threading.Timer(0.15, other_process_finishes).start()
+        result = self.manager.get_or_call('prompt', lambda: 'local result', 'analytics')
+
+        self.assertEqual(result, 'remote result')
+        self.assertEqual(self.manager.get_stats()['coalesced_remote'], 1)
+
+    @override_settings(AI_SINGLE_FLIGHT_WAIT=0.2)
+    def test_wait_is_bounded(self):
+        key = self.manager._generate_cache_key('prompt', 'analytics', None)
+        self._cache().add(key + AICacheManager.LOCK_SUFFIX, 'stuck-process', 30)
+
+        start = time.monotonic()
+        result = self.manager.get_or_call('prompt', lambda: 'own call', 'analytics')
+
+        self.assertEqual(result, 'own call')
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(self.manager.get_stats()['single_flight_timeouts'], 1)
+
+    def test_generate_ai_content_is_single_flighted(self):
+        from kanban.utils import ai_utils
+
+        calls = []
+        gate = threading.Event()
+
+        def complete(self, prompt, user=None, complexity='simple', **kwargs):
+            calls.append(prompt)
+            gate.wait(5)
+            return {'text': ' narrative '}
+
+        with patch('ai_assistant.utils.ai_router.AIRouter.complete', complete), \
+                patch('kanban_board.ai_cache.ai_cache_manager', self.manager):
+            threading.Timer(0.2, gate.set).start()
+            results = self._concurrent(
+                4, lambda: ai_utils.generate_ai_content('Summarise board', 'analytics', context_id='b1'),
+            )
+
+        self.assertEqual(results, ['narrative'] * 4)
+        self.assertEqual(len(calls), 1)
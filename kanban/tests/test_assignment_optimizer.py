@@ -0,0 +1,95 @@
+"""
+Matrix assignment optimizer behind ResourceLevelingService.get_board_optimization_suggestions.
+
+Covers:
+  * skill_match_matrix agrees with UserPerformanceProfile.calculate_skill_match.
+  * solve_slot_assignment uses each task once and honours per-giver limits.
+  * A board run keeps the per-user cap and giver/receiver coherence.
+"""
+
+import unittest
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from kanban.models import Board, BoardMembership, Column, Task, Workspace
+from kanban.resource_leveling import ResourceLevelingService
+from kanban.resource_leveling_models import UserPerformanceProfile
+from kanban.utils.assignment_optimizer import (
+    OPTIMIZER_AVAILABLE, np, skill_match_matrix, solve_slot_assignment,
+)
+
+
+@unittest.skipUnless(OPTIMIZER_AVAILABLE, 'numpy/scipy are not installed')
+class AssignmentMatrixTest(unittest.TestCase):
+    def test_skill_matrix_matches_profile_method(self):
+        texts = [
+            'Fix login API auth bug',
+            'Design the React dashboard UI',
+            'an ox',
+            'Deploy database migration deploy',
+        ]
+        keywords = [
+            {'login': 12, 'auth': 3},
+            {'react': 5, 'design': 7, 'dashboard': 2},
+            {},
+            {'deploy': 4},
+        ]
+        matrix = skill_match_matrix(texts, keywords)
+        for t, text in enumerate(texts):
+            for m, kw in enumerate(keywords):
+                expected = UserPerformanceProfile(skill_keywords=kw).calculate_skill_match(text)
+                self.assertAlmostEqual(matrix[t, m], expected, places=6, msg=(text, kw))
+
+    def test_solver_respects_giver_limits(self):
+        # Two slots, three tasks all owned by giver 0 who may only lose one.
+        gain = np.array([[9.0, 5.0, 1.0], [6.0, 3.0, 2.0]])
+        feasible = np.ones_like(gain, dtype=bool)
+        chosen = solve_slot_assignment(
+            gain, feasible, task_giver=np.array([0, 0, 0]), giver_caps={0: 1},
+        )
+        self.assertEqual(chosen, [(0, 0)])
+
+        chosen = solve_slot_assignment(gain, feasible)
+        self.assertEqual(sorted(c for _r, c in chosen), [0, 1])
+
+
+@unittest.skipUnless(OPTIMIZER_AVAILABLE, 'numpy/scipy are not installed')
+class BoardOptimizerTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        creator = User.objects.create_user(username='opt_creator', password='pw')
+        org = Organization.objects.create(name='Opt Org', created_by=creator)
+        ws = Workspace.objects.create(name='Opt WS', organization=org, created_by=creator, is_demo=False)
+        self.board = Board.objects.create(name='Opt Board', created_by=creator, owner=creator, workspace=ws)
+        col = Column.objects.create(board=self.board, name='Backlog', position=0)
+
+        self.users = {}
+        # heavy: 8 × 6 = 48h of 40h (120%); the light members sit at 10%.
+        for name, n, cx in [('heavy', 8, 6), ('light1', 1, 4), ('light2', 1, 4)]:
+            user = User.objects.create_user(username=name, password='pw')
+            BoardMembership.objects.create(board=self.board, user=user, role='member')
+            for i in range(n):
+                Task.objects.create(column=col, title=f'{name} api task {i}', complexity_score=cx,
+                                    assigned_to=user, created_by=creator)
+            self.users[name] = user
+        # Past the one-hour "brand-new task" gate.
+        Task.objects.filter(column__board=self.board).update(
+            created_at=timezone.now() - timedelta(hours=2),
+        )
+
+    def test_moves_are_capped_and_coherent(self):
+        svc = ResourceLevelingService()
+        tasks = Task.objects.filter(column__board=self.board).select_related('assigned_to', 'column')
+        suggestions = svc._optimized_board_suggestions(self.board, tasks)
+
+        self.assertTrue(suggestions)
+        sources = {s.current_assignee_id for s in suggestions}
+        targets = [s.suggested_assignee_id for s in suggestions]
+        self.assertEqual(sources, {self.users['heavy'].id})
+        self.assertEqual(sources & set(targets), set())
+        for user_id in set(targets):
+            self.assertLessEqual(targets.count(user_id), svc.MAX_SUGGESTIONS_PER_USER)
+        self.assertEqual(len({s.task_id for s in suggestions}), len(suggestions))
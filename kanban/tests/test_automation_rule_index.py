@@ -0,0 +1,130 @@
+"""
+Per-board automation rule index used by run_board_automations.
+
+The index groups a board's active rules by trigger type and is versioned per
+board: rule create/update/delete invalidates it. A save whose facts cannot
+satisfy any indexed trigger must not query the rule or log tables at all.
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+
+def _make_rule(board, user, trigger_type, trigger_config=None, **kwargs):
+    from kanban.automation_models import AutomationRule
+
+    return AutomationRule.objects.create(
+        board=board, created_by=user,
+        name=f'Rule: {trigger_type}',
+        trigger_type=trigger_type,
+        trigger_config=trigger_config or {},
+        condition_logic='AND',
+        conditions=[],
+        actions=[{'type': 'post_comment', 'target': None, 'message': 'fired'}],
+        otherwise_actions=[],
+        **kwargs,
+    )
+
+
+class AutomationRuleIndexTest(TestCase):
+    def setUp(self):
+        from kanban.models import Board, Column, Task
+
+        self.user = User.objects.create_user(username='idx_runner', password='x')
+        self.board = Board.objects.create(name='Index Board', created_by=self.user)
+        self.backlog = Column.objects.create(board=self.board, name='Backlog', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+        self.task = Task.objects.create(column=self.backlog, title='Indexed', created_by=self.user)
+        self.move_rule = _make_rule(
+            self.board, self.user, 'task_moved_to_column',
+            trigger_config={'column_name': 'done'},
+        )
+
+    def _logs(self, rule):
+        from kanban.automation_models import AutomationLog
+
+        return AutomationLog.objects.filter(rule=rule, task_affected=self.task).count()
+
+    def test_unrelated_edit_skips_rule_evaluation(self):
+        from kanban.models import Task
+
+        task = Task.objects.get(pk=self.task.pk)
+        task.description = 'warm the index'
+        task.save()
+        task.description = 'just notes'
+        with CaptureQueriesContext(connection) as ctx:
+            task.save()
+
+        automation_sql = [
+            q['sql'] for q in ctx.captured_queries
+            if 'kanban_automationrule' in q['sql'] or 'kanban_boardautomation' in q['sql']
+            or 'kanban_automationlog' in q['sql']
+        ]
+        self.assertEqual(automation_sql, [])
+
+    def test_matching_save_still_fires(self):
+        self.task.column = self.done
+        self.task.save()
+        self.assertEqual(self._logs(self.move_rule), 1)
+
+    def test_rule_changes_invalidate_the_index(self):
+        from kanban.models import Task
+
+        # Warm the index, then add a rule for a trigger it did not contain.
+        self.task.description = 'warm'
+        self.task.save()
+        priority_rule = _make_rule(self.board, self.user, 'task_priority_changed')
+
+        task = Task.objects.get(pk=self.task.pk)
+        task.priority = 'urgent'
+        task.save()
+        self.assertEqual(self._logs(priority_rule), 1)
+
+        # Deactivating through save() removes it from the index again.
+        priority_rule.is_active = False
+        priority_rule.save()
+        task = Task.objects.get(pk=self.task.pk)
+        task.priority = 'low'
+        task.save()
+        self.assertEqual(self._logs(priority_rule), 1)
+
+    def test_index_keeps_rule_order_within_candidates(self):
+        from kanban.automation_index import get_board_index, save_events
+
+        second = _make_rule(self.board, self.user, 'task_status_changed')
+        index = get_board_index(self.board.pk)
+        self.task.column = self.done
+        _, rules = index.candidates(save_events(self.task, False, True, False, False, False))
+
+        # Same order as AutomationRule's default (-created_at) queryset.
+        self.assertEqual([r.pk for r in rules], [second.pk, self.move_rule.pk])
+        _, none = index.candidates(save_events(self.task, False, False, False, False, False))
+        self.assertEqual(none, [])
+
+    def test_version_token_lives_in_the_shared_cache(self):
+        from kanban.automation_index import VERSION_KEY, get_board_index
+
+        get_board_index(self.board.pk)
+        key = VERSION_KEY.format(board_id=self.board.pk)
+        # The default cache is per-process LocMem in DEBUG; other processes
+        # would never see a bump written there.
+        self.assertIsNotNone(caches['ai_cache'].get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_unreachable_shared_cache_rebuilds_every_lookup(self):
+        from kanban.automation_index import get_board_index
+        from kanban.automation_models import AutomationRule
+
+        _, rules = get_board_index(self.board.pk).candidates({'column'})
+        self.assertIn(self.move_rule, rules)
+        # A queryset update fires no signal; without a usable token the
+        # stale copy must not be served.
+        AutomationRule.objects.filter(pk=self.move_rule.pk).update(is_active=False)
+        with patch.object(caches['ai_cache'], 'get', side_effect=ConnectionError('down')):
+            _, rules = get_board_index(self.board.pk).candidates({'column'})
+        self.assertNotIn(self.move_rule, rules)
@@ -0,0 +1,86 @@
+"""
+Bulk clone engine (kanban/utils/board_clone.py) behind _duplicate_board.
+
+Covers:
+  * Labels, columns, tasks, label/dependency links, parent tasks, comments
+    and checklist items are copied with every FK pointing into the new board.
+  * Template created_at/updated_at survive the bulk insert.
+  * The clone plan is served from cache until the template changes.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Organization, UserProfile
+from kanban.models import Board, ChecklistItem, Column, Comment, Task, TaskLabel, Workspace
+from kanban.sandbox_views import _duplicate_board
+from kanban.utils import board_clone
+
+
+class BoardCloneTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user('clone_creator', password='x')
+        org = Organization.objects.create(name='Clone Org', is_demo=True, created_by=self.creator)
+        ws = Workspace.objects.create(
+            name='Clone WS', organization=org, is_demo=True, is_active=True, created_by=self.creator,
+        )
+        self.template = Board.objects.create(
+            name='Template', organization=org, workspace=ws,
+            is_official_demo_board=True, is_seed_demo_data=True, created_by=self.creator,
+        )
+        todo = Column.objects.create(board=self.template, name='To Do', position=0)
+        Column.objects.create(board=self.template, name='Done', position=1)
+        bug = TaskLabel.objects.create(board=self.template, name='Bug', color='#dc3545')
+
+        self.parent = Task.objects.create(column=todo, title='Epic', created_by=self.creator)
+        self.child = Task.objects.create(
+            column=todo, title='Story', created_by=self.creator, parent_task=self.parent,
+            position=1, assigned_to=self.creator,
+        )
+        self.child.labels.add(bug)
+        self.child.dependencies.add(self.parent)
+        Comment.objects.create(task=self.child, user=self.creator, content='Looks good')
+        ChecklistItem.objects.create(task=self.child, title='Write tests', position=0)
+        self.created_at = timezone.now() - timedelta(days=40)
+        Task.objects.filter(pk=self.child.pk).update(created_at=self.created_at)
+
+        self.user = User.objects.create_user('clone_user', password='pw')
+        UserProfile.objects.get_or_create(user=self.user)
+
+    def test_structure_is_remapped_into_the_new_board(self):
+        board = _duplicate_board(self.template, self.user)
+
+        child = Task.objects.get(column__board=board, title='Story')
+        parent = Task.objects.get(column__board=board, title='Epic')
+        self.assertEqual(child.parent_task, parent)
+        self.assertEqual(list(child.dependencies.all()), [parent])
+        self.assertEqual([label.board_id for label in child.labels.all()], [board.pk])
+        self.assertEqual(child.column.board, board)
+        self.assertEqual(child.created_by, self.user)
+        self.assertEqual(child.assigned_to, self.creator)
+        self.assertEqual(child.created_at, self.created_at)
+        self.assertIsNotNone(child.column_entered_at)
+        self.assertEqual(child.comments.get().user, self.user)
+        self.assertEqual(child.checklist_items.get().title, 'Write tests')
+        self.assertEqual(
+            list(board.columns.values_list('name', 'aging_mode')),
+            [('To Do', 'inherit'), ('Done', 'disabled')],
+        )
+
+    def test_plan_is_cached_until_the_template_changes(self):
+        with mock.patch.object(board_clone, '_build_plan', wraps=board_clone._build_plan) as build:
+            board_clone.board_clone_plan(self.template)
+            board_clone.board_clone_plan(self.template)
+            self.assertEqual(build.call_count, 1)
+
+            Task.objects.create(
+                column=self.template.columns.first(), title='New', created_by=self.creator,
+            )
+            plan = board_clone.board_clone_plan(self.template)
+            self.assertEqual(build.call_count, 2)
+        self.assertEqual(len(plan['tasks']), 3)
@@ -0,0 +1,140 @@
+"""
+BoardDailyMetrics fact table (kanban/utils/board_metrics.py).
+
+Covers:
+  * refresh_board_metrics snapshot and flow counts on a small board.
+  * A Task save flags the row stale and the next analytics read refreshes it;
+    so do TaskCost and TimeEntry writes and deletes.
+  * get_portfolio_analytics reads any number of boards with the same query
+    count once their rows are current, and sums across them.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Organization
+from kanban.board_metrics_models import BoardDailyMetrics
+from kanban.models import (
+    Board, Column, Mission, OrganizationGoal, Strategy, Task, Workspace,
+)
+from kanban.utils.analytics_helpers import (
+    get_portfolio_analytics, get_promoted_metrics, get_weekly_completion_trend,
+)
+from kanban.utils.board_metrics import refresh_board_metrics
+
+
+class BoardMetricsTestBase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='facts_user', password='pw')
+        self.org = Organization.objects.create(name='Facts Org', created_by=self.user)
+        self.ws = Workspace.objects.create(name='Facts WS', organization=self.org, created_by=self.user)
+        self.now = timezone.now()
+
+    def _board(self, name, strategy=None):
+        board = Board.objects.create(
+            name=name, organization=self.org, workspace=self.ws, created_by=self.user,
+            project_type='product_tech', strategy=strategy,
+        )
+        todo = Column.objects.create(board=board, name='To Do', position=0)
+        review = Column.objects.create(board=board, name='In Review', position=1)
+        done = Column.objects.create(board=board, name='Done', position=2)
+        Task.objects.create(column=todo, title='Overdue', created_by=self.user,
+                            due_date=self.now - timedelta(days=1))
+        Task.objects.create(column=todo, title='Urgent', created_by=self.user, priority='urgent')
+        Task.objects.create(column=review, title='Reviewing', created_by=self.user, progress=60)
+        Task.objects.create(column=done, title='On time', created_by=self.user, progress=100,
+                            due_date=self.now + timedelta(days=1))
+        Task.objects.create(column=done, title='Late', created_by=self.user, progress=100,
+                            due_date=self.now - timedelta(days=3))
+        Task.objects.create(column=done, title='Launch', created_by=self.user,
+                            item_type='milestone', progress=100)
+        return board
+
+
+class RefreshBoardMetricsTest(BoardMetricsTestBase):
+    def test_snapshot_and_flow(self):
+        board = self._board('Facts Board')
+        row = refresh_board_metrics(board)
+
+        self.assertEqual((row.tasks_total, row.tasks_done), (5, 2))
+        self.assertEqual((row.overdue_count, row.at_risk_count, row.in_review_count), (1, 1, 1))
+        self.assertEqual((row.tasks_with_due, row.done_with_due, row.done_on_time), (3, 2, 1))
+        self.assertEqual((row.milestones_total, row.milestones_done), (1, 1))
+        self.assertEqual((row.tasks_created, row.tasks_completed), (5, 2))
+        self.assertEqual((row.completed_on_time, row.completed_late), (1, 1))
+        self.assertEqual(row.completed_last_7d, 2)
+        self.assertEqual(row.cycle_time_buckets[0], 2)
+        self.assertEqual([c['count'] for c in row.wip_by_column], [2, 1, 2])
+
+        stored = BoardDailyMetrics.objects.get(board=board, date=timezone.localdate())
+        self.assertFalse(stored.is_stale)
+        self.assertEqual(stored.overdue_count, 1)
+        self.assertEqual(get_weekly_completion_trend(board)[-1]['count'], 2)
+
+    def test_task_save_marks_row_stale(self):
+        board = self._board('Stale Board')
+        self.assertEqual(get_promoted_metrics(board, raw=True)['overdue_count'], 1)
+
+        Task.objects.create(column=board.columns.get(name='To Do'), title='Also overdue',
+                            created_by=self.user, due_date=self.now - timedelta(days=2))
+        self.assertTrue(BoardDailyMetrics.objects.get(board=board, date=timezone.localdate()).is_stale)
+        self.assertEqual(get_promoted_metrics(board, raw=True)['overdue_count'], 2)
+
+    def test_cost_and_time_entry_changes_mark_row_stale(self):
+        from decimal import Decimal
+
+        from kanban.budget_models import TaskCost, TimeEntry
+
+        board = self._board('Spend Board')
+        task = board.columns.get(name='To Do').tasks.first()
+        today = timezone.localdate()
+
+        def assert_marks_stale(change):
+            refresh_board_metrics(board)
+            change()
+            self.assertTrue(BoardDailyMetrics.objects.get(board=board, date=today).is_stale)
+
+        entry = TimeEntry(task=task, user=self.user, hours_spent=Decimal('2.5'), work_date=today)
+        assert_marks_stale(entry.save)
+        assert_marks_stale(entry.delete)
+        cost = TaskCost(task=task, estimated_cost=Decimal('100'))
+        assert_marks_stale(cost.save)
+        assert_marks_stale(cost.delete)
+
+
+class PortfolioAnalyticsTest(BoardMetricsTestBase):
+    def setUp(self):
+        super().setUp()
+        self.goal = OrganizationGoal.objects.create(
+            name='Goal', organization=self.org, workspace=self.ws, created_by=self.user,
+        )
+        mission = Mission.objects.create(
+            name='Mission', organization_goal=self.goal, workspace=self.ws, created_by=self.user,
+        )
+        self.strategy = Strategy.objects.create(
+            name='Strategy', mission=mission, workspace=self.ws, status='active', created_by=self.user,
+        )
+
+    def _warm_queries(self):
+        get_portfolio_analytics(self.goal, 'goal')  # creates any missing rows
+        with CaptureQueriesContext(connection) as ctx:
+            result = get_portfolio_analytics(self.goal, 'goal')
+        return len(ctx.captured_queries), result
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self._board('P1', self.strategy)
+        few, _ = self._warm_queries()
+        for i in range(2, 7):
+            self._board(f'P{i}', self.strategy)
+        many, result = self._warm_queries()
+
+        self.assertEqual(few, many)
+        group = result['groups'][0]
+        self.assertEqual(group['board_count'], 6)
+        self.assertEqual(group['metrics']['overdue_count'], 6)
+        self.assertEqual(group['metrics']['task_velocity'], '12 tasks/week')
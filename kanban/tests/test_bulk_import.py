@@ -0,0 +1,156 @@
+"""
+Bulk-write board import (kanban/utils/bulk_import.py).
+
+_create_board_from_import_result writes labels, columns, tasks and their M2M
+rows with bulk_create, so no per-task signal fires; board_imported is sent
+once for the whole import. Query count must not grow with the number
+of imported tasks.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from kanban.utils.import_adapters import ImportResult
+
+
+def _result(n_tasks, assignee=None):
+    result = ImportResult(source_tool='jira')
+    result.board_data = {'name': 'Imported'}
+    result.columns_data = [
+        {'name': 'Backlog', 'position': 0, 'temp_id': 'c0'},
+        {'name': 'Done', 'position': 1, 'temp_id': 'c1'},
+    ]
+    result.labels_data = [{'name': 'bug', 'color': '#FF0000'}]
+    for n in range(n_tasks):
+        result.tasks_data.append({
+            'title': f'Issue {n}',
+            'description': '<p>Body</p><script>alert(1)</script>',
+            'column_temp_id': 'c1' if n == 0 else 'c0',
+            'position': n,
+            'priority': 'high',
+            'progress': 100 if n == 0 else 0,
+            'assigned_to_username': assignee,
+            'label_names': ['bug', 'backend'] if n % 2 else [],
+            'external_id': f'KAN-{n}',
+            'dependency_external_ids': [f'KAN-{n - 1}'] if n else [],
+        })
+    return result
+
+
+class BulkImportTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization, UserProfile
+        from kanban.models import Workspace
+
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+
+        self.user = User.objects.create_user(username='importer', password='pw')
+        self.org = Organization.objects.create(name='Import Org', created_by=self.user)
+        ws = Workspace.objects.create(name='Import WS', organization=self.org, created_by=self.user)
+        UserProfile.objects.create(user=self.user, organization=self.org, active_workspace=ws)
+        self.dev = User.objects.create_user(username='Dev.One', email='dev@acme.com', password='pw')
+        UserProfile.objects.create(user=self.dev, organization=self.org)
+        outsider = User.objects.create_user(username='outsider', password='pw')
+        UserProfile.objects.create(user=outsider, organization=Organization.objects.create(
+            name='Other Org', created_by=outsider,
+        ))
+
+    def _import(self, result, **kwargs):
+        from kanban.views import _create_board_from_import_result
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return _create_board_from_import_result(result, self.user, self.org, {}, **kwargs)
+
+    def test_board_contents(self):
+        from kanban.models import BoardMembership, Task, UserBoardWorkload
+
+        board = self._import(_result(5, assignee='dev.one'))
+
+        columns = {c.name: c for c in board.columns.all()}
+        self.assertEqual(set(columns), {'Backlog', 'Done'})
+        self.assertEqual(columns['Done'].color, 'green')  # pre_save colouring still applied
+        self.assertEqual(
+            dict(board.labels.values_list('name', 'color')),
+            {'bug': '#FF0000', 'backend': '#FF5733'},
+        )
+
+        tasks = {t.title: t for t in Task.objects.filter(column__board=board)}
+        self.assertEqual(len(tasks), 5)
+        self.assertNotIn('<script>', tasks['Issue 1'].description)
+        self.assertIsNotNone(tasks['Issue 0'].completed_at)
+        self.assertEqual(tasks['Issue 0'].column, columns['Done'])
+        self.assertEqual(sorted(tasks['Issue 1'].labels.values_list('name', flat=True)), ['backend', 'bug'])
+        self.assertEqual(list(tasks['Issue 2'].dependencies.all()), [tasks['Issue 1']])
+        self.assertEqual(tasks['Issue 3'].assigned_to, self.dev)
+
+        self.assertTrue(BoardMembership.objects.filter(board=board, user=self.dev).exists())
+        self.assertEqual(
+            UserBoardWorkload.objects.get(board=board, user=self.dev).active_tasks, 4,
+        )
+
+    def test_done_column_rows_get_pre_save_fields(self):
+        from kanban.models import Task
+
+        result = _result(3)
+        result.tasks_data[1]['column_temp_id'] = 'c1'   # in Done, progress 0
+        board = self._import(result)
+
+        tasks = {t.title: t for t in Task.objects.filter(column__board=board)}
+        self.assertEqual(tasks['Issue 1'].progress, 100)
+        self.assertIsNotNone(tasks['Issue 1'].completed_at)
+        self.assertEqual(tasks['Issue 2'].progress, 0)
+        self.assertIsNone(tasks['Issue 2'].completed_at)
+        for task in tasks.values():
+            self.assertIsNotNone(task.column_entered_at)
+
+    def test_assignee_by_email_and_organization_check(self):
+        from kanban.models import Task
+
+        board = self._import(_result(1, assignee='DEV@acme.com'))
+        self.assertEqual(Task.objects.get(column__board=board).assigned_to, self.dev)
+
+        board = self._import(_result(1, assignee='outsider'))
+        self.assertIsNone(Task.objects.get(column__board=board).assigned_to)
+
+    def test_one_aggregated_event(self):
+        from kanban.project_signals_models import ProjectSignal
+        from kanban.utils.bulk_import import board_imported
+        from webhooks.models import WebhookEvent
+
+        received = []
+
+        def probe(sender, board, stats, **kwargs):
+            received.append(stats)
+
+        board_imported.connect(probe)
+        self.addCleanup(board_imported.disconnect, probe)
+        board = self._import(_result(6))
+
+        self.assertEqual([stats['tasks'] for stats in received], [6])
+        self.assertFalse(WebhookEvent.objects.filter(board=board).exists())
+        self.assertEqual(ProjectSignal.objects.filter(board=board).count(), 1)
+
+    def test_queries_do_not_grow_with_task_count(self):
+        def count(n):
+            with CaptureQueriesContext(connection) as ctx:
+                self._import(_result(n, assignee='dev.one'))
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count(10), count(60))
+
+    def test_progress_is_reported_per_chunk(self):
+        from kanban.models import Board
+        from kanban.utils.bulk_import import bulk_populate_board
+
+        board = Board.objects.create(name='Chunked', created_by=self.user)
+        calls = []
+        bulk_populate_board(
+            board, _result(25), self.user, self.org,
+            progress_cb=lambda pct, msg: calls.append(pct), chunk_size=10,
+        )
+        self.assertEqual(calls, [40, 80, 100])
@@ -0,0 +1,128 @@
+"""
+Set-based bulk_update_predictions.
+
+PredictionHistory answers the same three history tiers as
+_get_historical_statistics() (same assignee, same board, same workspace) from
+one load of completed tasks, so a board-wide refresh must produce the same
+statistics as the per-task queries while issuing a fixed number of queries.
+"""
+import datetime
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from kanban.utils.task_prediction import (
+    PredictionHistory, _get_historical_statistics, bulk_update_predictions,
+)
+
+
+class BulkPredictionTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Workspace, Board, Column
+
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+
+        self.owner = User.objects.create_user(username='pred_owner', password='pw')
+        self.alice = User.objects.create_user(username='pred_alice', password='pw')
+        self.org = Organization.objects.create(name='Pred Org', created_by=self.owner)
+        ws = Workspace.objects.create(name='Pred WS', organization=self.org, created_by=self.owner)
+        self.board = Board.objects.create(
+            name='Pred Board', created_by=self.owner, owner=self.owner,
+            organization=self.org, workspace=ws,
+        )
+        other_board = Board.objects.create(
+            name='Sibling Board', created_by=self.owner, owner=self.owner,
+            organization=self.org, workspace=ws,
+        )
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+        sibling_done = Column.objects.create(board=other_board, name='Done', position=0)
+
+        # Completed history: enough same-assignee rows for tier 1 at complexity
+        # ~5/high, same-board rows for tier 2 at medium, and workspace rows on
+        # another board for tier 3 at complexity ~9.
+        for n in range(6):
+            self._completed(self.done, 'high', 4 + n % 3, 2.0 + n, assignee=self.alice, title=f'A{n}')
+        for n in range(4):
+            self._completed(self.done, 'medium', 5, 3.0 + n, title=f'B{n}')
+        for n in range(3):
+            self._completed(sibling_done, 'low', 9, 6.0 + n, title=f'C{n}')
+        self._completed(self.done, 'medium', 5, 3.0, title='B0')  # duplicate for display dedupe
+
+        start = (timezone.now() - datetime.timedelta(days=2)).date()
+        self.open_tasks = [
+            self._open('high', 5, start, assignee=self.alice),
+            self._open('medium', 6, start),
+            self._open('urgent', 8, start),
+            self._open('low', 1, start),
+        ]
+        self.open_tasks[0].dependencies.add(self.open_tasks[1])
+
+    def _completed(self, column, priority, complexity, days, assignee=None, title='Done'):
+        from kanban.models import Task
+
+        task = Task.objects.create(
+            column=column, title=title, created_by=self.owner, assigned_to=assignee,
+            priority=priority, complexity_score=complexity,
+        )
+        Task.objects.filter(pk=task.pk).update(
+            progress=100, actual_duration_days=days,
+            completed_at=timezone.now() - datetime.timedelta(days=days),
+        )
+
+    def _open(self, priority, complexity, start, assignee=None):
+        from kanban.models import Task
+
+        return Task.objects.create(
+            column=self.todo, title='Open', created_by=self.owner, assigned_to=assignee,
+            priority=priority, complexity_score=complexity, progress=20, start_date=start,
+        )
+
+    def test_history_matches_per_task_statistics(self):
+        history = PredictionHistory.for_tasks(self.open_tasks)
+        qualities = []
+        for task in self.open_tasks:
+            expected = _get_historical_statistics(task)
+            actual = _get_historical_statistics(task, history)
+            if expected is None:
+                self.assertIsNone(actual)
+                qualities.append(None)
+                continue
+            qualities.append(actual['data_quality'])
+            for key in ('sample_size', 'displayed_tasks', 'data_quality'):
+                self.assertEqual(actual[key], expected[key], key)
+            for key in ('avg_duration', 'std_dev', 'velocity_factor'):
+                self.assertAlmostEqual(actual[key], expected[key], msg=key)
+            self.assertEqual(
+                sorted(t['id'] for t in actual['similar_tasks']),
+                sorted(t['id'] for t in expected['similar_tasks']),
+            )
+        self.assertEqual(qualities, ['high', 'medium', 'low', None])
+
+    def test_bulk_update_uses_a_fixed_number_of_queries(self):
+        from kanban.models import Task
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = bulk_update_predictions(board=self.board)
+
+        self.assertEqual(result, {'total_tasks': 4, 'updated': 4, 'failed': 0})
+        # Open tasks, history, one bulk UPDATE (wrapped in a savepoint).
+        self.assertLessEqual(len(ctx.captured_queries), 5)
+
+        first = Task.objects.get(pk=self.open_tasks[0].pk)
+        self.assertIsNotNone(first.predicted_completion_date)
+        self.assertEqual(first.prediction_metadata['prediction_method'], 'historical_analysis')
+        self.assertEqual(first.prediction_metadata['factors']['dependencies_count'], 1)
+        fallback = Task.objects.get(pk=self.open_tasks[3].pk)
+        self.assertEqual(fallback.prediction_metadata['prediction_method'], 'rule_based_fallback')
+
+    def test_organization_refresh(self):
+        result = bulk_update_predictions(organization=self.org)
+        self.assertEqual(result['updated'], 4)
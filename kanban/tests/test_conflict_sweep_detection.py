@@ -0,0 +1,146 @@
+"""
+Tests for the sweep-line resource conflict detector.
+
+``iter_overlapping_pairs`` must report exactly the pairs the old O(n²)
+``_tasks_overlap`` comparison found, and ``detect_resource_conflicts`` must
+keep its one-conflict-per-overbooked-user semantics while writing conflicts,
+M2M rows and notifications in bulk.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from kanban.utils.conflict_detection import (
+    ConflictDetectionService, iter_overlapping_pairs,
+)
+
+
+def _aware_due(d):
+    return timezone.make_aware(datetime.combine(d, time(23, 59, 59)))
+
+
+class IterOverlappingPairsTest(SimpleTestCase):
+    def _brute_force(self, intervals):
+        pairs = set()
+        for i, (s1, e1, a) in enumerate(intervals):
+            for s2, e2, b in intervals[i + 1:]:
+                if s1 <= e1 and s2 <= e2 and s1 <= e2 and s2 <= e1:
+                    pairs.add(frozenset((a, b)))
+        return pairs
+
+    def test_matches_pairwise_comparison(self):
+        rng = random.Random(42)
+        base = date(2026, 1, 1)
+        for _ in range(50):
+            intervals = []
+            for n in range(rng.randint(0, 40)):
+                start = base + timedelta(days=rng.randint(0, 60))
+                end = start + timedelta(days=rng.randint(-2, 10))
+                intervals.append((start, end, n))
+            found = [frozenset(p) for p in iter_overlapping_pairs(intervals)]
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(set(found), self._brute_force(intervals))
+
+    def test_touching_intervals_overlap(self):
+        d = date(2026, 3, 1)
+        pairs = list(iter_overlapping_pairs([(d, d, 'a'), (d, d + timedelta(days=1), 'b')]))
+        self.assertEqual(pairs, [('a', 'b')])
+
+    def test_first_pair_is_earliest_overlap(self):
+        d = date(2026, 3, 1)
+        intervals = [
+            (d + timedelta(days=20), d + timedelta(days=25), 'late'),
+            (d, d + timedelta(days=2), 'early'),
+            (d + timedelta(days=1), d + timedelta(days=3), 'second'),
+        ]
+        self.assertEqual(next(iter_overlapping_pairs(intervals)), ('early', 'second'))
+
+
+class DetectResourceConflictsTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Workspace, Board, BoardMembership, Column
+
+        self.owner = User.objects.create_user(username='sweep_owner', password='pw')
+        org = Organization.objects.create(name='Sweep Org', created_by=self.owner)
+        ws = Workspace.objects.create(
+            name='Sweep WS', organization=org, created_by=self.owner, is_demo=False,
+        )
+        self.board = Board.objects.create(
+            name='Sweep Board', created_by=self.owner, owner=self.owner,
+            organization=org, workspace=ws,
+        )
+        self.col = Column.objects.create(board=self.board, name='In Progress', position=0)
+        self.members = []
+        for n in range(3):
+            member = User.objects.create_user(username=f'sweep_member_{n}', password='pw')
+            BoardMembership.objects.create(board=self.board, user=member, role='member')
+            self.members.append(member)
+
+    def _task(self, user, start, days, title):
+        from kanban.models import Task
+        return Task.objects.create(
+            column=self.col, title=title, created_by=self.owner, assigned_to=user,
+            start_date=start, due_date=_aware_due(start + timedelta(days=days)),
+        )
+
+    def test_one_conflict_per_overbooked_user(self):
+        from kanban.conflict_models import ConflictDetection, ConflictNotification
+
+        d = date(2026, 5, 4)
+        busy, free, outsider = self.members[0], self.members[1], self.members[2]
+        first = self._task(busy, d, 5, 'Busy A')
+        second = self._task(busy, d + timedelta(days=2), 5, 'Busy B')
+        self._task(busy, d + timedelta(days=3), 5, 'Busy C')
+        self._task(free, d, 1, 'Free A')
+        self._task(free, d + timedelta(days=5), 1, 'Free B')
+
+        conflicts = ConflictDetectionService(self.board).detect_resource_conflicts(self.board)
+
+        self.assertEqual(len(conflicts), 1)
+        conflict = ConflictDetection.objects.get(pk=conflicts[0].pk)
+        self.assertEqual(set(conflict.tasks.values_list('pk', flat=True)), {first.pk, second.pk})
+        self.assertEqual(list(conflict.affected_users.all()), [busy])
+        self.assertEqual(conflict.conflict_data['overlap_days'], 4)
+        self.assertTrue(
+            ConflictNotification.objects.filter(conflict=conflict, user=busy).exists()
+        )
+        self.assertFalse(ConflictDetection.objects.filter(title__contains=outsider.username).exists())
+
+    def test_rerun_does_not_duplicate(self):
+        from kanban.conflict_models import ConflictDetection
+
+        d = date(2026, 5, 4)
+        for n in range(4):
+            self._task(self.members[0], d + timedelta(days=n), 3, f'Task {n}')
+        service = ConflictDetectionService(self.board)
+        self.assertEqual(len(service.detect_resource_conflicts(self.board)), 1)
+        self.assertEqual(service.detect_resource_conflicts(self.board), [])
+        self.assertEqual(
+            ConflictDetection.objects.filter(board=self.board, conflict_type='resource').count(), 1
+        )
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        d = date(2026, 5, 4)
+
+        def _count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                ConflictDetectionService(self.board).detect_resource_conflicts(self.board)
+            return len(ctx.captured_queries)
+
+        for n in range(3):
+            self._task(self.members[n], d, 3, f'Small {n}a')
+            self._task(self.members[n], d + timedelta(days=1), 3, f'Small {n}b')
+        small = _count_queries()
+
+        from kanban.conflict_models import ConflictDetection
+        ConflictDetection.objects.all().delete()
+        for n in range(3):
+            for k in range(20):
+                self._task(self.members[n], d + timedelta(days=k), 3, f'Big {n}-{k}')
+        self.assertEqual(_count_queries(), small)
@@ -0,0 +1,106 @@
+"""
+Per-board refresh records (kanban/demo_refresh_models.py) that keep the demo
+date refresh from rewriting a board twice in one day.
+
+Covers:
+  * A refresh records every rewritten board as refreshed today.
+  * Boards already refreshed today are skipped; with none due, the refresh
+    never opens its transaction but still refreshes board-independent data.
+  * ``force`` rewrites boards that were already refreshed today.
+  * ``should_refresh_demo_dates`` consults the records when the cache is empty.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Organization
+from kanban.models import Board, Column, DemoDateRefresh, Task, Workspace
+from kanban.utils import demo_date_refresh
+
+
+class DemoRefreshDedupTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        creator = User.objects.create_user('refresh_creator', password='x')
+        org = Organization.objects.create(name='Refresh Org', is_demo=True, created_by=creator)
+        ws = Workspace.objects.create(
+            name='Refresh WS', organization=org, is_demo=True, is_active=True, created_by=creator,
+        )
+        self.boards = [
+            Board.objects.create(name=f'Demo {i}', organization=org, workspace=ws, created_by=creator)
+            for i in range(2)
+        ]
+        column = Column.objects.create(board=self.boards[0], name='To Do', position=0)
+        Task.objects.create(
+            column=column, title='Seed', created_by=creator,
+            start_date=self.today - timedelta(days=90), due_date=timezone.now() - timedelta(days=80),
+        )
+
+    def _once(self):
+        return mock.patch.object(
+            demo_date_refresh, '_refresh_all_demo_dates_once', return_value={},
+        )
+
+    def test_refresh_records_boards_as_refreshed_today(self):
+        stats = demo_date_refresh.refresh_all_demo_dates()
+
+        self.assertEqual(stats['boards_refreshed'], 2)
+        self.assertEqual(
+            set(DemoDateRefresh.objects.values_list('board_id', 'refreshed_on')),
+            {(board.pk, self.today) for board in self.boards},
+        )
+
+    def test_only_boards_not_refreshed_today_are_rewritten(self):
+        DemoDateRefresh.objects.create(board=self.boards[0], refreshed_on=self.today)
+        DemoDateRefresh.objects.create(board=self.boards[1], refreshed_on=self.today - timedelta(days=1))
+
+        scopes = []
+        with self._once() as once:
+            once.side_effect = lambda **kw: scopes.append(demo_date_refresh._get_demo_board_ids()) or {}
+            stats = demo_date_refresh.refresh_all_demo_dates()
+        self.assertEqual(scopes, [[self.boards[1].pk]])
+        self.assertEqual(stats['boards_refreshed'], 1)
+        self.assertEqual(DemoDateRefresh.objects.get(board=self.boards[1]).refreshed_on, self.today)
+
+        with self._once() as once:
+            self.assertEqual(demo_date_refresh.refresh_all_demo_dates()['boards_refreshed'], 0)
+        once.assert_not_called()
+
+    def test_board_independent_data_refreshed_with_no_board_due(self):
+        for board in self.boards:
+            DemoDateRefresh.objects.create(board=board, refreshed_on=self.today)
+
+        with self._once() as once, mock.patch.object(
+            demo_date_refresh, '_refresh_ai_session_dates', return_value=3,
+        ) as sessions, mock.patch.object(
+            demo_date_refresh, '_refresh_wiki_dates', return_value=2,
+        ) as wiki:
+            stats = demo_date_refresh.refresh_all_demo_dates()
+        once.assert_not_called()
+        sessions.assert_called_once()
+        wiki.assert_called_once()
+        self.assertEqual(
+            stats, {'boards_refreshed': 0, 'ai_sessions_updated': 3, 'wiki_pages_updated': 2},
+        )
+
+    def test_force_rewrites_boards_refreshed_today(self):
+        for board in self.boards:
+            DemoDateRefresh.objects.create(board=board, refreshed_on=self.today)
+
+        with self._once() as once:
+            stats = demo_date_refresh.refresh_all_demo_dates(force=True)
+        once.assert_called_once()
+        self.assertEqual(stats['boards_refreshed'], 2)
+
+    def test_should_refresh_consults_records_on_cache_miss(self):
+        self.assertTrue(demo_date_refresh.should_refresh_demo_dates())
+
+        for board in self.boards:
+            DemoDateRefresh.objects.create(board=board, refreshed_on=self.today)
+        self.assertFalse(demo_date_refresh.should_refresh_demo_dates())
+        self.assertEqual(cache.get(demo_date_refresh.DEMO_DATE_REFRESH_CACHE_KEY), self.today.isoformat())
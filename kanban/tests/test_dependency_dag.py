@@ -0,0 +1,105 @@
+"""
+In-memory dependency DAG (kanban/utils/dependency_dag.py): two-query load,
+deterministic CPM forward/backward pass and topological cascade.
+
+Board used throughout (days are June 2026):
+
+    design   01 -> 05
+    backend  05 -> 12   (dep: design)
+    frontend 05 -> 08   (dep: design)
+    launch   12 -> 13   (dep: backend, frontend)
+
+Critical path: design -> backend -> launch; frontend has 4 days of slack.
+"""
+from datetime import date, datetime, time
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from kanban.utils.dependency_dag import DependencyCycleError, DependencyGraph
+
+
+def _due(d):
+    return timezone.make_aware(datetime.combine(d, time(23, 59, 59)))
+
+
+class DependencyGraphTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Board, Column, Task
+
+        user = User.objects.create_user(username='cpm_user', password='pw')
+        org = Organization.objects.create(name='CPM Org', created_by=user)
+        self.board = Board.objects.create(name='CPM Board', organization=org, created_by=user)
+        column = Column.objects.create(board=self.board, name='To Do', position=0)
+
+        def mk(title, start, due):
+            return Task.objects.create(
+                column=column, title=title, created_by=user,
+                start_date=start, due_date=_due(due),
+            )
+
+        self.design = mk('Design', date(2026, 6, 1), date(2026, 6, 5))
+        self.backend = mk('Backend', date(2026, 6, 5), date(2026, 6, 12))
+        self.frontend = mk('Frontend', date(2026, 6, 5), date(2026, 6, 8))
+        self.launch = mk('Launch', date(2026, 6, 12), date(2026, 6, 13))
+        self.backend.dependencies.add(self.design)
+        self.frontend.dependencies.add(self.design)
+        self.launch.dependencies.add(self.backend, self.frontend)
+
+    def test_loads_in_two_queries(self):
+        with self.assertNumQueries(2):
+            graph = DependencyGraph.for_board(self.board)
+        self.assertEqual(graph.predecessors[self.launch.id], sorted([self.backend.id, self.frontend.id]))
+
+    def test_critical_path_and_slack(self):
+        cpm = DependencyGraph.for_board(self.board).critical_path()
+
+        self.assertEqual(cpm['critical_path'], [self.design.id, self.backend.id, self.launch.id])
+        self.assertEqual(cpm['project_start'], '2026-06-01')
+        self.assertEqual(cpm['project_finish'], '2026-06-13')
+        self.assertEqual(cpm['duration_days'], 12)
+
+        frontend = cpm['tasks'][self.frontend.id]
+        self.assertEqual(frontend['slack_days'], 4)
+        self.assertFalse(frontend['is_critical'])
+        self.assertEqual(frontend['latest_start'], '2026-06-09')
+        self.assertEqual(frontend['latest_finish'], '2026-06-12')
+        self.assertEqual(cpm['tasks'][self.backend.id]['slack_days'], 0)
+
+    def test_cycle_is_reported(self):
+        self.design.dependencies.add(self.launch)
+        with self.assertRaises(DependencyCycleError) as ctx:
+            DependencyGraph.for_board(self.board).critical_path()
+        self.assertIn(self.design.id, ctx.exception.task_ids)
+
+    def test_cascade_moves_chain_in_one_write(self):
+        from kanban.models import Task
+
+        Task.objects.filter(id=self.design.id).update(due_date=_due(date(2026, 6, 10)))
+        graph = DependencyGraph.for_board(self.board)
+
+        with self.assertNumQueries(1):
+            moved = graph.cascade(self.design.id)
+
+        self.assertEqual([t.id for t in moved], [self.backend.id, self.frontend.id, self.launch.id])
+        backend = Task.objects.get(id=self.backend.id)
+        launch = Task.objects.get(id=self.launch.id)
+        local = timezone.localtime
+        self.assertEqual((backend.start_date, local(backend.due_date).date()), (date(2026, 6, 10), date(2026, 6, 17)))
+        # Launch waits for the later of its two moved predecessors.
+        self.assertEqual((launch.start_date, local(launch.due_date).date()), (date(2026, 6, 17), date(2026, 6, 18)))
+        self.assertEqual(local(launch.due_date).time(), local(self.launch.due_date).time())
+
+    @override_settings(TIME_ZONE='Asia/Kolkata')
+    def test_due_day_is_the_local_calendar_day(self):
+        from kanban.models import Task
+
+        # 02:00 IST on June 5 is still June 4 in UTC.
+        early = timezone.make_aware(datetime.combine(date(2026, 6, 5), time(2, 0)))
+        Task.objects.filter(id=self.design.id).update(due_date=early)
+        graph = DependencyGraph.for_board(self.board)
+
+        self.assertEqual(graph._due(graph.tasks[self.design.id]), date(2026, 6, 5))
+        self.assertEqual(graph.cascade(self.design.id, save=False), [])
@@ -87,6 +87,90 @@ class PrioritySuggestionServiceTest(TestCase):
         self.assertIsInstance(features[0], (int, float))  # days_until_due
 
 
+class PriorityModelCacheTest(TestCase):
+    """Cached model loading and batch scoring with a trained model"""
+
+    def setUp(self):
+        from ai_assistant.utils.priority_service import invalidate_priority_models
+
+        self.user = User.objects.create_user(username='testuser', password='12345')
+        self.org = Organization.objects.create(name='Test Org', created_by=self.user)
+        self.profile = UserProfile.objects.create(user=self.user, organization=self.org)
+        self.board = Board.objects.create(name='Test Board', organization=self.org, created_by=self.user)
+        BoardMembership.objects.get_or_create(board=self.board, user=self.user, defaults={'role': 'member'})
+        self.column = Column.objects.create(name='To Do', board=self.board, position=0)
+        self.service = PrioritySuggestionService()
+
+        invalidate_priority_models()
+        self.addCleanup(invalidate_priority_models)
+        self.model_obj = self._train(version=1)
+
+    def _train(self, version):
+        """Store a tiny model: due soon -> urgent, otherwise low"""
+        import pickle
+        from sklearn.ensemble import RandomForestClassifier
+
+        feature_count = len(PrioritySuggestionService.FEATURE_NAMES)
+        X = [[days] + [0] * (feature_count - 1) for days in (0.5, 1, 2, 30, 60, 999)]
+        y = ['urgent', 'urgent', 'urgent', 'low', 'low', 'low']
+        clf = RandomForestClassifier(n_estimators=10, random_state=42).fit(X, y)
+
+        PriorityModel.objects.filter(board=self.board).update(is_active=False)
+        return PriorityModel.objects.create(
+            board=self.board, model_version=version, model_file=pickle.dumps(clf),
+            feature_importance=dict(zip(PrioritySuggestionService.FEATURE_NAMES, clf.feature_importances_)),
+            training_samples=len(X), accuracy_score=1.0, is_active=True,
+        )
+
+    def _task(self, days):
+        return Task.objects.create(
+            title=f'Due in {days}', column=self.column, created_by=self.user,
+            due_date=timezone.now() + timedelta(days=days),
+        )
+
+    def test_model_is_unpickled_once(self):
+        import pickle
+        from unittest.mock import patch
+
+        task = self._task(1)
+        with patch('ai_assistant.utils.priority_service.pickle.loads', side_effect=pickle.loads) as loads:
+            first = self.service.suggest_priority(task)
+            second = self.service.suggest_priority(task)
+
+        self.assertEqual(loads.call_count, 1)
+        self.assertTrue(first['is_ml_based'])
+        self.assertEqual(first['suggested_priority'], 'urgent')
+        self.assertEqual(
+            (first['suggested_priority'], first['confidence']),
+            (second['suggested_priority'], second['confidence']),
+        )
+
+    def test_new_model_version_is_loaded(self):
+        task = self._task(1)
+        self.assertEqual(self.service.suggest_priority(task)['model_version'], 1)
+
+        self._train(version=2)
+        self.assertEqual(self.service.suggest_priority(task)['model_version'], 2)
+
+    def test_batch_features_match_single_extraction(self):
+        parent = self._task(5)
+        child = self._task(3)
+        child.parent_task = parent
+        child.assigned_to = self.user
+        child.save()
+        child.dependencies.add(parent)
+
+        tasks = [parent, child]
+        batch = self.service._extract_features_batch(tasks, self.board)
+        for task, row in zip(tasks, batch):
+            single = self.service._extract_features(task)
+            self.assertAlmostEqual(single[0], row[0], places=2)
+            self.assertEqual(single[1:], row[1:])
+        self.assertEqual(batch[0][3:5], [0, 1])   # parent is blocked by child's dependency
+        self.assertEqual(batch[1][3:5], [1, 0])
+        self.assertEqual((batch[0][11], batch[1][12]), (1, 1))
+
+
 class PriorityDecisionTest(TestCase):
     def setUp(self):
         # Create organization
@@ -0,0 +1,121 @@
+"""
+Full-text search index (kanban/utils/search_index.py).
+
+Covers:
+  * The sync triggers index inserts, re-index title/description updates and
+    drop deleted rows — including queryset ``.update()`` writes.
+  * Prefix matching, BM25 order (title hits first) and escaped snippets.
+  * Board scoping in the index read and the caller's queryset in
+    ``ranked_objects``.
+  * User input cannot inject FTS5 syntax.
+  * Triggers dropped by a SQLite table rebuild are restored.
+  * ``migrate`` drops the triggers before applying a plan and reinstalls
+    them afterwards.
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from accounts.models import Organization
+from kanban.models import Board, Column, Task, Workspace
+from kanban.utils import search_index
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        if not search_index.is_available():
+            self.skipTest('FTS5 search index requires SQLite')
+        self.user = User.objects.create_user('fts_user', password='x')
+        org = Organization.objects.create(name='FTS Org', created_by=self.user)
+        ws = Workspace.objects.create(name='FTS WS', organization=org, created_by=self.user)
+        self.board = Board.objects.create(name='Mine', organization=org, workspace=ws, created_by=self.user)
+        self.other = Board.objects.create(name='Theirs', organization=org, workspace=ws, created_by=self.user)
+        self.column = Column.objects.create(board=self.board, name='To Do', position=0)
+        other_column = Column.objects.create(board=self.other, name='To Do', position=0)
+
+        self.title_hit = Task.objects.create(
+            column=self.column, title='Fix checkout timeout', created_by=self.user,
+        )
+        self.body_hit = Task.objects.create(
+            column=self.column, title='Payments', created_by=self.user,
+            description='<p>The <b>checkout</b> page is slow</p>',
+        )
+        self.elsewhere = Task.objects.create(
+            column=other_column, title='Checkout redesign', created_by=self.user,
+        )
+
+    def _ids(self, query, **scope):
+        return [hit.object_id for hit in search_index.search(query, ['task'], **scope)]
+
+    def test_ranked_by_bm25_with_prefix_terms_and_board_scope(self):
+        self.assertEqual(
+            self._ids('check', board_ids=[self.board.pk]),
+            [self.title_hit.pk, self.body_hit.pk],
+        )
+        self.assertIn(self.elsewhere.pk, self._ids('checkout', board_ids=Board.objects.values('id')))
+
+    def test_snippet_is_escaped_and_highlighted(self):
+        hit = search_index.search('slow', ['task'], board_ids=[self.board.pk])[0]
+        self.assertEqual(hit.object_id, self.body_hit.pk)
+        self.assertIn('<mark>slow</mark>', hit.snippet)
+        self.assertNotIn('<b>', hit.snippet)
+
+    def test_triggers_follow_updates_and_deletes(self):
+        Task.objects.filter(pk=self.title_hit.pk).update(title='Fix login timeout')
+        self.assertNotIn(self.title_hit.pk, self._ids('checkout'))
+        self.assertEqual(self._ids('login'), [self.title_hit.pk])
+
+        self.body_hit.delete()
+        self.assertEqual(self._ids('slow'), [])
+
+        created = Task.objects.create(column=self.column, title='Refund flow', created_by=self.user)
+        self.assertEqual(self._ids('refund'), [created.pk])
+
+    def test_ranked_objects_applies_the_callers_queryset(self):
+        tasks = search_index.ranked_objects(
+            Task.objects.exclude(pk=self.title_hit.pk), 'checkout', 'task',
+        )
+        self.assertEqual([task.pk for task in tasks], [self.elsewhere.pk, self.body_hit.pk])
+        self.assertTrue(all(task.search_snippet for task in tasks))
+
+    def test_query_syntax_is_quoted(self):
+        self.assertEqual(search_index.match_expression('checkout OR "x" NEAR(*'), '"checkout"* "OR"* "x"* "NEAR"*')
+        self.assertEqual(self._ids('checkout OR payments'), [])
+        self.assertIsNone(search_index.match_expression('**'))
+
+    def test_lost_triggers_are_reinstalled(self):
+        self.assertFalse(search_index.ensure_installed())
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {search_index.TABLE}_task_ai")
+
+        self.assertTrue(search_index.ensure_installed())
+        created = Task.objects.create(column=self.column, title='Refund flow', created_by=self.user)
+        self.assertEqual(self._ids('refund'), [created.pk])
+
+    def _triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                [f'{search_index.TABLE}%'],
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_migrate_drops_triggers_first_and_reinstalls_them_after(self):
+        from django.apps import apps
+        from django.db.models.signals import post_migrate, pre_migrate
+
+        config = apps.get_app_config('kanban')
+        signal_kwargs = dict(
+            sender=config, app_config=config, verbosity=0, interactive=False,
+            using=connection.alias, apps=apps,
+        )
+        pre_migrate.send(plan=[], **signal_kwargs)
+        self.assertEqual(self._triggers(), set(search_index._trigger_names()))
+
+        pre_migrate.send(plan=[(object(), False)], **signal_kwargs)
+        self.assertEqual(self._triggers(), set())
+        written = Task.objects.create(column=self.column, title='Refund flow', created_by=self.user)
+
+        post_migrate.send(plan=[(object(), False)], **signal_kwargs)
+        self.assertEqual(self._triggers(), set(search_index._trigger_names()))
+        self.assertEqual(self._ids('refund'), [written.pk])
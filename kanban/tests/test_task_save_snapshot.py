@@ -0,0 +1,86 @@
+"""
+Query-count regression test for the shared pre-save Task snapshot.
+
+Assignment, priority/progress, column-entry, tracked-field and due-date
+tracking in kanban/signals.py, the webhook move/assign detectors and the
+knowledge-graph completion tracker all need the task's previous row. They read
+it through ``Task.get_previous_state()``, which loads it once per save — so a
+drag-and-drop re-reads the task row exactly once instead of once per receiver.
+"""
+from datetime import date, datetime, time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+class TaskSaveSnapshotTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Workspace, Board, BoardMembership, Column, Task
+
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+
+        self.owner = User.objects.create_user(username='snap_owner', password='pw')
+        self.member = User.objects.create_user(username='snap_member', password='pw')
+        org = Organization.objects.create(name='Snap Org', created_by=self.owner)
+        ws = Workspace.objects.create(name='Snap WS', organization=org, created_by=self.owner)
+        self.board = Board.objects.create(
+            name='Snap Board', created_by=self.owner, owner=self.owner,
+            organization=org, workspace=ws,
+        )
+        BoardMembership.objects.create(board=self.board, user=self.member, role='member')
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.doing = Column.objects.create(board=self.board, name='In Progress', position=1)
+        task = Task.objects.create(
+            column=self.todo, title='Snapshot task', created_by=self.owner,
+            start_date=date(2026, 6, 1),
+            due_date=timezone.make_aware(datetime.combine(date(2026, 6, 10), time(17))),
+        )
+        self.task = Task.objects.get(pk=task.pk)
+
+    def _row_reloads(self, queries):
+        marker = f'"kanban_task"."id" = {self.task.pk}'
+        return [
+            q['sql'] for q in queries
+            if q['sql'].startswith('SELECT') and 'FROM "kanban_task"' in q['sql'] and marker in q['sql']
+        ]
+
+    def test_drag_and_drop_reads_previous_row_once(self):
+        self.task.column = self.doing
+        self.task.assigned_to = self.member
+        self.task.priority = 'high'
+        with CaptureQueriesContext(connection) as ctx:
+            self.task.save()
+
+        self.assertEqual(len(self._row_reloads(ctx.captured_queries)), 1)
+        # The flags every receiver derives from the snapshot are still set.
+        self.assertEqual(self.task._old_column_id, self.todo.pk)
+        self.assertIsNone(self.task._old_assigned_to_id)
+        self.assertTrue(self.task._priority_changed)
+
+    def test_snapshot_is_refreshed_for_each_save(self):
+        self.task.column = self.doing
+        self.task.save()
+        self.assertEqual(self.task._old_column_id, self.todo.pk)
+
+        self.task.description = 'changed'
+        with CaptureQueriesContext(connection) as ctx:
+            self.task.save()
+
+        self.assertEqual(len(self._row_reloads(ctx.captured_queries)), 1)
+        self.assertEqual(self.task._old_column_id, self.doing.pk)
+        self.assertEqual(set(self.task._field_changes), {'description'})
+
+    def test_new_task_has_no_previous_state(self):
+        from kanban.models import Task
+
+        task = Task(column=self.todo, title='Fresh', created_by=self.owner)
+        self.assertIsNone(task.get_previous_state())
+        task.save()
+        self.assertEqual(task._field_changes, {})
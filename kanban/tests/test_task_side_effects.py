@@ -0,0 +1,163 @@
+"""
+Coalesced post-save side effects for Task writes.
+
+Per-user workload/profile refreshes and per-board branch recalculation are
+handed to kanban.utils.side_effects.defer(). A plain save still runs them
+immediately; inside coalesce_side_effects() (board import, live migration,
+drag-and-drop moves, automation actions) each distinct effect runs once,
+after the transaction commits.
+"""
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from kanban.utils.side_effects import coalesce_side_effects, defer, is_coalescing
+
+
+class TaskSideEffectsTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization
+        from kanban.models import Workspace, Board, BoardMembership, Column
+
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+
+        self.owner = User.objects.create_user(username='fx_owner', password='pw')
+        self.alice = User.objects.create_user(username='fx_alice', password='pw')
+        self.bob = User.objects.create_user(username='fx_bob', password='pw')
+        org = Organization.objects.create(name='FX Org', created_by=self.owner)
+        ws = Workspace.objects.create(name='FX WS', organization=org, created_by=self.owner)
+        self.board = Board.objects.create(
+            name='FX Board', created_by=self.owner, owner=self.owner,
+            organization=org, workspace=ws,
+        )
+        for user in (self.alice, self.bob):
+            BoardMembership.objects.create(board=self.board, user=user, role='member')
+        self.column = Column.objects.create(board=self.board, name='To Do', position=0)
+
+    def _create_tasks(self, count):
+        from kanban.models import Task
+
+        return [
+            Task.objects.create(
+                column=self.column, title=f'Task {n}', created_by=self.owner,
+                assigned_to=self.alice if n % 2 else self.bob,
+            )
+            for n in range(count)
+        ]
+
+    def test_plain_save_runs_effects_immediately(self):
+        from kanban.resource_leveling_models import UserPerformanceProfile
+
+        self._create_tasks(1)
+
+        profile = UserPerformanceProfile.objects.get(user=self.bob)
+        self.assertEqual(profile.current_active_tasks, 1)
+
+    def test_scope_runs_each_effect_once_after_commit(self):
+        from kanban.resource_leveling_models import UserPerformanceProfile
+
+        with patch('kanban.signals._recalc_user_workload') as recalc, \
+                patch.object(UserPerformanceProfile, 'update_current_workload',
+                             autospec=True) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                with coalesce_side_effects():
+                    self.assertTrue(is_coalescing())
+                    self._create_tasks(20)
+                    self.assertEqual(recalc.call_count, 0)
+                    self.assertEqual(refresh.call_count, 0)
+
+        self.assertEqual(
+            sorted(call.args[0].pk for call in recalc.call_args_list),
+            sorted([self.alice.pk, self.bob.pk]),
+        )
+        self.assertEqual(
+            sorted(call.args[0].user_id for call in refresh.call_args_list),
+            sorted([self.alice.pk, self.bob.pk]),
+        )
+        self.assertFalse(is_coalescing())
+
+    def test_nested_scopes_share_the_outer_batch(self):
+        with patch('kanban.signals._recalc_user_workload') as recalc:
+            with self.captureOnCommitCallbacks(execute=True):
+                with coalesce_side_effects():
+                    self._create_tasks(2)
+                    with coalesce_side_effects():
+                        self._create_tasks(2)
+                    self.assertEqual(recalc.call_count, 0)
+
+        self.assertEqual(recalc.call_count, 2)
+
+    def test_rolled_back_transaction_drops_the_batch(self):
+        with patch('kanban.signals._recalc_user_workload') as recalc:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic(), coalesce_side_effects():
+                        self._create_tasks(2)
+                        raise RuntimeError('abort import')
+                except RuntimeError:
+                    pass
+
+        recalc.assert_not_called()
+
+    @override_settings(TASK_SIDE_EFFECTS_ASYNC=True)
+    def test_async_mode_hands_one_batch_to_celery(self):
+        with patch('kanban.tasks.side_effect_tasks.run_side_effect_batch.delay') as delay, \
+                patch('kanban.signals._recalc_user_workload') as recalc:
+            with self.captureOnCommitCallbacks(execute=True):
+                with coalesce_side_effects():
+                    self._create_tasks(6)
+
+        recalc.assert_not_called()
+        delay.assert_called_once()
+        batch = delay.call_args.args[0]
+        self.assertIn(['user_workload', [self.alice.pk]], batch)
+        self.assertEqual(len(batch), len({(name, tuple(args)) for name, args in batch}))
+
+    def test_narrow_key_keeps_first_arguments(self):
+        from kanban.utils import side_effects
+
+        seen = []
+        with patch.dict(side_effects._effects, {'probe': lambda *args: seen.append(args)}):
+            with self.captureOnCommitCallbacks(execute=True):
+                with coalesce_side_effects():
+                    defer('probe', 1, 'first', key=(1,))
+                    defer('probe', 1, 'second', key=(1,))
+                    defer('probe', 2, 'other', key=(2,))
+
+        self.assertEqual(seen, [(1, 'first'), (2, 'other')])
+
+    def test_move_and_automation_writes_are_coalesced(self):
+        from kanban.models import Column, Task
+        from kanban.signals import _automation_guard
+
+        tasks = self._create_tasks(4)
+        done = Column.objects.create(board=self.board, name='Done', position=1)
+        seen = []
+
+        def probe(sender, instance, **kwargs):
+            seen.append(is_coalescing())
+
+        post_save.connect(probe, sender=Task)
+        self.addCleanup(post_save.disconnect, probe, sender=Task)
+
+        self.client.force_login(self.owner)
+        self.client.post(
+            reverse('move_task'),
+            data=json.dumps({'taskId': tasks[0].pk, 'columnId': self.column.pk, 'position': 3}),
+            content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        with _automation_guard():
+            for task in tasks[1:]:
+                task.column = done
+                task.save()
+
+        self.assertGreaterEqual(len(seen), 7)   # moved + 3 reordered + 3 automation saves
+        self.assertTrue(all(seen))
+        self.assertFalse(is_coalescing())
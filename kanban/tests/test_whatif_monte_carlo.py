@@ -0,0 +1,118 @@
+"""
+Monte Carlo completion dates for What-If / Shadow Branch simulations.
+
+Covers:
+  * ScheduleMonteCarlo percentiles and delay probability on a degenerate
+    (constant-velocity) history where the answer is known exactly.
+  * Common random numbers: more work or a smaller team never finishes
+    earlier within one batch, and a fixed seed reproduces the batch.
+  * A scenario's result is the same alone or inside a larger batch.
+  * WhatIfEngine.simulate_many reads the board once regardless of how many
+    scenarios it evaluates.
+"""
+
+import unittest
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from kanban.utils.schedule_monte_carlo import NUMPY_AVAILABLE, ScheduleMonteCarlo
+
+START = date(2026, 3, 2)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, 'numpy is not installed')
+class ScheduleMonteCarloTest(unittest.TestCase):
+    def test_constant_velocity_is_exact(self):
+        sampler = ScheduleMonteCarlo([5, 5, 5], trials=500)
+        late, early, done = sampler.run([
+            {'remaining': 10, 'deadline': START + timedelta(days=10)},
+            {'remaining': 10, 'deadline': START + timedelta(days=21)},
+            {'remaining': 0},
+        ], start=START)
+
+        two_weeks = (START + timedelta(days=14)).isoformat()
+        self.assertEqual((late['p50_date'], late['p95_date']), (two_weeks, two_weeks))
+        self.assertEqual(late['delay_probability'], 100.0)
+        self.assertEqual(early['delay_probability'], 0.0)
+        self.assertIsNone(done['delay_probability'])
+        self.assertEqual(done['p50_date'], START.isoformat())
+
+    def test_batch_is_ordered_and_reproducible(self):
+        sampler = ScheduleMonteCarlo([2, 6, 4, 0, 8, 5], trials=2000, seed=7)
+        scenarios = [
+            {'remaining': 30, 'velocity_factor': 1.0},
+            {'remaining': 45, 'velocity_factor': 1.0},
+            {'remaining': 45, 'velocity_factor': 0.8},
+        ]
+        base, more, smaller_team = sampler.run(scenarios, start=START)
+
+        for r in (base, more, smaller_team):
+            self.assertLessEqual(r['p50_date'], r['p80_date'])
+            self.assertLessEqual(r['p80_date'], r['p95_date'])
+        self.assertLess(base['p50_date'], more['p50_date'])
+        self.assertLess(more['p80_date'], smaller_team['p80_date'])
+        self.assertEqual(sampler.run(scenarios, start=START), [base, more, smaller_team])
+
+    def test_result_does_not_depend_on_the_rest_of_the_batch(self):
+        for history, baseline in (([3, 5, 2, 6, 4, 0, 7], 0), ([], 4.0)):
+            sampler = ScheduleMonteCarlo(history, baseline, trials=2000, seed=7)
+            scenario = {'remaining': 20, 'deadline': START + timedelta(weeks=6)}
+            alone, = sampler.run([scenario], start=START)
+            _, batched, _ = sampler.run([
+                {'remaining': 400, 'velocity_factor': 0.5}, scenario, {'remaining': 3},
+            ], start=START)
+            self.assertEqual(alone, batched)
+
+    def test_no_velocity_data(self):
+        self.assertEqual(ScheduleMonteCarlo([0, 0, 0], 0).run([{'remaining': 3}]), [None])
+        self.assertEqual(ScheduleMonteCarlo([], 4.0).source, 'baseline')
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, 'numpy is not installed')
+class WhatIfEngineBatchTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from accounts.models import Organization
+        from kanban.burndown_models import TeamVelocitySnapshot
+        from kanban.models import Board, Column, Task
+
+        user = User.objects.create_user(username='mc_user', password='pw')
+        org = Organization.objects.create(name='MC Org', created_by=user)
+        self.board = Board.objects.create(
+            name='MC Board', organization=org, created_by=user,
+            project_deadline=timezone.now().date() + timedelta(weeks=6),
+        )
+        column = Column.objects.create(board=self.board, name='To Do', position=0)
+        for i in range(20):
+            Task.objects.create(column=column, title=f'Task {i}', created_by=user)
+        today = timezone.now().date()
+        for weeks_ago, done in enumerate([4, 5, 3, 6]):
+            end = today - timedelta(weeks=weeks_ago)
+            TeamVelocitySnapshot.objects.create(
+                board=self.board, period_start=end - timedelta(days=6),
+                period_end=end, tasks_completed=done,
+            )
+
+    def _queries(self, engine, n):
+        params = [{'tasks_added': i, 'team_size_delta': 0, 'deadline_shift_days': 0} for i in range(n)]
+        with CaptureQueriesContext(connection) as ctx:
+            results = engine.simulate_many(params)
+        return len(ctx.captured_queries), results
+
+    def test_simulate_many_reads_board_once(self):
+        from kanban.utils.whatif_engine import WhatIfEngine
+
+        engine = WhatIfEngine(self.board)
+        one, _ = self._queries(engine, 1)
+        many, results = self._queries(engine, 25)
+
+        self.assertEqual(one, many)
+        self.assertEqual(len(results), 25)
+        first, last = results[0]['projected'], results[-1]['projected']
+        self.assertEqual(first['monte_carlo']['source'], 'history')
+        self.assertEqual(first['delay_probability'], min(first['monte_carlo']['delay_probability'], 99))
+        self.assertLessEqual(first['monte_carlo']['p50_date'], last['monte_carlo']['p50_date'])
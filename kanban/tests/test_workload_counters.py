@@ -0,0 +1,125 @@
+"""
+Incremental workload counters behind UserProfile.current_workload_hours.
+
+Each assigned task in a non-done column contributes one unit to the
+UserBoardWorkload row of (assignee, board). Saves move that unit only when the
+assignee or the column's done-state changes; reconcile_workload_counters()
+repairs drift from writes that bypass the signals.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from kanban.utils.workload_counters import reconcile_workload_counters
+
+
+class WorkloadCountersTest(TestCase):
+    def setUp(self):
+        from accounts.models import Organization, UserProfile
+        from kanban.models import Workspace, Board, BoardMembership, Column
+
+        celery_patcher = patch('celery.app.task.Task.apply_async', return_value=None)
+        celery_patcher.start()
+        self.addCleanup(celery_patcher.stop)
+
+        self.owner = User.objects.create_user(username='wl_owner', password='pw')
+        self.alice = User.objects.create_user(username='wl_alice', password='pw')
+        self.bob = User.objects.create_user(username='wl_bob', password='pw')
+        org = Organization.objects.create(name='WL Org', created_by=self.owner)
+        ws = Workspace.objects.create(name='WL WS', organization=org, created_by=self.owner)
+        self.board = Board.objects.create(
+            name='WL Board', created_by=self.owner, owner=self.owner,
+            organization=org, workspace=ws,
+        )
+        for user in (self.alice, self.bob):
+            BoardMembership.objects.create(board=self.board, user=user, role='member')
+            UserProfile.objects.create(user=user, organization=org)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+
+    def _counter(self, user):
+        from kanban.models import UserBoardWorkload
+
+        row = UserBoardWorkload.objects.filter(user=user, board=self.board).first()
+        return row.active_tasks if row else 0
+
+    def _hours(self, user):
+        user.profile.refresh_from_db()
+        return user.profile.current_workload_hours
+
+    def _legacy_count(self, user):
+        return user.assigned_tasks.filter(column__board=self.board).exclude(
+            Q(column__name__icontains='done') | Q(column__name__icontains='complete')
+        ).count()
+
+    def _task(self, **kwargs):
+        from kanban.models import Task
+
+        kwargs.setdefault('column', self.todo)
+        return Task.objects.create(title='Work', created_by=self.owner, **kwargs)
+
+    def test_assign_reassign_and_complete(self):
+        task = self._task(assigned_to=self.alice)
+        self._task(assigned_to=self.alice)
+        self.assertEqual(self._counter(self.alice), 2)
+        self.assertEqual(self._hours(self.alice), 16)
+
+        task.assigned_to = self.bob
+        task.save()
+        self.assertEqual((self._counter(self.alice), self._counter(self.bob)), (1, 1))
+        self.assertEqual((self._hours(self.alice), self._hours(self.bob)), (8, 8))
+
+        task.column = self.done
+        task.save()
+        self.assertEqual(self._counter(self.bob), 0)
+        self.assertEqual(self._hours(self.bob), 0)
+
+        task.column = self.todo
+        task.save()
+        self.assertEqual(self._counter(self.bob), 1)
+        for user in (self.alice, self.bob):
+            self.assertEqual(self._counter(user), self._legacy_count(user))
+
+    def test_unrelated_edit_does_not_touch_counters(self):
+        task = self._task(assigned_to=self.alice)
+        task.description = 'more detail'
+
+        with CaptureQueriesContext(connection) as ctx:
+            task.save()
+
+        touched = [
+            q['sql'] for q in ctx.captured_queries
+            if 'kanban_userboardworkload' in q['sql'] or 'accounts_userprofile' in q['sql']
+        ]
+        self.assertEqual(touched, [])
+
+    def test_column_rename_moves_its_tasks(self):
+        self._task(assigned_to=self.alice)
+        self._task(assigned_to=self.alice)
+
+        self.todo.name = 'Completed'
+        self.todo.save()
+        self.assertEqual(self._counter(self.alice), 0)
+        self.assertEqual(self._hours(self.alice), 0)
+
+        self.todo.name = 'Backlog'
+        self.todo.save()
+        self.assertEqual(self._counter(self.alice), 2)
+
+    def test_reconciliation_repairs_drift(self):
+        from kanban.models import Task
+
+        task = self._task(assigned_to=self.alice)
+        # Queryset updates bypass the Task signals.
+        Task.objects.filter(pk=task.pk).update(assigned_to=self.bob)
+        self.assertEqual((self._counter(self.alice), self._counter(self.bob)), (1, 0))
+
+        drifted = reconcile_workload_counters()
+
+        self.assertEqual(drifted, {self.alice.pk, self.bob.pk})
+        self.assertEqual((self._counter(self.alice), self._counter(self.bob)), (0, 1))
+        self.assertEqual(reconcile_workload_counters(), set())
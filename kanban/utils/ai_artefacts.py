@@ -0,0 +1,190 @@
+"""
+Stale-while-revalidate for AI-generated board artefacts.
+
+Board summaries, analytics summaries and analytics narratives each take one
+5–15 s LLM call. Pages that show them call ``get_board_artefact()``, which
+returns the last good value straight away with a staleness marker; when the
+value is older than ``AI_SWR_FRESH_FOR[name]`` one background refresh is
+queued on the ``ai_tasks`` queue (kanban/tasks/ai_artefact_tasks.py). Refreshes
+are throttled per board and artefact with an ``ai_cache_manager`` claim, so a
+burst of page loads queues a single LLM call.
+
+Where the last good value lives depends on the artefact: the board summary
+and narrative are persisted on Board (``ai_summary`` /
+``analytics_narrative`` and their ``*_generated_at``); the analytics summary
+is only kept in the AI cache via ``ai_cache_manager.set_entry()``.
+"""
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class BoardArtefact:
+    """
+    One AI artefact kind.
+
+    ``load(board)`` returns ``(value, generated_at)`` for the last good value
+    (``(None, None)`` if there is none); ``produce(board)`` makes the LLM call,
+    stores the result so ``load`` sees it, and returns the value or None.
+    """
+
+    def __init__(self, name, load, produce, fresh_for):
+        self.name = name
+        self.load = load
+        self.produce = produce
+        self.default_fresh_for = fresh_for
+
+    @property
+    def fresh_for(self):
+        return getattr(settings, 'AI_SWR_FRESH_FOR', {}).get(self.name, self.default_fresh_for)
+
+
+ARTEFACTS = {}
+
+
+def register(name, load, produce, fresh_for=3600):
+    ARTEFACTS[name] = BoardArtefact(name, load, produce, fresh_for)
+
+
+def artefact_state(board, name):
+    """
+    The last good value of artefact ``name`` for ``board`` without side effects.
+
+    Returns:
+        dict with ``value`` (None if there is none yet), ``generated_at``
+        (aware datetime or None) and ``stale`` (True when missing or older
+        than ``AI_SWR_FRESH_FOR[name]``)
+    """
+    artefact = ARTEFACTS[name]
+    value, generated_at = artefact.load(board)
+    stale = value is None or generated_at is None or (
+        (timezone.now() - generated_at).total_seconds() > artefact.fresh_for
+    )
+    return {'value': value, 'generated_at': generated_at, 'stale': stale}
+
+
+def get_board_artefact(board, name, produce_on_miss=False):
+    """
+    artefact_state(), plus a throttled background refresh when the value is
+    stale, a ``refreshing`` flag saying whether this call queued it, and a
+    ``produced`` flag saying whether this call generated the value inline.
+
+    A missing value is not refreshed in the background: the caller either
+    passes ``produce_on_miss`` to generate it inline, or runs its own
+    (blocking or streamed) generation path.
+    """
+    state = artefact_state(board, name)
+    state['refreshing'] = False
+    state['produced'] = False
+    if state['value'] is None:
+        if produce_on_miss:
+            state['produced'] = True
+            value = ARTEFACTS[name].produce(board)
+            if value is not None:
+                state.update(value=value, generated_at=timezone.now(), stale=False)
+    elif state['stale']:
+        state['refreshing'] = schedule_refresh(board.pk, name)
+    return state
+
+
+def schedule_refresh(board_id, name):
+    """Queue one background refresh unless one was queued within the throttle window."""
+    from kanban_board.ai_cache import ai_cache_manager
+
+    throttle = getattr(settings, 'AI_SWR_REFRESH_THROTTLE', 300)
+    if not ai_cache_manager.claim_refresh(name, board_id, throttle):
+        return False
+    try:
+        from kanban.tasks.ai_artefact_tasks import refresh_board_artefact_task
+        refresh_board_artefact_task.apply_async(args=[board_id, name])
+    except Exception as exc:
+        logger.warning(f"Could not queue {name} refresh for board {board_id}: {exc}")
+        ai_cache_manager.release_refresh(name, board_id)
+        return False
+    return True
+
+
+def refresh_board_artefact(board_id, name):
+    """Regenerate artefact ``name`` for a board now. Returns the value or None."""
+    from kanban.models import Board
+
+    try:
+        board = Board.objects.get(pk=board_id)
+    except Board.DoesNotExist:
+        return None
+    return ARTEFACTS[name].produce(board)
+
+
+def store_board_artefact(board, name, value):
+    """Record a value produced outside produce(), e.g. by the streaming task."""
+    from kanban_board.ai_cache import ai_cache_manager
+
+    if name == 'analytics_summary':
+        ai_cache_manager.set_entry(name, board.pk, value)
+
+
+# ---------------------------------------------------------------------------
+# Registered artefacts
+# ---------------------------------------------------------------------------
+
+def _load_board_summary(board):
+    return board.ai_summary or None, board.ai_summary_generated_at
+
+
+def _produce_board_summary(board):
+    from kanban.utils.ai_utils import generate_and_save_board_summary
+
+    return generate_and_save_board_summary(board)
+
+
+def _load_analytics_summary(board):
+    from kanban_board.ai_cache import ai_cache_manager
+
+    entry = ai_cache_manager.get_entry('analytics_summary', board.pk)
+    if not entry:
+        return None, None
+    return entry['value'], datetime.fromtimestamp(entry['generated_at'], tz=dt_timezone.utc)
+
+
+def _produce_analytics_summary(board):
+    from kanban.utils.ai_utils import summarize_board_analytics
+    from kanban.utils.analytics_helpers import get_board_analytics_summary_data
+
+    summary = summarize_board_analytics(get_board_analytics_summary_data(board))
+    if summary:
+        store_board_artefact(board, 'analytics_summary', summary)
+    return summary or None
+
+
+def _load_analytics_narrative(board):
+    return board.analytics_narrative or None, board.analytics_narrative_generated_at
+
+
+def produce_analytics_narrative(board):
+    """Generate the promoted-metrics narrative and save it on the board."""
+    from kanban.utils.ai_utils import generate_board_analytics_narrative
+    from kanban.utils.analytics_helpers import get_promoted_metrics
+
+    metrics = get_promoted_metrics(board)
+    narrative = generate_board_analytics_narrative(board, metrics)
+    if narrative is None:
+        return None
+    board.analytics_narrative = narrative
+    board.analytics_narrative_generated_at = timezone.now()
+    board.analytics_narrative_metric_snapshot = {
+        k: v for k, v in metrics.items() if isinstance(v, (str, int, float))
+    }
+    board.save(update_fields=[
+        'analytics_narrative', 'analytics_narrative_generated_at',
+        'analytics_narrative_metric_snapshot',
+    ])
+    return narrative
+
+
+register('board_summary', _load_board_summary, _produce_board_summary, fresh_for=3600)
+register('analytics_summary', _load_analytics_summary, _produce_analytics_summary, fresh_for=1800)
+register('analytics_narrative', _load_analytics_narrative, produce_analytics_narrative, fresh_for=3600)
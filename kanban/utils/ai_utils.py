@@ -264,7 +264,8 @@ def generate_ai_content(prompt: str, task_type='simple', use_cache: bool = True,
     - Creative tasks (0.6): task_description, retrospective
     - Conversational (0.7): chat responses
     
-    Caching is enabled by default to reduce API costs.
+    Caching is enabled by default to reduce API costs. Concurrent identical
+    requests are single-flighted: one AI call, the others get its result.
     
     Args:
         prompt: The prompt to send to the Gemini API
@@ -288,7 +289,15 @@ def generate_ai_content(prompt: str, task_type='simple', use_cache: bool = True,
         if cached is not None:
             logger.debug(f"AI content cache HIT for task_type: {task_type}")
             return cached
-    
+        return ai_cache_manager.single_flight(
+            prompt, lambda: _generate_ai_content(prompt, task_type, use_cache, context_id),
+            task_type, context_id,
+        )
+    return _generate_ai_content(prompt, task_type, use_cache, context_id)
+
+
+def _generate_ai_content(prompt, task_type, use_cache, context_id):
+    """The uncached AI call behind generate_ai_content(); stores its result when use_cache."""
     try:
         from ai_assistant.utils.ai_router import AIRouter
         router = AIRouter()
@@ -314,6 +323,7 @@ def generate_ai_content(prompt: str, task_type='simple', use_cache: bool = True,
         if result:
             # Cache the result if caching is enabled
             if use_cache:
+                from kanban_board.ai_cache import ai_cache_manager
                 ai_cache_manager.set(prompt, result, task_type, context_id)
                 logger.debug(f"AI content cached for task_type: {task_type}")
             return result
@@ -3573,16 +3583,81 @@ def analyze_critical_path(board_data: Dict) -> Optional[Dict]:
     """
     Analyze task dependencies and identify critical path using AI.
     
+    When ``board_data['cpm']`` holds the result of
+    ``DependencyGraph.critical_path()`` (kanban/utils/dependency_dag.py), the
+    model is given those numbers to narrate, and the critical path, dates and
+    slack in the returned analysis are overwritten with them, so the LLM only
+    contributes reasoning, risks and recommendations.
+    
     Args:
         board_data: Dictionary containing board tasks with dependencies, dates, and durations
         
     Returns:
         Dictionary with critical path analysis, slack times, and schedule insights
     """
+    result = _analyze_critical_path_ai(board_data)
+    cpm = board_data.get('cpm')
+    if result and cpm:
+        _apply_cpm_ground_truth(result, cpm)
+    return result
+
+
+def _apply_cpm_ground_truth(result: Dict, cpm: Dict) -> None:
+    """Replace the schedule numbers in an AI critical-path analysis with CPM results."""
+    cpm_tasks = {str(tid): data for tid, data in cpm['tasks'].items()}
+    
+    why = {
+        str(item.get('task_id')): item.get('why_critical')
+        for item in result.get('critical_path') or [] if isinstance(item, dict)
+    }
+    result['critical_path'] = [
+        {
+            'task_id': str(tid),
+            'task_title': cpm_tasks[str(tid)]['title'],
+            'position_in_path': position,
+            'duration_days': cpm_tasks[str(tid)]['duration_days'],
+            'earliest_start': cpm_tasks[str(tid)]['earliest_start'],
+            'earliest_finish': cpm_tasks[str(tid)]['earliest_finish'],
+            'why_critical': why.get(str(tid)) or 'Zero slack: any delay moves the project finish date.',
+        }
+        for position, tid in enumerate(cpm['critical_path'], start=1)
+    ]
+    
+    narrated = {
+        str(item.get('task_id')): item
+        for item in result.get('task_analysis') or [] if isinstance(item, dict)
+    }
+    task_analysis = []
+    for tid, data in cpm_tasks.items():
+        item = dict(narrated.get(tid, {}))
+        item.update({
+            'task_id': tid,
+            'task_title': data['title'],
+            'earliest_start': data['earliest_start'],
+            'earliest_finish': data['earliest_finish'],
+            'latest_start': data['latest_start'],
+            'latest_finish': data['latest_finish'],
+            'slack_days': data['slack_days'],
+            'is_critical': data['is_critical'],
+        })
+        item.pop('slack_hours', None)
+        task_analysis.append(item)
+    result['task_analysis'] = task_analysis
+    
+    insights = result.setdefault('project_insights', {})
+    insights['project_completion_date'] = cpm['project_finish']
+    insights['critical_path_duration_days'] = cpm['duration_days']
+    for stale_key in ('total_duration_hours', 'critical_path_duration'):
+        insights.pop(stale_key, None)
+    result['schedule_source'] = 'cpm'
+
+
+def _analyze_critical_path_ai(board_data: Dict) -> Optional[Dict]:
     try:
         tasks_info = board_data.get('tasks', [])
         if not tasks_info:
             return None
+        cpm_tasks = {str(tid): data for tid, data in (board_data.get('cpm') or {}).get('tasks', {}).items()}
               # Format tasks for AI analysis
         formatted_tasks = []
         for task in tasks_info:
@@ -3595,7 +3670,27 @@ def analyze_critical_path(board_data: Dict) -> Optional[Dict]:
             Column: {task.get('column_name', 'Unknown')}
             Priority: {task.get('priority', 'medium')}
             """
+            cpm_task = cpm_tasks.get(str(task.get('id')))
+            if cpm_task:
+                task_str += f"""Earliest Start/Finish: {cpm_task['earliest_start']} / {cpm_task['earliest_finish']}
+            Latest Start/Finish: {cpm_task['latest_start']} / {cpm_task['latest_finish']}
+            Slack: {cpm_task['slack_days']} days{' (CRITICAL)' if cpm_task['is_critical'] else ''}
+            """
             formatted_tasks.append(task_str)
+        
+        ground_truth = ''
+        if cpm_tasks:
+            cpm = board_data['cpm']
+            path_titles = ' -> '.join(cpm['tasks'][tid]['title'] for tid in cpm['critical_path'])
+            ground_truth = f"""
+        ## Computed Schedule (authoritative):
+        The critical path, earliest/latest dates and slack above were computed with the
+        Critical Path Method from the actual dependencies and dates. Use these numbers
+        exactly as given; do not recalculate them. Explain what they mean, assess risks
+        and recommend actions.
+        Critical path: {path_titles or 'none'}
+        Project finish: {cpm['project_finish']} ({cpm['duration_days']} days)
+        """
             
         prompt = f"""
         Analyze these project tasks to identify the critical path, calculate slack times, and assess schedule risks.
@@ -3604,7 +3699,7 @@ def analyze_critical_path(board_data: Dict) -> Optional[Dict]:
         
         ## Project Tasks:
         {chr(10).join(formatted_tasks)}
-        
+        {ground_truth}
         ## Analysis Required:
         1. **Critical Path Identification**: Find the longest sequence of dependent tasks that determines project duration
         2. **Slack Time Calculation**: Calculate float time for each task (Latest Start - Earliest Start)
@@ -7,8 +7,7 @@ provides aggregation helpers for portfolio-level analytics.
 import logging
 from datetime import timedelta
 
-from django.db.models import Count, Avg, Q, F
-from django.db.models.functions import Coalesce, TruncDate
+from django.db.models import Count, Avg, FilteredRelation, Q
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -146,52 +145,50 @@ PROMOTED_METRICS = {
 }
 
 
-def get_promoted_metrics(board, raw=False):
-    """
-    Calculate the promoted metrics for a board based on its project_type.
+def _pct(part, whole):
+    return int(part / whole * 100) if whole else 0
 
-    Returns a dict of metric_name → value.
-    Falls back to a generic set if project_type is not set.
-    """
-    from kanban.models import Task, Column, TaskActivity
 
-    project_type = board.project_type or 'product_tech'
-    today = timezone.now().date()
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
+def _fact_metrics(project_type, facts, row=None):
+    """
+    Raw promoted-metric values and explanations from BoardDailyMetrics fields.
 
-    tasks = Task.objects.filter(column__board=board, item_type='task')
-    total = tasks.count()
+    ``facts`` maps fact field names to numbers — one board's row, or the sums
+    over every board in a portfolio group. ``row`` (single board only) adds
+    the per-column and per-assignee breakdowns, which have no portfolio
+    equivalent.
 
+    Returns (metrics, explanations, headline_overrides).
+    """
     metrics = {}
-    task_details = {}        # key -> list of task dicts for modal display
-    explanations = {}        # key -> human-readable explanation string
-    headline_overrides = {}  # key -> headline string (when it differs from the breakdown)
+    explanations = {}
+    headline_overrides = {}
 
-    if project_type == 'product_tech':
-        # Task velocity: tasks completed in last 7 days
-        completed_last_week = tasks.filter(progress=100, updated_at__gte=seven_days_ago).count()
-        metrics['task_velocity'] = f"{completed_last_week} tasks/week"
+    def _workload():
+        # Named contributors first (by volume), the 'Unassigned' bucket last so
+        # it reads as a separate pile rather than a teammate.
+        workload = sorted(row.workload, key=lambda w: (w['username'] is None, -w['count']))
+        metrics['workload_distribution'] = {
+            (w['username'] or 'Unassigned'): f"{w['active']} active / {w['count']} total"
+            for w in workload
+        }
+        explanations['workload_distribution'] = (
+            "All team members with tasks on this board. "
+            "Shows active (incomplete) and total task counts per contributor."
+        )
 
-        # Overdue count
-        overdue = tasks.filter(
-            due_date__isnull=False, due_date__date__lt=today
-        ).exclude(progress=100).count()
-        metrics['overdue_count'] = overdue
+    if project_type == 'product_tech':
+        # Task velocity: tasks completed in the last 7 days
+        metrics['task_velocity'] = f"{facts['completed_last_7d']} tasks/week"
+        metrics['overdue_count'] = facts['overdue_count']
 
         # High-priority / at-risk count: urgent tasks, plus high-priority tasks
         # with 0% progress. NOTE: this is a priority-based attention signal, NOT
         # a true "blocked" state — the data has no dependency/blocked field.
-        blocked_qs = tasks.filter(
-            Q(priority='urgent') | Q(priority='high', progress=0)
-        ).exclude(progress=100).select_related('column', 'assigned_to')
-        metrics['blocked_count'] = blocked_qs.count()
-        task_details['blocked_count'] = list(
-            blocked_qs.values('id', 'title', 'priority', 'column__name', 'assigned_to__username')[:20]
-        )
+        metrics['blocked_count'] = facts['at_risk_count']
         explanations['blocked_count'] = (
             f"High-priority / at-risk tasks: urgent priority, or high priority with 0% progress. "
-            f"Found {blocked_qs.count()} task(s) that may need attention "
+            f"Found {facts['at_risk_count']} task(s) that may need attention "
             f"(not necessarily blocked)."
         )
 
@@ -202,67 +199,33 @@ def get_promoted_metrics(board, raw=False):
         # progress is coupled to column (a task only hits 100% in Done), every
         # non-Done column is 0% by construction and Done is 100% — it carries no
         # signal and cannot indicate stalling.
-        columns = Column.objects.filter(board=board).order_by('position')
-        col_counts = {}
-        for col in columns:
-            n = tasks.filter(column=col).count()
-            col_counts[col.name] = f"{n} task" + ("" if n == 1 else "s")
-        metrics['completion_rate_by_column'] = col_counts
-        done_all = tasks.filter(progress=100).count()
-        overall_pct = int(done_all / total * 100) if total else 0
-        headline_overrides['completion_rate_by_column'] = f"{overall_pct}% complete"
-        explanations['completion_rate_by_column'] = (
-            f"Overall board completion: {done_all} of {total} tasks are at 100% progress "
-            f"({overall_pct}%). The breakdown below shows how many tasks sit in each column, "
-            f"so you can see where the remaining work is concentrated."
-        )
-
-        # Workload distribution — show ALL users with tasks on the board
-        workload = list(
-            tasks.values('assigned_to__username')
-            .annotate(
-                count=Count('id'),
-                active_count=Count('id', filter=Q(progress__lt=100)),
+        done_all, total = facts['tasks_done'], facts['tasks_total']
+        overall_pct = _pct(done_all, total)
+        if row is not None:
+            metrics['completion_rate_by_column'] = {
+                col['name']: f"{col['count']} task" + ("" if col['count'] == 1 else "s")
+                for col in row.wip_by_column
+            }
+            headline_overrides['completion_rate_by_column'] = f"{overall_pct}% complete"
+            explanations['completion_rate_by_column'] = (
+                f"Overall board completion: {done_all} of {total} tasks are at 100% progress "
+                f"({overall_pct}%). The breakdown below shows how many tasks sit in each column, "
+                f"so you can see where the remaining work is concentrated."
             )
-            .order_by('-count')
-        )
-        # Named contributors first (by volume), the 'Unassigned' bucket last so it
-        # reads as a separate pile rather than a teammate.
-        workload.sort(key=lambda w: (w['assigned_to__username'] is None, -w['count']))
-        metrics['workload_distribution'] = {
-            (w['assigned_to__username'] or 'Unassigned'): f"{w['active_count']} active / {w['count']} total"
-            for w in workload
-        }
-        explanations['workload_distribution'] = (
-            f"All team members with tasks on this board. "
-            f"Shows active (incomplete) and total task counts per contributor."
-        )
+            _workload()
 
     elif project_type == 'marketing_campaign':
-        # Tasks by phase (column)
-        columns = Column.objects.filter(board=board).order_by('position')
-        phase_counts = {}
-        for col in columns:
-            phase_counts[col.name] = tasks.filter(column=col).count()
-        metrics['tasks_by_phase'] = phase_counts
-
-        # Deadline adherence rate
-        with_due = tasks.filter(due_date__isnull=False)
-        total_with_due = with_due.count()
-        # Completed tasks that were not overdue at completion. Judge by the real
-        # completion date (completed_at), not updated_at — updated_at is auto_now
-        # and unreliable as a completion signal (see on_time_rate / the chart).
-        completed_with_due = with_due.filter(progress=100)
-        completed_with_due_count = completed_with_due.count()
-        overdue_completed = completed_with_due.annotate(
-            _completed=Coalesce('completed_at', 'updated_at'),
-        ).annotate(
-            _completed_date=TruncDate('_completed'),
-            _due_date=TruncDate('due_date'),
-        ).filter(_due_date__lt=F('_completed_date')).count()
-        on_time_completed = completed_with_due_count - overdue_completed
-        adherence_pct = int(on_time_completed / total_with_due * 100) if total_with_due > 0 else 0
-        metrics['deadline_adherence_rate'] = f"{adherence_pct}%" if total_with_due > 0 else "N/A"
+        if row is not None:
+            metrics['tasks_by_phase'] = {col['name']: col['count'] for col in row.wip_by_column}
+
+        # Deadline adherence: completed tasks that were not overdue at completion,
+        # judged by the real completion date (completed_at), not updated_at.
+        total_with_due = facts['tasks_with_due']
+        on_time_completed = facts['done_on_time']
+        overdue_completed = facts['done_with_due'] - on_time_completed
+        metrics['deadline_adherence_rate'] = (
+            f"{_pct(on_time_completed, total_with_due)}%" if total_with_due > 0 else "N/A"
+        )
         explanations['deadline_adherence_rate'] = (
             f"Percentage of tasks with deadlines that were completed on time. "
             f"{on_time_completed} of {total_with_due} tasks with due dates were finished before their deadline. "
@@ -270,28 +233,17 @@ def get_promoted_metrics(board, raw=False):
         )
 
         # Content output rate (tasks completed this week)
-        content_done = tasks.filter(progress=100, updated_at__gte=seven_days_ago).count()
-        metrics['content_output_rate'] = f"{content_done} tasks/week"
+        metrics['content_output_rate'] = f"{facts['completed_last_7d']} tasks/week"
 
         # Tasks currently in review columns (heuristic: columns with 'review' in name)
-        review_cols = columns.filter(name__icontains='review')
-        if review_cols.exists():
-            review_tasks_qs = tasks.filter(column__in=review_cols).exclude(
-                progress=100
-            ).select_related('column', 'assigned_to')
-            review_count = review_tasks_qs.count()
+        review_count = facts['in_review_count']
+        if review_count is not None:
             metrics['tasks_in_review'] = review_count
-            task_details['tasks_in_review'] = list(
-                review_tasks_qs.values(
-                    'id', 'title', 'priority', 'column__name', 'assigned_to__username'
-                )[:20]
-            )
             explanations['tasks_in_review'] = (
                 f"Tasks sitting in columns containing 'review' in their name. "
                 f"Found {review_count} task(s) awaiting review/approval."
             )
         else:
-            # No review column on this board
             metrics['tasks_in_review'] = "N/A"
             explanations['tasks_in_review'] = (
                 "No column with 'review' in its name was found on this board. "
@@ -299,23 +251,14 @@ def get_promoted_metrics(board, raw=False):
             )
 
         # Milestone completion percentage — only count actual milestone items
-        milestone_qs = Task.objects.filter(column__board=board, item_type='milestone')
-        total_milestones = milestone_qs.count()
-        completed_milestones = milestone_qs.filter(
-            Q(milestone_status='completed') | Q(progress=100)
-        ).count()
+        total_milestones = facts['milestones_total']
+        completed_milestones = facts['milestones_done']
         if total_milestones > 0:
-            milestone_pct = int(completed_milestones / total_milestones * 100)
-            metrics['milestone_completion_pct'] = f"{milestone_pct}%"
+            metrics['milestone_completion_pct'] = f"{_pct(completed_milestones, total_milestones)}%"
             explanations['milestone_completion_pct'] = (
                 f"{completed_milestones} of {total_milestones} milestones are completed. "
                 f"This tracks progress through the project's key milestone markers."
             )
-            task_details['milestone_completion_pct'] = list(
-                milestone_qs.values(
-                    'id', 'title', 'milestone_status', 'column__name', 'assigned_to__username', 'progress'
-                )[:20]
-            )
         else:
             metrics['milestone_completion_pct'] = "N/A"
             explanations['milestone_completion_pct'] = (
@@ -325,92 +268,97 @@ def get_promoted_metrics(board, raw=False):
 
     elif project_type == 'operations':
         # Process completion rate (completed / created in last 30 days)
-        created_30d = tasks.filter(created_at__gte=thirty_days_ago).count()
-        completed_30d = tasks.filter(progress=100, updated_at__gte=thirty_days_ago).count()
-        process_pct = int(completed_30d / created_30d * 100) if created_30d > 0 else 0
-        metrics['process_completion_rate'] = f"{process_pct}%" if created_30d > 0 else "N/A"
+        created_30d = facts['created_last_30d']
+        completed_30d = facts['completed_last_30d']
+        metrics['process_completion_rate'] = (
+            f"{_pct(completed_30d, created_30d)}%" if created_30d > 0 else "N/A"
+        )
         explanations['process_completion_rate'] = (
             f"Ratio of completed tasks to newly created tasks in the last 30 days. "
             f"{completed_30d} completed out of {created_30d} created. "
             f"A rate above 100% means the team is clearing backlog faster than new work arrives."
         )
 
-        # Workload distribution — show ALL users with tasks on the board
-        workload = list(
-            tasks.values('assigned_to__username')
-            .annotate(
-                count=Count('id'),
-                active_count=Count('id', filter=Q(progress__lt=100)),
-            )
-            .order_by('-count')
-        )
-        # Named contributors first (by volume), the 'Unassigned' bucket last so it
-        # reads as a separate pile rather than a teammate.
-        workload.sort(key=lambda w: (w['assigned_to__username'] is None, -w['count']))
-        metrics['workload_distribution'] = {
-            (w['assigned_to__username'] or 'Unassigned'): f"{w['active_count']} active / {w['count']} total"
-            for w in workload
-        }
-        explanations['workload_distribution'] = (
-            f"All team members with tasks on this board. "
-            f"Shows active (incomplete) and total task counts per contributor."
-        )
+        if row is not None:
+            _workload()
 
-        # Average cycle time (creation → completion, in days). Measure to the real
-        # completion timestamp (completed_at), not updated_at — updated_at is
-        # auto_now and gets bumped by any later edit/reorder, which would inflate
-        # the average. Mirrors get_cycle_time_distribution so card and chart agree.
-        completed_tasks_qs = tasks.filter(progress=100)
-        if completed_tasks_qs.exists():
-            cycle_times = []
-            for t in completed_tasks_qs[:100]:  # cap for perf
-                end = t.completed_at or t.updated_at
-                if not end or not t.created_at:
-                    continue
-                delta = (end - t.created_at).total_seconds()
-                cycle_times.append(max(0, delta / 86400))  # convert to days, floor at 0
-            avg_days = sum(cycle_times) / len(cycle_times) if cycle_times else 0
+        # Average cycle time (creation → completion, in days), measured to the
+        # real completion timestamp so later edits do not inflate it.
+        if facts['cycle_time_count']:
+            avg_days = facts['cycle_time_days_sum'] / facts['cycle_time_count']
             metrics['avg_cycle_time_days'] = f"{avg_days:.1f} days"
             explanations['avg_cycle_time_days'] = (
                 f"Average time from task creation to completion across "
-                f"{len(cycle_times)} completed task(s). "
+                f"{facts['cycle_time_count']} completed task(s). "
                 f"Shorter cycle times indicate faster throughput."
             )
         else:
             metrics['avg_cycle_time_days'] = "N/A"
             explanations['avg_cycle_time_days'] = "No completed tasks to measure cycle time."
 
-        # Overdue count
-        overdue = tasks.filter(
-            due_date__isnull=False, due_date__date__lt=today
-        ).exclude(progress=100).count()
-        metrics['overdue_count'] = overdue
-
-        # On-time rate. Compare the deadline to the REAL completion date
-        # (completed_at, falling back to updated_at only when it is missing) — not
-        # updated_at, which auto_now bumps on any later edit so moving one task
-        # could flip many previously-on-time tasks to "late". Mirrors the
-        # On-Time vs Late chart so the card and chart always agree.
-        with_due = tasks.filter(due_date__isnull=False, progress=100).annotate(
-            _completed=Coalesce('completed_at', 'updated_at'),
-        ).annotate(
-            _completed_date=TruncDate('_completed'),
-            _due_date=TruncDate('due_date'),
+        metrics['overdue_count'] = facts['overdue_count']
+
+        # On-time rate: deadline vs the REAL completion date, so moving one task
+        # cannot flip earlier completions to "late". Mirrors the On-Time vs Late
+        # chart so the card and chart always agree.
+        total_done_with_due = facts['done_with_due']
+        on_time = facts['done_on_time']
+        overdue_at_completion = total_done_with_due - on_time
+        metrics['on_time_rate'] = (
+            f"{_pct(on_time, total_done_with_due)}%" if total_done_with_due > 0 else "N/A"
         )
-        total_done_with_due = with_due.count()
-        overdue_at_completion = with_due.filter(_due_date__lt=F('_completed_date')).count()
-        on_time = total_done_with_due - overdue_at_completion
-        on_time_pct = int(on_time / total_done_with_due * 100) if total_done_with_due > 0 else 0
-        metrics['on_time_rate'] = f"{on_time_pct}%" if total_done_with_due > 0 else "N/A"
         explanations['on_time_rate'] = (
             f"Percentage of completed tasks that were finished before their due date. "
             f"{on_time} of {total_done_with_due} completed tasks with deadlines were on time. "
             f"{overdue_at_completion} task(s) were completed after their deadline."
         )
 
+    return metrics, explanations, headline_overrides
+
+
+def get_promoted_metrics(board, raw=False):
+    """
+    Calculate the promoted metrics for a board based on its project_type.
+
+    Values come from the board's BoardDailyMetrics row
+    (kanban/utils/board_metrics.py); only the task lists behind the detail
+    modals are queried live, and not at all when ``raw`` is set.
+
+    Returns a dict of metric_name → value.
+    Falls back to a generic set if project_type is not set.
+    """
+    from kanban.models import Task
+    from kanban.utils.board_metrics import SNAPSHOT_FIELDS, board_metrics
+
+    project_type = board.project_type or 'product_tech'
+    row = board_metrics(board)
+    facts = {field: getattr(row, field) for field in SNAPSHOT_FIELDS}
+    metrics, explanations, headline_overrides = _fact_metrics(project_type, facts, row=row)
+
     if raw:
         return metrics
 
+    task_details = {}  # key -> list of task dicts for modal display
+    detail_fields = ('id', 'title', 'priority', 'column__name', 'assigned_to__username')
+    tasks = Task.objects.filter(column__board=board, item_type='task')
+    if project_type == 'product_tech' and metrics.get('blocked_count'):
+        task_details['blocked_count'] = list(
+            tasks.filter(Q(priority='urgent') | Q(priority='high', progress=0))
+            .exclude(progress=100).values(*detail_fields)[:20]
+        )
+    elif project_type == 'marketing_campaign':
+        if metrics.get('tasks_in_review') not in (None, 'N/A', 0):
+            task_details['tasks_in_review'] = list(
+                tasks.filter(column__name__icontains='review')
+                .exclude(progress=100).values(*detail_fields)[:20]
+            )
+        if facts['milestones_total']:
+            task_details['milestone_completion_pct'] = list(
+                Task.objects.filter(column__board=board, item_type='milestone').values(
+                    'id', 'title', 'milestone_status', 'column__name', 'assigned_to__username', 'progress'
+                )[:20]
+            )
+
     # Convert raw metrics dict to a list of rich dicts for the template
     metric_keys = PROMOTED_METRICS.get(project_type, list(metrics.keys()))
     result = []
@@ -487,67 +435,125 @@ def get_ai_summary_augmentation(board):
     return aug
 
 
+def get_board_analytics_summary_data(board):
+    """The analytics dict passed to ``summarize_board_analytics`` for a board.
+
+    Counts exclude milestones so they match the metric cards on the analytics
+    page; the type-specific block comes from ``get_ai_summary_augmentation``.
+    Shared by the synchronous summary endpoint and the background
+    stale-while-revalidate refresh (kanban/utils/ai_artefacts.py).
+    """
+    from kanban.models import Task
+    from kanban.utils.board_metrics import board_metrics
+
+    facts = board_metrics(board)
+    all_tasks = Task.objects.filter(column__board=board, item_type='task')
+    total_tasks = facts.tasks_total
+    completed_count = facts.tasks_done
+    productivity = (completed_count / total_tasks * 100) if total_tasks > 0 else 0
+
+    today = timezone.now().date()
+    overdue_count = facts.overdue_count
+    upcoming_count = all_tasks.filter(
+        due_date__isnull=False, due_date__date__gte=today,
+        due_date__date__lte=today + timedelta(days=7),
+    ).exclude(progress=100).count()
+
+    # Lean Six Sigma metrics
+    lean_counts = {}
+    for name in ('Value-Added', 'Necessary NVA', 'Waste/Eliminate'):
+        lean_counts[name] = Task.objects.filter(
+            column__board=board, labels__name=name, labels__category='lean',
+        ).count()
+    total_categorized = sum(lean_counts.values())
+    value_added_percentage = (
+        lean_counts['Value-Added'] / total_categorized * 100 if total_categorized > 0 else 0
+    )
+
+    tasks_by_column = [{'name': col['name'], 'count': col['count']} for col in facts.wip_by_column]
+
+    priority_names = dict(Task.PRIORITY_CHOICES)
+    tasks_by_priority = [
+        {'priority': priority_names.get(item['priority'], item['priority']), 'count': item['count']}
+        for item in all_tasks.values('priority').annotate(count=Count('id')).order_by('priority')
+    ]
+
+    tasks_by_user = []
+    for item in all_tasks.values('assigned_to__username').annotate(count=Count('id')).order_by('-count'):
+        completed_user_tasks = all_tasks.filter(
+            assigned_to__username=item['assigned_to__username'], progress=100,
+        ).count()
+        rate = (completed_user_tasks / item['count'] * 100) if item['count'] > 0 else 0
+        tasks_by_user.append({
+            'username': item['assigned_to__username'] or 'Unassigned',
+            'count': item['count'],
+            'completion_rate': int(rate),
+        })
+
+    data = {
+        'total_tasks': total_tasks,
+        'completed_count': completed_count,
+        'productivity': round(productivity, 1),
+        'overdue_count': overdue_count,
+        'upcoming_count': upcoming_count,
+        'value_added_percentage': round(value_added_percentage, 1),
+        'total_categorized': total_categorized,
+        'tasks_by_lean_category': [
+            {'name': name, 'count': count} for name, count in lean_counts.items()
+        ],
+        'tasks_by_column': tasks_by_column,
+        'tasks_by_priority': tasks_by_priority,
+        'tasks_by_user': tasks_by_user,
+        'board_name': board.name,
+        'project_type': board.project_type or 'general',
+    }
+    data.update(get_ai_summary_augmentation(board))
+    return data
+
+
 # ---------------------------------------------------------------------------
 # Per-type chart data computation helpers
 # ---------------------------------------------------------------------------
 
+_CYCLE_TIME_BUCKET_NAMES = ('1 day', '2-3 days', '4-7 days', '1-2 weeks', '2+ weeks')
+
+
 def get_cycle_time_distribution(board):
     """Bucket completed tasks by cycle time (created_at to completed_at / updated_at)."""
-    from kanban.models import Task
-    tasks = Task.objects.filter(
-        column__board=board, item_type='task', progress=100
-    ).exclude(created_at__isnull=True)
-    buckets = [
-        {'name': '1 day',      'count': 0},
-        {'name': '2-3 days',   'count': 0},
-        {'name': '4-7 days',   'count': 0},
-        {'name': '1-2 weeks',  'count': 0},
-        {'name': '2+ weeks',   'count': 0},
+    from kanban.utils.board_metrics import board_metrics
+    counts = board_metrics(board).cycle_time_buckets or []
+    return [
+        {'name': name, 'count': counts[i] if i < len(counts) else 0}
+        for i, name in enumerate(_CYCLE_TIME_BUCKET_NAMES)
     ]
-    for t in tasks:
-        end = t.completed_at or t.updated_at
-        if not end:
-            continue
-        days = max(0, (end - t.created_at).days)
-        if days <= 1:
-            buckets[0]['count'] += 1
-        elif days <= 3:
-            buckets[1]['count'] += 1
-        elif days <= 7:
-            buckets[2]['count'] += 1
-        elif days <= 14:
-            buckets[3]['count'] += 1
-        else:
-            buckets[4]['count'] += 1
-    return buckets
 
 
-def get_weekly_completion_trend(board, weeks=8):
-    """Return completed-task counts grouped by week for the last N weeks."""
-    from kanban.models import Task
-    cutoff = timezone.now() - timedelta(weeks=weeks)
-    qs = Task.objects.filter(
-        column__board=board, item_type='task', progress=100,
-        updated_at__gte=cutoff,
-    ).values('updated_at__date').annotate(count=Count('id')).order_by('updated_at__date')
-
-    # Map each completed date to its Monday (week start)
+def _weekly_flow(board, weeks):
+    """(Mondays of the last ``weeks`` weeks up to this one, {monday: summed flow counts})."""
+    from kanban.utils.board_metrics import board_metrics, daily_flow
+    board_metrics(board)
+    today = timezone.localdate()
+    start = today - timedelta(days=today.weekday(), weeks=weeks - 1)
     week_map = {}
-    for row in qs:
-        d = row['updated_at__date']
-        if d is None:
-            continue
-        monday = d - timedelta(days=d.weekday())
-        week_map[monday] = week_map.get(monday, 0) + row['count']
+    for day, flow in daily_flow(board, start).items():
+        monday = day - timedelta(days=day.weekday())
+        totals = week_map.setdefault(monday, dict.fromkeys(flow, 0))
+        for field, value in flow.items():
+            totals[field] += value
+    return [start + timedelta(weeks=i) for i in range(weeks)], week_map
 
-    start = (timezone.now() - timedelta(weeks=weeks)).date()
-    start -= timedelta(days=start.weekday())  # align to Monday
-    result = []
-    for i in range(weeks):
-        d = start + timedelta(weeks=i)
-        label = f"Wk {d.strftime('%b')} {d.day}"
-        result.append({'date': label, 'count': week_map.get(d, 0)})
-    return result
+
+def _week_label(d):
+    return f"Wk {d.strftime('%b')} {d.day}"
+
+
+def get_weekly_completion_trend(board, weeks=8):
+    """Return completed-task counts grouped by week (of completion) for the last N weeks."""
+    mondays, week_map = _weekly_flow(board, weeks)
+    return [
+        {'date': _week_label(d), 'count': week_map.get(d, {}).get('tasks_completed', 0)}
+        for d in mondays
+    ]
 
 
 # Expanded keyword sets for label/title classification
@@ -646,51 +652,24 @@ def get_backlog_age_distribution(board):
 
 def get_stage_transition_funnel(board):
     """Return task counts per column in board position order (pipeline funnel view)."""
-    from kanban.models import Task, Column
-    columns = Column.objects.filter(board=board).order_by('position')
-    tasks = Task.objects.filter(column__board=board, item_type='task')
+    from kanban.utils.board_metrics import board_metrics
     return [
-        {'name': col.name, 'count': tasks.filter(column=col).count(), 'position': col.position}
-        for col in columns
+        {'name': col['name'], 'count': col['count'], 'position': col['position']}
+        for col in board_metrics(board).wip_by_column
     ]
 
 
 def get_on_time_vs_late_weekly(board, weeks=8):
     """Return on-time vs late completed-task counts per week for the last N weeks.
     Returns None if fewer than 3 completed tasks have due dates (JS falls back to trend)."""
-    from kanban.models import Task
-    cutoff = timezone.now() - timedelta(weeks=weeks)
-    completed = Task.objects.filter(
-        column__board=board, item_type='task', progress=100,
-        updated_at__gte=cutoff, due_date__isnull=False,
-    )
-    if completed.count() < 3:
+    mondays, week_map = _weekly_flow(board, weeks)
+    weekly = [week_map.get(d, {}) for d in mondays]
+    if sum(w.get('completed_on_time', 0) + w.get('completed_late', 0) for w in weekly) < 3:
         return None
-
-    week_map = {}
-    for t in completed:
-        # Bucket by updated_at (spread across the full window) but judge on-time
-        # vs late by the REAL completion date vs the deadline — updated_at can be
-        # bumped by any later edit and is not a reliable completion signal.
-        d = t.updated_at.date()
-        monday = d - timedelta(days=d.weekday())
-        if monday not in week_map:
-            week_map[monday] = {'on_time': 0, 'late': 0}
-        completed_on = (t.completed_at or t.updated_at).date()
-        if completed_on <= t.due_date.date():
-            week_map[monday]['on_time'] += 1
-        else:
-            week_map[monday]['late'] += 1
-
-    start = (timezone.now() - timedelta(weeks=weeks)).date()
-    start -= timedelta(days=start.weekday())
-    result = []
-    for i in range(weeks):
-        d = start + timedelta(weeks=i)
-        label = f"Wk {d.strftime('%b')} {d.day}"
-        wd = week_map.get(d, {'on_time': 0, 'late': 0})
-        result.append({'date': label, 'on_time': wd['on_time'], 'late': wd['late']})
-    return result
+    return [
+        {'date': _week_label(d), 'on_time': w.get('completed_on_time', 0), 'late': w.get('completed_late', 0)}
+        for d, w in zip(mondays, weekly)
+    ]
 
 
 def _column_weight(name):
@@ -712,25 +691,18 @@ def get_estimated_time_per_stage(board):
     overall average cycle time.  Columns get weights based on typical workflow role
     so the bars are meaningfully different lengths even without task-column history.
     No task-column history is tracked; this is always an approximation."""
-    from kanban.models import Task, Column
-    columns = list(Column.objects.filter(board=board).order_by('position'))
+    from kanban.utils.board_metrics import board_metrics
+    row = board_metrics(board)
+    columns = row.wip_by_column
     if not columns:
         return []
-    completed = Task.objects.filter(
-        column__board=board, item_type='task', progress=100,
-    )
-    cycle_times = []
-    for t in completed[:100]:
-        end = t.completed_at or t.updated_at
-        if end and t.created_at:
-            cycle_times.append(max(0, (end - t.created_at).days))
-    avg_total = sum(cycle_times) / len(cycle_times) if cycle_times else 0
-
-    weights = [_column_weight(col.name) for col in columns]
+    avg_total = row.avg_cycle_time_days or 0
+
+    weights = [_column_weight(col['name']) for col in columns]
     total_weight = sum(weights) or 1
     return [
         {
-            'name': col.name,
+            'name': col['name'],
             'avg_days': round(avg_total * (weights[i] / total_weight), 1),
             'estimated': True,
         }
@@ -932,11 +904,26 @@ def get_boards_for_record(record, record_type):
     return qs
 
 
+# BoardDailyMetrics fields the portfolio roll-up sums across boards.
+_PORTFOLIO_FACT_FIELDS = (
+    'tasks_total', 'tasks_done', 'overdue_count', 'at_risk_count', 'in_review_count',
+    'tasks_with_due', 'done_with_due', 'done_on_time', 'milestones_total', 'milestones_done',
+    'completed_last_7d', 'completed_last_30d', 'created_last_30d',
+    'cycle_time_days_sum', 'cycle_time_count',
+)
+
+
 def get_portfolio_analytics(record, record_type):
     """
     Aggregate promoted metrics across all boards linked to a strategic record,
     grouped by project type.
 
+    Reads every board's BoardDailyMetrics row for today in one query (a
+    filtered LEFT JOIN from Board). Boards whose row is missing or stale are
+    refreshed and the query repeated, so steady-state cost does not grow
+    with the number of boards. Counts are summed and rates recomputed from
+    the summed numerators and denominators.
+
     Returns:
         {
             'groups': [ { type, label, board_count, metrics: { ... } }, ... ],
@@ -945,41 +932,52 @@ def get_portfolio_analytics(record, record_type):
         }
     """
     from kanban.models import Board
+    from kanban.utils.board_metrics import refresh_board_metrics
 
     boards = get_boards_for_record(record, record_type)
+    today = timezone.localdate()
+    fact_values = ['_facts__' + f for f in _PORTFOLIO_FACT_FIELDS]
+
+    def _rows():
+        return list(
+            boards.annotate(
+                _facts=FilteredRelation('daily_metrics', condition=Q(daily_metrics__date=today)),
+            ).values('id', 'project_type', '_facts__snapshot_at', '_facts__is_stale', *fact_values)
+        )
 
-    unclassified = boards.filter(
-        Q(project_type__isnull=True) | Q(project_type_confirmed=False, project_type__isnull=True)
-    )
-    unclassified_ids = list(unclassified.values_list('id', flat=True))
+    rows = _rows()
+    outdated = [
+        r['id'] for r in rows
+        if r['project_type'] and (r['_facts__snapshot_at'] is None or r['_facts__is_stale'])
+    ]
+    if outdated:
+        for board in Board.objects.filter(pk__in=outdated):
+            refresh_board_metrics(board, today=today)
+        rows = _rows()
 
-    classified = boards.filter(project_type__isnull=False)
+    unclassified_ids = [r['id'] for r in rows if r['project_type'] is None]
 
     type_labels = dict(Board.PROJECT_TYPE_CHOICES)
     groups = []
 
     for ptype in ['product_tech', 'marketing_campaign', 'operations']:
-        group_boards = classified.filter(project_type=ptype)
-        if not group_boards.exists():
+        group_rows = [r for r in rows if r['project_type'] == ptype]
+        if not group_rows:
             continue
 
-        # Aggregate metrics across boards of this type
-        aggregated = {}
-        for b in group_boards:
-            board_metrics = get_promoted_metrics(b, raw=True)
-            for k, v in board_metrics.items():
-                if isinstance(v, (int, float)):
-                    aggregated[k] = aggregated.get(k, 0) + v
-                elif isinstance(v, str) and v != 'N/A':
-                    # Keep first value as representative for string metrics
-                    if k not in aggregated:
-                        aggregated[k] = v
+        totals = {}
+        for field in _PORTFOLIO_FACT_FIELDS:
+            values = [r['_facts__' + field] for r in group_rows]
+            present = [v for v in values if v is not None]
+            # in_review_count stays None only when no board has a review column.
+            totals[field] = sum(present) if present or field != 'in_review_count' else None
+        metrics, _, _ = _fact_metrics(ptype, totals)
 
         groups.append({
             'type': ptype,
             'label': type_labels.get(ptype, ptype),
-            'board_count': group_boards.count(),
-            'metrics': aggregated,
+            'board_count': len(group_rows),
+            'metrics': metrics,
         })
 
     return {
@@ -0,0 +1,151 @@
+"""
+Matrix helpers for the resource-leveling assignment optimizer.
+
+``ResourceLevelingService.get_board_optimization_suggestions`` used to
+analyse every open task against every candidate one at a time (a workload
+``count()`` and a keyword scan per pair), then accept suggestions greedily
+in task order.  The optimizer instead scores the whole board at once:
+
+* ``skill_match_matrix`` reproduces
+  ``UserPerformanceProfile.calculate_skill_match`` for a task × member grid
+  with one matrix product over a shared keyword vocabulary.
+* ``solve_slot_assignment`` picks the reassignment set with a rectangular
+  min-cost assignment (``scipy.optimize.linear_sum_assignment``).  Each
+  receiver contributes one row per suggestion slot — the per-user cap — and
+  every task is a column, padded with zero-cost "no move" columns so slots
+  may stay empty.  A giver over its limit keeps only its best moves and
+  the rest is re-solved without that giver's other tasks.
+
+Scoring rules (weights, thresholds, coherence) stay in
+kanban/resource_leveling.py next to ``_analyze_candidate``; this module
+only knows about arrays.
+"""
+import re
+
+try:
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+    OPTIMIZER_AVAILABLE = True
+except ImportError:
+    OPTIMIZER_AVAILABLE = False
+    np = None
+    linear_sum_assignment = None
+
+_WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+# Matches the per-keyword cap in calculate_skill_match.
+SKILL_WEIGHT_CAP = 10
+# Cost of an infeasible (slot, task) pair; anything this large is never chosen
+# over an empty slot.
+INFEASIBLE = 1e9
+
+
+def skill_match_matrix(task_texts, skill_keywords):
+    """
+    Skill-match scores (0-100) for every task × member pair.
+
+    Args:
+        task_texts: list of "title description" strings
+        skill_keywords: list of ``UserPerformanceProfile.skill_keywords``
+            dicts (one per member)
+
+    Returns:
+        float array of shape (len(task_texts), len(skill_keywords)), equal
+        to calling ``calculate_skill_match`` for each pair
+    """
+    vocab = {}
+    for keywords in skill_keywords:
+        for word in (keywords or {}):
+            vocab.setdefault(word, len(vocab))
+
+    weights = np.zeros((len(vocab), len(skill_keywords)), dtype=np.float64)
+    for m, keywords in enumerate(skill_keywords):
+        for word, freq in (keywords or {}).items():
+            try:
+                freq = float(freq)
+            except (TypeError, ValueError):
+                continue
+            if freq > 0:
+                weights[vocab[word], m] = min(freq, SKILL_WEIGHT_CAP)
+
+    present = np.zeros((len(task_texts), len(vocab)), dtype=np.float64)
+    distinct = np.zeros(len(task_texts), dtype=np.float64)
+    for t, text in enumerate(task_texts):
+        words = set(_WORD_RE.findall(text.lower()))
+        distinct[t] = len(words)
+        for word in words:
+            col = vocab.get(word)
+            if col is not None:
+                present[t, col] = 1.0
+
+    total = present @ weights
+    max_possible = (distinct * SKILL_WEIGHT_CAP)[:, None]
+    scores = np.divide(
+        total * 100.0, max_possible,
+        out=np.zeros_like(total), where=max_possible > 0,
+    )
+    scores = np.minimum(scores, 100.0)
+    # No words, or skills that match nothing: the method's 10-point floor.
+    scores = np.where(total > 0, scores, 10.0)
+    has_skills = np.array([bool(k) for k in skill_keywords])
+    return np.where(has_skills[None, :], scores, 0.0)
+
+
+def solve_slot_assignment(gain, feasible, task_giver=None, giver_caps=None):
+    """
+    Choose at most one slot per task maximising total gain.
+
+    Args:
+        gain: array (slots, tasks) — benefit of filling the slot with the task
+        feasible: bool array of the same shape
+        task_giver: optional int array (tasks,) — index of the user losing
+            each task, or -1 for unassigned tasks
+        giver_caps: optional dict {giver index: max tasks moved off them}
+
+    Returns:
+        list of (slot, task) pairs, best gain first
+    """
+    n_slots, n_tasks = gain.shape
+    if n_slots == 0 or n_tasks == 0:
+        return []
+
+    allowed = feasible.copy()
+    giver_caps = dict(giver_caps or {})
+    while True:
+        # Tasks no slot may take are left out of the cost matrix entirely.
+        columns = np.flatnonzero(allowed.any(axis=0))
+        if not len(columns):
+            return []
+        sub_allowed = allowed[:, columns]
+        cost = np.where(sub_allowed, -np.maximum(gain[:, columns], 1e-6), INFEASIBLE)
+        # Zero-cost padding: one "no move" column per slot.
+        cost = np.hstack([cost, np.zeros((n_slots, n_slots))])
+        rows, cols = linear_sum_assignment(cost)
+        chosen = [
+            (int(r), int(columns[c])) for r, c in zip(rows, cols)
+            if c < len(columns) and sub_allowed[r, c]
+        ]
+        chosen.sort(key=lambda rc: -gain[rc])
+
+        if task_giver is None or not giver_caps:
+            return chosen
+
+        kept = {}
+        saturated = set()
+        for r, c in chosen:
+            giver = int(task_giver[c])
+            if giver < 0 or giver not in giver_caps:
+                continue
+            kept.setdefault(giver, []).append(c)
+            if len(kept[giver]) > giver_caps[giver]:
+                saturated.add(giver)
+        if not saturated:
+            return chosen
+        # An over-limit giver keeps only its best moves; every other task of
+        # theirs is withdrawn and the slots are re-solved, so this loops at
+        # most once per giver.
+        for giver in saturated:
+            keep = kept[giver][:giver_caps[giver]]
+            withdrawn = (task_giver == giver)
+            withdrawn[keep] = False
+            allowed[:, withdrawn] = False
+            del giver_caps[giver]
@@ -0,0 +1,233 @@
+"""
+Bulk clone engine for demo sandbox provisioning.
+
+``_duplicate_board`` (kanban/sandbox_views.py) used to copy a template's
+board structure row by row: a ``save()`` per label, column and task, an
+``update(created_at=...)`` per task, a ``create()`` per comment and checklist
+item, and an M2M ``add()`` per label, dependency and related task.  Every
+task save ran the whole Task signal chain as well, and on SQLite all of it
+held the single writer for seconds — on the signup critical path.
+
+Instead:
+
+* ``board_clone_plan(template)`` snapshots the template's labels, columns,
+  tasks, task links, comments and checklist items into a compact plan of
+  plain values, keyed by template pk.  Plans are cached and rebuilt only
+  when ``_template_fingerprint`` (a few aggregate reads) changes.
+* ``replay_board_clone_plan(plan, new_board, user)`` writes the plan into a
+  new board with one ``bulk_create`` per table in dependency order, remaps
+  every FK through in-memory pk maps and fixes the task self-references and
+  preserved timestamps with a single ``bulk_update``.
+
+``bulk_create`` fires no model signals.  What the Task receivers would have
+produced for a brand-new board is done once afterwards, as for bulk imports
+(kanban/utils/bulk_import.py): assignment history, workload counters and the
+deferred per-assignee recalculations.  The new board has no automation
+rules or webhooks the skipped receivers could have reached.
+"""
+import hashlib
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PLAN_CACHE_PREFIX = 'board_clone_plan'
+# Safety net for template writes that leave the fingerprint unchanged.
+PLAN_CACHE_TIMEOUT = 60 * 60 * 6
+BATCH_SIZE = 500
+
+COLUMN_FIELDS = ['name', 'position', 'wip_limit', 'aging_mode', 'aging_warning_days', 'aging_critical_days']
+TASK_FIELDS = [
+    'title', 'description', 'position', 'priority', 'progress', 'due_date', 'start_date',
+    'completed_at', 'phase', 'item_type', 'milestone_status', 'assigned_to_id',
+    'risk_level', 'risk_likelihood', 'risk_impact', 'complexity_score',
+    'created_at', 'updated_at',
+]
+CHECKLIST_FIELDS = [
+    'title', 'description', 'is_completed', 'completed_at', 'position',
+    'estimated_effort', 'priority', 'source',
+]
+
+
+def _template_fingerprint(template):
+    """
+    Cheap summary of the template's cloned rows.  Row counts and max ids
+    catch inserts and deletes, ``updated_at`` catches saves, and the due-date
+    range catches the daily demo date refresh (which writes with
+    ``.update()``).
+    """
+    from kanban.models import ChecklistItem, Column, Comment, Task, TaskLabel
+
+    tasks = Task.objects.filter(column__board=template).aggregate(
+        n=Count('id'), max_id=Max('id'), updated=Max('updated_at'),
+        first_due=Min('due_date'), last_due=Max('due_date'), last_start=Max('start_date'),
+    )
+    parts = [tasks]
+    for model, lookup in (
+        (Column, 'board'), (TaskLabel, 'board'),
+        (Comment, 'task__column__board'), (ChecklistItem, 'task__column__board'),
+    ):
+        parts.append(model.objects.filter(**{lookup: template}).aggregate(n=Count('id'), max_id=Max('id')))
+    return hashlib.md5(repr(parts).encode()).hexdigest()[:16]
+
+
+def _build_plan(template):
+    from kanban.models import ChecklistItem, Comment, Task, column_name_disables_aging
+    from kanban.utils.sanitize import sanitize_html
+
+    plan = {'labels': [], 'columns': [], 'tasks': [], 'task_labels': [],
+            'parents': [], 'dependencies': [], 'related': [], 'comments': [], 'checklist': []}
+
+    for pk, name, color, category in template.labels.order_by('pk').values_list(
+        'pk', 'name', 'color', 'category',
+    ):
+        plan['labels'].append((pk, {'name': name, 'color': color, 'category': category}))
+
+    for col in template.columns.order_by('position').values('pk', *COLUMN_FIELDS):
+        # Carry over the template's aging config; fall back to the name-based
+        # default so Done/Backlog columns stay disabled even if the template
+        # column predates the aging feature / wasn't backfilled.
+        if col['aging_mode'] == 'inherit' and column_name_disables_aging(col['name']):
+            col['aging_mode'] = 'disabled'
+        plan['columns'].append((col.pop('pk'), col))
+
+    tasks = Task.objects.filter(column__board=template)
+    for row in tasks.order_by('column__position', 'position').values(
+        'pk', 'column_id', 'parent_task_id', 'position_after_task_id', *TASK_FIELDS,
+    ):
+        pk = row.pop('pk')
+        parent_pk, after_pk = row.pop('parent_task_id'), row.pop('position_after_task_id')
+        # What Task.save() would do to every copy, done once per template.
+        if row['description']:
+            row['description'] = sanitize_html(row['description'])
+        plan['tasks'].append((pk, row.pop('column_id'), row))
+        if parent_pk or after_pk:
+            plan['parents'].append((pk, parent_pk, after_pk))
+
+    plan['task_labels'] = list(
+        Task.labels.through.objects.filter(task__column__board=template)
+        .values_list('task_id', 'tasklabel_id')
+    )
+    plan['dependencies'] = list(
+        Task.dependencies.through.objects.filter(from_task__column__board=template)
+        .values_list('from_task_id', 'to_task_id')
+    )
+    plan['related'] = list(
+        Task.related_tasks.through.objects.filter(from_task__column__board=template)
+        .values_list('from_task_id', 'to_task_id')
+    )
+    plan['comments'] = list(
+        Comment.objects.filter(task__column__board=template)
+        .order_by('task_id', 'created_at', 'pk').values_list('task_id', 'content')
+    )
+    for row in ChecklistItem.objects.filter(task__column__board=template).order_by(
+        'task_id', 'position', 'pk',
+    ).values('task_id', *CHECKLIST_FIELDS):
+        plan['checklist'].append((row.pop('task_id'), row))
+    return plan
+
+
+def board_clone_plan(template):
+    """The template's clone plan, from cache unless the template changed."""
+    key = f'{PLAN_CACHE_PREFIX}:{template.pk}:{_template_fingerprint(template)}'
+    plan = cache.get(key)
+    if plan is None:
+        plan = _build_plan(template)
+        cache.set(key, plan, PLAN_CACHE_TIMEOUT)
+    return plan
+
+
+def replay_board_clone_plan(plan, new_board, user):
+    """
+    Write ``plan`` into the freshly created ``new_board`` for ``user``.
+
+    Returns ``(label_map, column_map, task_map)``: template pk → new instance,
+    for the remaining clone steps that reference labels, columns or tasks.
+    """
+    from kanban.models import ChecklistItem, Column, Comment, Task, TaskLabel
+    from kanban.signals import auto_assign_column_color
+    from kanban.utils.bulk_import import _after_import, _ensure_pks, _record_assignments
+
+    labels = [(pk, TaskLabel(board=new_board, **fields)) for pk, fields in plan['labels']]
+    TaskLabel.objects.bulk_create([label for _, label in labels], batch_size=BATCH_SIZE)
+    label_map = dict(labels)
+
+    columns = [(pk, Column(board=new_board, **fields)) for pk, fields in plan['columns']]
+    # pre_save does not run for bulk_create.
+    for _, column in columns:
+        auto_assign_column_color(Column, column)
+    Column.objects.bulk_create([column for _, column in columns], batch_size=BATCH_SIZE)
+    column_map = dict(columns)
+
+    # One read for the assignees, whose names the assignment history uses.
+    assignees = User.objects.in_bulk(
+        {fields['assigned_to_id'] for _, _, fields in plan['tasks'] if fields['assigned_to_id']}
+    )
+    now = timezone.now()
+    tasks = []
+    for pk, column_pk, fields in plan['tasks']:
+        column = column_map.get(column_pk)
+        if column is None:
+            continue
+        task = Task(
+            column=column, created_by=user, column_entered_at=now,
+            # Clear AI and personal operational data
+            ai_summary=None, ai_summary_generated_at=None,
+            ai_risk_score=None, ai_recommendations=None,
+            **fields,
+        )
+        task.assigned_to = assignees.get(task.assigned_to_id)
+        if (task.progress == 100) != bool(task.completed_at):
+            # Completion bookkeeping save() would do; the description is
+            # already sanitized in the plan.
+            task.apply_derived_fields()
+        tasks.append((pk, task))
+    Task.objects.bulk_create([task for _, task in tasks], batch_size=BATCH_SIZE)
+    _ensure_pks(new_board, [task for _, task in tasks])
+    task_map = dict(tasks)
+
+    # bulk_create stamps auto_now(_add) fields; put the template's back and
+    # wire the self-references in the same UPDATE.
+    fields_by_pk = {pk: fields for pk, _, fields in plan['tasks']}
+    for pk, task in tasks:
+        task.created_at = fields_by_pk[pk]['created_at']
+        task.updated_at = fields_by_pk[pk]['updated_at']
+    for pk, parent_pk, after_pk in plan['parents']:
+        task = task_map.get(pk)
+        if task is not None:
+            task.parent_task = task_map.get(parent_pk)
+            task.position_after_task = task_map.get(after_pk)
+    Task.objects.bulk_update(
+        [task for _, task in tasks],
+        ['created_at', 'updated_at', 'parent_task', 'position_after_task'],
+        batch_size=BATCH_SIZE,
+    )
+
+    def _link(through, pairs, targets, source_field, target_field):
+        through.objects.bulk_create([
+            through(**{source_field: task_map[a].pk, target_field: targets[b].pk})
+            for a, b in pairs if a in task_map and b in targets
+        ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+    _link(Task.labels.through, plan['task_labels'], label_map, 'task_id', 'tasklabel_id')
+    _link(Task.dependencies.through, plan['dependencies'], task_map, 'from_task_id', 'to_task_id')
+    _link(Task.related_tasks.through, plan['related'], task_map, 'from_task_id', 'to_task_id')
+
+    # Demo comments are kept for realism, re-authored by the sandbox owner.
+    Comment.objects.bulk_create([
+        Comment(task=task_map[task_pk], user=user, content=content)
+        for task_pk, content in plan['comments'] if task_pk in task_map
+    ], batch_size=BATCH_SIZE)
+    ChecklistItem.objects.bulk_create([
+        ChecklistItem(task=task_map[task_pk], **fields)
+        for task_pk, fields in plan['checklist'] if task_pk in task_map
+    ], batch_size=BATCH_SIZE)
+
+    new_tasks = list(task_map.values())
+    _record_assignments(new_tasks, user, BATCH_SIZE)
+    _after_import(new_tasks)
+    return label_map, column_map, task_map
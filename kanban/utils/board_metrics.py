@@ -0,0 +1,257 @@
+"""
+Maintenance and reads for the BoardDailyMetrics fact table.
+
+The analytics cards, the promoted charts and the portfolio roll-ups used to
+aggregate Task live — a dozen or more queries per board, repeated for every
+board under a goal or mission. Instead each board keeps one
+``BoardDailyMetrics`` row per day (kanban/board_metrics_models.py):
+
+* ``refresh_board_metrics(board)`` recomputes today's snapshot and rewrites
+  the flow counts for the trailing ``FLOW_WINDOW_DAYS`` with a fixed handful
+  of grouped queries, whatever the board size.
+* Task, Column and TaskCost signals call ``mark_board_metrics_stale()`` (one
+  UPDATE); the next reader refreshes the row before using it.
+* The nightly ``kanban.refresh_board_metrics`` job refreshes every active
+  board, so each day starts with a row and date-based counts (overdue,
+  rolling 7/30-day totals) roll over even when nothing was edited.
+
+Writes that bypass signals (queryset ``.update()``, ``bulk_create``) are
+picked up by the nightly job; callers that need them sooner can call
+``refresh_board_metrics`` directly.
+
+Rows are dated by the local calendar day (``timezone.localdate()``), the same
+day ``TruncDate`` and ``__date`` lookups use for the counts.
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Nine weeks: the 8-week charts start on a Monday up to 55 days back, and the
+# 30-day cards fit well inside.
+FLOW_WINDOW_DAYS = 63
+
+FLOW_FIELDS = ['tasks_created', 'tasks_completed', 'completed_on_time', 'completed_late']
+SNAPSHOT_FIELDS = [
+    'tasks_total', 'tasks_done', 'overdue_count', 'at_risk_count', 'in_review_count',
+    'tasks_with_due', 'done_with_due', 'done_on_time', 'milestones_total', 'milestones_done',
+    'completed_last_7d', 'completed_last_30d', 'created_last_30d',
+    'cycle_time_days_sum', 'cycle_time_count', 'cycle_time_buckets',
+    'wip_by_column', 'workload', 'estimated_cost', 'actual_cost',
+    'snapshot_at', 'is_stale',
+]
+# Upper bound (inclusive, whole days) of each cycle-time bucket; the last is open.
+CYCLE_TIME_BUCKET_LIMITS = (1, 3, 7, 14)
+
+
+def _cycle_time_bucket(days):
+    for i, limit in enumerate(CYCLE_TIME_BUCKET_LIMITS):
+        if days <= limit:
+            return i
+    return len(CYCLE_TIME_BUCKET_LIMITS)
+
+
+def refresh_board_metrics(board, today=None):
+    """
+    Recompute ``board``'s row for ``today`` and the flow counts of the
+    trailing window, and return today's (unsaved-state) row.
+
+    Runs a constant number of queries: one task aggregate, one per grouped
+    breakdown (columns, assignees, creations, completions), one for cycle
+    times, two for cost and two upserts.
+    """
+    from kanban.board_metrics_models import BoardDailyMetrics
+    from kanban.budget_models import TaskCost, TimeEntry
+    from kanban.models import Column, Task
+
+    today = today or timezone.localdate()
+    window_start = today - timedelta(days=FLOW_WINDOW_DAYS - 1)
+
+    items = Task.objects.filter(column__board=board)
+    tasks = items.filter(item_type='task')
+    is_task = Q(item_type='task')
+    is_open = ~Q(progress=100)
+    has_due = Q(due_date__isnull=False)
+    # Judge deadlines by the real completion date; updated_at is auto_now and
+    # only stands in when completed_at is missing.
+    completed_day = TruncDate(Coalesce('completed_at', 'updated_at'))
+
+    stock = items.annotate(_done_day=completed_day, _due_day=TruncDate('due_date')).aggregate(
+        tasks_total=Count('id', filter=is_task),
+        tasks_done=Count('id', filter=is_task & Q(progress=100)),
+        overdue_count=Count('id', filter=is_task & is_open & has_due & Q(due_date__date__lt=today)),
+        at_risk_count=Count('id', filter=is_task & is_open & (
+            Q(priority='urgent') | Q(priority='high', progress=0)
+        )),
+        in_review_count=Count('id', filter=is_task & is_open & Q(column__name__icontains='review')),
+        tasks_with_due=Count('id', filter=is_task & has_due),
+        done_with_due=Count('id', filter=is_task & has_due & Q(progress=100)),
+        done_on_time=Count('id', filter=is_task & has_due & Q(progress=100, _due_day__gte=F('_done_day'))),
+        milestones_total=Count('id', filter=Q(item_type='milestone')),
+        milestones_done=Count('id', filter=Q(item_type='milestone') & (
+            Q(milestone_status='completed') | Q(progress=100)
+        )),
+    )
+
+    columns = list(
+        Column.objects.filter(board=board).order_by('position')
+        .annotate(n=Count('tasks', filter=Q(tasks__item_type='task')))
+        .values('id', 'name', 'position', 'n')
+    )
+    if not any('review' in (c['name'] or '').lower() for c in columns):
+        stock['in_review_count'] = None
+
+    workload = list(
+        tasks.values('assigned_to__username')
+        .annotate(count=Count('id'), active=Count('id', filter=is_open))
+        .order_by('-count')
+    )
+
+    created = dict(
+        tasks.filter(created_at__date__gte=window_start)
+        .annotate(_day=TruncDate('created_at'))
+        .values('_day').annotate(n=Count('id')).values_list('_day', 'n')
+    )
+    completed = {
+        row['_day']: row for row in
+        tasks.filter(progress=100)
+        .annotate(_day=completed_day, _due_day=TruncDate('due_date'))
+        .filter(_day__gte=window_start)
+        .values('_day')
+        .annotate(
+            n=Count('id'),
+            on_time=Count('id', filter=has_due & Q(_due_day__gte=F('_day'))),
+            late=Count('id', filter=has_due & Q(_due_day__lt=F('_day'))),
+        )
+    }
+
+    cycle_sum, cycle_count = 0.0, 0
+    buckets = [0] * (len(CYCLE_TIME_BUCKET_LIMITS) + 1)
+    for created_at, completed_at, updated_at in tasks.filter(progress=100).values_list(
+        'created_at', 'completed_at', 'updated_at',
+    ):
+        end = completed_at or updated_at
+        if not end or not created_at:
+            continue
+        delta = end - created_at
+        cycle_sum += max(0.0, delta.total_seconds() / 86400)
+        cycle_count += 1
+        buckets[_cycle_time_bucket(max(0, delta.days))] += 1
+
+    # Same spend definition as ProjectBudget.get_spent_amount.
+    cost = TaskCost.objects.filter(task__column__board=board).aggregate(
+        estimated=Sum('estimated_cost'),
+        direct=Sum('actual_cost') + Sum('resource_cost'),
+    )
+    labor = TimeEntry.objects.filter(
+        task__column__board=board, task__cost__hourly_rate__isnull=False,
+    ).aggregate(
+        total=Sum(
+            F('hours_spent') * F('task__cost__hourly_rate'),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+    )['total'] or Decimal('0.00')
+
+    rows = []
+    for offset in range(FLOW_WINDOW_DAYS):
+        day = window_start + timedelta(days=offset)
+        done = completed.get(day) or {}
+        rows.append(BoardDailyMetrics(
+            board=board, date=day,
+            tasks_created=created.get(day, 0),
+            tasks_completed=done.get('n', 0),
+            completed_on_time=done.get('on_time', 0),
+            completed_late=done.get('late', 0),
+        ))
+    past, row = rows[:-1], rows[-1]
+
+    def _since(days, field):
+        return sum(getattr(r, field) for r in rows[-days:])
+
+    row.completed_last_7d = _since(7, 'tasks_completed')
+    row.completed_last_30d = _since(30, 'tasks_completed')
+    row.created_last_30d = _since(30, 'tasks_created')
+    for field, value in stock.items():
+        setattr(row, field, value)
+    row.cycle_time_days_sum = cycle_sum
+    row.cycle_time_count = cycle_count
+    row.cycle_time_buckets = buckets
+    row.wip_by_column = [
+        {'id': c['id'], 'name': c['name'], 'position': c['position'], 'count': c['n']}
+        for c in columns
+    ]
+    row.workload = [
+        {'username': w['assigned_to__username'], 'count': w['count'], 'active': w['active']}
+        for w in workload
+    ]
+    row.estimated_cost = cost['estimated'] or Decimal('0.00')
+    row.actual_cost = (cost['direct'] or Decimal('0.00')) + labor
+    row.snapshot_at = timezone.now()
+    row.is_stale = False
+
+    # Past days only get their flow counts rewritten; their snapshot stays
+    # what it was when that day ended.
+    BoardDailyMetrics.objects.bulk_create(
+        past, update_conflicts=True, unique_fields=['board', 'date'], update_fields=FLOW_FIELDS,
+    )
+    BoardDailyMetrics.objects.bulk_create(
+        [row], update_conflicts=True, unique_fields=['board', 'date'],
+        update_fields=FLOW_FIELDS + SNAPSHOT_FIELDS,
+    )
+    return row
+
+
+def mark_board_metrics_stale(board_id):
+    """Flag today's row for ``board_id`` so the next reader refreshes it."""
+    from kanban.board_metrics_models import BoardDailyMetrics
+
+    if board_id:
+        BoardDailyMetrics.objects.filter(
+            board_id=board_id, date=timezone.localdate(), is_stale=False,
+        ).update(is_stale=True)
+
+
+def board_metrics(board):
+    """Today's fact row for ``board``, refreshed first if missing or stale."""
+    from kanban.board_metrics_models import BoardDailyMetrics
+
+    row = BoardDailyMetrics.objects.filter(
+        board=board, date=timezone.localdate(), snapshot_at__isnull=False,
+    ).first()
+    if row is None or row.is_stale:
+        row = refresh_board_metrics(board)
+    return row
+
+
+def daily_flow(board, since):
+    """
+    ``{date: {'tasks_completed', 'completed_on_time', 'completed_late',
+    'tasks_created'}}`` for ``since``..today (days without a row are absent).
+    Callers make sure today's row is current (``board_metrics``) first.
+    """
+    from kanban.board_metrics_models import BoardDailyMetrics
+
+    return {
+        row.pop('date'): row for row in
+        BoardDailyMetrics.objects.filter(board=board, date__gte=since)
+        .values('date', *FLOW_FIELDS)
+    }
+
+
+def refresh_all_board_metrics():
+    """Refresh today's row for every non-archived board. Returns the count refreshed."""
+    from kanban.models import Board
+
+    refreshed = 0
+    for board in Board.objects.filter(is_archived=False).iterator(chunk_size=200):
+        try:
+            refresh_board_metrics(board)
+            refreshed += 1
+        except Exception:
+            logger.exception(f"refresh_all_board_metrics: board {board.pk} failed")
+    return refreshed
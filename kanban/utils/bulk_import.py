@@ -0,0 +1,323 @@
+"""
+Bulk-write path for board imports and external migrations.
+
+Creating an imported board row by row costs a ``get_or_create`` per label, an
+INSERT per column and task, and the full Task signal chain per task —
+automations, webhooks, workload, project signals, calendar sync. A 20k-issue
+Jira project took tens of minutes.
+
+``bulk_populate_board()`` fills a freshly created board with ``bulk_create``
+for labels, columns, tasks, label and dependency M2M rows and the initial
+assignment history, so no per-row signal fires. What those signals would have
+produced for a brand-new board is done once afterwards:
+
+* workload counters of the assignees are reconciled and their per-user
+  recalculations deferred (coalesced by kanban/utils/side_effects.py);
+* calendar sync is deferred only for tasks whose assignee has sync enabled;
+* ``board_imported`` is sent once with aggregate stats, and records one
+  ProjectSignal instead of one per task.
+
+The board is new, so it has no automation rules or webhooks that the skipped
+per-task signals could have reached.
+"""
+import logging
+
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower
+from django.dispatch import Signal
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Sent once per board filled by bulk_populate_board().
+# kwargs: board, user, stats (dict of row counts).
+board_imported = Signal()
+
+TASK_CHUNK_SIZE = 1000
+DEFAULT_LABEL_COLOR = '#FF5733'
+
+
+def bulk_populate_board(board, result, user, organization, created_by_session=None,
+                        progress_cb=None, chunk_size=TASK_CHUNK_SIZE):
+    """
+    Write an ImportResult's labels, columns and tasks into a new, empty board.
+
+    Args:
+        board: freshly created Board
+        result: ImportResult from an import adapter
+        user: importing user (created_by / changed_by on every row)
+        organization: assignees must belong to it to be assigned
+        created_by_session: demo-mode session id stamped on tasks
+        progress_cb: optional callback(percent:int, message:str), called after
+            each chunk of ``chunk_size`` tasks
+        chunk_size: tasks per INSERT
+
+    Returns:
+        dict of row counts (columns, labels, tasks, label_links, dependencies)
+    """
+    from kanban.models import Task
+
+    def progress(pct, msg):
+        if progress_cb:
+            try:
+                progress_cb(pct, msg)
+            except Exception:
+                logger.debug("progress_cb failed", exc_info=True)
+
+    labels = _create_labels(board, result)
+    columns = _create_columns(board, result)
+    assignees = _resolve_assignees(board, result, organization)
+
+    tasks_data = result.tasks_data
+    default_column = next(iter(columns.values()))
+    now = timezone.now()
+    tasks = []
+    for task_data in tasks_data:
+        task = Task(
+            title=(task_data.get('title') or 'Untitled Task')[:200],
+            description=task_data.get('description', '') or '',
+            column=columns.get(task_data.get('column_temp_id')) or default_column,
+            position=task_data.get('position', 0),
+            created_by=user,
+            priority=task_data.get('priority', 'medium'),
+            progress=task_data.get('progress', 0),
+            complexity_score=task_data.get('complexity_score', 5),
+            phase=task_data.get('phase'),
+            created_by_session=created_by_session,
+        )
+        if task_data.get('start_date'):
+            task.start_date = task_data['start_date']
+        if task_data.get('due_date'):
+            task.due_date = task_data['due_date']
+        assignee = assignees.get((task_data.get('assigned_to_username') or '').lower())
+        if assignee:
+            task.assigned_to = assignee
+        # What the pre_save receivers track_column_entry_time and
+        # auto_update_progress_for_done_column would have done.
+        task.column_entered_at = now
+        if task.column.is_done():
+            task.progress = 100
+        task.apply_derived_fields()
+        tasks.append(task)
+
+    total = len(tasks)
+    for start in range(0, total, chunk_size):
+        Task.objects.bulk_create(tasks[start:start + chunk_size])
+        done = min(start + chunk_size, total)
+        progress(int(100 * done / total), f"Imported {done}/{total} tasks")
+    _ensure_pks(board, tasks)
+
+    stats = {
+        'columns': len(columns),
+        'labels': len(labels),
+        'tasks': total,
+        'label_links': _link_labels(board, tasks, tasks_data, labels, chunk_size),
+        'dependencies': _link_dependencies(tasks, tasks_data, chunk_size),
+    }
+    _record_assignments(tasks, user, chunk_size)
+    _after_import(tasks)
+
+    board_imported.send(sender=board.__class__, board=board, user=user, stats=stats)
+    return stats
+
+
+def _create_labels(board, result):
+    """name -> TaskLabel for the declared labels and any only named on tasks."""
+    from kanban.models import TaskLabel
+
+    colors = {}
+    for label_data in result.labels_data:
+        name = label_data.get('name')
+        if name and name not in colors:
+            colors[name] = label_data.get('color', DEFAULT_LABEL_COLOR)
+    for task_data in result.tasks_data:
+        for name in task_data.get('label_names', []) or []:
+            if name:
+                colors.setdefault(name, DEFAULT_LABEL_COLOR)
+
+    labels = TaskLabel.objects.bulk_create([
+        TaskLabel(name=name, board=board, color=color) for name, color in colors.items()
+    ])
+    return {label.name: label for label in labels}
+
+
+def _create_columns(board, result):
+    """temp_id -> Column, with a default 'To Do' column when none were given."""
+    from kanban.models import Column
+    from kanban.signals import auto_assign_column_color
+
+    columns = {}
+    for col_data in result.columns_data:
+        columns[col_data.get('temp_id')] = Column(
+            name=col_data.get('name', 'Column'),
+            board=board,
+            position=col_data.get('position', 0),
+        )
+    if not columns:
+        columns['default'] = Column(name='To Do', board=board, position=0)
+
+    # pre_save does not run for bulk_create.
+    for column in columns.values():
+        auto_assign_column_color(Column, column)
+    Column.objects.bulk_create(list(columns.values()))
+    return columns
+
+
+def _resolve_assignees(board, result, organization):
+    """
+    lowercased assigned_to_username -> User, for users in ``organization``.
+
+    Matches username case-insensitively, then email for values containing '@'
+    — the same rules as the per-row import — with two queries in total.
+    Every assignee is made a board member, so "assignee always has board
+    access" holds.
+    """
+    from kanban.models import BoardMembership
+
+    wanted = {
+        (task_data.get('assigned_to_username') or '').lower()
+        for task_data in result.tasks_data
+    } - {''}
+    if not wanted:
+        return {}
+
+    matched = {}
+    by_username = (
+        User.objects.select_related('profile')
+        .annotate(username_lower=Lower('username'))
+        .filter(username_lower__in=wanted)
+        .order_by('pk')
+    )
+    for candidate in by_username:
+        matched.setdefault(candidate.username_lower, candidate)
+
+    emails = {name for name in wanted - set(matched) if '@' in name}
+    if emails:
+        by_email = (
+            User.objects.select_related('profile')
+            .annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=emails)
+            .order_by('pk')
+        )
+        for candidate in by_email:
+            matched.setdefault(candidate.email_lower, candidate)
+
+    organization_id = organization.pk if organization else None
+    assignees = {}
+    for key, candidate in matched.items():
+        if hasattr(candidate, 'profile') and candidate.profile.organization_id == organization_id:
+            assignees[key] = candidate
+
+    for member in {u.pk: u for u in assignees.values()}.values():
+        BoardMembership.objects.get_or_create(
+            board=board, user=member, defaults={'role': 'member'}
+        )
+    return assignees
+
+
+def _ensure_pks(board, tasks):
+    """Backfill pks on backends whose bulk INSERT cannot return them."""
+    from kanban.models import Task
+
+    if not tasks or tasks[0].pk is not None:
+        return
+    # The board was empty, so its tasks in pk order are exactly ours, in
+    # insertion order.
+    pks = Task.objects.filter(column__board=board).order_by('pk').values_list('pk', flat=True)
+    for task, pk in zip(tasks, pks):
+        task.pk = pk
+
+
+def _link_labels(board, tasks, tasks_data, labels, chunk_size):
+    from kanban.models import Task
+
+    Through = Task.labels.through
+    rows = []
+    for task, task_data in zip(tasks, tasks_data):
+        label_ids = {labels[name].pk for name in task_data.get('label_names', []) or [] if name in labels}
+        rows.extend(Through(task_id=task.pk, tasklabel_id=label_id) for label_id in label_ids)
+    Through.objects.bulk_create(rows, batch_size=chunk_size)
+    return len(rows)
+
+
+def _link_dependencies(tasks, tasks_data, chunk_size):
+    """
+    Wire ``dependency_external_ids`` (external ids of blocking tasks in the
+    same import) into Task.dependencies. Unknown ids are ignored.
+    """
+    from kanban.models import Task
+
+    by_external_id = {
+        task_data['external_id']: task
+        for task, task_data in zip(tasks, tasks_data)
+        if task_data.get('external_id')
+    }
+    Through = Task.dependencies.through
+    rows = []
+    for task, task_data in zip(tasks, tasks_data):
+        blocking_ids = set()
+        for external_id in task_data.get('dependency_external_ids', []) or []:
+            blocking = by_external_id.get(external_id)
+            if blocking is not None and blocking.pk != task.pk:
+                blocking_ids.add(blocking.pk)
+        rows.extend(Through(from_task_id=task.pk, to_task_id=pk) for pk in blocking_ids)
+    Through.objects.bulk_create(rows, batch_size=chunk_size)
+    return len(rows)
+
+
+def _record_assignments(tasks, user, chunk_size):
+    """The history and activity rows update_workload_on_assignment_change writes for new tasks."""
+    from kanban.models import TaskActivity
+    from kanban.resource_leveling_models import TaskAssignmentHistory
+
+    assigned = [task for task in tasks if task.assigned_to_id]
+    TaskAssignmentHistory.objects.bulk_create([
+        TaskAssignmentHistory(
+            task=task, previous_assignee=None, new_assignee=task.assigned_to,
+            changed_by=user, reason='manual',
+        )
+        for task in assigned
+    ], batch_size=chunk_size)
+    TaskActivity.objects.bulk_create([
+        TaskActivity(
+            task=task, user=user, activity_type='assigned',
+            description=f"assigned this task to {task.assigned_to.get_full_name() or task.assigned_to.username}",
+        )
+        for task in assigned
+    ], batch_size=chunk_size)
+
+
+def _after_import(tasks):
+    """Follow-ups the skipped Task post_save receivers would have queued."""
+    from kanban.utils import workload_counters
+    from kanban.utils.side_effects import defer
+
+    for board_id in {task.column.board_id for task in tasks if task.column_id}:
+        defer('board_metrics_stale', board_id)
+
+    assignee_ids = {task.assigned_to_id for task in tasks if task.assigned_to_id}
+    if not assignee_ids:
+        return
+
+    workload_counters.reconcile_workload_counters(user_ids=assignee_ids)
+    completed_by = {task.assigned_to_id for task in tasks if task.assigned_to_id and task.completed_at}
+    for user_id in assignee_ids:
+        defer('performance_workload', user_id)
+        defer('user_workload', user_id)
+    for user_id in completed_by:
+        defer('performance_metrics', user_id)
+
+    try:
+        from kanban.utils.demo_protection import calendar_sync_suppressed
+        if calendar_sync_suppressed():
+            return
+    except Exception:
+        pass
+    from accounts.models import GoogleCalendarToken
+    syncing = set(
+        GoogleCalendarToken.objects.filter(user_id__in=assignee_ids, sync_enabled=True)
+        .values_list('user_id', flat=True)
+    )
+    for task in tasks:
+        if task.due_date and task.assigned_to_id in syncing:
+            defer('google_calendar_sync', task.pk, task.assigned_to_id, None, None)
@@ -11,12 +11,52 @@ from kanban.models import Task, Board
 from kanban.conflict_models import (
     ConflictDetection, ConflictResolution, ResolutionPattern
 )
+import heapq
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _as_date(value):
+    """Normalise a date or datetime to a date."""
+    return value.date() if hasattr(value, 'date') else value
+
+
+def iter_overlapping_pairs(intervals):
+    """
+    Yield every pair of overlapping intervals using a sweep line.
+    
+    Args:
+        intervals: iterable of ``(start, end, item)`` tuples with inclusive
+            bounds. Intervals whose end precedes their start are ignored.
+    
+    Yields:
+        ``(item_a, item_b)`` tuples where ``item_a`` starts no later than
+        ``item_b``. Pairs are produced in sweep order (by ``item_b``'s start,
+        then by ``item_a``'s start), so the first pair yielded is the earliest
+        overlap — callers that only need one can stop there.
+    
+    Sorting costs O(n log n); the sweep itself is O(n log n + k) for k pairs.
+    """
+    ordered = sorted(
+        ((start, end, idx, item)
+         for idx, (start, end, item) in enumerate(intervals)
+         if start <= end),
+        key=lambda entry: (entry[0], entry[2]),
+    )
+    active = {}  # position -> item, in start order
+    expiry = []  # min-heap of (end, position)
+    for position, (start, end, _idx, item) in enumerate(ordered):
+        while expiry and expiry[0][0] < start:
+            _, expired = heapq.heappop(expiry)
+            del active[expired]
+        for other in active.values():
+            yield other, item
+        active[position] = item
+        heapq.heappush(expiry, (end, position))
+
+
 class ConflictDetectionService:
     """
     Main service for detecting and analyzing conflicts in project management.
@@ -92,9 +132,13 @@ class ConflictDetectionService:
         1. Same user assigned to multiple tasks
         2. Tasks have overlapping time periods
         3. Total workload exceeds reasonable capacity
-        """
-        conflicts = []
         
+        Overlaps are found per assignee with an interval sweep
+        (:func:`iter_overlapping_pairs`, O(n log n)) instead of comparing every
+        pair of tasks. Active resource conflicts are preloaded once per board
+        into an in-memory title index, and new conflicts, their M2M rows and
+        notifications are written in bulk.
+        """
         # Get all tasks with assignments and dates
         tasks = Task.objects.filter(
             column__board=board,
@@ -115,86 +159,124 @@ class ConflictDetectionService:
                 user_tasks[user] = []
             user_tasks[user].append(task)
         
-        # Check each user for overlapping tasks
+        # Existing active conflicts, keyed by title. Title match (instead of an
+        # M2M lookup) keeps copied conflicts with empty M2M detected.
+        existing_titles = set(
+            ConflictDetection.objects.filter(
+                board=board,
+                conflict_type='resource',
+                status='active',
+            ).values_list('title', flat=True)
+        )
+        
+        pending = []  # (conflict, task1, task2, user)
         for user, user_task_list in user_tasks.items():
             if len(user_task_list) < 2:
                 continue
             
-            # Sort by start date
-            user_task_list.sort(key=lambda t: t.start_date)
+            user_display = user.get_full_name() or user.username
+            conflict_title = f"Resource conflict: {user_display} overbooked"
+            if conflict_title in existing_titles:
+                continue  # Skip if already detected
             
-            # Check for overlaps
-            for i, task1 in enumerate(user_task_list):
-                for task2 in user_task_list[i+1:]:
-                    # Convert due_date (datetime) to date for comparison
-                    task1_due = task1.due_date.date() if hasattr(task1.due_date, 'date') else task1.due_date
-                    task2_due = task2.due_date.date() if hasattr(task2.due_date, 'date') else task2.due_date
-                    
-                    # Check if tasks overlap
-                    if self._tasks_overlap(
+            intervals = [
+                (task.start_date, _as_date(task.due_date), task)
+                for task in user_task_list
+            ]
+            # One conflict per user: record the earliest overlapping pair.
+            pair = next(iter_overlapping_pairs(intervals), None)
+            if pair is None:
+                continue
+            task1, task2 = pair
+            task1_due = _as_date(task1.due_date)
+            task2_due = _as_date(task2.due_date)
+            
+            # Calculate severity based on overlap duration and task priority
+            severity = self._calculate_resource_conflict_severity(
+                task1, task2, user
+            )
+            
+            conflict = ConflictDetection(
+                conflict_type='resource',
+                severity=severity,
+                board=board,
+                title=conflict_title,
+                description=f"{user_display} is assigned to overlapping tasks: '{task1.title}' and '{task2.title}'",
+                conflict_data={
+                    'user_id': user.id,
+                    'user_name': user_display,
+                    'task1_id': task1.id,
+                    'task1_title': task1.title,
+                    'task1_dates': {
+                        'start': str(task1.start_date),
+                        'due': str(task1.due_date)
+                    },
+                    'task2_id': task2.id,
+                    'task2_title': task2.title,
+                    'task2_dates': {
+                        'start': str(task2.start_date),
+                        'due': str(task2.due_date)
+                    },
+                    'overlap_days': self._calculate_overlap_days(
                         task1.start_date, task1_due,
                         task2.start_date, task2_due
-                    ):
-                        user_display = user.get_full_name() or user.username
-                        conflict_title = f"Resource conflict: {user_display} overbooked"
-
-                        # Check if this conflict already exists and is active
-                        # Use title match instead of M2M lookup so copied
-                        # conflicts with empty M2M are still detected.
-                        existing = ConflictDetection.objects.filter(
-                            board=board,
-                            conflict_type='resource',
-                            status='active',
-                            title=conflict_title,
-                        ).first()
-                        
-                        if existing:
-                            continue  # Skip if already detected
-                        
-                        # Calculate severity based on overlap duration and task priority
-                        severity = self._calculate_resource_conflict_severity(
-                            task1, task2, user
-                        )
-                        
-                        # Create conflict
-                        conflict = ConflictDetection.objects.create(
-                            conflict_type='resource',
-                            severity=severity,
-                            board=board,
-                            title=conflict_title,
-                            description=f"{user.get_full_name() or user.username} is assigned to overlapping tasks: '{task1.title}' and '{task2.title}'",
-                            conflict_data={
-                                'user_id': user.id,
-                                'user_name': user.get_full_name() or user.username,
-                                'task1_id': task1.id,
-                                'task1_title': task1.title,
-                                'task1_dates': {
-                                    'start': str(task1.start_date),
-                                    'due': str(task1.due_date)
-                                },
-                                'task2_id': task2.id,
-                                'task2_title': task2.title,
-                                'task2_dates': {
-                                    'start': str(task2.start_date),
-                                    'due': str(task2.due_date)
-                                },
-                                'overlap_days': self._calculate_overlap_days(
-                                    task1.start_date, task1_due,
-                                    task2.start_date, task2_due
-                                )
-                            },
-                            detection_run_id=self.detection_run_id,
-                            auto_detection=True
-                        )
-                        
-                        # Add related tasks and users
-                        conflict.tasks.add(task1, task2)
-                        conflict.affected_users.add(user)
-                        
-                        # Ensure notifications are created
-                        conflict.ensure_notifications()
-                        
-                        conflicts.append(conflict)
+                    )
+                },
+                detection_run_id=self.detection_run_id,
+                auto_detection=True
+            )
+            existing_titles.add(conflict_title)
+            pending.append((conflict, task1, task2, user))
+        
+        if not pending:
+            return []
+        return self._bulk_create_resource_conflicts(board, pending)
+    
+    def _bulk_create_resource_conflicts(self, board, pending):
+        """
+        Persist new resource conflicts with bulk writes.
+        
+        Produces the same end state as ``create()`` + ``tasks.add()`` +
+        ``affected_users.add()`` + ``ensure_notifications()`` per conflict: a
+        resource conflict's recipients are exactly the overbooked user (who is
+        also the assignee of both tasks), so board access is checked once per
+        user and the M2M and notification rows are inserted in one batch each.
+        ``post_save`` is sent for every new conflict so ``conflict_detected``
+        automations still fire.
+        """
+        from django.db import transaction
+        from django.db.models.signals import post_save
+        from kanban.conflict_models import ConflictNotification
+        from kanban.simple_access import can_access_board
+        
+        conflicts = [item[0] for item in pending]
+        with transaction.atomic():
+            ConflictDetection.objects.bulk_create(conflicts)
+            for conflict in conflicts:
+                post_save.send(
+                    sender=ConflictDetection, instance=conflict, created=True,
+                    update_fields=None, raw=False, using=conflict._state.db,
+                )
+            
+            TaskLink = ConflictDetection.tasks.through
+            UserLink = ConflictDetection.affected_users.through
+            task_links, user_links, notifications = [], [], []
+            for conflict, task1, task2, user in pending:
+                task_links.append(TaskLink(conflictdetection_id=conflict.pk, task_id=task1.pk))
+                task_links.append(TaskLink(conflictdetection_id=conflict.pk, task_id=task2.pk))
+                # RBAC: users without board access are neither linked nor notified.
+                if not can_access_board(user, board):
+                    continue
+                user_links.append(UserLink(conflictdetection_id=conflict.pk, user_id=user.pk))
+                notifications.append(ConflictNotification(
+                    conflict=conflict,
+                    user=user,
+                    notification_type='in_app',
+                    acknowledged=False,
+                ))
+            TaskLink.objects.bulk_create(task_links, ignore_conflicts=True)
+            UserLink.objects.bulk_create(user_links, ignore_conflicts=True)
+            ConflictNotification.objects.bulk_create(notifications, ignore_conflicts=True)
         
         return conflicts
     
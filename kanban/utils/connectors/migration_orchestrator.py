@@ -20,6 +20,7 @@ from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
 from kanban.utils.import_adapters import AdapterFactory
+from kanban.utils.side_effects import coalesce_side_effects
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +98,7 @@ def _group_raw_by_epic(provider: str, raw: Dict) -> List[Dict[str, Any]]:
     return [{"name": None, "raw": raw}]
 
 
+@coalesce_side_effects()
 def run_migration(
     *,
     provider: str,
@@ -118,6 +120,9 @@ def run_migration(
         project_name: source project name, used for the Mission/Strategy title.
         user / organization / session: as required by _create_board_from_import_result.
         progress_cb: optional callback(percent:int, message:str) for live progress.
+
+    Boards are filled by the bulk import path (kanban/utils/bulk_import.py);
+    the per-user follow-ups for every imported board share one coalesced batch.
     """
     from kanban.models import Mission, Strategy  # local import to avoid cycles
     from kanban.views import _create_board_from_import_result
@@ -176,7 +181,15 @@ def run_migration(
         # Board title = epic/bucket name (overrides the adapter's project-derived name).
         import_result.board_data["name"] = bucket_name[:100]
 
-        board = _create_board_from_import_result(import_result, user, organization, session)
+        # Task rows are bulk-written in chunks; spread their progress over
+        # this bucket's share of the 20-80% band.
+        def bucket_progress(pct, msg, base=20 + 60 * idx / total, span=60 / total,
+                            name=bucket_name):
+            progress(int(base + span * pct / 100), f"{name}: {msg}")
+
+        board = _create_board_from_import_result(
+            import_result, user, organization, session, progress_cb=bucket_progress,
+        )
         # Wire the board into the Strategy (and keep workspace consistent).
         board.strategy = strategy
         if ws and board.workspace_id != ws.id:
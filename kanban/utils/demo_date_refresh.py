@@ -12,6 +12,14 @@ IMPORTANT ARCHITECTURAL NOTES:
 2. The refresh runs once per day (cached) to avoid performance impact.
    - First demo access of the day triggers the refresh
    - All subsequent accesses that day skip the refresh
+
+3. Each demo board has a ``DemoDateRefresh`` row (kanban/demo_refresh_models.py)
+   recording the last day it was refreshed.  Only boards not yet refreshed
+   today are rewritten, and their rows are then updated in one UPDATE — a
+   board refreshed at provisioning time, or by an earlier run the same day,
+   is never rewritten again, and a day with no board left to do skips the
+   full-database transaction.  Wiki pages and AI assistant sessions belong to
+   no board and are refreshed on every run.
 """
 
 import threading
@@ -36,11 +44,12 @@ _local = threading.local()
 @contextmanager
 def _scoped_to_boards(board_ids):
     """Context manager to restrict _get_demo_board_ids() to a specific set."""
+    previous = getattr(_local, 'scoped_board_ids', None)
     _local.scoped_board_ids = board_ids
     try:
         yield
     finally:
-        _local.scoped_board_ids = None
+        _local.scoped_board_ids = previous
 
 
 def _get_demo_board_ids():
@@ -81,17 +90,24 @@ def should_refresh_demo_dates():
     last_refresh = cache.get(DEMO_DATE_REFRESH_CACHE_KEY)
     today = timezone.now().date()
     
-    if last_refresh is None:
-        return True
-    
-    # If last refresh was on a previous day, refresh is needed
     if isinstance(last_refresh, str):
         try:
             last_refresh = date.fromisoformat(last_refresh)
         except (ValueError, TypeError):
-            return True
-    
-    return last_refresh < today
+            last_refresh = None
+
+    if last_refresh is not None and last_refresh >= today:
+        return False
+
+    # The cache only says nobody marked today yet (e.g. after a cache flush);
+    # the per-board records say whether anything actually needs rewriting.
+    # Every refresh that recorded a board also refreshed the board-independent
+    # data, so with no demo boards at all there is no record to go by.
+    board_ids = _get_demo_board_ids()
+    if board_ids and not _boards_not_refreshed_today(board_ids, today):
+        mark_demo_dates_refreshed()
+        return False
+    return True
 
 
 def mark_demo_dates_refreshed():
@@ -107,22 +123,61 @@ def refresh_single_board_dates(board_id):
 
     Used after sandbox provisioning so that only the newly created board is
     updated instead of triggering a global refresh across all users'
-    sandboxes.  Does NOT mark the daily cache so the full daily refresh still
-    runs later.
+    sandboxes.  Does NOT mark the daily cache; the board is recorded as
+    refreshed today, so the next daily refresh skips it until tomorrow.
     """
     with _scoped_to_boards([board_id]):
         return refresh_all_demo_dates(skip_mark_cache=True)
 
 
+def _boards_not_refreshed_today(board_ids, today):
+    """The subset of ``board_ids`` without a DemoDateRefresh for ``today``."""
+    if not board_ids:
+        return []
+    try:
+        from kanban.models import DemoDateRefresh
+        done = set(
+            DemoDateRefresh.objects.filter(board_id__in=board_ids, refreshed_on=today)
+            .values_list('board_id', flat=True)
+        )
+    except Exception:
+        # No table yet (migration pending): treat every board as due.
+        return list(board_ids)
+    return [board_id for board_id in board_ids if board_id not in done]
+
+
+def _record_refreshed_boards(board_ids, today):
+    """Record ``board_ids`` as refreshed on ``today``: one UPDATE plus inserts for new boards."""
+    from kanban.models import Board, DemoDateRefresh
+
+    DemoDateRefresh.objects.filter(board_id__in=board_ids).update(
+        refreshed_on=today, refreshed_at=timezone.now(),
+    )
+    recorded = set(
+        DemoDateRefresh.objects.filter(board_id__in=board_ids).values_list('board_id', flat=True)
+    )
+    missing = Board.objects.filter(id__in=set(board_ids) - recorded).values_list('id', flat=True)
+    DemoDateRefresh.objects.bulk_create(
+        [DemoDateRefresh(board_id=board_id, refreshed_on=today) for board_id in missing],
+        batch_size=500, ignore_conflicts=True,
+    )
+
+
 # How many times to re-run the whole demo-date refresh if a SQLite write lock
 # poisons its single all-or-nothing transaction.
 _MAX_DEMO_REFRESH_ATTEMPTS = 4
 
 
-def refresh_all_demo_dates(skip_mark_cache=False):
+def refresh_all_demo_dates(skip_mark_cache=False, force=False):
     """
     Refresh all SEED demo data dates to be relative to the current date.
 
+    Only boards not yet refreshed today (per ``DemoDateRefresh``) are
+    rewritten, or all boards in scope when ``force`` is set.  After a
+    successful refresh the rewritten boards are recorded as refreshed today.
+    Demo data that belongs to no board (``_refresh_shared_demo_dates``) is
+    refreshed on every call, including when no board is due.
+
     Public entry point. Delegates to ``_refresh_all_demo_dates_once`` and retries
     the ENTIRE refresh if a SQLite write lock poisoned the transaction (raised as
     ``OperationalError``). The refresh is fully idempotent, so a retry re-runs it
@@ -132,9 +187,22 @@ def refresh_all_demo_dates(skip_mark_cache=False):
     IMMEDIATE`` (settings) makes such locks rare in the first place; this is the
     belt-and-suspenders net for the ones that still slip through.
     """
+    today = timezone.now().date()
+    board_ids = _get_demo_board_ids()
+    if not force:
+        board_ids = _boards_not_refreshed_today(board_ids, today)
+    if not board_ids:
+        stats = _refresh_shared_demo_dates(timezone.now())
+        if not skip_mark_cache:
+            mark_demo_dates_refreshed()
+        logger.info(f"Demo boards already current; refreshed board-independent data: {stats}")
+        stats['boards_refreshed'] = 0
+        return stats
+
     for attempt in range(_MAX_DEMO_REFRESH_ATTEMPTS):
         try:
-            return _refresh_all_demo_dates_once(skip_mark_cache=skip_mark_cache)
+            with _scoped_to_boards(board_ids):
+                stats = _refresh_all_demo_dates_once(skip_mark_cache=skip_mark_cache)
         except OperationalError as e:
             if attempt < _MAX_DEMO_REFRESH_ATTEMPTS - 1:
                 logger.warning(
@@ -148,6 +216,31 @@ def refresh_all_demo_dates(skip_mark_cache=False):
                 f"attempts: {e}"
             )
             raise
+        # The refresh is idempotent, so a crash before this line only means
+        # the same boards are rewritten again next time.
+        _record_refreshed_boards(board_ids, today)
+        stats['boards_refreshed'] = len(board_ids)
+        return stats
+
+
+def _refresh_shared_demo_dates(now):
+    """
+    Refresh demo data that is scoped to the demo organisations and workspaces
+    rather than to a board: wiki pages and AI assistant sessions, messages
+    and analytics.  ``DemoDateRefresh`` only tracks boards, so these run on
+    every refresh, whether or not a board was due.
+    """
+    stats = {'wiki_pages_updated': 0, 'ai_sessions_updated': 0}
+    for key, fn in (
+        ('wiki_pages_updated', _refresh_wiki_dates),
+        ('ai_sessions_updated', _refresh_ai_session_dates),
+    ):
+        try:
+            with transaction.atomic():
+                stats[key] = fn(now)
+        except Exception as e:
+            logger.warning(f"Refresh sub-function '{key}' failed: {e}")
+    return stats
 
 
 def _refresh_all_demo_dates_once(skip_mark_cache=False):
@@ -263,11 +356,9 @@ def _refresh_all_demo_dates_once(skip_mark_cache=False):
             # 9. Refresh Conflict Detection dates
             stats['conflicts_updated'] = _refresh_conflict_dates(now)
 
-            # 10. Refresh Wiki Page dates
-            _safe(lambda: _refresh_wiki_dates(now), 'wiki_pages_updated')
-
-            # 11. Refresh AI Assistant Session dates
-            _safe(lambda: _refresh_ai_session_dates(now), 'ai_sessions_updated')
+            # 10-11. Wiki pages and AI Assistant sessions are not tied to a
+            #        board; see _refresh_shared_demo_dates.
+            stats.update(_refresh_shared_demo_dates(now))
 
             # 12. Refresh Improvement Metrics dates
             stats['improvement_metrics_updated'] = _refresh_improvement_metrics_dates(base_date)
@@ -323,6 +414,11 @@ def _refresh_all_demo_dates_once(skip_mark_cache=False):
             #     to today instead of drifting from their frozen clone dates.
             _safe(lambda: _refresh_exit_protocol_dates(base_date), 'exit_protocol_dates_updated')
 
+            # 29. The refreshers above move task dates with queryset updates,
+            #     which bypass the Task signals — flag the analytics fact rows
+            #     so the next read recomputes them.
+            _safe(lambda: _mark_board_metrics_stale(now), 'board_metrics_marked_stale')
+
             # A "database is locked" swallowed by one of the directly-called
             # refreshers above (e.g. _refresh_task_dates) leaves the connection
             # flagged needs_rollback, silently no-opping every step after it and
@@ -377,6 +473,14 @@ def _refresh_board_deadlines(base_date):
 MEMORY_ANCHOR_OFFSET = 7
 
 
+def _mark_board_metrics_stale(now):
+    """Flag today's BoardDailyMetrics rows of the demo boards for recomputation."""
+    from kanban.board_metrics_models import BoardDailyMetrics
+    return BoardDailyMetrics.objects.filter(
+        board_id__in=_get_demo_board_ids(), date=timezone.localdate(now), is_stale=False,
+    ).update(is_stale=True)
+
+
 def _refresh_memory_node_dates(base_date):
     """
     Keep Organizational Memory (knowledge graph) node dates relative to "today",
@@ -0,0 +1,249 @@
+"""
+In-memory dependency DAG for a board: topological order, Critical Path
+Method (CPM) and Finish-to-Start cascade rescheduling.
+
+``DependencyGraph.for_board()`` loads a board's tasks and the dependency
+edges between them with two queries; every computation afterwards runs in
+memory and is deterministic (ties are broken by task id), so the same
+board always yields the same critical path. ``cascade()`` writes the tasks
+it moved back with a single ``bulk_update``.
+
+Scheduling is in whole days, using the same convention as the Gantt chart:
+a task spans ``start_date`` .. the local date of ``due_date`` and a
+dependent may start on the day its predecessor is due. Tasks without both
+dates have zero duration; one with only a due date is pinned to that day and
+one with no dates only follows its predecessors. Edges to tasks on other boards are
+ignored.
+"""
+import heapq
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+class DependencyCycleError(ValueError):
+    """The dependency edges contain a cycle, so no schedule exists."""
+
+    def __init__(self, task_ids):
+        self.task_ids = sorted(task_ids)
+        super().__init__(f"Dependency cycle among tasks {self.task_ids}")
+
+
+class DependencyGraph:
+    TASK_FIELDS = ('id', 'title', 'item_type', 'start_date', 'due_date', 'progress')
+
+    def __init__(self, tasks, edges):
+        """
+        Args:
+            tasks: Task instances (only TASK_FIELDS are read)
+            edges: (predecessor_id, successor_id) pairs
+        """
+        self.tasks = {t.id: t for t in tasks}
+        self.predecessors = {tid: [] for tid in self.tasks}
+        self.successors = {tid: [] for tid in self.tasks}
+        for pred_id, succ_id in edges:
+            if pred_id in self.tasks and succ_id in self.tasks and pred_id != succ_id:
+                self.predecessors[succ_id].append(pred_id)
+                self.successors[pred_id].append(succ_id)
+        for ids in list(self.predecessors.values()) + list(self.successors.values()):
+            ids.sort()
+
+    @classmethod
+    def for_board(cls, board, item_types=('task', 'milestone')):
+        """Load ``board``'s tasks and the dependency edges between them (two queries)."""
+        from kanban.models import Task
+
+        tasks = list(
+            Task.objects.filter(column__board=board, item_type__in=item_types)
+            .only(*cls.TASK_FIELDS)
+            .order_by('id')
+        )
+        # Task.dependencies: from_task depends on to_task, i.e. to_task -> from_task.
+        edges = Task.dependencies.through.objects.filter(
+            from_task__column__board=board, to_task__column__board=board,
+        ).values_list('to_task_id', 'from_task_id')
+        return cls(tasks, list(edges))
+
+    # ------------------------------------------------------------------
+    # Graph walks
+    # ------------------------------------------------------------------
+
+    def topological_order(self, task_ids=None):
+        """
+        Kahn's algorithm over ``task_ids`` (all tasks by default), always
+        releasing the lowest ready id first.
+
+        Raises:
+            DependencyCycleError: if the subgraph is not acyclic
+        """
+        nodes = set(self.tasks if task_ids is None else task_ids)
+        indegree = {
+            tid: sum(1 for p in self.predecessors[tid] if p in nodes) for tid in nodes
+        }
+        ready = [tid for tid, deg in indegree.items() if deg == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            tid = heapq.heappop(ready)
+            order.append(tid)
+            for succ in self.successors[tid]:
+                if succ in nodes:
+                    indegree[succ] -= 1
+                    if indegree[succ] == 0:
+                        heapq.heappush(ready, succ)
+        if len(order) != len(nodes):
+            raise DependencyCycleError(nodes.difference(order))
+        return order
+
+    def descendants(self, task_id):
+        """Ids of every task transitively depending on ``task_id``."""
+        seen = set()
+        stack = list(self.successors.get(task_id, ()))
+        while stack:
+            tid = stack.pop()
+            if tid not in seen:
+                seen.add(tid)
+                stack.extend(self.successors[tid])
+        return seen
+
+    # ------------------------------------------------------------------
+    # Critical Path Method
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _due(task):
+        # The local calendar day: a 02:00 IST due time is still that day,
+        # not the previous UTC one.
+        return timezone.localtime(task.due_date).date() if task.due_date else None
+
+    def _duration(self, task):
+        due = self._due(task)
+        if task.start_date and due:
+            return max((due - task.start_date).days, 0)
+        return 0
+
+    def critical_path(self):
+        """
+        Forward/backward CPM pass over the whole board.
+
+        Returns:
+            dict with ``project_start`` / ``project_finish`` (ISO dates or
+            None), ``duration_days``, ``critical_path`` (ordered task ids of
+            one zero-slack chain ending at the project finish),
+            ``critical_task_ids`` and ``tasks``: per task id, ``title``,
+            ``duration_days``, ``earliest_start``, ``earliest_finish``,
+            ``latest_start``, ``latest_finish`` (ISO dates), ``slack_days``
+            and ``is_critical``.
+
+        Raises:
+            DependencyCycleError: if the dependencies contain a cycle
+        """
+        order = self.topological_order()
+        anchors = [t.start_date or self._due(t) for t in self.tasks.values()]
+        anchors = [d for d in anchors if d]
+        origin = min(anchors) if anchors else timezone.localdate()
+
+        duration = {tid: self._duration(self.tasks[tid]) for tid in order}
+        es, ef = {}, {}
+        for tid in order:
+            task = self.tasks[tid]
+            own_start = task.start_date or self._due(task)
+            start = (own_start - origin).days if own_start else 0
+            for pred in self.predecessors[tid]:
+                start = max(start, ef[pred])
+            es[tid] = start
+            ef[tid] = start + duration[tid]
+
+        finish = max(ef.values(), default=0)
+        ls, lf = {}, {}
+        for tid in reversed(order):
+            succs = self.successors[tid]
+            lf[tid] = min((ls[s] for s in succs), default=finish)
+            ls[tid] = lf[tid] - duration[tid]
+
+        slack = {tid: ls[tid] - es[tid] for tid in order}
+        critical = sorted(tid for tid in order if slack[tid] == 0)
+
+        path = []
+        if critical:
+            current = min(critical, key=lambda tid: (-ef[tid], tid))
+            while current is not None:
+                path.append(current)
+                current = next(
+                    (p for p in self.predecessors[current]
+                     if slack[p] == 0 and ef[p] == es[current]),
+                    None,
+                )
+            path.reverse()
+
+        def day(offset):
+            return (origin + timedelta(days=offset)).isoformat()
+
+        return {
+            'project_start': day(min(es.values())) if es else None,
+            'project_finish': day(finish) if es else None,
+            'duration_days': (finish - min(es.values())) if es else 0,
+            'critical_path': path,
+            'critical_task_ids': critical,
+            'tasks': {
+                tid: {
+                    'title': self.tasks[tid].title,
+                    'duration_days': duration[tid],
+                    'earliest_start': day(es[tid]),
+                    'earliest_finish': day(ef[tid]),
+                    'latest_start': day(ls[tid]),
+                    'latest_finish': day(lf[tid]),
+                    'slack_days': slack[tid],
+                    'is_critical': slack[tid] == 0,
+                }
+                for tid in order
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Cascade rescheduling
+    # ------------------------------------------------------------------
+
+    def cascade(self, source_id, save=True):
+        """
+        Push every transitive dependent of ``source_id`` forward so it starts
+        no earlier than the latest due date among its predecessors, keeping
+        its own duration and the time component of its due date. Dependents
+        already starting late enough are left alone, and so are tasks
+        missing either date.
+
+        One topological pass suffices: each task is visited after all of its
+        predecessors have reached their final dates.
+
+        Returns:
+            list of moved Task instances, in topological order
+
+        Raises:
+            DependencyCycleError: if the dependents contain a cycle
+        """
+        from kanban.models import Task
+
+        moved = []
+        for tid in self.topological_order(self.descendants(source_id)):
+            task = self.tasks[tid]
+            if not task.start_date or not task.due_date:
+                continue
+            pred_dues = [self._due(self.tasks[p]) for p in self.predecessors[tid]]
+            pred_dues = [d for d in pred_dues if d]
+            if not pred_dues:
+                continue
+            required_start = max(pred_dues)
+            if task.start_date >= required_start:
+                continue
+            local_due = timezone.localtime(task.due_date)
+            span = max((local_due.date() - task.start_date).days, 0)
+            new_due = required_start + timedelta(days=span)
+            task.start_date = required_start
+            task.due_date = local_due.replace(
+                year=new_due.year, month=new_due.month, day=new_due.day,
+            )
+            moved.append(task)
+
+        if save and moved:
+            Task.objects.bulk_update(moved, ['start_date', 'due_date'], batch_size=500)
+        return moved
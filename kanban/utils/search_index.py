@@ -0,0 +1,344 @@
+"""
+SQLite FTS5 full-text index over tasks, wiki pages, chat messages and
+organizational memory nodes.
+
+The search endpoints (global search, wiki search, chat room search, the
+board search box and Spectra's memory keyword augmentation) used
+``icontains`` — a ``LIKE '%q%'`` scan of every row in scope, with results in
+``updated_at`` order rather than by relevance.
+
+``kanban_search_index`` is one FTS5 table holding ``title`` and ``body`` for
+every indexed row, plus unindexed ``kind``, ``object_id``, ``board_id``,
+``workspace_id`` and ``parent_id`` (the chat room) used for scoping.  The rowid
+is ``object_id * 4 + kind code`` so a row can be replaced without scanning.
+
+* SQL triggers on the source tables keep the index in sync, so ``.update()``,
+  ``bulk_create`` and raw SQL writes are covered the same as ``save()``.
+  Triggers fire only on the indexed columns, not on every date or status
+  update.
+* ``search()`` returns hits in BM25 order (title weighted above body) with a
+  highlighted snippet.  Terms are matched as prefixes and all must match
+  unless ``any_term`` is set.
+* Hits are pre-filtered on board/workspace ids in SQL; callers still load
+  the objects through their usual RBAC-scoped queryset (``ranked_objects``),
+  so the index never widens what a user can see.
+
+The index only exists on SQLite (migration 0170); elsewhere ``is_available()``
+is False and callers keep their ``icontains`` query.  The trigger bodies read
+``kanban_column``, ``kanban_board`` and ``messaging_chatroom``, and SQLite
+refuses to rebuild a table (as most ALTERs do) while a trigger elsewhere
+names it.  So ``drop_triggers`` runs before ``migrate`` applies anything and
+``ensure_installed`` after it reindexes and restores them; migration 0170
+itself creates only the table.  ``manage.py rebuild_search_index`` recreates
+the table, triggers and contents on demand.
+"""
+import logging
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.utils.html import escape, strip_tags
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'kanban_search_index'
+COLUMNS = ('title', 'body', 'kind', 'object_id', 'board_id', 'workspace_id', 'parent_id')
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+    "title, body, kind UNINDEXED, object_id UNINDEXED, board_id UNINDEXED, "
+    "workspace_id UNINDEXED, parent_id UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+# kind -> (rowid code, source table, SELECT of COLUMNS for rows aliased ``src``,
+#          columns whose update re-indexes the row)
+SOURCES = {
+    'task': (
+        0, 'kanban_task',
+        "SELECT src.id * 4 + 0, src.title, COALESCE(src.description, ''), 'task', src.id, "
+        "col.board_id, b.workspace_id, NULL "
+        "FROM kanban_task src "
+        "JOIN kanban_column col ON col.id = src.column_id "
+        "JOIN kanban_board b ON b.id = col.board_id",
+        ('title', 'description', 'column_id'),
+    ),
+    'wiki': (
+        1, 'wiki_wikipage',
+        "SELECT src.id * 4 + 1, src.title, src.content, 'wiki', src.id, "
+        "NULL, src.workspace_id, NULL "
+        "FROM wiki_wikipage src",
+        ('title', 'content', 'workspace_id'),
+    ),
+    'chat': (
+        2, 'messaging_chatmessage',
+        "SELECT src.id * 4 + 2, '', src.content, 'chat', src.id, "
+        "room.board_id, b.workspace_id, src.chat_room_id "
+        "FROM messaging_chatmessage src "
+        "JOIN messaging_chatroom room ON room.id = src.chat_room_id "
+        "LEFT JOIN kanban_board b ON b.id = room.board_id",
+        ('content', 'chat_room_id'),
+    ),
+    'memory': (
+        3, 'knowledge_graph_memorynode',
+        "SELECT src.id * 4 + 3, src.title, src.content, 'memory', src.id, "
+        "src.board_id, b.workspace_id, NULL "
+        "FROM knowledge_graph_memorynode src "
+        "LEFT JOIN kanban_board b ON b.id = src.board_id",
+        ('title', 'content', 'board_id'),
+    ),
+}
+
+# bm25() weights for (title, body); the unindexed columns score nothing.
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+SNIPPET_TOKENS = 12
+MAX_TERMS = 8
+# Hits first fetched per requested result, for callers whose queryset drops
+# some (non-task items, unpublished pages, stricter RBAC).
+OVERFETCH = 3
+
+# Snippet markers: control characters survive strip_tags/escape untouched and
+# are swapped for <mark> afterwards, so indexed HTML never reaches the page.
+_MARK_START, _MARK_END = '\x02', '\x03'
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+Hit = namedtuple('Hit', ['kind', 'object_id', 'snippet'])
+
+
+def _trigger_sql(kind):
+    code, table, select, watched = SOURCES[kind]
+    columns = ', '.join(('rowid',) + COLUMNS)
+    insert = f"INSERT INTO {TABLE}({columns}) {select} WHERE src.id = new.id;"
+    delete = f"DELETE FROM {TABLE} WHERE rowid = old.id * 4 + {code};"
+    return [
+        f"CREATE TRIGGER {TABLE}_{kind}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER {TABLE}_{kind}_au AFTER UPDATE OF {', '.join(watched)} ON {table} "
+        f"BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER {TABLE}_{kind}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+    ]
+
+
+def install(conn=None, triggers=True):
+    """
+    (Re)create the FTS5 table and index every source row, then its triggers
+    unless ``triggers`` is False.  No-op on non-SQLite backends.  Returns
+    per-kind row counts.
+    """
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return {}
+    uninstall(conn)
+    counts = {}
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_TABLE_SQL)
+        for kind, (_, _, select, _) in SOURCES.items():
+            cursor.execute(f"INSERT INTO {TABLE}({', '.join(('rowid',) + COLUMNS)}) {select}")
+            counts[kind] = cursor.rowcount
+            if triggers:
+                for statement in _trigger_sql(kind):
+                    cursor.execute(statement)
+        if triggers:
+            # Boards moving workspace carry their tasks, chat and memories along.
+            cursor.execute(
+                f"CREATE TRIGGER {TABLE}_board_au AFTER UPDATE OF workspace_id ON kanban_board "
+                f"BEGIN UPDATE {TABLE} SET workspace_id = new.workspace_id "
+                f"WHERE board_id = new.id; END"
+            )
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+    _available.pop(conn.alias, None)
+    return counts
+
+
+def uninstall(conn=None):
+    """Drop the FTS5 table and its triggers."""
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return
+    drop_triggers(conn)
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    _available.pop(conn.alias, None)
+
+
+def drop_triggers(conn=None):
+    """
+    Drop the sync triggers but keep the table.  Run before migrations, so
+    none of them has to rebuild a table a trigger body refers to;
+    ``ensure_installed`` puts them back (and reindexes) afterwards.
+    """
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        for name in _trigger_names():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def _trigger_names():
+    names = [f"{TABLE}_{kind}_{suffix}" for kind in SOURCES for suffix in ('ai', 'au', 'ad')]
+    return names + [f"{TABLE}_board_au"]
+
+
+def ensure_installed(conn=None):
+    """
+    Reinstall the index if any of its triggers is missing.  Run after
+    migrations, which start by dropping them (``drop_triggers``); rows
+    written in between are picked up by the reindex.  Does nothing until
+    migration 0170 created the index.
+    """
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            [f'{TABLE}%'],
+        )
+        present = {row[0] for row in cursor.fetchall()}
+    if TABLE not in present or set(_trigger_names()) <= present:
+        return False
+    logger.info("Search index triggers missing; rebuilding")
+    install(conn)
+    return True
+
+
+_available = {}
+
+
+def is_available(conn=None):
+    """True when the index table exists on this database."""
+    conn = conn or connection
+    if conn.alias not in _available:
+        _available[conn.alias] = (
+            conn.vendor == 'sqlite' and TABLE in conn.introspection.table_names()
+        )
+    return _available[conn.alias]
+
+
+def match_expression(text, any_term=False):
+    """
+    FTS5 MATCH expression for free-text ``text``: each word becomes a quoted
+    prefix term (so user input can never inject FTS syntax), ANDed together,
+    or ORed with ``any_term``.  None when ``text`` has no words.
+    """
+    terms = _TERM_RE.findall(text or '')[:MAX_TERMS]
+    if not terms:
+        return None
+    return (' OR ' if any_term else ' ').join(f'"{term}"*' for term in terms)
+
+
+def _in_clause(column, ids):
+    """``column IN (...)`` for a list of ids or a ``values('id')`` queryset."""
+    if hasattr(ids, 'query'):
+        sql, params = ids.query.sql_with_params()
+        return f"{column} IN ({sql})", list(params)
+    ids = list(ids)
+    if not ids:
+        return '0', []
+    return f"{column} IN ({', '.join(['%s'] * len(ids))})", ids
+
+
+def _snippet_html(raw):
+    text = escape(strip_tags(raw or ''))
+    return text.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def search(query, kinds, board_ids=None, workspace_ids=None, parent_id=None,
+           limit=20, any_term=False):
+    """
+    Ranked hits for ``query`` among ``kinds``.
+
+    Args:
+        query: free text from the user
+        kinds: iterable of SOURCES keys
+        board_ids / workspace_ids: ids or ``values('id')`` querysets; a row
+            matches if its board or its workspace is in scope.  Both None
+            means unscoped (the caller filters).
+        parent_id: chat room id, for searching one room
+        limit: maximum hits, or None for all
+
+    Returns:
+        list of Hit(kind, object_id, snippet) in BM25 order; ``snippet`` is
+        escaped HTML with the matched terms in ``<mark>``.
+    """
+    expr = match_expression(query, any_term=any_term)
+    if expr is None:
+        return []
+
+    where = [f"{TABLE} MATCH %s"]
+    params = [_MARK_START, _MARK_END, expr]
+    kinds = list(kinds)
+    where.append(f"kind IN ({', '.join(['%s'] * len(kinds))})")
+    params.extend(kinds)
+
+    scope = []
+    for column, ids in (('board_id', board_ids), ('workspace_id', workspace_ids)):
+        if ids is not None:
+            clause, clause_params = _in_clause(column, ids)
+            scope.append(clause)
+            params.extend(clause_params)
+    if scope:
+        where.append(f"({' OR '.join(scope)})")
+    if parent_id is not None:
+        where.append("parent_id = %s")
+        params.append(parent_id)
+
+    sql = (
+        f"SELECT kind, object_id, snippet({TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS}) "
+        f"FROM {TABLE} WHERE {' AND '.join(where)} "
+        f"ORDER BY bm25({TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT})"
+    )
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [Hit(kind, int(object_id), _snippet_html(snippet)) for kind, object_id, snippet in rows]
+
+
+def ranked_objects(queryset, query, kind, limit=20, **scope):
+    """
+    ``queryset`` rows matching ``query`` in rank order, at most ``limit``,
+    each with a ``search_snippet`` attribute.  ``queryset`` carries the
+    caller's access rules; ``scope`` (the other ``search`` arguments) only
+    narrows the index read.  Returns None when the index is unavailable, so the caller can
+    fall back to ``icontains``.
+    """
+    if not is_available():
+        return None
+    fetch = limit * OVERFETCH if limit else None
+    while True:
+        try:
+            hits = search(query, [kind], limit=fetch, **scope)
+        except Exception as e:
+            logger.warning("Search index query failed, falling back: %s", e)
+            return None
+        objects = queryset.in_bulk([hit.object_id for hit in hits])
+        ranked = []
+        for hit in hits:
+            obj = objects.get(hit.object_id)
+            if obj is not None:
+                obj.search_snippet = hit.snippet
+                ranked.append(obj)
+        # Widen the read only when the queryset dropped so many hits that
+        # more matches may exist past the window.
+        if fetch is None or len(ranked) >= limit or len(hits) < fetch:
+            return ranked[:limit] if limit else ranked
+        fetch *= 4
+
+
+def matching_ids(query, kind, **scope):
+    """
+    Ids of every ``kind`` row matching ``query``, for filtering a queryset
+    (``pk__in``) without ranking.  None when the index is unavailable.
+    """
+    if not is_available():
+        return None
+    try:
+        return [hit.object_id for hit in search(query, [kind], limit=None, **scope)]
+    except Exception as e:
+        logger.warning("Search index query failed, falling back: %s", e)
+        return None
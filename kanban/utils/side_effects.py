@@ -0,0 +1,124 @@
+"""
+Coalesced post-save side effects for Task writes.
+
+Several Task ``post_save`` receivers recompute aggregates that depend on *who*
+or *which board* a task touched rather than on the task itself — a user's
+workload hours, their performance profile, a board's shadow-branch
+feasibility. Saving 500 tasks in an import or a bulk move recomputed each of
+those aggregates 500 times.
+
+Receivers hand such work to ``defer(name, *args)`` instead of doing it inline:
+
+* Outside a ``coalesce_side_effects()`` block the effect runs immediately —
+  exactly the behaviour the receiver had before.
+* Inside one, each (effect, key) pair is recorded once. When the outermost
+  block exits, the batch is scheduled with ``transaction.on_commit`` so it
+  runs once, after the surrounding transaction commits (immediately when
+  there is none; never when it rolls back). With ``TASK_SIDE_EFFECTS_ASYNC``
+  on, the whole batch is handed to Celery as a single task instead.
+
+Effects are registered by name with ``@side_effect('name')`` and take only
+JSON-serialisable arguments (ids, strings) so a batch can cross into a worker.
+
+Usage::
+
+    from kanban.utils.side_effects import coalesce_side_effects
+
+    with coalesce_side_effects():
+        for row in rows:
+            Task.objects.create(...)   # workload recalculated once per user
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_effects = {}
+_state = threading.local()
+
+
+def side_effect(name):
+    """Register ``func`` as the deferrable side effect called ``name``."""
+    def decorator(func):
+        _effects[name] = func
+        return func
+    return decorator
+
+
+def _pending():
+    return getattr(_state, 'pending', None)
+
+
+def is_coalescing():
+    """True while a ``coalesce_side_effects()`` block is open on this thread."""
+    return _pending() is not None
+
+
+def defer(name, *args, key=None):
+    """
+    Run side effect ``name`` now, or queue it on the open coalescing batch.
+
+    ``key`` controls deduplication and defaults to ``args``. Pass a narrower
+    key when some arguments are descriptive only (e.g. a trigger message) and
+    the first caller's values should win.
+    """
+    pending = _pending()
+    if pending is None:
+        return _effects[name](*args)
+    pending.setdefault((name, args if key is None else key), (name, args))
+    return None
+
+
+@contextmanager
+def coalesce_side_effects():
+    """
+    Collect deferred side effects for the duration of the block and run each
+    distinct one once after commit. Nested blocks join the outermost batch.
+    Also usable as a function decorator.
+    """
+    if _pending() is not None:
+        yield
+        return
+
+    _state.pending = {}
+    try:
+        yield
+    finally:
+        batch = list(_state.pending.values())
+        _state.pending = None
+        # Scheduled even when the block raised: if an enclosing atomic() rolls
+        # back, Django discards the callback; if the writes were autocommitted
+        # they happened, and so must their side effects.
+        if batch:
+            transaction.on_commit(lambda: dispatch(batch))
+
+
+def dispatch(batch):
+    """Run a collected batch, via one Celery task when TASK_SIDE_EFFECTS_ASYNC is on."""
+    if getattr(settings, 'TASK_SIDE_EFFECTS_ASYNC', False):
+        try:
+            from kanban.tasks.side_effect_tasks import run_side_effect_batch
+            run_side_effect_batch.delay([[name, list(args)] for name, args in batch])
+            return
+        except Exception as exc:
+            logger.info(
+                f"side effects: Celery unavailable ({exc}), running "
+                f"{len(batch)} effect(s) in-process."
+            )
+    run_batch(batch)
+
+
+def run_batch(batch):
+    """Run ``[(name, args), ...]`` in order; one failing effect does not stop the rest."""
+    done = 0
+    for name, args in batch:
+        try:
+            _effects[name](*args)
+            done += 1
+        except Exception:
+            logger.exception(f"side effect {name}{tuple(args)} failed")
+    return done
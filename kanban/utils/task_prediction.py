@@ -4,6 +4,8 @@ Predicts task completion dates based on historical data and team velocity
 """
 
 import logging
+import statistics
+from collections import defaultdict
 from datetime import timedelta
 from django.utils import timezone
 from django.db.models import Avg, StdDev, Count, Q
@@ -12,12 +14,14 @@ from kanban.models import Task
 logger = logging.getLogger(__name__)
 
 
-def predict_task_completion_date(task):
+def predict_task_completion_date(task, history=None):
     """
     Predict task completion date based on historical data and multiple factors.
     
     Args:
         task: Task object to predict completion for
+        history: PredictionHistory to read completed tasks from instead of
+            querying them (used by bulk_update_predictions)
     
     Returns:
         dict: {
@@ -47,7 +51,7 @@ def predict_task_completion_date(task):
         remaining_progress = 0.01  # Nearly complete
     
     # Get historical data
-    historical_stats = _get_historical_statistics(task)
+    historical_stats = _get_historical_statistics(task, history)
     
     if not historical_stats:
         return _fallback_prediction(task)
@@ -110,7 +114,7 @@ def predict_task_completion_date(task):
         'workload_impact': task.workload_impact,
         'skill_match_score': task.skill_match_score,
         'collaboration_required': task.collaboration_required,
-        'dependencies_count': task.dependencies.count(),
+        'dependencies_count': _dependency_count(task),
         'risk_score': task.risk_score,
         'team_member_velocity': round(historical_stats.get('velocity_factor', 1.0), 2),
         'historical_avg_days': round(historical_stats['avg_duration'], 1),
@@ -136,17 +140,21 @@ def predict_task_completion_date(task):
     }
 
 
-def _get_historical_statistics(task):
+def _get_historical_statistics(task, history=None):
     """
     Get statistical data from historical completed tasks.
     
     Args:
         task: Task object to analyze
+        history: optional PredictionHistory; when given, the same tiers are
+            evaluated in memory instead of with per-task queries
     
     Returns:
         dict with avg_duration, std_dev, sample_size, velocity_factor
         or None if insufficient data
     """
+    if history is not None:
+        return history.historical_statistics(task)
     
     # Build query for similar tasks
     query = Q(
@@ -300,6 +308,144 @@ def _get_historical_statistics(task):
     return None
 
 
+def _dependency_count(task):
+    """Number of blocking dependencies, using the bulk annotation when present."""
+    count = getattr(task, 'dependency_count', None)
+    if count is None:
+        count = task.dependencies.count()
+    return count
+
+
+class PredictionHistory:
+    """
+    Completed-task history for many predictions, loaded with one query.
+
+    _get_historical_statistics() runs up to three aggregate queries plus a
+    ``.values()`` scan per task, and Task.get_velocity_factor() another one.
+    For a board- or organization-wide refresh this loads the completed tasks
+    of every workspace and board involved once, buckets them by
+    (workspace, assignee, priority, complexity), (board, priority, complexity)
+    and (workspace, complexity), and answers the same three tiers from those
+    buckets. A complexity window of ±2 is the union of at most five buckets.
+    """
+
+    SIMILAR_TASK_FIELDS = ('id', 'title', 'actual_duration_days', 'complexity_score',
+                           'priority', 'completed_at')
+
+    def __init__(self, rows):
+        self.by_assignee = defaultdict(list)     # (ws, user, priority, complexity)
+        self.by_board = defaultdict(list)        # (board, priority, complexity)
+        self.by_workspace = defaultdict(list)    # (ws, complexity)
+        self.by_user = defaultdict(list)         # (ws, user, complexity) — velocity
+        for row in rows:
+            ws_id = row['column__board__workspace_id']
+            complexity = row['complexity_score']
+            if ws_id is not None:
+                if row['assigned_to_id']:
+                    self.by_assignee[(ws_id, row['assigned_to_id'], row['priority'], complexity)].append(row)
+                    self.by_user[(ws_id, row['assigned_to_id'], complexity)].append(row)
+                self.by_workspace[(ws_id, complexity)].append(row)
+            self.by_board[(row['column__board_id'], row['priority'], complexity)].append(row)
+
+    @classmethod
+    def for_tasks(cls, tasks):
+        """History covering the workspaces and boards of ``tasks``."""
+        board_ids = {task.column.board_id for task in tasks}
+        workspace_ids = {task.column.board.workspace_id for task in tasks} - {None}
+        if not board_ids:
+            return cls([])
+        rows = Task.objects.filter(
+            Q(column__board__workspace_id__in=workspace_ids) | Q(column__board_id__in=board_ids),
+            progress=100,
+            actual_duration_days__isnull=False,
+        ).values(
+            *cls.SIMILAR_TASK_FIELDS,
+            'assigned_to_id', 'column__board_id', 'column__board__workspace_id',
+        )
+        return cls(rows)
+
+    @staticmethod
+    def _window(complexity):
+        return range(max(1, complexity - 2), min(10, complexity + 2) + 1)
+
+    def _collect(self, index, key_for, task):
+        rows = []
+        for complexity in self._window(task.complexity_score):
+            rows.extend(r for r in index.get(key_for(complexity), ()) if r['id'] != task.id)
+        return rows
+
+    def _tier(self, rows, minimum, data_quality, velocity_factor):
+        rows = [r for r in rows if r['actual_duration_days'] > 0]
+        if len(rows) < minimum:
+            return None
+        durations = [r['actual_duration_days'] for r in rows]
+
+        # Newest first, as order_by('-completed_at') returns them
+        rows.sort(key=lambda r: (r['completed_at'] is not None, r['completed_at']), reverse=True)
+        similar_tasks_list = []
+        seen_keys = set()
+        for row in rows:
+            task_dict = {field: row[field] for field in self.SIMILAR_TASK_FIELDS}
+            if task_dict.get('completed_at'):
+                task_dict['completed_at'] = task_dict['completed_at'].isoformat()
+            dedup_key = (task_dict['title'], task_dict['actual_duration_days'])
+            if dedup_key not in seen_keys:
+                seen_keys.add(dedup_key)
+                similar_tasks_list.append(task_dict)
+            if len(similar_tasks_list) >= 10:
+                break
+
+        return {
+            'avg_duration': statistics.fmean(durations),
+            'std_dev': statistics.pstdev(durations),
+            'sample_size': len(durations),
+            'displayed_tasks': len(similar_tasks_list),
+            'data_quality': data_quality,
+            'velocity_factor': velocity_factor() if callable(velocity_factor) else velocity_factor,
+            'similar_tasks': similar_tasks_list
+        }
+
+    def velocity_factor(self, task):
+        """In-memory equivalent of Task.get_velocity_factor()."""
+        workspace_id = task.column.board.workspace_id
+        if not task.assigned_to_id or workspace_id is None:
+            return 1.0
+        durations = [
+            r['actual_duration_days']
+            for r in self._collect(self.by_user, lambda c: (workspace_id, task.assigned_to_id, c), task)
+        ]
+        avg_duration = statistics.fmean(durations) if durations else None
+        if avg_duration and avg_duration > 0:
+            baseline = task.complexity_score * 1.5
+            return avg_duration / baseline
+        return 1.0
+
+    def historical_statistics(self, task):
+        """Same tiers and thresholds as _get_historical_statistics()."""
+        board = task.column.board
+        workspace_id = board.workspace_id
+
+        if task.assigned_to_id and workspace_id is not None:
+            stats = self._tier(
+                self._collect(self.by_assignee, lambda c: (workspace_id, task.assigned_to_id, task.priority, c), task),
+                5, 'high', lambda: self.velocity_factor(task),
+            )
+            if stats:
+                return stats
+
+        stats = self._tier(
+            self._collect(self.by_board, lambda c: (board.id, task.priority, c), task),
+            3, 'medium', 1.0,
+        )
+        if stats or workspace_id is None:
+            return stats
+
+        return self._tier(
+            self._collect(self.by_workspace, lambda c: (workspace_id, c), task),
+            2, 'low', 1.0,
+        )
+
+
 def _apply_prediction_adjustments(base_days, task, historical_stats):
     """
     Apply various adjustments to the base prediction.
@@ -336,8 +482,8 @@ def _apply_prediction_adjustments(base_days, task, historical_stats):
         adjustments['risk_adjustment'] = f"{risk_factor:.2f}x (risk score: {task.risk_score})"
     
     # Dependency adjustment - tasks with dependencies take longer
-    if task.dependencies.exists():
-        dependency_count = task.dependencies.count()
+    dependency_count = _dependency_count(task)
+    if dependency_count:
         dependency_factor = 1.0 + (dependency_count * 0.1)  # +10% per dependency
         adjusted_days *= min(dependency_factor, 1.5)  # Cap at +50%
         adjustments['dependency_adjustment'] = f"{dependency_count} dependencies"
@@ -530,6 +676,31 @@ def _fallback_prediction(task):
     }
 
 
+PREDICTION_FIELDS = [
+    'predicted_completion_date',
+    'prediction_confidence',
+    'prediction_metadata',
+    'last_prediction_update',
+]
+
+
+def _apply_prediction(task, prediction, updated_at):
+    """Copy a prediction dict onto the task's prediction fields (no save)."""
+    task.predicted_completion_date = prediction['predicted_date']
+    task.prediction_confidence = prediction['confidence']
+    task.prediction_metadata = {
+        'confidence_interval_days': prediction['confidence_interval_days'],
+        'based_on_tasks': prediction['based_on_tasks'],
+        'displayed_tasks': prediction.get('displayed_tasks', len(prediction.get('similar_tasks', []))),
+        'similar_tasks': prediction.get('similar_tasks', []),
+        'factors': prediction['factors'],
+        'early_date': prediction['early_date'].isoformat(),
+        'late_date': prediction['late_date'].isoformat(),
+        'prediction_method': prediction['prediction_method']
+    }
+    task.last_prediction_update = updated_at
+
+
 def update_task_prediction(task):
     """
     Update prediction for a task and save to database.
@@ -559,19 +730,7 @@ def update_task_prediction(task):
     prediction = predict_task_completion_date(task)
 
     if prediction:
-        task.predicted_completion_date = prediction['predicted_date']
-        task.prediction_confidence = prediction['confidence']
-        task.prediction_metadata = {
-            'confidence_interval_days': prediction['confidence_interval_days'],
-            'based_on_tasks': prediction['based_on_tasks'],
-            'displayed_tasks': prediction.get('displayed_tasks', len(prediction.get('similar_tasks', []))),
-            'similar_tasks': prediction.get('similar_tasks', []),
-            'factors': prediction['factors'],
-            'early_date': prediction['early_date'].isoformat(),
-            'late_date': prediction['late_date'].isoformat(),
-            'prediction_method': prediction['prediction_method']
-        }
-        task.last_prediction_update = timezone.now()
+        _apply_prediction(task, prediction, timezone.now())
         with automation_silent():
             task.save()
         
@@ -588,6 +747,12 @@ def bulk_update_predictions(board=None, organization=None):
     """
     Update predictions for all active tasks in a board or organization.
     
+    Completed-task history is loaded once into a PredictionHistory and the
+    results are written with a single bulk_update, so the refresh costs a
+    fixed handful of queries instead of several per task. Only the
+    prediction fields are written; like update_task_prediction's silenced
+    save, no automation rules run.
+    
     Args:
         board: Board object (optional)
         organization: Organization object (optional)
@@ -604,22 +769,34 @@ def bulk_update_predictions(board=None, organization=None):
     elif organization:
         query &= Q(column__board__organization=organization)
     
-    tasks = Task.objects.filter(query)
+    tasks = list(
+        Task.objects.filter(query)
+        .select_related('column__board')
+        .annotate(dependency_count=Count('dependencies'))
+    )
+    history = PredictionHistory.for_tasks(tasks)
     
-    updated_count = 0
+    updated_at = timezone.now()
+    predicted = []
     failed_count = 0
     
     for task in tasks:
         try:
-            prediction = update_task_prediction(task)
-            if prediction:
-                updated_count += 1
+            prediction = predict_task_completion_date(task, history=history)
         except Exception as e:
             logger.error(f"Failed to update prediction for task {task.id}: {e}")
             failed_count += 1
+            continue
+        if prediction:
+            _apply_prediction(task, prediction, updated_at)
+            predicted.append(task)
+    
+    if predicted:
+        Task.objects.bulk_update(predicted, PREDICTION_FIELDS, batch_size=500)
+        logger.info(f"Updated predictions for {len(predicted)} task(s)")
     
     return {
-        'total_tasks': tasks.count(),
-        'updated': updated_count,
+        'total_tasks': len(tasks),
+        'updated': len(predicted),
         'failed': failed_count
     }
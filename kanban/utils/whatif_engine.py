@@ -4,7 +4,8 @@ What-If Scenario Engine
 Computes cascading project impacts for hypothetical changes (scope, team, deadline)
 without writing anything to the database.  Uses existing board metrics, burndown
 predictions, budget data, and resource forecasts as the baseline, then applies
-pure-math projections and optional Gemini AI analysis.
+pure-math projections, a Monte Carlo completion-date distribution sampled from
+the team's velocity history, and optional Gemini AI analysis.
 """
 import json
 import logging
@@ -35,7 +36,7 @@ class WhatIfEngine:
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
-    def simulate(self, params: dict) -> dict:
+    def simulate(self, params: dict, baseline: dict | None = None) -> dict:
         """
         Run a what-if simulation.
 
@@ -45,35 +46,74 @@ class WhatIfEngine:
                 "team_size_delta": int,       # +/- team member change
                 "deadline_shift_days": int,   # +/- days (positive = extend)
             }
+            baseline: a result of _capture_baseline() to reuse; captured
+                fresh when omitted
 
         Returns:
             dict with keys: baseline, projected, deltas, new_conflicts,
             feasibility_score, warnings
         """
-        tasks_added = int(params.get('tasks_added', 0))
-        team_delta = int(params.get('team_size_delta', 0))
-        deadline_shift = int(params.get('deadline_shift_days', 0))
+        return self.simulate_many([params], baseline=baseline)[0]
+
+    def simulate_many(self, params_list: list, baseline: dict | None = None) -> list:
+        """
+        Run several what-if simulations against one board snapshot.
+
+        The baseline and velocity history are read once and every scenario's
+        Monte Carlo completion distribution is sampled in a single batch
+        (see kanban/utils/schedule_monte_carlo.py), so the cost of N shadow
+        branches is one set of queries plus one vectorized pass.
+
+        Returns:
+            list of simulate() results, aligned with ``params_list``
+        """
+        if baseline is None:
+            baseline = self._capture_baseline()
+        else:
+            baseline = dict(baseline)
+
+        parsed = [self._parse_params(params) for params in params_list]
+        distributions = self._monte_carlo(baseline, parsed)
+        baseline_mc = distributions[0]
+        if baseline_mc:
+            baseline['monte_carlo'] = baseline_mc
+            if baseline_mc['delay_probability'] is not None:
+                baseline['delay_probability'] = min(baseline_mc['delay_probability'], 99)
+                baseline['risk_level'] = self._risk_from_delay(baseline['delay_probability'])
+        warnings = self._generate_warnings(baseline)
+
+        results = []
+        for (tasks_added, team_delta, deadline_shift, velocity_health), mc in zip(
+                parsed, distributions[1:]):
+            projected = self._compute_projected(
+                baseline, tasks_added, team_delta, deadline_shift, monte_carlo=mc,
+            )
+            deltas = self._compute_deltas(baseline, projected)
+            conflicts = self._detect_new_conflicts(baseline, projected, tasks_added, team_delta, deadline_shift)
+            feasibility = self._compute_feasibility(projected, deltas, conflicts, velocity_health)
+
+            results.append({
+                'baseline': baseline,
+                'projected': projected,
+                'deltas': deltas,
+                'new_conflicts': conflicts,
+                'feasibility_score': feasibility,
+                'warnings': list(warnings),
+            })
+        return results
+
+    @staticmethod
+    def _parse_params(params: dict) -> tuple:
         # velocity_health is an optional multiplicative health signal supplied by
         # the live shadow-branch recalculation path: actual_7d_velocity / branch_baseline_velocity.
         # What-If dashboard calls leave this as 1.0 (neutral) so baseline simulations
         # remain deterministic across runs.
-        velocity_health = params.get('velocity_health', 1.0)
-
-        baseline = self._capture_baseline()
-        projected = self._compute_projected(baseline, tasks_added, team_delta, deadline_shift)
-        deltas = self._compute_deltas(baseline, projected)
-        conflicts = self._detect_new_conflicts(baseline, projected, tasks_added, team_delta, deadline_shift)
-        feasibility = self._compute_feasibility(projected, deltas, conflicts, velocity_health)
-        warnings = self._generate_warnings(baseline)
-
-        return {
-            'baseline': baseline,
-            'projected': projected,
-            'deltas': deltas,
-            'new_conflicts': conflicts,
-            'feasibility_score': feasibility,
-            'warnings': warnings,
-        }
+        return (
+            int(params.get('tasks_added', 0)),
+            int(params.get('team_size_delta', 0)),
+            int(params.get('deadline_shift_days', 0)),
+            params.get('velocity_health', 1.0),
+        )
 
     def analyze_with_ai(self, params: dict, simulation_results: dict) -> dict:
         """
@@ -222,11 +262,58 @@ class WhatIfEngine:
             ),
         }
 
+    # ------------------------------------------------------------------
+    # Monte Carlo completion distribution
+    # ------------------------------------------------------------------
+    def _monte_carlo(self, baseline: dict, parsed: list) -> list:
+        """
+        Completion-date distributions for the baseline followed by each
+        parsed scenario, sampled in one batch.  All None when numpy or
+        velocity data are unavailable — callers then keep the heuristic
+        delay estimate.
+        """
+        from kanban.utils.schedule_monte_carlo import ScheduleMonteCarlo
+
+        deadline = (
+            date.fromisoformat(baseline['effective_deadline'])
+            if baseline['effective_deadline'] else None
+        )
+        scenarios = [{
+            'remaining': baseline['remaining_tasks'],
+            'velocity_factor': 1.0,
+            'deadline': deadline,
+        }]
+        for tasks_added, team_delta, deadline_shift, _health in parsed:
+            new_team = max(baseline['team_size'] + team_delta, 1)
+            scenarios.append({
+                'remaining': max(baseline['remaining_tasks'] + tasks_added, 0),
+                'velocity_factor': self._team_velocity_factor(baseline['team_size'], new_team),
+                'deadline': deadline + timedelta(days=deadline_shift) if deadline else None,
+            })
+
+        try:
+            sampler = ScheduleMonteCarlo.for_board(
+                self.board, baseline_velocity=baseline['velocity_per_week'],
+            )
+            return sampler.run(scenarios)
+        except Exception as exc:
+            logger.warning('What-If Monte Carlo failed for board %s: %s', self.board.pk, exc)
+            return [None] * len(scenarios)
+
+    @staticmethod
+    def _team_velocity_factor(old_team: int, new_team: int) -> float:
+        """Velocity multiplier for a team-size change (Brooks's Law)."""
+        old_team = old_team or 1
+        if new_team == old_team:
+            return 1.0
+        return (new_team / old_team) ** TEAM_SCALING_EXPONENT
+
     # ------------------------------------------------------------------
     # Projected state (pure math, zero DB writes)
     # ------------------------------------------------------------------
     def _compute_projected(self, baseline: dict, tasks_added: int,
-                           team_delta: int, deadline_shift: int) -> dict:
+                           team_delta: int, deadline_shift: int,
+                           monte_carlo: dict | None = None) -> dict:
         # --- Scope ---
         new_total = baseline['total_tasks'] + tasks_added
         new_remaining = max(baseline['remaining_tasks'] + tasks_added, 0)
@@ -235,12 +322,9 @@ class WhatIfEngine:
         new_team = max(baseline['team_size'] + team_delta, 1)
 
         # --- Velocity (Brooks's Law) ---
-        old_team = baseline['team_size'] or 1
-        if new_team != old_team and baseline['velocity_per_week'] > 0:
-            ratio = new_team / old_team
-            new_velocity = baseline['velocity_per_week'] * (ratio ** TEAM_SCALING_EXPONENT)
-        else:
-            new_velocity = baseline['velocity_per_week']
+        new_velocity = baseline['velocity_per_week'] * self._team_velocity_factor(
+            baseline['team_size'], new_team,
+        )
         new_velocity = round(max(new_velocity, 0.1), 2)
 
         # --- Timeline ---
@@ -282,10 +366,17 @@ class WhatIfEngine:
             buffer_days = (new_deadline - new_predicted_date).days
 
         # --- Delay probability ---
-        new_delay_prob = self._estimate_delay_probability(
-            new_remaining, new_velocity, new_predicted_date, new_deadline,
-            baseline['delay_probability'],
-        )
+        # Sampled probability of missing the deadline when the Monte Carlo
+        # run had velocity data and a deadline; the buffer heuristic otherwise.
+        # Capped at 99 like the heuristic so the saturation tail in
+        # _compute_feasibility keeps its meaning.
+        if monte_carlo and monte_carlo['delay_probability'] is not None:
+            new_delay_prob = min(monte_carlo['delay_probability'], 99)
+        else:
+            new_delay_prob = self._estimate_delay_probability(
+                new_remaining, new_velocity, new_predicted_date, new_deadline,
+                baseline['delay_probability'],
+            )
 
         # --- Budget ---
         additional_cost = tasks_added * baseline['avg_cost_per_task']
@@ -333,6 +424,7 @@ class WhatIfEngine:
             'utilization_raw': utilization_raw,
             'schedule_overshoot_days': schedule_overshoot_days,
             'buffer_days': buffer_days,
+            'monte_carlo': monte_carlo,
         }
 
     # ------------------------------------------------------------------
@@ -714,6 +806,14 @@ class WhatIfEngine:
     # ------------------------------------------------------------------
     # AI prompt
     # ------------------------------------------------------------------
+    @staticmethod
+    def _percentile_text(state: dict) -> str:
+        mc = state.get('monte_carlo')
+        if not mc:
+            return 'N/A'
+        dates = [mc.get(f'p{p}_date') or 'beyond horizon' for p in (50, 80, 95)]
+        return f"{' / '.join(dates)} ({mc['trials']} simulated trials)"
+
     def _build_ai_prompt(self, params, baseline, projected, deltas,
                          conflicts, feasibility) -> str:
         conflict_text = '\n'.join(
@@ -764,6 +864,7 @@ GROUND RULES (do not violate):
 - Velocity: {baseline['velocity_per_week']} tasks/week
 - Budget: {baseline['budget_currency']} {baseline['budget_spent']:.0f} / {baseline['budget_allocated']:.0f} ({baseline['budget_utilization_pct']:.0f}%)
 - Predicted completion: {baseline.get('predicted_date', 'N/A')}
+- Completion P50 / P80 / P95: {self._percentile_text(baseline)}
 - Deadline: {baseline.get('effective_deadline', 'N/A')}
 - Delay probability: {baseline['delay_probability']}%
 - Risk level: {baseline['risk_level']}
@@ -775,6 +876,7 @@ GROUND RULES (do not violate):
 - Velocity: {projected['velocity_per_week']} tasks/week
 - Budget spent: {projected['budget_currency']} {projected['budget_spent']:.0f} ({projected['budget_utilization_pct']:.0f}%)
 - Predicted completion: {projected.get('predicted_date', 'N/A')}
+- Completion P50 / P80 / P95: {self._percentile_text(projected)}
 - Deadline: {projected.get('effective_deadline', 'N/A')}
 - Delay probability: {projected['delay_probability']}%
 - Risk level: {projected['risk_level']}
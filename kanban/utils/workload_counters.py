@@ -0,0 +1,135 @@
+"""
+Incremental per-(user, board) open-task counters.
+
+UserProfile.current_workload_hours used to be rebuilt on every Task save with
+a join over the user's tasks and an ``icontains`` scan of column names — for
+both the new and the old assignee. Instead, each task contributes one unit to
+the UserBoardWorkload row of (assignee, board) while its column is not a
+done/complete column; a save only moves that unit when the assignee or the
+column's done-state actually changed. The profile total is then a sum over a
+handful of counter rows.
+
+Writes that bypass signals (queryset ``.update()``, ``bulk_create``) cannot be
+tracked, so ``reconcile_workload_counters()`` recounts from the tasks and fixes
+any drift; it runs periodically via kanban.reconcile_workload_counters.
+"""
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WORKLOAD_HOURS_PER_TASK = 8
+_DONE_KEYWORDS = ('done', 'complete')
+
+
+def is_workload_column(column):
+    """True if tasks in ``column`` count as open work (the old icontains rule)."""
+    name = (column.name or '').lower()
+    return not any(kw in name for kw in _DONE_KEYWORDS)
+
+
+def workload_key(assigned_to_id, column):
+    """The (user_id, board_id) counter a task contributes to, or None."""
+    if not assigned_to_id or column is None or not is_workload_column(column):
+        return None
+    return (assigned_to_id, column.board_id)
+
+
+def bump(user_id, board_id, delta):
+    """Atomically add ``delta`` to one counter, creating it on first increment."""
+    from kanban.models import UserBoardWorkload
+
+    counters = UserBoardWorkload.objects.filter(user_id=user_id, board_id=board_id)
+    if counters.update(active_tasks=F('active_tasks') + delta, updated_at=timezone.now()):
+        return
+    if delta <= 0:
+        # Never tracked (e.g. bulk-created task) — reconciliation will seed it.
+        return
+    try:
+        with transaction.atomic():
+            UserBoardWorkload.objects.create(user_id=user_id, board_id=board_id, active_tasks=delta)
+    except IntegrityError:
+        # Lost a creation race; the row exists now.
+        counters.update(active_tasks=F('active_tasks') + delta, updated_at=timezone.now())
+
+
+def move(old_key, new_key):
+    """Move one task's unit from ``old_key`` to ``new_key``. Returns affected user ids."""
+    if old_key == new_key:
+        return set()
+    if old_key:
+        bump(*old_key, -1)
+    if new_key:
+        bump(*new_key, 1)
+    return {key[0] for key in (old_key, new_key) if key}
+
+
+def active_task_count(user, boards):
+    """Open tasks of ``user`` across ``boards`` (a Board queryset), from the counters."""
+    from kanban.models import UserBoardWorkload
+
+    total = UserBoardWorkload.objects.filter(user=user, board__in=boards).aggregate(
+        n=Sum('active_tasks'),
+    )['n'] or 0
+    return max(total, 0)
+
+
+def reconcile_workload_counters(user_ids=None):
+    """
+    Recount open tasks per (user, board) and repair drifted counters.
+
+    Args:
+        user_ids: restrict to these users; ``None`` reconciles everyone.
+
+    Returns:
+        set of user ids whose counters changed.
+    """
+    from kanban.models import Task, UserBoardWorkload
+
+    tasks = Task.objects.filter(assigned_to__isnull=False).exclude(
+        Q(column__name__icontains='done') | Q(column__name__icontains='complete')
+    )
+    counters = UserBoardWorkload.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(assigned_to_id__in=user_ids)
+        counters = counters.filter(user_id__in=user_ids)
+
+    actual = {
+        (row['assigned_to_id'], row['column__board_id']): row['n']
+        for row in tasks.values('assigned_to_id', 'column__board_id').annotate(n=Count('id'))
+    }
+    stored = {
+        (row['user_id'], row['board_id']): (row['id'], row['active_tasks'])
+        for row in counters.values('id', 'user_id', 'board_id', 'active_tasks')
+    }
+
+    drifted = set()
+    now = timezone.now()
+    stale_ids = []
+    for key, (pk, value) in stored.items():
+        expected = actual.get(key, 0)
+        if expected == 0:
+            stale_ids.append(pk)
+            if value != 0:
+                drifted.add(key[0])
+        elif value != expected:
+            UserBoardWorkload.objects.filter(pk=pk).update(active_tasks=expected, updated_at=now)
+            drifted.add(key[0])
+    if stale_ids:
+        UserBoardWorkload.objects.filter(pk__in=stale_ids).delete()
+
+    missing = [
+        UserBoardWorkload(user_id=user_id, board_id=board_id, active_tasks=n)
+        for (user_id, board_id), n in actual.items()
+        if (user_id, board_id) not in stored
+    ]
+    if missing:
+        UserBoardWorkload.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+        drifted.update(counter.user_id for counter in missing)
+
+    if drifted:
+        logger.info(f"reconcile_workload_counters: repaired counters for {len(drifted)} user(s)")
+    return drifted
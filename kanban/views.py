@@ -27,6 +27,7 @@ from accounts.models import UserProfile, Organization
 from .stakeholder_models import StakeholderTaskInvolvement, ProjectStakeholder
 from .favorite_views import is_user_favorite as _is_fav
 from .utils.sanitize import csv_safe_cell, html_to_plain_text
+from .utils.side_effects import coalesce_side_effects
 from .ai_briefing import build_action_plan_cached as _build_action_plan_cached
 from decision_center.models import DecisionItem, DecisionCenterSettings, DecisionCenterBriefing
 
@@ -2631,13 +2632,19 @@ def board_detail(request, board_id):
         if search_form.cleaned_data.get('assignee'):
             tasks = tasks.filter(assigned_to=search_form.cleaned_data['assignee'])
         
-        # Filter by search term (in title or description)
+        # Filter by search term (in title or description), through the
+        # full-text index when available (kanban/utils/search_index.py)
         if search_form.cleaned_data.get('search_term'):
+            from kanban.utils import search_index
             search_term = search_form.cleaned_data['search_term']
-            tasks = tasks.filter(
-                Q(title__icontains=search_term) | 
-                Q(description__icontains=search_term)
-            )
+            matched_ids = search_index.matching_ids(search_term, 'task', board_ids=[board.pk])
+            if matched_ids is not None:
+                tasks = tasks.filter(pk__in=matched_ids)
+            else:
+                tasks = tasks.filter(
+                    Q(title__icontains=search_term) | 
+                    Q(description__icontains=search_term)
+                )
     
     # Get all labels for this board
     labels = TaskLabel.objects.filter(board=board)
@@ -4431,6 +4438,7 @@ def milestone_detail(request, milestone_id):
     return render(request, 'kanban/milestone_detail.html', context)
 
 
+@coalesce_side_effects()
 def move_task(request):
     """
     Move a task to a different column via drag-and-drop.
@@ -5259,15 +5267,22 @@ def import_board(request):
         return redirect('board_list')
 
 
-def _create_board_from_import_result(result, user, organization, session):
+@coalesce_side_effects()
+def _create_board_from_import_result(result, user, organization, session, progress_cb=None):
     """
     Create a Board and its contents from an ImportResult object.
+
+    Contents are bulk-written by kanban/utils/bulk_import.py; the per-user
+    workload and profile recalculations it queues are coalesced and run once
+    after commit (see kanban/utils/side_effects.py).
     
     Args:
         result: ImportResult from adapter
         user: User creating the board
         organization: Organization for the board
         session: Request session for demo mode tracking
+        progress_cb: optional callback(percent:int, message:str) reported
+            after each chunk of tasks
     
     Returns:
         Created Board instance
@@ -5303,112 +5318,19 @@ def _create_board_from_import_result(result, user, organization, session):
         defaults={'role': 'owner', 'added_by': user}
     )
     
-    # Create labels first (so we can reference them from tasks)
-    labels_map = {}  # label_name -> TaskLabel instance
-    for label_data in result.labels_data:
-        label, created = TaskLabel.objects.get_or_create(
-            name=label_data.get('name'),
-            board=new_board,
-            defaults={'color': label_data.get('color', '#FF5733')}
-        )
-        labels_map[label_data.get('name')] = label
-    
-    # Create columns and build mapping
-    columns_map = {}  # temp_id -> Column instance
-    for col_data in result.columns_data:
-        column = Column.objects.create(
-            name=col_data.get('name', 'Column'),
-            board=new_board,
-            position=col_data.get('position', 0)
-        )
-        columns_map[col_data.get('temp_id')] = column
-    
-    # If no columns were created, create a default one
-    if not columns_map:
-        default_column = Column.objects.create(
-            name='To Do',
-            board=new_board,
-            position=0
-        )
-        columns_map['default'] = default_column
-    
-    # Create tasks
+    # Labels, columns, tasks and their M2M rows are written with bulk_create;
+    # per-task signals don't fire and one board_imported signal is sent instead.
     is_demo_mode = session.get('is_demo_mode', False)
     created_by_session = None
     if is_demo_mode:
         created_by_session = session.get('browser_fingerprint') or session.session_key
     
-    for task_data in result.tasks_data:
-        # Get the column for this task
-        column_temp_id = task_data.get('column_temp_id')
-        column = columns_map.get(column_temp_id)
-        
-        # Fall back to first column if column not found
-        if not column:
-            column = list(columns_map.values())[0]
-        
-        # Create the task
-        new_task = Task.objects.create(
-            title=task_data.get('title', 'Untitled Task')[:200],
-            description=task_data.get('description', '') or '',
-            column=column,
-            position=task_data.get('position', 0),
-            created_by=user,
-            priority=task_data.get('priority', 'medium'),
-            progress=task_data.get('progress', 0),
-            complexity_score=task_data.get('complexity_score', 5),
-            phase=task_data.get('phase'),
-            created_by_session=created_by_session
-        )
-        
-        # Handle dates
-        if task_data.get('start_date'):
-            new_task.start_date = task_data['start_date']
-        if task_data.get('due_date'):
-            new_task.due_date = task_data['due_date']
-        
-        # Handle assigned user
-        assigned_username = task_data.get('assigned_to_username')
-        if assigned_username:
-            try:
-                # Try exact username match first
-                assigned_user = User.objects.filter(username__iexact=assigned_username).first()
-                
-                # Try email match
-                if not assigned_user and '@' in assigned_username:
-                    assigned_user = User.objects.filter(email__iexact=assigned_username).first()
-                
-                # Verify user is in the same organization, then ensure they are
-                # a member of the imported board before assigning. The import
-                # describes the board's team, so we add the assignee as a member
-                # — this keeps the invariant "assignee always has board access"
-                # and prevents non-member assignees from leaking conflict
-                # notifications later.
-                if assigned_user:
-                    if hasattr(assigned_user, 'profile') and assigned_user.profile.organization == organization:
-                        from kanban.models import BoardMembership
-                        BoardMembership.objects.get_or_create(
-                            board=new_board, user=assigned_user,
-                            defaults={'role': 'member'}
-                        )
-                        new_task.assigned_to = assigned_user
-            except Exception:
-                pass  # Skip if user lookup fails
-        
-        new_task.save()
-        
-        # Handle labels
-        for label_name in task_data.get('label_names', []):
-            if label_name in labels_map:
-                new_task.labels.add(labels_map[label_name])
-            else:
-                # Create new label if not exists
-                label, _ = TaskLabel.objects.get_or_create(
-                    name=label_name,
-                    board=new_board,
-                    defaults={'color': '#FF5733'}
-                )
-                new_task.labels.add(label)
+    from kanban.utils.bulk_import import bulk_populate_board
+    bulk_populate_board(
+        new_board, result, user, organization,
+        created_by_session=created_by_session,
+        progress_cb=progress_cb,
+    )
     
     # Auto-add workspace members to the imported board
     from kanban.workspace_member_utils import auto_add_workspace_members_to_board
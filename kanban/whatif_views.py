@@ -88,14 +88,15 @@ def whatif_simulate(request, board_id):
     from kanban.tasks.shadow_branch_tasks import (
         compute_actual_7d_velocity, MIN_BASELINE_VELOCITY,
     )
-    baseline_velocity = float(engine._capture_baseline().get('velocity_per_week') or 0.0)
+    baseline = engine._capture_baseline()
+    baseline_velocity = float(baseline.get('velocity_per_week') or 0.0)
     if baseline_velocity > 0:
         baseline_velocity = max(baseline_velocity, MIN_BASELINE_VELOCITY)
         params['velocity_health'] = compute_actual_7d_velocity(board) / baseline_velocity
     else:
         params['velocity_health'] = 1.0
 
-    results = engine.simulate(params)
+    results = engine.simulate(params, baseline=baseline)
 
     # Optional AI analysis
     if body.get('include_ai'):
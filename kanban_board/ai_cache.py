@@ -9,6 +9,7 @@ Features:
 - Statistics tracking for cache efficiency
 - Graceful fallback when cache unavailable
 - Easy-to-use decorators for any AI function
+- Single-flight: concurrent misses for the same key make one AI call
 
 Usage:
     from kanban_board.ai_cache import cache_ai_call, ai_cache_manager
@@ -31,7 +32,9 @@ import hashlib
 import functools
 import json
 import logging
+import threading
 import time
+import uuid
 from typing import Any, Callable, Dict, Optional, Union
 from datetime import datetime
 
@@ -104,6 +107,36 @@ def get_ttl_for_operation(operation: str) -> int:
     return AI_CACHE_TTLS.get(operation, AI_CACHE_TTLS['default'])
 
 
+# =============================================================================
+# SINGLE-FLIGHT
+# =============================================================================
+#
+# When several requests miss the same key at once (N users opening the same
+# board analytics), only one of them — the leader — calls the model. Followers
+# in the same process wait on the leader's _Flight; followers in other
+# processes see the leader's lock in the cache backend (cache.add = SET NX on
+# Redis) and poll for the result it stores. Both waits are bounded: a follower
+# that times out makes its own call, exactly as before single-flight existed.
+
+class _Flight:
+    """One in-progress call that same-process followers wait on."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _single_flight_wait() -> float:
+    return getattr(settings, 'AI_SINGLE_FLIGHT_WAIT', _single_flight_lock_ttl())
+
+
+def _single_flight_lock_ttl() -> int:
+    return getattr(settings, 'AI_SINGLE_FLIGHT_LOCK_TTL', 120)
+
+
 # =============================================================================
 # AI CACHE MANAGER CLASS
 # =============================================================================
@@ -124,17 +157,27 @@ class AICacheManager:
     
     # Key prefix for all AI cache entries
     KEY_PREFIX = 'prizmAI:ai_response'
+    LOCK_SUFFIX = ':inflight'
     
     def __init__(self):
-        self._stats = {
+        self._stats = self._empty_stats()
+        self._last_reset = datetime.now()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+    
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
             'hits': 0,
             'misses': 0,
             'errors': 0,
             'api_calls_saved': 0,
             'estimated_cost_saved': 0.0,  # Estimated based on avg Gemini pricing
             'cache_bypassed': 0,  # Count of requests when cache is disabled
+            'coalesced': 0,  # Followers served by a leader in this process
+            'coalesced_remote': 0,  # Followers served by a leader in another process
+            'single_flight_timeouts': 0,  # Followers that gave up waiting and called
         }
-        self._last_reset = datetime.now()
     
     def is_enabled(self) -> bool:
         """Check if AI caching is enabled via settings."""
@@ -277,18 +320,190 @@ class AICacheManager:
         if cached is not None:
             return cached
         
-        # Call the function
+        def load():
+            try:
+                result = call_func()
+            except Exception as e:
+                logger.error(f"AI call failed for operation {operation}: {e}")
+                return None
+            if result is not None:
+                self.set(prompt, result, operation, context_hash, ttl)
+            return result
+        
+        return self.single_flight(prompt, load, operation, context_hash)
+    
+    def single_flight(self, prompt: str, load: Callable,
+                      operation: str = 'default',
+                      context_hash: Optional[str] = None) -> Any:
+        """
+        Run ``load`` once for concurrent misses of the same cache key.
+        
+        ``load`` makes the AI call and stores its result with set() (so that
+        followers in other processes can read it) and returns it. Callers check
+        the cache themselves first; single_flight only de-duplicates the miss.
+        
+        Followers in this process get the leader's return value (or its
+        exception re-raised). Followers elsewhere poll the cache until the
+        leader's lock goes away; if no result appeared by then, or after
+        AI_SINGLE_FLIGHT_WAIT seconds, they call ``load`` themselves.
+        
+        Returns:
+            Whatever ``load`` returned for the leader
+        """
+        if not self.is_enabled():
+            return load()
+        
+        cache_key = self._generate_cache_key(prompt, operation, context_hash)
+        
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = _Flight()
+        
+        if not leader:
+            if flight.done.wait(_single_flight_wait()):
+                self._stats['coalesced'] += 1
+                logger.debug(f"AI call coalesced (local) for operation: {operation}")
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            self._stats['single_flight_timeouts'] += 1
+            logger.info(f"Single-flight wait timed out for operation: {operation}")
+            return load()
+        
         try:
-            result = call_func()
+            flight.result = self._load_once(cache_key, load, operation)
+            return flight.result
         except Exception as e:
-            logger.error(f"AI call failed for operation {operation}: {e}")
-            return None
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            flight.done.set()
+    
+    def _load_once(self, cache_key: str, load: Callable, operation: str) -> Any:
+        """Cross-process half of single_flight(): lock in the cache backend."""
+        cache = self._get_cache()
+        if cache is None:
+            return load()
         
-        # Cache the result
-        if result is not None:
-            self.set(prompt, result, operation, context_hash, ttl)
+        lock_key = cache_key + self.LOCK_SUFFIX
+        token = uuid.uuid4().hex
+        try:
+            acquired = cache.add(lock_key, token, timeout=_single_flight_lock_ttl())
+        except Exception as e:
+            logger.warning(f"AI cache lock error: {e}")
+            return load()
         
-        return result
+        if acquired:
+            try:
+                # A leader elsewhere may have stored the result between the
+                # caller's cache check and our lock.
+                result = cache.get(cache_key)
+                if result is not None:
+                    self._stats['coalesced_remote'] += 1
+                    return result
+                return load()
+            finally:
+                try:
+                    # Only release our own lock — it may have expired and been
+                    # taken by another leader during a very slow call.
+                    if cache.get(lock_key) == token:
+                        cache.delete(lock_key)
+                except Exception:
+                    pass
+        
+        # Another process is calling: poll for its result.
+        deadline = time.monotonic() + _single_flight_wait()
+        delay = 0.05
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            try:
+                result = cache.get(cache_key)
+                if result is not None:
+                    self._stats['coalesced_remote'] += 1
+                    logger.debug(f"AI call coalesced (remote) for operation: {operation}")
+                    return result
+                if cache.get(lock_key) is None:
+                    break  # leader finished without a cacheable result
+            except Exception:
+                break
+        else:
+            self._stats['single_flight_timeouts'] += 1
+            logger.info(f"Single-flight wait timed out for operation: {operation}")
+        return load()
+    
+    # ------------------------------------------------------------------
+    # Stale-while-revalidate entries (kanban/utils/ai_artefacts.py)
+    # ------------------------------------------------------------------
+    
+    def _entry_key(self, operation: str, scope) -> str:
+        return f"{self.KEY_PREFIX}:swr:{operation}:{scope}"
+    
+    def get_entry(self, operation: str, scope) -> Optional[Dict]:
+        """
+        Last good value stored with set_entry(), as
+        ``{'value': ..., 'generated_at': epoch seconds}``, or None.
+        
+        Entries are kept for AI_SWR_MAX_AGE regardless of the operation's
+        TTL — freshness is judged by the caller from ``generated_at``.
+        """
+        if not self.is_enabled():
+            return None
+        cache = self._get_cache()
+        if cache is None:
+            return None
+        try:
+            return cache.get(self._entry_key(operation, scope))
+        except Exception as e:
+            self._stats['errors'] += 1
+            logger.warning(f"AI cache get_entry error: {e}")
+            return None
+    
+    def set_entry(self, operation: str, scope, value: Any,
+                  generated_at: Optional[float] = None) -> bool:
+        """Store ``value`` as the last good result for (operation, scope)."""
+        if not self.is_enabled() or value is None:
+            return False
+        cache = self._get_cache()
+        if cache is None:
+            return False
+        entry = {'value': value, 'generated_at': generated_at or time.time()}
+        try:
+            cache.set(self._entry_key(operation, scope), entry,
+                      getattr(settings, 'AI_SWR_MAX_AGE', 7 * 86400))
+            return True
+        except Exception as e:
+            self._stats['errors'] += 1
+            logger.warning(f"AI cache set_entry error: {e}")
+            return False
+    
+    def claim_refresh(self, operation: str, scope, throttle: int) -> bool:
+        """
+        True for the first caller in a ``throttle``-second window for
+        (operation, scope) — atomic via cache.add (SET NX on Redis).
+        """
+        cache = self._get_cache()
+        if cache is None:
+            return False
+        try:
+            return cache.add(f"{self._entry_key(operation, scope)}:refresh", True, timeout=throttle)
+        except Exception as e:
+            logger.warning(f"AI cache claim_refresh error: {e}")
+            return False
+    
+    def release_refresh(self, operation: str, scope) -> None:
+        """Drop a refresh claim early, e.g. when the refresh could not be queued."""
+        cache = self._get_cache()
+        if cache is None:
+            return
+        try:
+            cache.delete(f"{self._entry_key(operation, scope)}:refresh")
+        except Exception:
+            pass
     
     def invalidate(self, prompt: str, operation: str = 'default',
                    context_hash: Optional[str] = None) -> bool:
@@ -354,14 +569,7 @@ class AICacheManager:
     
     def reset_stats(self):
         """Reset statistics."""
-        self._stats = {
-            'hits': 0,
-            'misses': 0,
-            'errors': 0,
-            'api_calls_saved': 0,
-            'estimated_cost_saved': 0.0,
-            'cache_bypassed': 0,
-        }
+        self._stats = self._empty_stats()
         self._last_reset = datetime.now()
 
 
@@ -434,15 +642,14 @@ def cache_ai_call(operation: str = 'default', ttl: Optional[int] = None,
                 logger.debug(f"Cache HIT for {func.__name__}")
                 return cached
             
-            # Call function
-            result = func(*args, **kwargs)
-            
-            # Cache result
-            if result is not None:
-                ai_cache_manager.set(prompt_key, result, operation, context_hash, ttl)
-                logger.debug(f"Cached result for {func.__name__}")
+            def load():
+                result = func(*args, **kwargs)
+                if result is not None:
+                    ai_cache_manager.set(prompt_key, result, operation, context_hash, ttl)
+                    logger.debug(f"Cached result for {func.__name__}")
+                return result
             
-            return result
+            return ai_cache_manager.single_flight(prompt_key, load, operation, context_hash)
         
         # Add utility methods to wrapper
         wrapper.cache_clear = lambda: ai_cache_manager.invalidate_operation(operation)
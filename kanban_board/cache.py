@@ -31,6 +31,7 @@ import hashlib
 import json
 import logging
 import functools
+import uuid
 from typing import Any, Callable, Optional, Union
 from datetime import timedelta
 
@@ -634,6 +635,52 @@ def warmup_user_cache(user_id: int) -> None:
         logger.error(f"Error warming user cache: {e}")
 
 
+# =============================================================================
+# CROSS-PROCESS STATE
+# =============================================================================
+
+def shared_cache():
+    """
+    Cache for state every process must agree on (version tokens, counters).
+
+    The default cache is a per-process LocMemCache in DEBUG, so a write made
+    by the web process is invisible to Celery workers and other web workers.
+    ``ai_cache`` stays on Redis in every mode where those processes exist.
+    Unlike the default cache it raises when Redis is unreachable, so callers
+    must handle errors.
+    """
+    try:
+        return caches['ai_cache']
+    except Exception:
+        return cache
+
+
+def get_version_token(key: str) -> Optional[str]:
+    """
+    The shared version token stored under ``key``, created on first use.
+    Returns None when the shared cache is unreachable; callers should then
+    treat any local copy as stale.
+    """
+    store = shared_cache()
+    try:
+        version = store.get(key)
+        if version is None:
+            store.add(key, uuid.uuid4().hex, timeout=None)
+            version = store.get(key)
+        return version
+    except Exception as e:
+        logger.warning(f"Version token {key} unavailable: {e}")
+        return None
+
+
+def bump_version_token(key: str) -> None:
+    """Replace the token under ``key`` so every process's copy goes stale."""
+    try:
+        shared_cache().set(key, uuid.uuid4().hex, timeout=None)
+    except Exception as e:
+        logger.warning(f"Could not bump version token {key}: {e}")
+
+
 # =============================================================================
 # CACHE INVALIDATION SIGNALS
 # =============================================================================
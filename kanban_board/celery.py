@@ -183,6 +183,37 @@ app.conf.beat_schedule = {
         'task': 'analytics.tasks.generate_daily_analytics_report',
         'schedule': crontab(hour=5, minute=0),
     },
+    # --- Workload Counters ---
+    # Repair drift in the incremental per-(user, board) workload counters
+    # (queryset .update()/bulk_create writes bypass the Task signals).
+    # Hourly at :25 — no other hourly job uses that minute.
+    'reconcile-workload-counters': {
+        'task': 'kanban.reconcile_workload_counters',
+        'schedule': crontab(minute=25),  # Every hour at :25
+    },
+    # --- API Token Usage ---
+    # Write the cache-side API token counters and last_used back to the
+    # APIToken rows (api/token_usage.py). Every minute, so the usage
+    # dashboards lag by at most a minute.
+    'flush-api-token-usage': {
+        'task': 'api.flush_token_usage',
+        'schedule': crontab(),  # Every minute
+    },
+    # Persist chat last_seen stamps queued by websocket heartbeats
+    # (messaging/presence.py), so quiet rooms still reach the DB. Skipped when
+    # a request already flushed within CHAT_LAST_SEEN_FLUSH_INTERVAL.
+    'flush-chat-last-seen': {
+        'task': 'messaging.flush_chat_last_seen',
+        'schedule': crontab(),  # Every minute
+    },
+    # --- Board Analytics Facts ---
+    # Roll every active board's BoardDailyMetrics row over to the new day
+    # (overdue and rolling 7/30-day counts change at midnight without any
+    # task edit). Daily at 00:20 — clear of the 00:05 job.
+    'refresh-board-metrics': {
+        'task': 'kanban.refresh_board_metrics',
+        'schedule': crontab(hour=0, minute=20),  # Daily at 00:20
+    },
     # --- Webhook Maintenance ---
     # Purge webhook delivery logs older than 30 days (daily at 4:15 AM) so the
     # WebhookDelivery table doesn't grow unbounded.
@@ -190,6 +221,12 @@ app.conf.beat_schedule = {
         'task': 'webhooks.tasks.cleanup_old_deliveries',
         'schedule': crontab(hour=4, minute=15),
     },
+    # Requeue webhook deliveries stuck 'pending' or 'sent' for 15+ minutes
+    # (worker died mid-flush, or the delivery/flush task was lost).
+    'requeue-stuck-webhook-deliveries': {
+        'task': 'webhooks.tasks.requeue_stuck_deliveries',
+        'schedule': crontab(minute='*/10'),  # Every 10 minutes
+    },
 }
 
 # Route all AI summary tasks to a dedicated 'summaries' queue so they never
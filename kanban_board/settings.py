@@ -438,6 +438,13 @@ ANTHROPIC_MODEL_PREMIUM = os.getenv('ANTHROPIC_MODEL_PREMIUM', os.getenv('ANTHRO
 # the router and call Gemini directly.  Use this only during production incidents.
 AI_ROUTER_ENABLED = os.getenv('AI_ROUTER_ENABLED', 'true').lower() == 'true'
 
+# Token streaming for AI chat (AIRouter.stream → AITaskConsumer). Deltas are
+# buffered and sent as one 'ai_delta' WebSocket frame once this many characters
+# are pending or this many seconds have passed since the last frame, whichever
+# comes first — a frame per token would flood the channel layer.
+AI_STREAM_FRAME_CHARS = int(os.getenv('AI_STREAM_FRAME_CHARS', '48'))
+AI_STREAM_FRAME_SECONDS = float(os.getenv('AI_STREAM_FRAME_SECONDS', '0.1'))
+
 # BYOK Encryption Key — used by AIRouter to encrypt/decrypt user and org BYOK API keys.
 # Must be a valid Fernet key. Generate one with:
 #   from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())
@@ -471,6 +478,27 @@ AI_ASSISTANT_CONFIG = {
     'CACHE_TTL': 3600,  # 1 hour
 }
 
+# Knowledge Base semantic search — per-organization embedding matrix
+# (ai_assistant/utils/embedding_index.py). Vectors are stored as float32 .npy
+# files that are memory-mapped on load; set KB_EMBEDDING_INDEX_DIR to None to
+# keep the index in memory only. KB_SEMANTIC_CANDIDATES is the top-k pulled
+# from the index for each Spectra question.
+KB_EMBEDDING_INDEX_ENABLED = os.getenv('KB_EMBEDDING_INDEX_ENABLED', 'true').lower() == 'true'
+KB_EMBEDDING_INDEX_DIR = os.getenv('KB_EMBEDDING_INDEX_DIR', os.path.join(BASE_DIR, 'kb_index'))
+KB_SEMANTIC_CANDIDATES = 30
+
+# Spectra context providers — concurrent fan-out.
+# When enabled, the ~40 context providers run on a bounded thread pool instead
+# of one after another. A provider that runs longer than the per-provider
+# timeout, or is still pending when the overall budget is spent, degrades to
+# its "data temporarily unavailable" line. Providers slower than
+# SPECTRA_CONTEXT_SLOW_PROVIDER_MS are logged as warnings.
+SPECTRA_CONTEXT_PARALLEL = os.getenv('SPECTRA_CONTEXT_PARALLEL', 'true').lower() == 'true'
+SPECTRA_CONTEXT_MAX_WORKERS = int(os.getenv('SPECTRA_CONTEXT_MAX_WORKERS', '8'))
+SPECTRA_CONTEXT_PROVIDER_TIMEOUT = float(os.getenv('SPECTRA_CONTEXT_PROVIDER_TIMEOUT', '3'))  # seconds
+SPECTRA_CONTEXT_BUDGET = float(os.getenv('SPECTRA_CONTEXT_BUDGET', '8'))  # seconds, whole fan-out
+SPECTRA_CONTEXT_SLOW_PROVIDER_MS = 500
+
 # Logging for AI Assistant
 LOGGING = {
     'version': 1,
@@ -547,6 +575,10 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Chat presence/typing lives in the cache (messaging/presence.py); queued
+# UserProfile.last_seen stamps are written in one batch at most this often.
+CHAT_LAST_SEEN_FLUSH_INTERVAL = int(os.getenv('CHAT_LAST_SEEN_FLUSH_INTERVAL', '60'))
+
 # Cache Configuration (for caching AI responses and search results)
 # Multi-tier caching strategy for cloud cost optimization
 # ============================================
@@ -708,6 +740,9 @@ if DEBUG and not os.getenv('FORCE_REDIS_CACHE'):
         # Channels, but without Redis there's no Channels anyway — and DB
         # sessions are fully reliable with the Django dev server.
         SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+        # No beat to flush cached API token usage (api/token_usage.py), so
+        # count it on the APIToken row per request instead.
+        API_TOKEN_USAGE_IN_CACHE = False
         # Use in-memory channel layer (WebSockets won't work cross-process
         # but the app won't crash on import).
         CHANNEL_LAYERS = {
@@ -733,6 +768,28 @@ CACHE_TIMEOUTS = {
 # These can be overridden via environment variables
 AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'true').lower() == 'true'
 
+# Single-flight for AI cache misses (kanban_board/ai_cache.py): concurrent
+# identical requests wait up to AI_SINGLE_FLIGHT_WAIT seconds for the one call
+# in flight instead of each calling the model. The cross-process lock in the
+# ai_cache backend expires after AI_SINGLE_FLIGHT_LOCK_TTL (>= provider timeout).
+# The wait defaults to the same bound: a follower that gives up before a slow
+# leader finishes makes the duplicate call single-flight exists to prevent.
+# Followers still return as soon as the leader does.
+AI_SINGLE_FLIGHT_LOCK_TTL = int(os.getenv('AI_SINGLE_FLIGHT_LOCK_TTL', '120'))
+AI_SINGLE_FLIGHT_WAIT = float(os.getenv('AI_SINGLE_FLIGHT_WAIT', str(AI_SINGLE_FLIGHT_LOCK_TTL)))
+
+# Stale-while-revalidate for AI board artefacts (kanban/utils/ai_artefacts.py).
+# A value older than its AI_SWR_FRESH_FOR entry is still served, marked stale,
+# and at most one background refresh per board and artefact is queued every
+# AI_SWR_REFRESH_THROTTLE seconds. Cached values are kept for AI_SWR_MAX_AGE.
+AI_SWR_FRESH_FOR = {
+    'board_summary': 3600,
+    'analytics_summary': 1800,
+    'analytics_narrative': 3600,
+}
+AI_SWR_REFRESH_THROTTLE = int(os.getenv('AI_SWR_REFRESH_THROTTLE', '300'))
+AI_SWR_MAX_AGE = 7 * 86400
+
 # AI Cache TTL overrides (in seconds) - comma-separated key:value pairs
 # Example: AI_CACHE_TTLS="budget_analysis:7200,skill_analysis:3600"
 AI_CACHE_TTL_OVERRIDES = {}
@@ -791,6 +848,7 @@ CELERY_RESULT_EXPIRES = 3600  # Results expire after 1 hour
 CELERY_TASK_ROUTES = {
     'kanban.ai_summary.*': {'queue': 'summaries'},
     'kanban.ai_streaming.*': {'queue': 'ai_tasks'},
+    'kanban.ai_artefacts.*': {'queue': 'ai_tasks'},
     # Live project migration is user-triggered + progress-watched, so keep it on
     # the dedicated 'interactive' worker (same queue as sandbox provisioning),
     # off the heavy default queue. NB: this dict (settings.CELERY_TASK_ROUTES) is
@@ -813,6 +871,36 @@ AI_SUMMARY_DEBOUNCE_SECONDS = 600          # 10 minutes
 # dashboard UI and in the /api/summary-status/ polling endpoint.
 AI_SUMMARY_STALE_THRESHOLD_MINUTES = 120   # 2 hours
 
+# ---------------------------------------------------------------------------
+# Coalesced Task side effects (kanban/utils/side_effects.py)
+# ---------------------------------------------------------------------------
+# Inside coalesce_side_effects() (board import, live migration, drag-and-drop
+# moves, automation actions and the scheduled automation sweeps) per-user and
+# per-board recomputations triggered by Task saves run once after commit.
+# When True the whole batch is handed to Celery as one task instead of running
+# in the web process; falls back to in-process if the broker is unreachable.
+TASK_SIDE_EFFECTS_ASYNC = os.getenv('TASK_SIDE_EFFECTS_ASYNC', 'False').lower() == 'true'
+
+# Per-process cap on boards whose automation rule index (kanban/automation_index.py)
+# is kept in memory; least-recently-used boards are rebuilt on next access.
+AUTOMATION_RULE_INDEX_MAX_BOARDS = 512
+
+# ---------------------------------------------------------------------------
+# Webhook delivery (webhooks/delivery.py, webhooks/subscriptions.py)
+# ---------------------------------------------------------------------------
+# Per worker process: threads sending one event to its endpoints concurrently
+# (also the keep-alive connection pool size per host), and the cap on requests
+# in flight to any single webhook endpoint.
+WEBHOOK_DELIVERY_MAX_WORKERS = int(os.getenv('WEBHOOK_DELIVERY_MAX_WORKERS', '8'))
+WEBHOOK_ENDPOINT_CONCURRENCY = int(os.getenv('WEBHOOK_ENDPOINT_CONCURRENCY', '4'))
+# Per-process cap on boards whose (event -> webhooks) subscription index is
+# kept in memory.
+WEBHOOK_SUBSCRIPTION_INDEX_MAX_BOARDS = 512
+
+# Per-process cap on unpickled priority models kept by
+# ai_assistant/utils/priority_service.py, keyed by (model id, version).
+PRIORITY_MODEL_CACHE_SIZE = 32
+
 # Map Django message levels to Bootstrap CSS classes
 from django.contrib.messages import constants as message_constants
 MESSAGE_TAGS = {
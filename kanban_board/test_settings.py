@@ -70,6 +70,13 @@ DATABASES = {
     }
 }
 
+# =============================================================================
+# KB EMBEDDING INDEX FOR TESTING
+# =============================================================================
+# Keep the per-organization embedding index in memory so tests never write
+# .npy files into the repo.
+KB_EMBEDDING_INDEX_DIR = None
+
 # =============================================================================
 # PASSWORD HASHERS FOR TESTING
 # =============================================================================
@@ -97,6 +104,9 @@ CACHES = {
     }
     for alias in ('default', 'ai_cache', 'session_cache', 'analytics_cache', 'local')
 }
+# settings.py turns this off when Redis is down; tests run in one process, so
+# the in-memory ai_cache is shared for API token usage either way.
+API_TOKEN_USAGE_IN_CACHE = True
 
 # =============================================================================
 # CHANNELS FOR TESTING
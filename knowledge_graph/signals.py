@@ -30,17 +30,14 @@ def _node_exists(source_type, source_id, extra_tag=None):
 @receiver(pre_save, sender='kanban.Task')
 def track_task_completion_for_memory(sender, instance, **kwargs):
     """Track whether this save transitions the task to completed."""
-    if not instance.pk:
+    old = instance.get_previous_state()
+    if old is None:
         instance._kg_just_completed = False
         return
-    try:
-        old = sender.objects.get(pk=instance.pk)
-        instance._kg_just_completed = (
-            old.progress < 100 and instance.progress >= 100
-        )
-        instance._kg_old_progress = old.progress
-    except sender.DoesNotExist:
-        instance._kg_just_completed = False
+    instance._kg_just_completed = (
+        old.progress < 100 and instance.progress >= 100
+    )
+    instance._kg_old_progress = old.progress
 
 
 @receiver(post_save, sender='kanban.Task')
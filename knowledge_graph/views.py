@@ -948,7 +948,16 @@ def organizational_memory_search(request):
     # silently excluded by the rank-based cutoff.
     import re as _re
     raw_keywords = _re.findall(r'[a-zA-Z]{4,}', query_text)[:6]
+    extra_nodes = None
     if raw_keywords:
+        # Best keyword matches first from the full-text index; any keyword may
+        # match, as with the icontains fallback below.
+        from kanban.utils import search_index
+        extra_nodes = search_index.ranked_objects(
+            accessible.exclude(pk__in=top_ids).select_related('board'),
+            ' '.join(raw_keywords), 'memory', limit=20, any_term=True,
+        )
+    if raw_keywords and extra_nodes is None:
         from django.db.models import Q as DQ
         kw_q = DQ()
         for kw in raw_keywords:
@@ -960,7 +969,7 @@ def organizational_memory_search(request):
             .select_related('board')
             .order_by('-importance_score', '-created_at')[:20]
         )
-    else:
+    elif extra_nodes is None:
         extra_nodes = []
 
     nodes = top_nodes + extra_nodes
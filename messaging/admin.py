@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TaskThreadComment, ChatRoom, ChatMessage, Notification, UserTypingStatus, ChatRoomInvitation
+from .models import TaskThreadComment, ChatRoom, ChatMessage, ChatReadState, Notification, UserTypingStatus, ChatRoomInvitation
 
 
 @admin.register(ChatRoomInvitation)
@@ -36,6 +36,14 @@ class ChatMessageAdmin(admin.ModelAdmin):
     filter_horizontal = ['mentioned_users']
 
 
+@admin.register(ChatReadState)
+class ChatReadStateAdmin(admin.ModelAdmin):
+    list_display = ['user', 'chat_room', 'last_read_message_id', 'updated_at']
+    list_filter = ['chat_room']
+    search_fields = ['user__username', 'chat_room__name']
+    readonly_fields = ['updated_at']
+
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ['id', 'recipient', 'sender', 'notification_type', 'is_read', 'created_at']
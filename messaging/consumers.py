@@ -2,9 +2,11 @@ import asyncio
 import json
 import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import User
-from .models import ChatMessage, ChatRoom, TaskThreadComment, UserTypingStatus, Notification
+from .models import ChatMessage, ChatReadState, ChatRoom, TaskThreadComment, Notification
+from . import presence
 from kanban.models import Task, BoardMembership
 from django.utils import timezone
 
@@ -12,11 +14,11 @@ logger = logging.getLogger(__name__)
 
 
 class ChatRoomConsumer(AsyncWebsocketConsumer):
-    """WebSocket consumer for real-time chat room messaging"""
+    """WebSocket consumer for real-time chat room messaging
 
-    # Maps room_id (int) → set of user_ids currently connected.
-    # Class-level so all consumer instances in the same process share it.
-    _active_connections: dict = {}
+    Typing, connection and last_seen state is kept in the cache
+    (messaging/presence.py), shared by every process serving the room.
+    """
     
     async def connect(self):
         """Handle WebSocket connection"""
@@ -44,11 +46,7 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
         )
 
         # Track active connection
-        ChatRoomConsumer._active_connections.setdefault(self.room_id, set())
-        ChatRoomConsumer._active_connections[self.room_id].add(self.user.id)
-
-        # Update last_seen timestamp
-        await self.update_last_seen()
+        await self.track_connection(connected=True)
 
         # NOTE: Messages are NOT auto-marked as read when joining.
         # Users must manually click "Mark as Read" for privacy control.
@@ -75,12 +73,9 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
-        # Remove from active connections
-        room_connections = ChatRoomConsumer._active_connections.get(self.room_id, set())
-        room_connections.discard(self.user.id)
-
-        # Update last_seen on disconnect so offline timestamp is fresh
-        await self.update_last_seen()
+        # Remove from active connections; last_seen is stamped so the
+        # offline timestamp is fresh
+        await self.track_connection(connected=False)
 
         await self.channel_layer.group_discard(
             self.room_group_name,
@@ -111,7 +106,7 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
 
             # Handle heartbeat ping - respond with pong and refresh last_seen
             if message_type == 'ping':
-                await self.update_last_seen()
+                await self.track_connection(heartbeat=True)
                 await self.send(text_data=json.dumps({'type': 'pong'}))
                 return
 
@@ -355,8 +350,7 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
 
     async def broadcast_presence(self):
         """Build current presence state and broadcast to the whole room group."""
-        active_ids = ChatRoomConsumer._active_connections.get(self.room_id, set())
-        members_data = await self.get_room_members_presence(active_ids)
+        members_data = await self.get_room_members_presence()
         active_count = sum(1 for m in members_data if m['status'] == 'active')
         await self.channel_layer.group_send(
             self.room_group_name,
@@ -410,13 +404,18 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
             return False
 
     @database_sync_to_async
-    def update_last_seen(self):
-        """Stamp UserProfile.last_seen with the current time."""
-        from accounts.models import UserProfile
-        UserProfile.objects.filter(user=self.user).update(last_seen=timezone.now())
+    def track_connection(self, connected=None, heartbeat=False):
+        """Record a connect, disconnect or heartbeat and stamp last_seen (cache only)."""
+        if connected is True:
+            presence.connect(self.room_id, self.user.id)
+        elif connected is False:
+            presence.disconnect(self.room_id, self.user.id)
+        elif heartbeat:
+            presence.heartbeat(self.room_id, self.user.id)
+        presence.touch_last_seen(self.user.id)
 
     @database_sync_to_async
-    def get_room_members_presence(self, active_ids):
+    def get_room_members_presence(self):
         """Return a list of presence dicts for all room members.
 
         Each dict contains:
@@ -427,21 +426,24 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
         (their timestamp is hidden from others) or when last_seen is null.
         Option B: the *requesting* user's own toggle only hides their own
         timestamp — they can still see everyone else's.
+
+        Built from the cached roster and live presence keys; the database is
+        only read when the roster has expired.
         """
-        from accounts.models import UserProfile
-        try:
-            chat_room = ChatRoom.objects.get(id=self.room_id)
-        except ChatRoom.DoesNotExist:
+        roster = presence.room_roster(self.room_id)
+        if roster is None:
             return []
 
+        member_ids = [m['user_id'] for m in roster]
+        active_ids = presence.active_user_ids(self.room_id, member_ids)
+        live_last_seen = presence.last_seen_map(member_ids)
+
         away_cutoff = timezone.now() - timezone.timedelta(minutes=2)
-        members = chat_room.members.select_related('profile').all()
         result = []
-        for member in members:
-            profile = getattr(member, 'profile', None)
-            last_seen_dt = profile.last_seen if profile else None
+        for member in roster:
+            last_seen_dt = live_last_seen.get(member['user_id'], member['last_seen'])
 
-            if member.id in active_ids:
+            if member['user_id'] in active_ids:
                 status = 'active'
             elif last_seen_dt and last_seen_dt >= away_cutoff:
                 status = 'away'
@@ -450,14 +452,13 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
 
             # Only expose last_seen for offline members (active/away show dot instead)
             # and only when the member hasn't opted out
-            show = profile.show_last_seen if profile else True
             last_seen_iso = None
-            if status == 'offline' and show and last_seen_dt:
+            if status == 'offline' and member['show_last_seen'] and last_seen_dt:
                 last_seen_iso = last_seen_dt.isoformat()
 
             result.append({
-                'user_id': member.id,
-                'display_name': member.get_full_name() or member.username,
+                'user_id': member['user_id'],
+                'display_name': member['display_name'],
                 'status': status,
                 'last_seen_iso': last_seen_iso,
             })
@@ -491,7 +492,7 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
             )
             
             # Auto-mark sender's message as read for themselves
-            message.read_by.add(self.user)
+            ChatReadState.mark_read(chat_room, self.user, message.id)
             
             # Extract and add mentioned users
             # This is OPTIONAL - messages don't need mentions to be sent
@@ -527,46 +528,28 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
         except ChatRoom.DoesNotExist:
             return {'id': None, 'timestamp': None, 'mentioned_users': [], 'chat_room_id': None, 'chat_room_name': None}
     
-    @database_sync_to_async
+    @sync_to_async
     def update_typing_status(self):
-        """Update user typing status"""
-        try:
-            chat_room = ChatRoom.objects.get(id=self.room_id)
-            typing_status, created = UserTypingStatus.objects.get_or_create(
-                chat_room=chat_room,
-                user=self.user
-            )
-            return typing_status
-        except ChatRoom.DoesNotExist:
-            return None
+        """Update user typing status (cache entry that expires on its own)"""
+        presence.set_typing(self.room_id, self.user.id)
     
-    @database_sync_to_async
+    @sync_to_async
     def remove_typing_status(self):
         """Remove user typing status"""
-        try:
-            UserTypingStatus.objects.filter(
-                chat_room_id=self.room_id,
-                user=self.user
-            ).delete()
-        except:
-            pass
+        presence.clear_typing(self.room_id, self.user.id)
     
     @database_sync_to_async
     def mark_message_as_read(self, message_id):
         """Mark a message as read by the current user"""
         try:
-            message = ChatMessage.objects.get(id=message_id)
-            message.read_by.add(self.user)
+            message = ChatMessage.objects.select_related('chat_room').get(id=message_id)
+            chat_room = message.chat_room
+            ChatReadState.mark_read(chat_room, self.user, message.id)
             
-            total_members = message.chat_room.members.count()
-            read_count = message.read_by.count()
+            total_members = chat_room.members.count()
+            read_count = ChatReadState.read_counts(chat_room, [message.id])[message.id]
             all_read = read_count >= total_members
             
-            if all_read:
-                message.is_read = True
-                message.read_at = timezone.now()
-                message.save()
-            
             return {
                 'read_count': read_count,
                 'total_members': total_members,
@@ -577,72 +560,64 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
     
     async def mark_all_messages_read_on_join(self):
         """Mark all unread messages as read when user joins the room and broadcast updates"""
-        updates = await self.get_and_mark_unread_messages()
-        
-        # Broadcast read status updates for each message
-        for update in updates:
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'message_marked_read',
-                    'message_id': update['message_id'],
-                    'username': self.user.username,
-                    'user_id': self.user.id,
-                    'read_count': update['read_count'],
-                    'total_members': update['total_members'],
-                    'all_read': update['all_read']
-                }
-            )
+        update = await self.get_and_mark_unread_messages()
+        if not update:
+            return
         
-        # If any messages were marked, also trigger notification count update
-        if updates:
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'notification_count_update',
-                    'trigger': 'bulk_read_on_join'
-                }
-            )
+        # One watermark event covers every message in (from_id, to_id]
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'messages_marked_read',
+                'username': self.user.username,
+                'user_id': self.user.id,
+                'from_id': update['from_id'],
+                'to_id': update['to_id'],
+                'read_floor': update['read_floor'],
+                'total_members': update['total_members'],
+            }
+        )
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'notification_count_update',
+                'trigger': 'bulk_read_on_join'
+            }
+        )
+    
+    async def messages_marked_read(self, event):
+        """Send a read-watermark advance to WebSocket"""
+        await self.send(text_data=json.dumps({
+            'type': 'messages_marked_read',
+            'username': event['username'],
+            'user_id': event['user_id'],
+            'from_id': event['from_id'],
+            'to_id': event['to_id'],
+            'read_floor': event['read_floor'],
+            'total_members': event['total_members'],
+        }))
     
     @database_sync_to_async
     def get_and_mark_unread_messages(self):
-        """Get all unread messages for this user in this room and mark them as read"""
-        from django.db.models import Q
+        """Move this user's read watermark to the newest message in the room.
         
+        Returns the advanced range, or None when nothing was unread.
+        """
         try:
             chat_room = ChatRoom.objects.get(id=self.room_id)
-            total_members = chat_room.members.count()
-            
-            # Get messages not read by this user (excluding their own messages)
-            unread_messages = ChatMessage.objects.filter(
-                chat_room=chat_room
-            ).exclude(
-                read_by=self.user
-            ).exclude(
-                author=self.user
-            )
-            
-            updates = []
-            for message in unread_messages:
-                message.read_by.add(self.user)
-                read_count = message.read_by.count()
-                all_read = read_count >= total_members
-                
-                if all_read and not message.is_read:
-                    message.is_read = True
-                    message.read_at = timezone.now()
-                    message.save()
-                
-                updates.append({
-                    'message_id': message.id,
-                    'read_count': read_count,
-                    'total_members': total_members,
-                    'all_read': all_read
-                })
-            
-            return updates
         except ChatRoom.DoesNotExist:
-            return []
+            return None
+        
+        from_id = ChatReadState.watermark(chat_room, self.user)
+        to_id = ChatReadState.mark_read(chat_room, self.user)
+        if to_id <= from_id:
+            return None
+        return {
+            'from_id': from_id,
+            'to_id': to_id,
+            'read_floor': ChatReadState.read_floor(chat_room),
+            'total_members': chat_room.members.count(),
+        }
 
 
 class TaskCommentConsumer(AsyncWebsocketConsumer):
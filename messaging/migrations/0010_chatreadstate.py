@@ -0,0 +1,55 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_read_states(apps, schema_editor):
+    """One watermark per (room, user) at the newest message they had in read_by."""
+    ChatMessage = apps.get_model('messaging', 'ChatMessage')
+    ChatReadState = apps.get_model('messaging', 'ChatReadState')
+    ReadBy = ChatMessage.read_by.through
+
+    rows = (
+        ReadBy.objects.values('chatmessage__chat_room_id', 'user_id')
+        .annotate(last_read=Max('chatmessage_id'))
+        .order_by()
+    )
+    ChatReadState.objects.bulk_create(
+        [
+            ChatReadState(
+                chat_room_id=row['chatmessage__chat_room_id'],
+                user_id=row['user_id'],
+                last_read_message_id=row['last_read'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0009_chat_room_invitation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('chat_room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_states', to='messaging.chatroom')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_read_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('chat_room', 'user')},
+                'indexes': [models.Index(fields=['chat_room', 'last_read_message_id'], name='messaging_c_chat_ro_c945c8_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_read_states, migrations.RunPython.noop),
+    ]
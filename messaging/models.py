@@ -1,7 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 from kanban.models import Task, Board
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 
 
@@ -119,7 +121,10 @@ class ChatMessage(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     
-    # Message read status tracking
+    # Message read status tracking. ``is_read``/``read_at`` flip once every
+    # member's ChatReadState watermark has passed the message. ``read_by`` is
+    # the pre-watermark per-message record; it is no longer written and only
+    # kept as the source of migration 0010's backfill.
     is_read = models.BooleanField(default=False)
     read_by = models.ManyToManyField(User, related_name='read_messages', blank=True)
     read_at = models.DateTimeField(null=True, blank=True)
@@ -143,16 +148,16 @@ class ChatMessage(models.Model):
         return list(set(mentions))  # Remove duplicates
     
     def mark_as_read(self, user):
-        """Mark message as read by a specific user"""
-        self.read_by.add(user)
-        if self.read_by.count() == self.chat_room.members.count():
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save()
+        """Mark this message (and every earlier one in the room) as read by ``user``"""
+        ChatReadState.mark_read(self.chat_room, user, self.id)
+    
+    def get_read_count(self):
+        """Get number of room members who have read this message"""
+        return ChatReadState.read_counts(self.chat_room, [self.id])[self.id]
     
     def get_unread_count(self):
         """Get number of users who haven't read this message"""
-        return self.chat_room.members.count() - self.read_by.count()
+        return self.chat_room.members.count() - self.get_read_count()
     
     def notify_mentioned_users(self):
         """Create notifications for mentioned users"""
@@ -171,6 +176,120 @@ class ChatMessage(models.Model):
                 pass
 
 
+class ChatReadState(models.Model):
+    """Per-(room, user) read watermark.
+
+    Every message in ``chat_room`` with ``id <= last_read_message_id`` counts
+    as read by ``user``. Message ids grow with creation order, so unread
+    counts, "read by N of M" and mark-all-read are each a single query
+    instead of one ``read_by`` row per message.
+    """
+    chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='read_states')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chat_read_states')
+    last_read_message_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['chat_room', 'user']
+        indexes = [
+            models.Index(fields=['chat_room', 'last_read_message_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} read {self.chat_room.name} up to {self.last_read_message_id}"
+    
+    @classmethod
+    def mark_read(cls, chat_room, user, message_id=None):
+        """
+        Advance ``user``'s watermark in ``chat_room`` to ``message_id`` (the
+        room's latest message when None). Never moves it backwards.
+        
+        Also flips ``is_read`` on the messages every member has now read.
+        Returns the watermark after the update.
+        """
+        if message_id is None:
+            message_id = chat_room.messages.order_by('-id').values_list('id', flat=True).first()
+            if message_id is None:
+                return 0
+        
+        qs = cls.objects.filter(chat_room=chat_room, user=user)
+        advanced = Greatest(
+            F('last_read_message_id'), Value(message_id),
+            output_field=models.PositiveBigIntegerField(),
+        )
+        if not qs.update(last_read_message_id=advanced, updated_at=timezone.now()):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(chat_room=chat_room, user=user, last_read_message_id=message_id)
+            except IntegrityError:
+                # A concurrent first read created the row; advance it instead.
+                qs.update(last_read_message_id=advanced, updated_at=timezone.now())
+        
+        floor = cls.read_floor(chat_room)
+        if floor:
+            chat_room.messages.filter(id__lte=floor, is_read=False).update(
+                is_read=True, read_at=timezone.now(),
+            )
+        return qs.values_list('last_read_message_id', flat=True).first() or 0
+    
+    @classmethod
+    def member_watermarks(cls, chat_room):
+        """Sorted watermarks of the room's members (0 for members who never read)."""
+        marks = dict(
+            cls.objects.filter(chat_room=chat_room, user__in=chat_room.members.all())
+            .values_list('user_id', 'last_read_message_id')
+        )
+        member_ids = chat_room.members.values_list('id', flat=True)
+        return sorted(marks.get(uid, 0) for uid in member_ids)
+    
+    @classmethod
+    def read_floor(cls, chat_room):
+        """Highest message id every member has read (0 if anyone has read nothing)."""
+        marks = cls.member_watermarks(chat_room)
+        return marks[0] if marks else 0
+    
+    @classmethod
+    def read_counts(cls, chat_room, message_ids):
+        """``{message_id: members who have read it}`` from one watermark query."""
+        from bisect import bisect_left
+        
+        marks = cls.member_watermarks(chat_room)
+        return {mid: len(marks) - bisect_left(marks, mid) for mid in message_ids}
+    
+    @classmethod
+    def watermark(cls, chat_room, user):
+        """``user``'s watermark in ``chat_room`` (0 when they have read nothing)."""
+        return cls.objects.filter(chat_room=chat_room, user=user).values_list(
+            'last_read_message_id', flat=True,
+        ).first() or 0
+    
+    @classmethod
+    def unread_counts(cls, user, chat_rooms):
+        """
+        ``{room_id: unread messages}`` for ``user`` across ``chat_rooms`` in
+        one aggregate query. Messages written by ``user`` never count as unread;
+        rooms without unread messages are omitted.
+        """
+        watermark = Subquery(
+            cls.objects.filter(chat_room=OuterRef('chat_room'), user=user)
+            .values('last_read_message_id')[:1]
+        )
+        rows = (
+            ChatMessage.objects.filter(chat_room__in=chat_rooms)
+            .exclude(author=user)
+            .filter(id__gt=Coalesce(watermark, Value(0), output_field=models.PositiveBigIntegerField()))
+            .order_by()
+            .values('chat_room_id')
+            .annotate(unread=Count('id'))
+        )
+        return {row['chat_room_id']: row['unread'] for row in rows}
+    
+    @classmethod
+    def total_unread(cls, user, chat_rooms):
+        """Sum of unread_counts() across ``chat_rooms``."""
+        return sum(cls.unread_counts(user, chat_rooms).values())
+
+
 class Notification(models.Model):
     """Notifications for mentions and activity"""
     NOTIFICATION_TYPES = [
@@ -289,7 +408,11 @@ Example outputs:
 
 
 class UserTypingStatus(models.Model):
-    """Track user typing status in chat rooms"""
+    """Track user typing status in chat rooms
+
+    No longer written: live typing state is kept in the cache
+    (messaging/presence.py).
+    """
     chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='typing_users')
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     last_update = models.DateTimeField(auto_now=True)
@@ -0,0 +1,261 @@
+"""
+Ephemeral chat presence and typing state.
+
+Typing indicators, "who is connected to this room" and live ``last_seen``
+stamps change on every keystroke, heartbeat and socket (re)connect. They
+live in the default cache (Redis in production) with short TTLs instead of
+``UserTypingStatus`` rows and per-event ``UserProfile`` updates, so that
+chat traffic does not queue behind other writes on the database.
+
+``UserProfile.last_seen`` is still persisted for offline timestamps that
+outlive the cache, but through a coalesced write-behind: each user is
+queued at most once per ``LAST_SEEN_FLUSH_INTERVAL`` and the flush writes
+all queued users in one pass. The flush runs from the
+``messaging.flush_chat_last_seen`` beat task, or earlier from whichever
+request first finds the flush window open. The cached value is
+authoritative for live presence; the database only has to be roughly right
+once it expires.
+
+The queue is a log of numbered slots, one per queued user: a touch takes
+the next slot number with an atomic ``incr`` and writes the user id under
+its own key, so concurrent touches never overwrite each other. Only the
+flush (one at a time, behind the flush-window claim) moves the read
+position. last_seen state lives in the shared cache, so the Celery worker
+sees what the web processes queued.
+"""
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from kanban_board.cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'chat'
+
+# Typing indicators expire on their own if 'stop_typing' never arrives
+# (matches the old UserTypingStatus.is_typing timeout).
+TYPING_TTL = 10
+# Clients ping every 25 s; a connection missing three pings counts as gone.
+CONNECTION_TTL = 75
+LAST_SEEN_TTL = 7 * 86400
+# Room member display data (names, show_last_seen) reused across broadcasts.
+ROSTER_TTL = 60
+
+
+def _flush_interval():
+    return getattr(settings, 'CHAT_LAST_SEEN_FLUSH_INTERVAL', 60)
+
+
+def _typing_key(room_id, user_id):
+    return f'{KEY_PREFIX}:typing:{room_id}:{user_id}'
+
+
+def _connection_key(room_id, user_id):
+    return f'{KEY_PREFIX}:conn:{room_id}:{user_id}'
+
+
+def _last_seen_key(user_id):
+    return f'{KEY_PREFIX}:last_seen:{user_id}'
+
+
+def _roster_key(room_id):
+    return f'{KEY_PREFIX}:roster:{room_id}'
+
+
+def _queued_key(user_id):
+    return f'{KEY_PREFIX}:last_seen:queued:{user_id}'
+
+
+def _slot_key(slot):
+    return f'{KEY_PREFIX}:last_seen:slot:{slot}'
+
+
+_SEQ_KEY = f'{KEY_PREFIX}:last_seen:seq'
+# {'read': last slot read, 'gaps': {slot: flushes seen missing}}; only the
+# flush writes it.
+_FLUSH_STATE_KEY = f'{KEY_PREFIX}:last_seen:flush_state'
+_FLUSH_CLAIM_KEY = f'{KEY_PREFIX}:last_seen:flush'
+
+
+# ---------------------------------------------------------------------------
+# Typing
+# ---------------------------------------------------------------------------
+
+def set_typing(room_id, user_id):
+    cache.set(_typing_key(room_id, user_id), True, TYPING_TTL)
+
+
+def clear_typing(room_id, user_id):
+    cache.delete(_typing_key(room_id, user_id))
+
+
+# ---------------------------------------------------------------------------
+# Connections
+# ---------------------------------------------------------------------------
+
+def connect(room_id, user_id):
+    """Count one more open socket for the user in the room (tabs are counted separately)."""
+    key = _connection_key(room_id, user_id)
+    if not cache.add(key, 1, CONNECTION_TTL):
+        try:
+            cache.incr(key)
+            cache.touch(key, CONNECTION_TTL)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.set(key, 1, CONNECTION_TTL)
+
+
+def disconnect(room_id, user_id):
+    key = _connection_key(room_id, user_id)
+    try:
+        if cache.decr(key) <= 0:
+            cache.delete(key)
+    except ValueError:
+        pass
+
+
+def heartbeat(room_id, user_id):
+    """Keep the connection entry alive; recreate it if it lapsed."""
+    if not cache.touch(_connection_key(room_id, user_id), CONNECTION_TTL):
+        cache.set(_connection_key(room_id, user_id), 1, CONNECTION_TTL)
+
+
+def active_user_ids(room_id, user_ids):
+    """Subset of ``user_ids`` with at least one open socket in the room."""
+    keys = {_connection_key(room_id, uid): uid for uid in user_ids}
+    return {keys[k] for k, count in cache.get_many(list(keys)).items() if count and count > 0}
+
+
+# ---------------------------------------------------------------------------
+# last_seen
+# ---------------------------------------------------------------------------
+
+def touch_last_seen(user_id):
+    """Stamp the user's live last_seen and queue it for the next coalesced flush."""
+    store = shared_cache()
+    try:
+        store.set(_last_seen_key(user_id), time.time(), LAST_SEEN_TTL)
+        if store.add(_queued_key(user_id), True, _flush_interval()):
+            store.add(_SEQ_KEY, 0, None)
+            store.set(_slot_key(store.incr(_SEQ_KEY)), user_id, LAST_SEEN_TTL)
+    except Exception as exc:
+        logger.debug(f"Chat last_seen not recorded for user {user_id}: {exc}")
+        return
+    maybe_flush_last_seen()
+
+
+def maybe_flush_last_seen():
+    """Flush unless another process already did within the flush window."""
+    try:
+        claimed = shared_cache().add(_FLUSH_CLAIM_KEY, True, _flush_interval())
+    except Exception as exc:
+        logger.debug(f"Chat last_seen flush skipped: {exc}")
+        return 0
+    return flush_last_seen() if claimed else 0
+
+
+def _claim_queued():
+    """User ids queued since the last flush; advances the read position."""
+    store = shared_cache()
+    seq = store.get(_SEQ_KEY) or 0
+    state = store.get(_FLUSH_STATE_KEY) or {'read': 0, 'gaps': {}}
+    if seq < state['read']:
+        # The counter was lost (cache restart); start over.
+        state = {'read': 0, 'gaps': {}}
+    slots = list(state['gaps']) + list(range(state['read'] + 1, seq + 1))
+    found = store.get_many([_slot_key(slot) for slot in slots])
+
+    # A slot can be numbered but not yet written by its touch; look again on
+    # the next flush, then give up on it.
+    gaps = {}
+    for slot in slots:
+        if _slot_key(slot) not in found and state['gaps'].get(slot, 0) < 1:
+            gaps[slot] = state['gaps'].get(slot, 0) + 1
+    store.set(_FLUSH_STATE_KEY, {'read': seq, 'gaps': gaps}, None)
+    store.delete_many(list(found))
+    return set(found.values())
+
+
+def flush_last_seen():
+    """Write queued last_seen stamps to UserProfile. Returns the number of users written."""
+    from accounts.models import UserProfile
+
+    try:
+        user_ids = _claim_queued()
+        if not user_ids:
+            return 0
+        # The newest cached stamp, not the one from when the user was queued.
+        latest = shared_cache().get_many([_last_seen_key(uid) for uid in user_ids])
+    except Exception as exc:
+        logger.warning(f"Chat last_seen queue unavailable: {exc}")
+        return 0
+    stamps = {uid: latest[_last_seen_key(uid)] for uid in user_ids if _last_seen_key(uid) in latest}
+    profiles = list(UserProfile.objects.filter(user_id__in=stamps))
+    for profile in profiles:
+        profile.last_seen = datetime.fromtimestamp(stamps[profile.user_id], tz=dt_timezone.utc)
+    try:
+        UserProfile.objects.bulk_update(profiles, ['last_seen'], batch_size=500)
+    except Exception as exc:
+        logger.warning(f"Flushing chat last_seen for {len(profiles)} user(s) failed: {exc}")
+        return 0
+    return len(profiles)
+
+
+def last_seen_map(user_ids):
+    """``{user_id: aware datetime}`` for users with a live last_seen in the cache."""
+    keys = {_last_seen_key(uid): uid for uid in user_ids}
+    try:
+        found = shared_cache().get_many(list(keys))
+    except Exception as exc:
+        logger.debug(f"Chat last_seen unavailable: {exc}")
+        return {}
+    return {keys[k]: datetime.fromtimestamp(ts, tz=dt_timezone.utc) for k, ts in found.items()}
+
+
+# ---------------------------------------------------------------------------
+# Room roster
+# ---------------------------------------------------------------------------
+
+def room_roster(room_id):
+    """
+    Members of a room as dicts with ``user_id``, ``display_name``,
+    ``show_last_seen`` and the persisted ``last_seen`` (aware datetime or
+    None), cached for ``ROSTER_TTL`` seconds. None if the room is gone.
+    """
+    roster = cache.get(_roster_key(room_id))
+    if roster is not None:
+        return roster
+
+    from .models import ChatRoom
+
+    try:
+        chat_room = ChatRoom.objects.get(id=room_id)
+    except ChatRoom.DoesNotExist:
+        return None
+    roster = []
+    for member in chat_room.members.select_related('profile'):
+        profile = getattr(member, 'profile', None)
+        roster.append({
+            'user_id': member.id,
+            'display_name': member.get_full_name() or member.username,
+            'show_last_seen': profile.show_last_seen if profile else True,
+            'last_seen': profile.last_seen if profile else None,
+        })
+    cache.set(_roster_key(room_id), roster, ROSTER_TTL)
+    return roster
+
+
+def invalidate_roster(room_id):
+    cache.delete(_roster_key(room_id))
+
+
+def invalidate_user_rosters(user_id):
+    """Drop the cached roster of every room ``user_id`` belongs to."""
+    from .models import ChatRoom
+
+    room_ids = ChatRoom.objects.filter(members__id=user_id).values_list('id', flat=True)
+    cache.delete_many([_roster_key(room_id) for room_id in room_ids])
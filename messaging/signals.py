@@ -1,8 +1,9 @@
 import logging
 
-from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed, post_delete
 from django.dispatch import receiver
 
+from . import presence
 from .models import ChatRoom, Notification
 
 logger = logging.getLogger(__name__)
@@ -28,3 +29,17 @@ def delete_notifications_for_deleted_room(sender, instance, **kwargs):
             'delete_notifications_for_deleted_room: cleanup failed for room %s',
             instance.id, exc_info=True,
         )
+
+
+@receiver(m2m_changed, sender=ChatRoom.members.through)
+def invalidate_roster_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Joins and leaves change who the cached room roster lists."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        presence.invalidate_roster(instance.pk)
+    elif action == 'pre_clear':
+        presence.invalidate_user_rosters(instance.pk)
+    else:
+        for room_id in pk_set or ():
+            presence.invalidate_roster(room_id)
@@ -0,0 +1,19 @@
+"""
+Celery tasks for the messaging app
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='messaging.flush_chat_last_seen')
+def flush_chat_last_seen():
+    """Write queued chat last_seen stamps to UserProfile (messaging/presence.py)."""
+    from messaging.presence import maybe_flush_last_seen
+
+    flushed = maybe_flush_last_seen()
+    if flushed:
+        logger.debug("Flushed chat last_seen for %d users", flushed)
+    return flushed
@@ -13,7 +13,7 @@ from kanban.models import Board, Task, Column
 from kanban.decorators import demo_write_guard
 from kanban.utils.demo_protection import get_user_boards
 from kanban.favorite_views import is_user_favorite as _is_fav
-from .models import ChatRoom, ChatMessage, TaskThreadComment, Notification, FileAttachment
+from .models import ChatRoom, ChatMessage, ChatReadState, TaskThreadComment, Notification, FileAttachment
 from .forms import ChatRoomForm, ChatMessageForm, TaskThreadCommentForm, MentionForm, ChatRoomFileForm
 
 
@@ -97,11 +97,11 @@ def messaging_hub(request):
     for room in user_rooms:
         board_room_map[room.board].append(room)
 
+    room_unread = ChatReadState.unread_counts(request.user, user_rooms)
+
     boards_with_unread = []
     for board, rooms in board_room_map.items():
-        unread_count = 0
-        for room in rooms:
-            unread_count += room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
+        unread_count = sum(room_unread.get(room.id, 0) for room in rooms)
         has_board_access = (
             BoardMembership.objects.filter(board=board, user=request.user).exists()
             or board.created_by == request.user
@@ -183,10 +183,11 @@ def chat_room_list(request, board_id):
     chat_rooms = board.chat_rooms.all()
 
     # Add unread count for each chat room
+    room_unread = ChatReadState.unread_counts(request.user, chat_rooms)
     chat_rooms_with_unread = []
     total_unread_in_board = 0
     for room in chat_rooms:
-        unread_count = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
+        unread_count = room_unread.get(room.id, 0)
         chat_rooms_with_unread.append({
             'room': room,
             'unread_count': unread_count
@@ -238,14 +239,20 @@ def chat_room_detail(request, room_id):
     # Users must manually click "Mark as Read" to indicate they've read a message.
     # This gives users control over read receipts for privacy.
     
+    # "Read by N/M" for the visible page from one watermark query.
+    read_counts = ChatReadState.read_counts(chat_room, [m.id for m in chat_messages])
+    for message in chat_messages:
+        message.read_count = read_counts[message.id]
+
     chat_messages = reversed(chat_messages)
     
     form = ChatMessageForm()
     
     # Get list of message IDs that current user has read
     # Include messages from the current user (they don't need to be marked as read)
+    last_read_id = ChatReadState.watermark(chat_room, request.user)
     read_message_ids = set(chat_room.messages.filter(
-        Q(read_by=request.user) | Q(author=request.user)
+        Q(id__lte=last_read_id) | Q(author=request.user)
     ).values_list('id', flat=True))
     
     board_columns = Column.objects.filter(board=chat_room.board).order_by('position')
@@ -704,7 +711,8 @@ def search_room_messages(request, room_id):
     Security:
     - room_id comes from the URL, never from the request body.
     - Membership is verified server-side before any query executes.
-    - All filtering uses ORM parameterized queries (no raw SQL).
+    - All filtering uses parameterized queries; the full-text index quotes
+      every search term (kanban/utils/search_index.match_expression).
     - Optional sender_id is validated as an integer AND checked to be
       an actual member of the room to prevent user enumeration.
     """
@@ -721,10 +729,7 @@ def search_room_messages(request, room_id):
     if len(q) < 3:
         return JsonResponse({'error': 'Query must be at least 3 characters'}, status=400)
 
-    qs = ChatMessage.objects.filter(
-        chat_room=chat_room,
-        content__icontains=q,
-    ).select_related('author').order_by('-created_at')
+    qs = ChatMessage.objects.filter(chat_room=chat_room).select_related('author')
 
     # Optional sender filter — validate id and confirm sender is a room member
     sender_id_raw = request.GET.get('sender_id', '').strip()
@@ -741,6 +746,13 @@ def search_room_messages(request, room_id):
             return JsonResponse({'error': 'Sender not in room'}, status=403)
         qs = qs.filter(author_id=sender_id)
 
+    # Ranked by the full-text index when available (kanban/utils/search_index.py),
+    # newest-first icontains matches otherwise.
+    from kanban.utils import search_index
+    messages = search_index.ranked_objects(qs, q, 'chat', limit=50, parent_id=chat_room.id)
+    if messages is None:
+        messages = qs.filter(content__icontains=q).order_by('-created_at')[:50]
+
     results = [
         {
             'id': msg.id,
@@ -748,8 +760,9 @@ def search_room_messages(request, room_id):
             'author_display_name': msg.author.get_full_name() or msg.author.username,
             'created_at': msg.created_at.isoformat(),
             'content': msg.content,
+            'snippet': getattr(msg, 'search_snippet', None),
         }
-        for msg in qs[:50]
+        for msg in messages
     ]
 
     return JsonResponse({'results': results, 'query': q})
@@ -840,12 +853,8 @@ def get_unread_message_count(request):
     ).distinct()
     
     # Count total unread messages
-    # Messages are unread if: the user hasn't marked them as read AND they're not from the user
-    unread_count = 0
-    for room in user_chat_rooms:
-        # Count messages from this room that the current user hasn't read
-        room_unread = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
-        unread_count += room_unread
+    # Messages are unread if: they're past the user's read watermark AND they're not from the user
+    unread_count = ChatReadState.total_unread(request.user, user_chat_rooms)
     
     return JsonResponse({'unread_count': unread_count})
 
@@ -860,21 +869,16 @@ def mark_chat_message_read(request, message_id):
     if message.chat_room.board and not request.user.has_perm('prizmai.view_board', message.chat_room.board):
         return JsonResponse({'error': 'Permission denied'}, status=403)
     
-    # Mark message as read by this user
-    message.read_by.add(request.user)
+    # Advance this user's read watermark to the message
+    chat_room = message.chat_room
+    ChatReadState.mark_read(chat_room, request.user, message.id)
     
     # Check if all members have read it
-    chat_room = message.chat_room
     total_members = chat_room.members.count()
-    read_count = message.read_by.count()
+    read_count = ChatReadState.read_counts(chat_room, [message.id])[message.id]
     
     all_read = read_count >= total_members
     
-    if all_read:
-        message.is_read = True
-        message.read_at = timezone.now()
-        message.save()
-    
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({
             'success': True,
@@ -910,11 +914,7 @@ def get_unread_message_count_v2(request):
             pass
     
     # Count messages the user hasn't marked as read
-    unread_count = 0
-    for room in user_chat_rooms:
-        # Count messages that the current user hasn't read
-        unread_msgs = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
-        unread_count += unread_msgs
+    unread_count = ChatReadState.total_unread(request.user, user_chat_rooms)
     
     return JsonResponse({'unread_count': unread_count})
 
@@ -929,13 +929,9 @@ def mark_room_messages_read(request, room_id):
     if chat_room.board and not request.user.has_perm('prizmai.view_board', chat_room.board):
         return JsonResponse({'error': 'Permission denied'}, status=403)
     
-    # Get all messages the user hasn't read
-    messages_to_mark = chat_room.messages.exclude(read_by=request.user)
-    
-    count = 0
-    for message in messages_to_mark:
-        message.read_by.add(request.user)
-        count += 1
+    # Count what the watermark jump covers, then move it to the newest message
+    count = ChatReadState.unread_counts(request.user, [chat_room]).get(chat_room.id, 0)
+    ChatReadState.mark_read(chat_room, request.user)
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({
@@ -1112,7 +1108,7 @@ def upload_chat_room_file(request, room_id):
             )
             
             # Auto-mark the uploader as having read the file upload message
-            system_message.read_by.add(request.user)
+            ChatReadState.mark_read(chat_room, request.user, system_message.id)
             
             # Create notifications for other room members
             for member in chat_room.members.all():
@@ -0,0 +1,142 @@
+"""
+bench_automation_rule_index.py — Task.save() cost on a board with many automation rules.
+
+Builds a throwaway board with --rules active AutomationRules spread over the
+save-time trigger types, then times Task.save() for three kinds of edit:
+
+* description — matches only task_description_updated rules
+* progress    — matches the progress/schedule triggers
+* no-op       — a field no trigger watches (title); should skip evaluation
+
+Each edit is measured twice:
+
+* cold — the rule index is invalidated before every save, so each save
+  re-reads both rule tables (what every save paid before the index existed)
+* warm — the cached per-board index from kanban/automation_index.py
+
+and reports mean ms per save plus the number of queries that touch the
+automation tables. Everything runs inside a transaction that is rolled back,
+so the configured database is left untouched. NOT part of the automated test
+suite.
+
+Usage
+-----
+    python scripts/bench_automation_rule_index.py
+    python scripts/bench_automation_rule_index.py --rules 200 --saves 100
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from kanban.automation_index import invalidate_board  # noqa: E402
+from kanban.automation_models import AutomationRule  # noqa: E402
+from kanban.models import Board, Column, Task  # noqa: E402
+
+# Mostly rules that a plain edit cannot satisfy, like a real busy board.
+TRIGGERS = [
+    ('task_moved_to_column', {'column_name': 'review'}),
+    ('task_priority_changed', {'priority': 'urgent'}),
+    ('task_assigned', {}),
+    ('task_completed', {}),
+    ('task_created', {}),
+    ('task_due_date_changed', {}),
+    ('risk_level_changed', {}),
+    ('task_description_updated', {}),
+    ('task_progress_changed', {'min_delta': 90}),
+    ('schedule_status_changed', {}),
+]
+
+AUTOMATION_TABLES = ('kanban_automationrule', 'kanban_boardautomation', 'kanban_automationlog')
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _setup(n_rules):
+    user = User.objects.create_user(username='bench_rule_index', password='x')
+    board = Board.objects.create(name='Rule index bench', created_by=user)
+    column = Column.objects.create(board=board, name='Backlog', position=0)
+    AutomationRule.objects.bulk_create([
+        AutomationRule(
+            board=board, created_by=user, name=f'Bench rule {n}',
+            trigger_type=TRIGGERS[n % len(TRIGGERS)][0],
+            trigger_config=TRIGGERS[n % len(TRIGGERS)][1],
+            condition_logic='AND',
+            # A condition that never holds keeps matching rules from running
+            # actions, so the numbers isolate trigger evaluation.
+            conditions=[{'attribute': 'priority', 'operator': 'is', 'value': '__never__'}],
+            actions=[], otherwise_actions=[], is_active=True,
+        )
+        for n in range(n_rules)
+    ])
+    invalidate_board(board.pk)
+    task = Task.objects.create(column=column, title='Bench task', created_by=user)
+    return board, task
+
+
+def _edits():
+    def description(task, i):
+        task.description = f'revision {i}'
+
+    def progress(task, i):
+        task.progress = (i * 7) % 100
+
+    def noop(task, i):
+        task.title = f'Bench task {i}'
+
+    return [('description', description), ('progress', progress), ('no-op', noop)]
+
+
+def _measure(board, task, edit, saves, cold):
+    elapsed = 0.0
+    rule_queries = 0
+    for i in range(saves):
+        task = Task.objects.get(pk=task.pk)
+        edit(task, i)
+        if cold:
+            invalidate_board(board.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            task.save()
+            elapsed += time.perf_counter() - t0
+        rule_queries += sum(
+            1 for q in ctx.captured_queries if any(t in q['sql'] for t in AUTOMATION_TABLES)
+        )
+    return elapsed * 1000 / saves, rule_queries / saves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rules', type=int, default=200)
+    parser.add_argument('--saves', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f'{args.rules} rules, {args.saves} saves per edit kind')
+    print(f"{'edit':>12} {'cold ms':>9} {'cold q':>7} {'warm ms':>9} {'warm q':>7}")
+    try:
+        with transaction.atomic():
+            board, task = _setup(args.rules)
+            for name, edit in _edits():
+                cold_ms, cold_q = _measure(board, task, edit, args.saves, cold=True)
+                warm_ms, warm_q = _measure(board, task, edit, args.saves, cold=False)
+                print(f'{name:>12} {cold_ms:9.2f} {cold_q:7.1f} {warm_ms:9.2f} {warm_q:7.1f}')
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+if __name__ == '__main__':
+    main()
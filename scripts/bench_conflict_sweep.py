@@ -0,0 +1,95 @@
+"""
+bench_conflict_sweep.py — Scaling benchmark for resource conflict detection.
+
+Compares the sweep-line overlap finder used by
+ConflictDetectionService.detect_resource_conflicts (iter_overlapping_pairs)
+against the pairwise O(n²) loop it replaced (which compared every pair, even
+after the user's conflict had been found), on synthetic task date
+ranges for a single assignee. Pure CPU: no database and no Django test runner,
+so it is NOT part of the automated test suite.
+
+Two numbers are reported per size:
+
+* first-pair — what detection actually needs (one conflict per overbooked user)
+* all-pairs  — full enumeration of every overlap, O(n log n + k)
+
+The pairwise baseline is skipped above --max-pairwise tasks because it becomes
+impractically slow.
+
+Usage
+-----
+    python scripts/bench_conflict_sweep.py
+    python scripts/bench_conflict_sweep.py --sizes 100 1000 10000 50000 --max-pairwise 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from kanban.utils.conflict_detection import iter_overlapping_pairs  # noqa: E402
+
+
+def _make_intervals(n, seed=7):
+    """Sparse schedule: mostly back-to-back tasks with occasional overlaps."""
+    rng = random.Random(seed)
+    day = date(2026, 1, 1)
+    intervals = []
+    for i in range(n):
+        start = day + timedelta(days=rng.randint(0, 3))
+        end = start + timedelta(days=rng.randint(1, 4))
+        intervals.append((start, end, i))
+        # ~5% of tasks start before the previous one ends.
+        day = start + timedelta(days=1) if rng.random() < 0.05 else end + timedelta(days=1)
+    rng.shuffle(intervals)
+    return intervals
+
+
+def _pairwise_all(intervals):
+    """The old detector's loop: every pair is compared, even after a hit."""
+    ordered = sorted(intervals, key=lambda t: t[0])
+    found = 0
+    for i, (s1, e1, _a) in enumerate(ordered):
+        for s2, e2, _b in ordered[i + 1:]:
+            if s1 <= e2 and s2 <= e1:
+                found += 1
+    return found
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 1000, 5000, 10000, 50000])
+    parser.add_argument('--max-pairwise', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'pairwise ms':>12} {'sweep first ms':>15} "
+          f"{'sweep all ms':>13} {'pairs':>8}")
+    for n in args.sizes:
+        intervals = _make_intervals(n)
+        if n <= args.max_pairwise:
+            _, pairwise_ms = _timed(_pairwise_all, intervals)
+            pairwise = f'{pairwise_ms:12.1f}'
+        else:
+            pairwise = f"{'skipped':>12}"
+        _, first_ms = _timed(lambda iv: next(iter_overlapping_pairs(iv), None), intervals)
+        pairs, all_ms = _timed(lambda iv: sum(1 for _ in iter_overlapping_pairs(iv)), intervals)
+        print(f'{n:>8} {pairwise} {first_ms:15.1f} {all_ms:13.1f} {pairs:>8}')
+
+
+if __name__ == '__main__':
+    main()
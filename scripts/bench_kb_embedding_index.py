@@ -0,0 +1,111 @@
+"""
+bench_kb_embedding_index.py — Recall and latency of KB semantic search.
+
+Compares the NumPy embedding index (ai_assistant/utils/embedding_index.py)
+against the previous hybrid-search path in
+TaskFlowChatbotService.get_knowledge_base_context, which scored at most 30
+embedding-only candidates (the most recent rows) with the pure-Python
+cosine_similarity loop. Uses synthetic 768-dim vectors with planted near
+neighbours; no database and no Gemini calls, so it is NOT part of the
+automated test suite.
+
+Reported per KB size:
+
+* recall@5 of each method against exact brute-force top-5
+* mean query latency of each method
+* time to build the index from JSON-style float lists
+
+Usage
+-----
+    python scripts/bench_kb_embedding_index.py
+    python scripts/bench_kb_embedding_index.py --sizes 100 1000 10000 --queries 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+import numpy as np  # noqa: E402
+
+from ai_assistant.utils.ai_clients import GEMINI_EMBEDDING_DIM, cosine_similarity  # noqa: E402
+from ai_assistant.utils.embedding_index import OrgEmbeddingIndex  # noqa: E402
+
+TOP_K = 5
+OLD_SAMPLE = 30
+
+
+def _corpus(n, queries, rng):
+    """Random rows, plus TOP_K planted neighbours per query spread through the corpus."""
+    data = rng.standard_normal((n, GEMINI_EMBEDDING_DIM)).astype(np.float32)
+    qs = rng.standard_normal((queries, GEMINI_EMBEDDING_DIM)).astype(np.float32)
+    for q in qs:
+        for _ in range(TOP_K):
+            row = rng.integers(n)
+            data[row] = q + 0.3 * rng.standard_normal(GEMINI_EMBEDDING_DIM)
+    rows = [(i + 1, 1, data[i].tolist()) for i in range(n)]
+    return rows, [q.tolist() for q in qs]
+
+
+def _exact_top(rows, query):
+    scored = sorted(rows, key=lambda r: -cosine_similarity(query, r[2]))
+    return {r[0] for r in scored[:TOP_K]}
+
+
+def _old_loop(rows, query):
+    # Rows are ordered -updated_at in the old query; the newest 30 were scored.
+    sample = rows[-OLD_SAMPLE:]
+    scored = sorted(sample, key=lambda r: -cosine_similarity(query, r[2]))
+    return {r[0] for r in scored[:TOP_K]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[80, 1000, 10000, 50000])
+    parser.add_argument('--queries', type=int, default=10)
+    args = parser.parse_args()
+    rng = np.random.default_rng(17)
+    random.seed(17)
+
+    print(f"{'rows':>7} {'build ms':>9} {'old recall':>11} {'old ms':>8} "
+          f"{'index recall':>13} {'index ms':>9} {'full loop ms':>13}")
+    for n in args.sizes:
+        rows, queries = _corpus(n, args.queries, rng)
+
+        t0 = time.perf_counter()
+        index = OrgEmbeddingIndex.from_rows(rows, GEMINI_EMBEDDING_DIM)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        old_hits = index_hits = 0
+        old_ms = index_ms = full_ms = 0.0
+        for query in queries:
+            t0 = time.perf_counter()
+            truth = _exact_top(rows, query)
+            full_ms += (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            old = _old_loop(rows, query)
+            old_ms += (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            found = {kb_id for kb_id, _ in index.search(query, k=TOP_K)}
+            index_ms += (time.perf_counter() - t0) * 1000
+
+            old_hits += len(old & truth)
+            index_hits += len(found & truth)
+
+        total = TOP_K * len(queries)
+        q = len(queries)
+        print(f'{n:>7} {build_ms:9.1f} {old_hits / total:11.2f} {old_ms / q:8.2f} '
+              f'{index_hits / total:13.2f} {index_ms / q:9.2f} {full_ms / q:13.1f}')
+
+
+if __name__ == '__main__':
+    main()
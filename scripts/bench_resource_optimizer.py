@@ -0,0 +1,105 @@
+"""
+bench_resource_optimizer.py — CPU cost of board-wide resource-leveling suggestions.
+
+Times the array half of ResourceLevelingService._optimized_board_suggestions
+on a synthetic board: the task × member skill matrix (skill_match_matrix)
+and the capped min-cost assignment (solve_slot_assignment).  As a
+reference it also times the per-pair calculate_skill_match scan the old
+greedy loop made (before even counting its per-pair workload query).
+Uses unsaved profiles and no database, so it is NOT part of the automated
+test suite.
+
+Reported per board size:
+
+* matrix ms    — skill_match_matrix for every task × member pair
+* solve ms     — solve_slot_assignment with giver caps
+* per-pair ms  — calculate_skill_match called once per pair
+* moves        — suggestions chosen by the solver
+
+Usage
+-----
+    python scripts/bench_resource_optimizer.py
+    python scripts/bench_resource_optimizer.py --tasks 500 2000 --members 40
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from kanban.resource_leveling import ResourceLevelingService  # noqa: E402
+from kanban.resource_leveling_models import UserPerformanceProfile  # noqa: E402
+from kanban.utils.assignment_optimizer import (  # noqa: E402
+    OPTIMIZER_AVAILABLE, np, skill_match_matrix, solve_slot_assignment,
+)
+
+VOCAB = [
+    'api', 'auth', 'login', 'react', 'dashboard', 'design', 'deploy', 'database',
+    'migration', 'test', 'report', 'billing', 'search', 'mobile', 'cache', 'email',
+    'invoice', 'onboarding', 'export', 'chart', 'security', 'docs', 'queue', 'sync',
+]
+
+
+def _board(n_tasks, n_members, seed=5):
+    rng = random.Random(seed)
+    texts = [' '.join(rng.sample(VOCAB, 6)) for _ in range(n_tasks)]
+    keywords = [
+        {w: rng.randint(1, 15) for w in rng.sample(VOCAB, 8)} for _ in range(n_members)
+    ]
+    owners = [rng.randrange(n_members) for _ in range(n_tasks)]
+    return texts, keywords, owners
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[200, 1000, 2000])
+    parser.add_argument('--members', type=int, default=40)
+    args = parser.parse_args()
+
+    if not OPTIMIZER_AVAILABLE:
+        sys.exit('numpy and scipy are required for this benchmark')
+
+    slots = ResourceLevelingService.MAX_SUGGESTIONS_PER_USER
+    print(f'{"tasks":>6} {"members":>7} {"matrix ms":>10} {"solve ms":>9} '
+          f'{"per-pair ms":>12} {"moves":>6}')
+    for n_tasks in args.tasks:
+        texts, keywords, owners = _board(n_tasks, args.members)
+
+        t0 = time.perf_counter()
+        skill = skill_match_matrix(texts, keywords)
+        matrix_ms = (time.perf_counter() - t0) * 1000
+
+        # Skewed load: the first quarter of members are givers.
+        givers = set(range(args.members // 4))
+        receivers = [m for m in range(args.members) if m not in givers]
+        task_giver = np.array([o if o in givers else -1 for o in owners])
+        row_member = np.repeat(receivers, slots)
+        gain = skill[:, row_member].T
+        feasible = (task_giver >= 0)[None, :] & (gain > 40)
+        caps = {g: math.ceil(n_tasks / args.members / 3) for g in givers}
+
+        t0 = time.perf_counter()
+        moves = solve_slot_assignment(gain, feasible, task_giver=task_giver, giver_caps=caps)
+        solve_ms = (time.perf_counter() - t0) * 1000
+
+        profiles = [UserPerformanceProfile(skill_keywords=kw) for kw in keywords]
+        t0 = time.perf_counter()
+        for text in texts:
+            for profile in profiles:
+                profile.calculate_skill_match(text)
+        pair_ms = (time.perf_counter() - t0) * 1000
+
+        print(f'{n_tasks:>6} {args.members:>7} {matrix_ms:10.1f} {solve_ms:9.1f} '
+              f'{pair_ms:12.1f} {len(moves):>6}')
+
+
+if __name__ == '__main__':
+    main()
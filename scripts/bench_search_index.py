@@ -0,0 +1,170 @@
+"""
+bench_search_index.py — FTS5 search index vs icontains scans.
+
+Builds a scratch SQLite database with the task, column and board tables the
+index reads, fills it with synthetic task titles/descriptions (Zipf-weighted
+pseudo-words) spread over --boards boards, and times:
+
+* icontains — the ``Q(title__icontains=q) | Q(description__icontains=q)``
+  query global_search ran (LIKE '%q%' on both columns, scoped to the user's
+  boards, newest 20)
+* fts       — kanban/utils/search_index.py: MATCH on prefix terms, scoped on
+  board ids, BM25-ordered top 20 with snippets
+* index build time, and the per-row INSERT overhead the sync triggers add
+
+Uses the stdlib sqlite3 module and the index's own DDL/trigger SQL; Django is
+set up only to import the module. NOT part of the automated test suite.
+
+Usage
+-----
+    python scripts/bench_search_index.py
+    python scripts/bench_search_index.py --rows 100000 1000000 --queries 20 --boards 500
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from kanban.utils import search_index  # noqa: E402
+
+VOCAB_SIZE = 30000
+SYLLABLES = [c + v for c in 'bcdfghklmnprstvz' for v in 'aeiou']
+SCHEMA = """
+CREATE TABLE kanban_board (id INTEGER PRIMARY KEY, workspace_id INTEGER);
+CREATE TABLE kanban_column (id INTEGER PRIMARY KEY, board_id INTEGER);
+CREATE TABLE kanban_task (
+    id INTEGER PRIMARY KEY, title TEXT, description TEXT, column_id INTEGER,
+    updated_at TEXT
+);
+CREATE INDEX kanban_task_column ON kanban_task(column_id);
+"""
+
+
+def _vocabulary(rng):
+    """Pseudo-words with Zipf weights, like word frequencies in real text."""
+    words = set()
+    while len(words) < VOCAB_SIZE:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    cum_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, VOCAB_SIZE + 1)))
+    return words, cum_weights
+
+
+def _text(rng, vocab, words):
+    return ' '.join(rng.choices(vocab[0], cum_weights=vocab[1], k=words))
+
+
+def _database(rows, boards, rng, vocab):
+    path = tempfile.mktemp(suffix='.sqlite3')
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    db.executemany('INSERT INTO kanban_board VALUES (?, ?)', [(b, b % 20) for b in range(1, boards + 1)])
+    db.executemany('INSERT INTO kanban_column VALUES (?, ?)', [(b, b) for b in range(1, boards + 1)])
+    db.executemany(
+        'INSERT INTO kanban_task VALUES (?, ?, ?, ?, ?)',
+        ((i, _text(rng, vocab, 5), _text(rng, vocab, 40), rng.randint(1, boards),
+          f'2026-01-01 00:{i % 60:02d}')
+         for i in range(1, rows + 1)),
+    )
+    db.commit()
+    return db, path
+
+
+def _install(db):
+    db.execute(search_index.CREATE_TABLE_SQL)
+    _, _, select, _ = search_index.SOURCES['task']
+    columns = ', '.join(('rowid',) + search_index.COLUMNS)
+    db.execute(f'INSERT INTO {search_index.TABLE}({columns}) {select}')
+    for statement in search_index._trigger_sql('task'):
+        db.execute(statement)
+    db.execute(f"INSERT INTO {search_index.TABLE}({search_index.TABLE}) VALUES ('optimize')")
+    db.commit()
+
+
+def _icontains(db, term, board_ids):
+    marks = ', '.join('?' * len(board_ids))
+    pattern = f'%{term}%'
+    return db.execute(
+        f"SELECT t.id FROM kanban_task t JOIN kanban_column c ON c.id = t.column_id "
+        f"WHERE c.board_id IN ({marks}) AND (t.title LIKE ? OR t.description LIKE ?) "
+        f"ORDER BY t.updated_at DESC LIMIT 20",
+        (*board_ids, pattern, pattern),
+    ).fetchall()
+
+
+def _fts(db, term, board_ids):
+    table = search_index.TABLE
+    marks = ', '.join('?' * len(board_ids))
+    return db.execute(
+        f"SELECT object_id, snippet({table}, -1, '<mark>', '</mark>', '…', "
+        f"{search_index.SNIPPET_TOKENS}) FROM {table} "
+        f"WHERE {table} MATCH ? AND kind = 'task' AND board_id IN ({marks}) "
+        f"ORDER BY bm25({table}, {search_index.TITLE_WEIGHT}, {search_index.BODY_WEIGHT}) LIMIT 20",
+        (search_index.match_expression(term), *board_ids),
+    ).fetchall()
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - t0) * 1000
+
+
+def _insert_ms(db, rng, vocab, start, count):
+    rows = [(i, _text(rng, vocab, 5), _text(rng, vocab, 40), '2026-01-02 00:00')
+            for i in range(start, start + count)]
+    t0 = time.perf_counter()
+    for row in rows:
+        db.execute('INSERT INTO kanban_task VALUES (?, ?, ?, 1, ?)', row)
+    db.commit()
+    return (time.perf_counter() - t0) * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--boards', type=int, default=200)
+    parser.add_argument('--scope', type=int, default=50, help='boards visible to the searching user')
+    parser.add_argument('--queries', type=int, default=10)
+    args = parser.parse_args()
+    rng = random.Random(23)
+    vocab = _vocabulary(rng)
+
+    print(f"{'rows':>8} {'build s':>8} {'icontains ms':>13} {'fts ms':>8} {'speedup':>8} "
+          f"{'insert us':>10} {'+trigger us':>12}")
+    for rows in args.rows:
+        db, path = _database(rows, args.boards, rng, vocab)
+        try:
+            plain_insert = _insert_ms(db, rng, vocab, rows + 1, 2000)
+            t0 = time.perf_counter()
+            _install(db)
+            build_s = time.perf_counter() - t0
+            indexed_insert = _insert_ms(db, rng, vocab, rows + 2001, 2000)
+
+            scope = rng.sample(range(1, args.boards + 1), min(args.scope, args.boards))
+            # Typical search terms: neither stop-word common nor hapax rare.
+            terms = [vocab[0][rng.randint(50, 5000)] for _ in range(args.queries)]
+            like_ms = sum(_timed(_icontains, db, term, scope) for term in terms) / len(terms)
+            fts_ms = sum(_timed(_fts, db, term, scope) for term in terms) / len(terms)
+            print(f'{rows:>8} {build_s:8.1f} {like_ms:13.1f} {fts_ms:8.1f} '
+                  f'{like_ms / fts_ms if fts_ms else 0:7.1f}x {plain_insert * 1000:10.0f} '
+                  f'{indexed_insert * 1000:12.0f}')
+        finally:
+            db.close()
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
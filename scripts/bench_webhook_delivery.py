@@ -0,0 +1,180 @@
+"""
+bench_webhook_delivery.py — webhook delivery load test against tools/webhook_receiver.py.
+
+Starts the bundled receiver in-process (quiet, with --latency-ms of simulated
+endpoint processing per request) and delivers --events events to each of
+--endpoints webhooks, timing:
+
+* per-request — what deliver_webhook did: one ``requests.post`` per delivery,
+  a new TCP connection each time, one endpoint after another
+* pooled      — webhooks/delivery.py ``send``: the per-host keep-alive session,
+  still one endpoint after another
+* concurrent  — ``send_all``: each event's endpoints in parallel on the pool,
+  as deliver_webhooks does
+* batched     — --batch events per batch window coalesced into one POST per
+  endpoint, as flush_webhook_batch does
+
+The receiver counts TCP connections, so the table also shows connection
+reuse. Only webhooks/delivery.py is exercised (no database); Django settings
+are configured in-process. NOT part of the automated test suite.
+
+Usage
+-----
+    python scripts/bench_webhook_delivery.py
+    python scripts/bench_webhook_delivery.py --events 500 --endpoints 8 --latency-ms 50 --batch 20
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+
+import requests
+from django.conf import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import webhook_receiver  # noqa: E402
+
+SECRET = 'bench-secret'
+
+
+class _CountingHandler(webhook_receiver.WebhookHandler):
+    connections = 0
+    latency = 0.0
+    _lock = threading.Lock()
+
+    def setup(self):
+        with self._lock:
+            _CountingHandler.connections += 1
+        super().setup()
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        super().do_POST()
+
+
+def _start_receiver(latency_ms):
+    webhook_receiver.QUIET = True
+    webhook_receiver.SECRET = SECRET
+    _CountingHandler.latency = latency_ms / 1000
+    server = webhook_receiver.ThreadingHTTPServer(('127.0.0.1', 0), _CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _request(delivery_ref, webhook_id, url, events):
+    from webhooks.delivery import OutboundRequest
+
+    if len(events) == 1:
+        payload = {'event': 'task.updated', 'delivery_id': events[0], 'data': _task_data(events[0])}
+    else:
+        payload = {'event': 'batch', 'events': [
+            {'event': 'task.updated', 'delivery_id': i, 'data': _task_data(i)} for i in events
+        ]}
+    body = json.dumps(payload).encode()
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return OutboundRequest(
+        webhook_id=webhook_id,
+        url=url,
+        body=body,
+        headers={
+            'Content-Type': 'application/json',
+            'X-Webhook-Event': payload['event'],
+            'X-Webhook-Delivery': str(delivery_ref),
+            'X-Webhook-Signature': f'sha256={signature}',
+        },
+        timeout=10,
+    )
+
+
+def _task_data(task_id):
+    return {
+        'id': task_id, 'title': f'Task {task_id}', 'description': 'x' * 600,
+        'board': {'id': 1, 'name': 'Load test'}, 'priority': 'medium', 'progress': 40,
+    }
+
+
+def _per_request(rounds):
+    for requests_ in rounds:
+        for request in requests_:
+            requests.post(request.url, data=request.body, headers=request.headers,
+                          timeout=request.timeout, allow_redirects=False)
+
+
+def _pooled(rounds):
+    from webhooks.delivery import send
+
+    for requests_ in rounds:
+        for request in requests_:
+            send(request)
+
+
+def _concurrent(rounds):
+    from webhooks.delivery import send_all
+
+    for requests_ in rounds:
+        send_all(requests_)
+
+
+def _rounds(base_url, events, endpoints, batch):
+    """Per round (one event, or one batch window), a request for each endpoint."""
+    rounds = []
+    for start in range(0, events, batch):
+        ids = list(range(start, min(start + batch, events)))
+        rounds.append([
+            _request(start, endpoint, f'{base_url}/hook/{endpoint}', ids)
+            for endpoint in range(1, endpoints + 1)
+        ])
+    return rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--endpoints', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=20,
+                        help='simulated endpoint processing time per request')
+    parser.add_argument('--batch', type=int, default=10, help='events per batch window')
+    args = parser.parse_args()
+
+    settings.configure(
+        WEBHOOK_ALLOW_PRIVATE_TARGETS=True,
+        WEBHOOK_DELIVERY_MAX_WORKERS=max(8, args.endpoints),
+        WEBHOOK_ENDPOINT_CONCURRENCY=4,
+    )
+    server = _start_receiver(args.latency_ms)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    deliveries = args.events * args.endpoints
+
+    single = _rounds(base_url, args.events, args.endpoints, 1)
+    modes = [
+        ('per-request', _per_request, single),
+        ('pooled', _pooled, single),
+        ('concurrent', _concurrent, single),
+        ('batched', _concurrent, _rounds(base_url, args.events, args.endpoints, args.batch)),
+    ]
+    print(f'{args.events} events x {args.endpoints} endpoints, '
+          f'{args.latency_ms:g} ms endpoint latency, batch {args.batch}')
+    print(f"{'mode':<12} {'wall s':>8} {'requests':>9} {'deliveries/s':>13} {'connections':>12}")
+    baseline = None
+    for name, run, rounds in modes:
+        _CountingHandler.connections = 0
+        t0 = time.perf_counter()
+        run(rounds)
+        wall = time.perf_counter() - t0
+        baseline = baseline or wall
+        print(f'{name:<12} {wall:8.2f} {sum(map(len, rounds)):9} {deliveries / wall:13.0f} '
+              f'{_CountingHandler.connections:12}  ({baseline / wall:.1f}x)')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+bench_whatif_monte_carlo.py — Cost of Monte Carlo recalcs for many shadow branches.
+
+Compares one batched ScheduleMonteCarlo.run over every branch (what
+run_branch_recalc_sync does now via WhatIfEngine.simulate_many) against
+calling it once per branch (what a per-branch WhatIfEngine.simulate loop
+would do), plus a pure-Python trial loop as the naive reference. Uses a
+synthetic 12-week velocity history; no database, so it is NOT part of the
+automated test suite.
+
+Reported per branch count:
+
+* batch ms       — one vectorized pass for all branches
+* per-branch ms  — one vectorized pass per branch
+* python ms      — per-branch, per-trial Python loop (skipped above --max-python)
+* max |ΔP50|     — largest P50 difference in days, batch vs per-branch
+                   (sampling noise only; both are seeded)
+
+Usage
+-----
+    python scripts/bench_whatif_monte_carlo.py
+    python scripts/bench_whatif_monte_carlo.py --branches 1 10 100 --trials 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from kanban.utils.schedule_monte_carlo import ScheduleMonteCarlo  # noqa: E402
+
+HISTORY = [3, 6, 4, 0, 7, 5, 5, 2, 8, 4, 6, 3]
+START = date(2026, 1, 5)
+
+
+def _scenarios(n, seed=11):
+    """Branches spread over plausible slider values on a 60-task board."""
+    rng = random.Random(seed)
+    scenarios = []
+    for _ in range(n):
+        team_ratio = rng.choice([4, 5, 6, 7, 8]) / 6
+        scenarios.append({
+            'remaining': max(60 + rng.randint(-20, 40), 0),
+            'velocity_factor': team_ratio ** 0.7,
+            'deadline': date(2026, 4, 1),
+        })
+    return scenarios
+
+
+def _python_loop(scenario, trials, seed=0):
+    """Per-trial week-by-week walk: the obvious non-vectorized implementation."""
+    rng = random.Random(seed)
+    days = []
+    for _ in range(trials):
+        done, weeks = 0.0, 0
+        while done < scenario['remaining'] and weeks < 260:
+            done += rng.choice(HISTORY) * scenario['velocity_factor']
+            weeks += 1
+        days.append(weeks * 7)
+    days.sort()
+    return days[len(days) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--branches', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--trials', type=int, default=5000)
+    parser.add_argument('--max-python', type=int, default=10)
+    args = parser.parse_args()
+
+    sampler = ScheduleMonteCarlo(HISTORY, trials=args.trials, seed=17)
+    if not sampler.available:
+        sys.exit('numpy is required for this benchmark')
+
+    print(f'{"branches":>8} {"trials":>7} {"batch ms":>9} {"per-branch ms":>14} '
+          f'{"python ms":>10} {"max |dP50| d":>13}')
+    for n in args.branches:
+        scenarios = _scenarios(n)
+
+        t0 = time.perf_counter()
+        batch = sampler.run(scenarios, start=START)
+        batch_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        single = [sampler.run([s], start=START)[0] for s in scenarios]
+        single_ms = (time.perf_counter() - t0) * 1000
+
+        python_ms = float('nan')
+        if n <= args.max_python:
+            t0 = time.perf_counter()
+            for s in scenarios:
+                _python_loop(s, args.trials)
+            python_ms = (time.perf_counter() - t0) * 1000
+
+        drift = max(
+            abs((date.fromisoformat(b['p50_date']) - date.fromisoformat(s['p50_date'])).days)
+            for b, s in zip(batch, single)
+            if b['p50_date'] and s['p50_date']
+        )
+        print(f'{n:>8} {args.trials:>7} {batch_ms:9.1f} {single_ms:14.1f} '
+              f'{python_ms:10.1f} {drift:13d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@
  *     containerSelector: '#ai-summary-result',
  *     loadingHTML: '<div class="ai-skeleton ai-skeleton--shimmer"></div>',
  *     onStatus(msg, pct)  { console.log(msg, pct); },
+ *     onDelta(text, soFar) { preview.textContent = soFar; },
  *     onResult(data)       { renderSummary(data); },
  *     onError(msg)         { alert(msg); },
  *   });
@@ -50,6 +51,9 @@
    * @param {string}   [opts.progressSelector]         – CSS selector for progress bar element.
    * @param {string}   [opts.loadingHTML]              – HTML snippet shown while waiting.
    * @param {Function} [opts.onStatus(message, pct)]   – Called on each status update.
+   * @param {Function} [opts.onDelta(text, soFar)]    – Called with each streamed text batch
+   *                                                    and the text received so far. The
+   *                                                    final result supersedes it.
    * @param {Function} [opts.onResult(data)]           – Called with the final AI result.
    * @param {Function} [opts.onError(message)]         – Called on failure.
    * @param {number}   [opts.timeoutMs=90000]          – WebSocket timeout (ms).
@@ -62,6 +66,7 @@
     var progressEl       = opts.progressSelector  ? document.querySelector(opts.progressSelector)  : null;
     var loadingHTML      = opts.loadingHTML || '<div class="ai-skeleton ai-skeleton--shimmer" style="height:120px"></div>';
     var onStatus         = opts.onStatus  || function () {};
+    var onDelta          = opts.onDelta   || function () {};
     var onResult         = opts.onResult  || function () {};
     var onError          = opts.onError   || function (msg) { console.error('[AI Progressive]', msg); };
     var timeoutMs        = opts.timeoutMs || 90000;
@@ -113,6 +118,7 @@
     function _connectWebSocket(taskId) {
       var ws = new WebSocket(_wsURL(taskId));
       var timer = null;
+      var streamed = '';
 
       if (timeoutMs > 0) {
         timer = setTimeout(function () {
@@ -129,6 +135,10 @@
           case 'ai_status_update':
             _handleStatus(msg.message, msg.progress || 0);
             break;
+          case 'ai_delta':
+            streamed += msg.text || '';
+            onDelta(msg.text || '', streamed);
+            break;
           case 'ai_result':
             clearTimeout(timer);
             ws.close();
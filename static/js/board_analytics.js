@@ -894,6 +894,14 @@ function generateAISummary(boardId) {
                     } else {
                         formatted = '<div class="alert alert-warning">Invalid summary format.</div>';
                     }
+                    if (data.stale) {
+                        // Last good summary; a background refresh is only
+                        // queued once per throttle window (data.refreshing).
+                        formatted = '<div class="small text-muted mb-2"><i class="fas fa-history me-1"></i>' +
+                            'Showing a summary from ' + new Date(data.generated_at).toLocaleString() +
+                            (data.refreshing ? ' &mdash; an updated one is being prepared.' : '.') +
+                            '</div>' + formatted;
+                    }
                     textElement.innerHTML = formatted;
                     var downloadBtn = document.getElementById('download-pdf-summary');
                     if (downloadBtn) downloadBtn.classList.remove('d-none');
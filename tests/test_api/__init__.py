@@ -422,3 +422,110 @@ class APITokenScopeTests(APITestCase):
             '/api/v1/tasks/', {'title': 'New', 'column': self.column.id}, format='json'
         )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class APITokenUsageTests(APITestCase):
+    """Cache-side token lookup, rate limiting and batched usage writes."""
+
+    def setUp(self):
+        from django.core.cache import cache, caches
+        from api.models import APIToken
+        cache.clear()
+        caches['ai_cache'].clear()
+        self.user = User.objects.create_user(
+            username='usageuser', email='usage@example.com', password='testpass123'
+        )
+        org = Organization.objects.create(
+            name='Usage Org', domain='usage.org', created_by=self.user
+        )
+        UserProfile.objects.create(user=self.user, organization=org)
+        self.token = APIToken.objects.create(
+            user=self.user, name='usage-token', rate_limit_per_hour=3
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token.token}')
+
+    def test_requests_are_counted_in_cache_and_flushed_in_batch(self):
+        from api.token_usage import flush_usage
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_200_OK)
+
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.request_count_current_hour, 0)
+        self.assertIsNone(self.token.last_used)
+
+        self.assertEqual(flush_usage(), 1)
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.request_count_current_hour, 2)
+        self.assertEqual(self.token.request_count_current_month, 2)
+        self.assertIsNotNone(self.token.last_used)
+        self.assertEqual(flush_usage(), 0)
+
+    def test_hourly_limit_rejects_without_counting(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        from api.token_usage import flush_usage
+        flush_usage()
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.request_count_current_hour, 3)
+
+    def test_sliding_window_weights_previous_hour(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from api.token_usage import consume
+        start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        for _ in range(3):
+            self.assertTrue(consume(self.token, now=start - timedelta(minutes=1)))
+        # 15 minutes in, 75% of the previous hour still overlaps the window.
+        self.assertFalse(consume(self.token, now=start + timedelta(minutes=15)))
+        # 45 minutes in, only 25% does: 3 * 0.25 + 1 is under the limit.
+        self.assertTrue(consume(self.token, now=start + timedelta(minutes=45)))
+
+    def test_revoked_token_is_rejected_despite_cache(self):
+        self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_200_OK)
+        self.token.is_active = False
+        self.token.save()
+        self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_counters_seed_from_db(self):
+        from django.utils import timezone
+        from datetime import timedelta
+        from api.token_usage import consume
+        self.token.request_count_current_hour = 3
+        self.token.rate_limit_reset_at = timezone.now() + timedelta(minutes=30)
+        self.token.save()
+        self.assertFalse(consume(self.token))
+
+    def test_deactivated_user_is_rejected_despite_cache(self):
+        self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_and_usage_live_in_shared_cache(self):
+        from django.core.cache import cache, caches
+        from api.token_usage import _last_used_key, _token_cache_key
+        self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_200_OK)
+
+        key = _token_cache_key(self.token.token)
+        self.assertIsNotNone(caches['ai_cache'].get(key))
+        self.assertIsNotNone(caches['ai_cache'].get(_last_used_key(self.token.pk)))
+        self.assertIsNone(cache.get(key))
+
+        self.token.is_active = False
+        self.token.save()
+        self.assertIsNone(caches['ai_cache'].get(key))
+
+    def test_without_shared_cache_counts_on_the_row(self):
+        from django.test import override_settings
+        from api.token_usage import flush_usage
+        with override_settings(API_TOKEN_USAGE_IN_CACHE=False):
+            for _ in range(2):
+                self.assertEqual(self.client.get('/api/v1/boards/').status_code, status.HTTP_200_OK)
+            self.assertEqual(flush_usage(), 0)
+
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.request_count_current_hour, 2)
+        self.assertIsNotNone(self.token.last_used)
@@ -274,7 +274,7 @@ class ChatMessageTests(TestCase):
         self.assertFalse(message.is_read)
         
         message.mark_as_read(self.user2)
-        self.assertEqual(message.read_by.count(), 1)
+        self.assertEqual(message.get_read_count(), 1)
     
     def test_get_unread_count(self):
         """Test getting unread count"""
@@ -0,0 +1,146 @@
+"""
+Tests for ephemeral chat presence (messaging/presence.py)
+==========================================================
+
+Typing and connection state live in the cache; last_seen is written to
+UserProfile in coalesced batches from a queue in the shared cache.
+"""
+
+from django.contrib.auth.models import User
+from unittest.mock import patch
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import Organization, UserProfile
+from messaging import presence
+
+
+@override_settings(CHAT_LAST_SEEN_FLUSH_INTERVAL=60)
+class PresenceStoreTests(TestCase):
+    """Test the cache-backed presence store"""
+
+    def setUp(self):
+        cache.clear()
+        caches['ai_cache'].clear()
+        self.user = User.objects.create_user(username='present', password='testpass123')
+        self.other = User.objects.create_user(username='absent', password='testpass123')
+        org = Organization.objects.create(name='Presence Org', domain='presence.org', created_by=self.user)
+        UserProfile.objects.create(user=self.user, organization=org)
+        UserProfile.objects.create(user=self.other, organization=org)
+
+    def test_typing_is_cache_only(self):
+        """Typing state is set and cleared without database writes"""
+        with self.assertNumQueries(0):
+            presence.set_typing(1, self.user.id)
+            self.assertTrue(cache.get(presence._typing_key(1, self.user.id)))
+            self.assertIsNone(cache.get(presence._typing_key(1, self.other.id)))
+            presence.clear_typing(1, self.user.id)
+            self.assertIsNone(cache.get(presence._typing_key(1, self.user.id)))
+
+    def test_connections_are_counted_per_socket(self):
+        """A user stays active until their last tab disconnects"""
+        presence.connect(1, self.user.id)
+        presence.connect(1, self.user.id)
+        presence.disconnect(1, self.user.id)
+        self.assertEqual(presence.active_user_ids(1, [self.user.id, self.other.id]), {self.user.id})
+
+        presence.disconnect(1, self.user.id)
+        self.assertEqual(presence.active_user_ids(1, [self.user.id]), set())
+
+    def test_last_seen_flushes_are_coalesced(self):
+        """Repeated heartbeats write UserProfile once per flush window"""
+        presence.touch_last_seen(self.user.id)
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertIsNotNone(profile.last_seen)
+
+        with self.assertNumQueries(0):
+            for _ in range(20):
+                presence.touch_last_seen(self.user.id)
+                presence.touch_last_seen(self.other.id)
+
+        self.assertIsNone(UserProfile.objects.get(user=self.other).last_seen)
+        self.assertIn(self.other.id, presence.last_seen_map([self.user.id, self.other.id]))
+
+        self.assertEqual(presence.flush_last_seen(), 1)
+        self.assertIsNotNone(UserProfile.objects.get(user=self.other).last_seen)
+
+    def test_every_queued_user_reaches_the_flush(self):
+        """Each touch queues under its own slot, so no user is overwritten"""
+        users = [User.objects.create_user(username=f'chatter{n}', password='x') for n in range(5)]
+        for user in users:
+            UserProfile.objects.create(user=user)
+        presence.touch_last_seen(self.user.id)   # opens (and uses) the flush window
+        for user in users:
+            presence.touch_last_seen(user.id)
+
+        self.assertEqual(presence.flush_last_seen(), 5)
+        self.assertEqual(presence.flush_last_seen(), 0)
+        self.assertFalse(UserProfile.objects.filter(user__in=users, last_seen__isnull=True).exists())
+
+    def test_slot_numbered_but_not_yet_written_is_picked_up_next_flush(self):
+        """A touch between incr() and set() is not lost to a concurrent flush"""
+        store = caches['ai_cache']
+        store.add(presence._SEQ_KEY, 0, None)
+        slot = store.incr(presence._SEQ_KEY)   # a touch in flight
+        self.assertEqual(presence.flush_last_seen(), 0)
+
+        store.set(presence._last_seen_key(self.other.id), 1_700_000_000, 60)
+        store.set(presence._slot_key(slot), self.other.id, 60)
+        self.assertEqual(presence.flush_last_seen(), 1)
+        self.assertIsNotNone(UserProfile.objects.get(user=self.other).last_seen)
+
+    def test_beat_task_flushes_once_per_window(self):
+        """The periodic task flushes queued users unless a request just did"""
+        from messaging.tasks import flush_chat_last_seen
+
+        presence.touch_last_seen(self.user.id)
+        presence.touch_last_seen(self.other.id)
+        self.assertEqual(flush_chat_last_seen(), 0)   # window claimed by the first touch
+
+        caches['ai_cache'].delete(presence._FLUSH_CLAIM_KEY)
+        self.assertEqual(flush_chat_last_seen(), 1)
+        self.assertIsNotNone(UserProfile.objects.get(user=self.other).last_seen)
+
+    def test_unreachable_shared_cache_does_not_break_heartbeats(self):
+        with patch.object(caches['ai_cache'], 'set', side_effect=ConnectionError('down')):
+            presence.touch_last_seen(self.user.id)
+        self.assertEqual(presence.flush_last_seen(), 0)
+
+
+class RosterInvalidationTests(TestCase):
+    """Cached room rosters follow membership and privacy changes"""
+
+    def setUp(self):
+        from kanban.models import Board
+        from messaging.models import ChatRoom
+
+        cache.clear()
+        self.user = User.objects.create_user(username='rostered', password='testpass123')
+        self.other = User.objects.create_user(username='joiner', password='testpass123')
+        org = Organization.objects.create(name='Roster Org', domain='roster.org', created_by=self.user)
+        UserProfile.objects.create(user=self.user, organization=org)
+        UserProfile.objects.create(user=self.other, organization=org)
+        board = Board.objects.create(name='Roster Board', organization=org, created_by=self.user)
+        self.room = ChatRoom.objects.create(board=board, name='General', created_by=self.user)
+        self.room.members.add(self.user)
+
+    def _roster_ids(self):
+        return [member['user_id'] for member in presence.room_roster(self.room.id)]
+
+    def test_membership_changes_rebuild_the_roster(self):
+        self.assertEqual(self._roster_ids(), [self.user.id])
+        self.room.members.add(self.other)
+        self.assertCountEqual(self._roster_ids(), [self.user.id, self.other.id])
+        self.other.chat_rooms.remove(self.room)
+        self.assertEqual(self._roster_ids(), [self.user.id])
+
+    def test_privacy_toggle_rebuilds_the_roster(self):
+        self.assertTrue(presence.room_roster(self.room.id)[0]['show_last_seen'])
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse('update_presence_preference'),
+            data='{"show_last_seen": false}', content_type='application/json',
+        )
+        self.assertFalse(presence.room_roster(self.room.id)[0]['show_last_seen'])
@@ -0,0 +1,88 @@
+"""
+Tests for chat read watermarks (messaging.models.ChatReadState)
+================================================================
+
+Unread counts, "read by N of M" and mark-all-read are driven by one
+last-read message id per (room, member) instead of per-message rows.
+"""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Organization
+from kanban.models import Board
+from messaging.models import ChatMessage, ChatReadState, ChatRoom
+
+
+class ChatReadStateTests(TestCase):
+    """Test read watermark bookkeeping"""
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='testpass123')
+        self.bob = User.objects.create_user(username='bob', password='testpass123')
+        self.carol = User.objects.create_user(username='carol', password='testpass123')
+        org = Organization.objects.create(name='Read Org', domain='read.org', created_by=self.alice)
+        board = Board.objects.create(name='Read Board', organization=org, created_by=self.alice)
+        self.room = ChatRoom.objects.create(board=board, name='General', created_by=self.alice)
+        self.room.members.add(self.alice, self.bob, self.carol)
+        self.other_room = ChatRoom.objects.create(board=board, name='Random', created_by=self.alice)
+        self.other_room.members.add(self.alice, self.bob)
+
+    def _post(self, room, author, count):
+        return [
+            ChatMessage.objects.create(chat_room=room, author=author, content=f'm{i}')
+            for i in range(count)
+        ]
+
+    def test_unread_counts_exclude_own_messages_and_read_ones(self):
+        """Unread counts are per room, skip the reader's own messages and honour the watermark"""
+        general = self._post(self.room, self.alice, 5)
+        self._post(self.room, self.bob, 2)
+        self._post(self.other_room, self.alice, 3)
+
+        ChatReadState.mark_read(self.room, self.bob, general[2].id)
+
+        with self.assertNumQueries(1):
+            counts = ChatReadState.unread_counts(self.bob, ChatRoom.objects.all())
+        self.assertEqual(counts, {self.room.id: 2, self.other_room.id: 3})
+        self.assertEqual(ChatReadState.total_unread(self.alice, ChatRoom.objects.all()), 2)
+
+    def test_watermark_never_moves_backwards(self):
+        """Marking an older message read keeps the newer watermark"""
+        messages = self._post(self.room, self.alice, 3)
+
+        ChatReadState.mark_read(self.room, self.bob, messages[2].id)
+        ChatReadState.mark_read(self.room, self.bob, messages[0].id)
+
+        self.assertEqual(ChatReadState.watermark(self.room, self.bob), messages[2].id)
+        self.assertEqual(ChatReadState.objects.filter(chat_room=self.room, user=self.bob).count(), 1)
+
+    def test_mark_all_read_is_constant_in_queries(self):
+        """Joining a room with many unread messages is a fixed number of queries"""
+        self._post(self.room, self.alice, 200)
+
+        with CaptureQueriesContext(connection) as ctx:
+            watermark = ChatReadState.mark_read(self.room, self.bob)
+
+        self.assertLessEqual(len(ctx.captured_queries), 10)
+        self.assertEqual(watermark, self.room.messages.latest('id').id)
+        self.assertEqual(ChatReadState.unread_counts(self.bob, [self.room]), {})
+
+    def test_read_counts_and_all_read_flag(self):
+        """'Read by N of M' follows the member watermarks; is_read flips when everyone passed it"""
+        first, second = self._post(self.room, self.alice, 2)
+        ChatReadState.mark_read(self.room, self.alice, second.id)
+        ChatReadState.mark_read(self.room, self.bob, second.id)
+        ChatReadState.mark_read(self.room, self.carol, first.id)
+
+        self.assertEqual(
+            ChatReadState.read_counts(self.room, [first.id, second.id]),
+            {first.id: 3, second.id: 2},
+        )
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertTrue(first.is_read)
+        self.assertFalse(second.is_read)
+        self.assertEqual(second.get_unread_count(), 1)
@@ -679,3 +679,217 @@ class WebhookFormJSONFieldTests(TestCase):
         self.assertTrue(form.is_valid(), form.errors)
         self.assertEqual(form.cleaned_data['custom_headers'], {})
         self.assertEqual(form.cleaned_data['provider_config'], {})
+
+
+class WebhookDeliveryEngineTests(TestCase):
+    """Subscription index, concurrent fan-out and batched delivery"""
+
+    def setUp(self):
+        from django.core.cache import cache, caches
+        cache.clear()
+        caches['ai_cache'].clear()
+        self.user = User.objects.create_user(
+            username='engineuser',
+            email='engine@example.com',
+            password='testpass123'
+        )
+        self.org = Organization.objects.create(
+            name='Engine Org',
+            domain='engine.org',
+            created_by=self.user
+        )
+        self.board = Board.objects.create(
+            name='Engine Board',
+            organization=self.org,
+            created_by=self.user
+        )
+        self.webhook = Webhook.objects.create(
+            name='Engine Webhook',
+            url='https://example.com/webhook',
+            board=self.board,
+            created_by=self.user,
+            events=['task.created']
+        )
+
+    def _ok(self):
+        from webhooks.delivery import Outcome
+        return Outcome(status_code=200, text='ok', response_time_ms=5)
+
+    def _pending(self, count):
+        return [
+            WebhookDelivery.objects.create(
+                webhook=self.webhook, event_type='task.created',
+                payload={'title': f'Task {i}'}, status='pending'
+            )
+            for i in range(count)
+        ]
+
+    def test_subscription_index_follows_webhook_changes(self):
+        from webhooks.subscriptions import active_subscribers, subscriber_ids
+        self.assertEqual(subscriber_ids(self.board.id, 'task.created'), (self.webhook.id,))
+        self.assertEqual(subscriber_ids(self.board.id, 'task.deleted'), ())
+
+        self.webhook.events = ['task.deleted']
+        self.webhook.save()
+        self.assertEqual(subscriber_ids(self.board.id, 'task.created'), ())
+        self.assertEqual(subscriber_ids(self.board.id, 'task.deleted'), (self.webhook.id,))
+
+        # Stats writes leave the index alone; inactive webhooks are filtered on load.
+        for _ in range(10):
+            self.webhook.increment_delivery_stats(success=False)
+        self.assertEqual(subscriber_ids(self.board.id, 'task.deleted'), (self.webhook.id,))
+        self.assertEqual(active_subscribers(self.board.id, 'task.deleted'), [])
+
+    def test_stale_subscription_index_never_adds_deliveries(self):
+        from webhooks.subscriptions import active_subscribers, subscriber_ids
+        self.assertEqual(subscriber_ids(self.board.id, 'task.created'), (self.webhook.id,))
+        # .update() skips the signal, so this process's copy is now behind.
+        Webhook.objects.filter(id=self.webhook.id).update(events=['task.deleted'])
+        self.assertEqual(subscriber_ids(self.board.id, 'task.created'), (self.webhook.id,))
+        self.assertEqual(active_subscribers(self.board.id, 'task.created'), [])
+
+    def test_subscription_index_rebuilds_without_shared_cache(self):
+        from webhooks.subscriptions import subscriber_ids
+        with patch('webhooks.subscriptions.get_version_token', return_value=None):
+            self.assertEqual(subscriber_ids(self.board.id, 'task.created'), (self.webhook.id,))
+            Webhook.objects.filter(id=self.webhook.id).update(events=['task.deleted'])
+            self.assertEqual(subscriber_ids(self.board.id, 'task.created'), ())
+
+    def test_event_fans_out_in_one_task(self):
+        other = Webhook.objects.create(
+            name='Other', url='https://example.org/hook', board=self.board,
+            created_by=self.user, events=['task.created']
+        )
+        column = Column.objects.create(name='To Do', board=self.board)
+        with patch('webhooks.signals.deliver_webhooks.delay') as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                Task.objects.create(title='Fan out', column=column, created_by=self.user)
+        mock_delay.assert_called_once()
+        ids = mock_delay.call_args[0][0]
+        self.assertEqual(
+            set(WebhookDelivery.objects.filter(id__in=ids).values_list('webhook_id', flat=True)),
+            {self.webhook.id, other.id}
+        )
+
+        from webhooks.tasks import deliver_webhooks
+        with patch('webhooks.tasks.send_all', return_value=[self._ok(), self._ok()]) as mock_send:
+            deliver_webhooks(ids)
+        self.assertEqual(len(mock_send.call_args[0][0]), 2)
+        self.assertEqual(
+            WebhookDelivery.objects.filter(id__in=ids, status='success').count(), 2
+        )
+
+    def test_send_error_fails_only_its_own_delivery(self):
+        from webhooks.delivery import Outcome
+        from webhooks.tasks import deliver_webhooks
+        other = Webhook.objects.create(
+            name='Other', url='https://example.org/hook', board=self.board,
+            created_by=self.user, events=['task.created']
+        )
+        [delivery] = self._pending(1)
+        broken = WebhookDelivery.objects.create(
+            webhook=other, event_type='task.created', payload={'title': 'x'}, status='pending'
+        )
+
+        def send(request):
+            if request.webhook_id == other.id:
+                raise RuntimeError('boom')
+            return Outcome(status_code=200, text='ok', response_time_ms=5)
+
+        with patch('webhooks.delivery.send', side_effect=send):
+            deliver_webhooks([delivery.id, broken.id])
+        delivery.refresh_from_db()
+        broken.refresh_from_db()
+        self.assertEqual(delivery.status, 'success')
+        self.assertEqual(broken.status, 'failed')
+        self.assertIn('RuntimeError', broken.error_message)
+
+    def test_stuck_deliveries_are_requeued(self):
+        from datetime import timedelta
+        from webhooks.tasks import requeue_stuck_deliveries
+        batched = Webhook.objects.create(
+            name='Batched', url='https://example.org/hook', board=self.board,
+            created_by=self.user, events=['task.created'], batch_window_seconds=5
+        )
+        old, recent = self._pending(2)
+        claimed = WebhookDelivery.objects.create(
+            webhook=batched, event_type='task.created', payload={'title': 'x'}, status='sent'
+        )
+        WebhookDelivery.objects.filter(id__in=[old.id, claimed.id]).update(
+            created_at=timezone.now() - timedelta(minutes=30)
+        )
+
+        with patch('webhooks.tasks.deliver_webhooks.delay') as mock_deliver, \
+                patch('webhooks.tasks.flush_webhook_batch.delay') as mock_flush:
+            result = requeue_stuck_deliveries()
+        mock_deliver.assert_called_once_with([old.id])
+        mock_flush.assert_called_once_with(batched.id)
+        self.assertEqual(result, {'requeued': 1, 'batches_flushed': 1, 'reclaimed': 1})
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, 'pending')
+
+    def test_batch_window_schedules_one_flush(self):
+        self.webhook.batch_window_seconds = 5
+        self.webhook.save()
+        column = Column.objects.create(name='To Do', board=self.board)
+        with patch('webhooks.tasks.flush_webhook_batch.apply_async') as mock_flush:
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(3):
+                    Task.objects.create(title=f'Burst {i}', column=column, created_by=self.user)
+        mock_flush.assert_called_once_with(args=[self.webhook.id], countdown=5)
+
+    def test_flush_sends_pending_deliveries_as_one_request(self):
+        from webhooks.tasks import flush_webhook_batch
+        self.webhook.secret = 'batch-secret'
+        self.webhook.save()
+        deliveries = self._pending(3)
+
+        with patch('webhooks.tasks.send', return_value=self._ok()) as mock_send:
+            result = flush_webhook_batch(self.webhook.id)
+        mock_send.assert_called_once()
+        request = mock_send.call_args[0][0]
+        body = json.loads(request.body)
+        self.assertEqual(body['event'], 'batch')
+        self.assertEqual([e['delivery_id'] for e in body['events']], [d.id for d in deliveries])
+        self.assertIn('X-Webhook-Signature', request.headers)
+        self.assertEqual(result['sent'], 3)
+
+        self.assertEqual(WebhookDelivery.objects.filter(status='success').count(), 3)
+        self.webhook.refresh_from_db()
+        self.assertEqual(self.webhook.total_deliveries, 3)
+        self.assertEqual(self.webhook.successful_deliveries, 3)
+        self.assertEqual(flush_webhook_batch(self.webhook.id), {'sent': 0})
+
+    def test_chat_provider_batch_joins_messages(self):
+        from webhooks.tasks import _build_batch_payloads
+        deliveries = self._pending(2)
+        [(batch, payload)] = _build_batch_payloads('slack', deliveries)
+        self.assertEqual(batch, deliveries)
+        self.assertEqual(payload['text'].count('\n'), 1)
+        self.assertIsNone(_build_batch_payloads('pagerduty', deliveries, {'routing_key': 'x'}))
+
+    def test_discord_batch_is_split_to_fit_message_limit(self):
+        from webhooks.tasks import flush_webhook_batch
+        self.webhook.url = 'https://discord.com/api/webhooks/1/abc'
+        self.webhook.save()
+        for i in range(30):
+            WebhookDelivery.objects.create(
+                webhook=self.webhook, event_type='task.created',
+                payload={'title': f'{i} ' + 'x' * 150}, status='pending'
+            )
+
+        with patch('webhooks.tasks.send', return_value=self._ok()) as mock_send:
+            result = flush_webhook_batch(self.webhook.id)
+        bodies = [json.loads(call.args[0].body) for call in mock_send.call_args_list]
+        self.assertGreater(len(bodies), 1)
+        self.assertTrue(all(len(body['content']) <= 2000 for body in bodies))
+        self.assertEqual(sum(body['content'].count('\n') + 1 for body in bodies), 30)
+        self.assertEqual(result['sent'], 30)
+        self.assertEqual(WebhookDelivery.objects.filter(status='success').count(), 30)
+
+    def test_sessions_are_shared_per_host_and_refuse_cookies(self):
+        from webhooks.delivery import session_for
+        session = session_for('https://hooks.example.com/a')
+        self.assertIs(session, session_for('https://hooks.example.com/b'))
+        self.assertIsNot(session, session_for('https://other.example.com/a'))
+        self.assertEqual(session.cookies.get_policy().allowed_domains(), ())
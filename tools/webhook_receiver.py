@@ -2,7 +2,7 @@
 """
 PrizmAI Webhook Test Receiver
 Run this alongside your Django dev server to catch and inspect webhook deliveries.
-Usage: python webhook_receiver.py [--port 9000] [--secret your-hmac-secret]
+Usage: python webhook_receiver.py [--port 9000] [--secret your-hmac-secret] [--quiet]
 """
 import argparse
 import hashlib
@@ -11,10 +11,11 @@ import json
 import sys
 import time
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from collections import deque
 
 SECRET = None
+QUIET = False
 deliveries = deque(maxlen=100)
 
 RESET  = "\033[0m"
@@ -39,9 +40,26 @@ def verify_signature(body: bytes, header_sig: str) -> tuple[bool, str]:
         return False, f"error: {e}"
 
 class WebhookHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so senders that pool connections can reuse them. Every
+    # response therefore carries a Content-Length.
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY a
+    # kept-alive connection waits on the client's delayed ACK between them.
+    disable_nagle_algorithm = True
+
     def log_message(self, *_):
         pass  # silence default access log
 
+    def _respond(self, status, body=b"", content_type=None, cors=False):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if cors:
+            self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_POST(self):
         content_length = int(self.headers.get("Content-Length", 0))
         body = self.rfile.read(content_length)
@@ -62,23 +80,17 @@ class WebhookHandler(BaseHTTPRequestHandler):
 
         # Decide response based on path (simulate failure endpoints)
         if self.path == "/fail":
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(b"Internal Server Error")
+            self._respond(500, b"Internal Server Error")
             status = 500
         elif self.path == "/timeout":
             time.sleep(15)
-            self.send_response(200)
-            self.end_headers()
+            self._respond(200)
             status = "timeout-sim"
         elif self.path == "/401":
-            self.send_response(401)
-            self.end_headers()
+            self._respond(401)
             status = 401
         else:
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b'{"ok": true}')
+            self._respond(200, b'{"ok": true}', "application/json")
             status = 200
 
         record = {
@@ -94,6 +106,8 @@ class WebhookHandler(BaseHTTPRequestHandler):
             "raw": body.decode(errors="replace"),
         }
         deliveries.append(record)
+        if QUIET:
+            return
 
         # ── pretty-print to terminal ──────────────────────────────────────────
         color = GREEN if sig_ok and parse_ok and status == 200 else RED
@@ -115,22 +129,18 @@ class WebhookHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         # /log — return all deliveries as JSON for the test dashboard
         if self.path == "/log":
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
-            self.wfile.write(json.dumps(list(deliveries), default=str).encode())
+            self._respond(200, json.dumps(list(deliveries), default=str).encode(),
+                          "application/json", cors=True)
         else:
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"PrizmAI webhook receiver running. POST here, GET /log for history.")
+            self._respond(200, b"PrizmAI webhook receiver running. POST here, GET /log for history.",
+                          "text/plain")
 
     def do_OPTIONS(self):
         self.send_response(204)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "POST, GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "*")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
 if __name__ == "__main__":
@@ -138,12 +148,15 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=9000)
     parser.add_argument("--secret", type=str, default=None,
                         help="HMAC secret to verify signatures (optional)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Don't print each delivery (for load tests)")
     args = parser.parse_args()
     SECRET = args.secret
+    QUIET = args.quiet
 
     # Bind to 127.0.0.1 so that "localhost" resolves without an IPv6 fallback
     # delay (~2 s on Windows when the server only has an IPv4 socket).
-    server = HTTPServer(("127.0.0.1", args.port), WebhookHandler)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), WebhookHandler)
     print(f"{BOLD}{GREEN}PrizmAI Webhook Receiver{RESET}")
     print(f"  Listening on  http://127.0.0.1:{args.port}/")
     print(f"  Failure sims  /fail (500) · /timeout · /401")
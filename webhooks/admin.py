@@ -28,7 +28,7 @@ class WebhookAdmin(admin.ModelAdmin):
             'fields': ('is_active', 'status')
         }),
         ('Delivery Settings', {
-            'fields': ('timeout_seconds', 'max_retries', 'retry_delay_seconds')
+            'fields': ('timeout_seconds', 'max_retries', 'retry_delay_seconds', 'batch_window_seconds')
         }),
         ('Security', {
             'fields': ('secret', 'custom_headers'),
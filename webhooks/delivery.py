@@ -0,0 +1,170 @@
+"""
+HTTP side of webhook delivery: pooled sessions and bounded concurrency.
+
+deliver_webhook used to call ``requests.post`` for every delivery — a fresh
+TCP (and TLS) connection per event, and one Celery task per subscribed
+endpoint sending one request at a time. This module keeps, per worker process:
+
+* one keep-alive ``requests.Session`` per (scheme, host, port), so
+  consecutive deliveries to the same host reuse connections;
+* a slot semaphore per webhook, so a burst never opens more than
+  WEBHOOK_ENDPOINT_CONCURRENCY requests to one endpoint at once;
+* a thread pool (``send_all``) that sends the deliveries of one event to
+  all of its endpoints concurrently.
+
+Only the network work happens here — SSRF validation (it resolves DNS) and
+the POST itself. Building the request and recording the outcome on the
+WebhookDelivery row stay in webhooks/tasks.py, in the calling thread, so the
+pool threads never touch the database.
+
+Sessions refuse cookies: several webhooks (from different boards and
+organisations) can share a host, and a cookie set for one must not be sent
+with another's deliveries.
+"""
+import http.cookiejar
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from requests.adapters import HTTPAdapter
+
+from webhooks.security import validate_webhook_target
+
+USER_AGENT = 'PrizmAI-Webhook/1.0'
+
+
+def _max_workers():
+    return getattr(settings, 'WEBHOOK_DELIVERY_MAX_WORKERS', 8)
+
+
+def _endpoint_concurrency():
+    return getattr(settings, 'WEBHOOK_ENDPOINT_CONCURRENCY', 4)
+
+
+@dataclass
+class OutboundRequest:
+    """One POST to send: the signed body and headers for a webhook."""
+    webhook_id: int
+    url: str
+    body: bytes
+    headers: dict
+    timeout: float
+
+
+@dataclass
+class Outcome:
+    """What happened to an OutboundRequest."""
+    status_code: int = None
+    text: str = ''
+    response_time_ms: int = None
+    # 'blocked' (SSRF guard), 'timeout' or 'error'; '' when a response came back.
+    error_kind: str = ''
+    error: str = ''
+    blocked_reasons: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+
+_lock = threading.Lock()
+_sessions = {}     # (scheme, host, port) -> requests.Session
+_slots = {}        # webhook_id -> BoundedSemaphore
+_executor = None
+
+
+def _host_key(url):
+    parsed = urlparse(url)
+    scheme = (parsed.scheme or '').lower()
+    return scheme, (parsed.hostname or '').lower(), parsed.port or (443 if scheme == 'https' else 80)
+
+
+def session_for(url):
+    """The shared keep-alive session for ``url``'s host."""
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            # Room for every pool thread, so a busy host never has
+            # connections discarded instead of returned to the pool.
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_max_workers(), max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+        return session
+
+
+def _slot(webhook_id):
+    with _lock:
+        slot = _slots.get(webhook_id)
+        if slot is None:
+            slot = _slots[webhook_id] = threading.BoundedSemaphore(_endpoint_concurrency())
+        return slot
+
+
+def send(request):
+    """POST ``request`` on its host's pooled session. Never raises."""
+    # SSRF guard: refuse to deliver to internal/private targets. Re-checked
+    # here (after DNS resolution) as the authoritative enforcement point.
+    try:
+        validate_webhook_target(request.url)
+    except ValidationError as exc:
+        return Outcome(error_kind='blocked', blocked_reasons=exc.messages)
+
+    with _slot(request.webhook_id):
+        start_time = time.time()
+        try:
+            response = session_for(request.url).post(
+                request.url,
+                data=request.body,
+                headers=request.headers,
+                timeout=request.timeout,
+                allow_redirects=False,
+            )
+        except requests.exceptions.Timeout:
+            return Outcome(error_kind='timeout')
+        except requests.exceptions.RequestException as e:
+            return Outcome(error_kind='error', error=str(e))
+        return Outcome(
+            status_code=response.status_code,
+            text=response.text,
+            response_time_ms=int((time.time() - start_time) * 1000),
+        )
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers(), thread_name_prefix='webhook-delivery',
+            )
+        return _executor
+
+
+def send_all(requests_):
+    """
+    Send ``requests_`` concurrently; outcomes in the same order.  ``send``
+    does not raise for network errors, but anything unexpected is returned
+    in place of that request's outcome instead of failing the others.
+    """
+    if len(requests_) <= 1:
+        futures = None
+    else:
+        pool = _pool()
+        futures = [pool.submit(send, request) for request in requests_]
+    outcomes = []
+    for i, request in enumerate(requests_):
+        try:
+            outcomes.append(futures[i].result() if futures else send(request))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
@@ -59,7 +59,7 @@ class WebhookForm(forms.ModelForm):
         fields = [
             'name', 'url', 'events', 'is_active',
             'timeout_seconds', 'max_retries', 'retry_delay_seconds',
-            'secret', 'provider', 'custom_headers', 'provider_config'
+            'batch_window_seconds', 'secret', 'provider', 'custom_headers', 'provider_config'
         ]
         widgets = {
             'name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., Slack Notifications'}),
@@ -67,6 +67,7 @@ class WebhookForm(forms.ModelForm):
             'timeout_seconds': forms.NumberInput(attrs={'class': 'form-control', 'min': 1, 'max': 60}),
             'max_retries': forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 10}),
             'retry_delay_seconds': forms.NumberInput(attrs={'class': 'form-control', 'min': 10, 'max': 3600}),
+            'batch_window_seconds': forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 60}),
             'secret': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Optional: Secret key for HMAC signatures'}),
         }
         help_texts = {
@@ -74,6 +75,7 @@ class WebhookForm(forms.ModelForm):
             'timeout_seconds': 'Request timeout in seconds (1-60)',
             'max_retries': 'Number of retry attempts on failure (0-10)',
             'retry_delay_seconds': 'Delay between retries in seconds',
+            'batch_window_seconds': 'Send events raised within this window as one batched request (0 = off, max 60)',
             'secret': 'Optional secret key for webhook signature verification',
         }
     
@@ -121,6 +123,12 @@ class WebhookForm(forms.ModelForm):
     def clean_provider_config(self):
         return self._clean_json_object('provider_config')
 
+    def clean_batch_window_seconds(self):
+        window = self.cleaned_data.get('batch_window_seconds') or 0
+        if not 0 <= window <= 60:
+            raise forms.ValidationError("Batch window must be between 0 and 60 seconds.")
+        return window
+
     def clean_url(self):
         """Reject SSRF-prone targets (internal/private addresses, bad schemes)."""
         url = self.cleaned_data.get('url')
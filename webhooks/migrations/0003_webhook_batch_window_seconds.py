@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0002_webhook_provider_webhook_provider_config'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_window_seconds',
+            field=models.IntegerField(blank=True, default=0, help_text='Coalesce events raised within this many seconds into one POST (0 = send each event on its own)'),
+        ),
+    ]
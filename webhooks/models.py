@@ -95,6 +95,12 @@ class Webhook(models.Model):
         default=60,
         help_text="Delay between retry attempts in seconds"
     )
+    batch_window_seconds = models.IntegerField(
+        default=0,
+        blank=True,
+        help_text="Coalesce events raised within this many seconds into one POST "
+                  "(0 = send each event on its own)"
+    )
     
     # Statistics
     total_deliveries = models.IntegerField(
@@ -153,25 +159,27 @@ class Webhook(models.Model):
     def __str__(self):
         return f"{self.name} ({self.board.name})"
     
-    def increment_delivery_stats(self, success=True, is_retry=False):
+    def increment_delivery_stats(self, success=True, is_retry=False, count=1):
         """Update delivery statistics.
 
         is_retry=True: the original attempt already counted; a success here converts
         the earlier failed_deliveries tick rather than adding a new total_deliveries tick.
+        count: deliveries sent in this one request (batched webhooks); it is still a
+        single attempt for consecutive_failures.
         """
         if not is_retry:
-            self.total_deliveries += 1
+            self.total_deliveries += count
 
         if success:
-            self.successful_deliveries += 1
+            self.successful_deliveries += count
             self.consecutive_failures = 0
             if is_retry:
                 # Convert the failure that was recorded on the first attempt.
-                self.failed_deliveries = max(0, self.failed_deliveries - 1)
+                self.failed_deliveries = max(0, self.failed_deliveries - count)
             if self.status == 'failed':
                 self.status = 'active'
         else:
-            self.failed_deliveries += 1
+            self.failed_deliveries += count
             self.consecutive_failures += 1
             # Disable webhook after 10 consecutive failures
             if self.consecutive_failures >= 10:
@@ -7,8 +7,9 @@ from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.db import transaction
 from kanban.models import Task, Comment, Board
-from webhooks.models import Webhook, WebhookDelivery, WebhookEvent
-from webhooks.tasks import deliver_webhook
+from webhooks.models import WebhookDelivery, WebhookEvent
+from webhooks.subscriptions import active_subscribers
+from webhooks.tasks import deliver_webhooks, schedule_batch
 import threading
 
 # Thread-local storage to track boards being cascade-deleted
@@ -35,17 +36,10 @@ def trigger_webhooks(event_type, board, object_id, data, triggered_by=None):
         triggered_by=triggered_by
     )
     
-    # Find all active webhooks for this board and event type
-    webhooks = Webhook.objects.filter(
-        board=board,
-        is_active=True,
-        status='active'
-    )
+    # Active webhooks subscribed to this event, via the (board, event) index
+    webhooks = active_subscribers(board.id, event_type)
     
-    # Filter by event type (workaround for SQLite not supporting contains on JSONField)
-    webhooks = [w for w in webhooks if event_type in w.events]
-    
-    triggered_count = 0
+    immediate_ids = []
     for webhook in webhooks:
         # Create delivery record
         delivery = WebhookDelivery.objects.create(
@@ -55,11 +49,18 @@ def trigger_webhooks(event_type, board, object_id, data, triggered_by=None):
             status='pending'
         )
         
-        # Queue delivery task only after the current transaction commits so the
+        # Queue delivery only after the current transaction commits so the
         # Celery worker is guaranteed to find the delivery record in the DB.
-        delivery_id = delivery.id
-        transaction.on_commit(lambda did=delivery_id: deliver_webhook.delay(did))
-        triggered_count += 1
+        # Batched webhooks collect pending deliveries until their window closes.
+        if webhook.batch_window_seconds > 0:
+            transaction.on_commit(lambda w=webhook: schedule_batch(w))
+        else:
+            immediate_ids.append(delivery.id)
+    
+    # One task sends the event to every other endpoint concurrently
+    if immediate_ids:
+        transaction.on_commit(lambda ids=immediate_ids: deliver_webhooks.delay(ids))
+    triggered_count = len(webhooks)
     
     # Update event log
     event.webhooks_triggered = triggered_count
@@ -144,15 +145,12 @@ def task_column_changed(sender, instance, **kwargs):
     Detect when a task is moved to a different column
     """
     if instance.pk:  # Only for existing tasks
-        try:
-            old_task = Task.objects.get(pk=instance.pk)
-            if old_task.column_id != instance.column_id:
-                # Task was moved to different column
-                # Store this info for post_save signal
-                instance._column_changed = True
-                instance._old_column = old_task.column
-        except Task.DoesNotExist:
-            pass
+        old_task = instance.get_previous_state()
+        if old_task is not None and old_task.column_id != instance.column_id:
+            # Task was moved to different column
+            # Store this info for post_save signal
+            instance._column_changed = True
+            instance._old_column = old_task.column
 
 
 @receiver(post_save, sender=Task)
@@ -201,14 +199,11 @@ def task_assignment_changed(sender, instance, **kwargs):
     Detect when a task is assigned to someone
     """
     if instance.pk:  # Only for existing tasks
-        try:
-            old_task = Task.objects.get(pk=instance.pk)
-            if old_task.assigned_to_id != instance.assigned_to_id:
-                # Task assignment changed
-                instance._assignment_changed = True
-                instance._old_assigned_to = old_task.assigned_to
-        except Task.DoesNotExist:
-            pass
+        old_task = instance.get_previous_state()
+        if old_task is not None and old_task.assigned_to_id != instance.assigned_to_id:
+            # Task assignment changed
+            instance._assignment_changed = True
+            instance._old_assigned_to = old_task.assigned_to
 
 
 @receiver(post_save, sender=Task)
@@ -0,0 +1,130 @@
+"""
+Per-board (event type -> webhook ids) subscription index for trigger_webhooks.
+
+Every Task save used to load all of the board's active webhooks and test
+``event_type in webhook.events`` in Python (SQLite can't filter JSONField
+containment). This module keeps, per process, each board's event type ->
+webhook id map, so an event nobody subscribes to costs no webhook query and
+one that does costs a primary-key lookup of just its subscribers.
+
+The index covers every webhook on the board, active or not: is_active and
+status change with every delivery outcome (increment_delivery_stats), so they
+are filtered when the subscribers are loaded instead of invalidating the
+index each time. Only writes that can change ``events`` or ``board`` — and
+webhook creation and deletion — invalidate. The loaded subscribers are also
+re-checked against ``events`` and ``board``, so a copy that is briefly behind
+can only cost a wasted lookup, never a delivery the webhook didn't ask for.
+
+Versioning works as in kanban/automation_index.py: a per-board version token
+in the shared cache (kanban_board.cache.shared_cache), replaced on relevant
+writes (immediately and again on commit); a process rebuilds its copy when
+the token no longer matches, and on every lookup while the shared cache is
+unreachable.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from kanban_board.cache import bump_version_token, get_version_token
+
+VERSION_KEY = 'webhook_subscription_index_v:{board_id}'
+
+# Webhook fields the index is built from.
+INDEXED_FIELDS = frozenset({'events', 'board', 'board_id'})
+
+_lock = threading.Lock()
+_indexes = OrderedDict()   # board_id -> (version, {event_type: (webhook_id, ...)})
+
+
+def _max_boards():
+    return getattr(settings, 'WEBHOOK_SUBSCRIPTION_INDEX_MAX_BOARDS', 512)
+
+
+def _current_version(board_id):
+    return get_version_token(VERSION_KEY.format(board_id=board_id))
+
+
+def _build(board_id):
+    from webhooks.models import Webhook
+
+    index = {}
+    for webhook_id, events in Webhook.objects.filter(board_id=board_id).values_list('id', 'events'):
+        for event_type in events or ():
+            index.setdefault(event_type, []).append(webhook_id)
+    return {event_type: tuple(ids) for event_type, ids in index.items()}
+
+
+def subscriber_ids(board_id, event_type):
+    """Ids of the board's webhooks (active or not) subscribed to ``event_type``."""
+    version = _current_version(board_id)
+    with _lock:
+        entry = _indexes.get(board_id)
+        if entry is not None and version is not None and entry[0] == version:
+            _indexes.move_to_end(board_id)
+            return entry[1].get(event_type, ())
+
+    index = _build(board_id)
+    if version is None:
+        return index.get(event_type, ())
+    with _lock:
+        _indexes[board_id] = (version, index)
+        _indexes.move_to_end(board_id)
+        while len(_indexes) > _max_boards():
+            _indexes.popitem(last=False)
+    return index.get(event_type, ())
+
+
+def active_subscribers(board_id, event_type):
+    """The board's active webhooks subscribed to ``event_type``."""
+    from webhooks.models import Webhook
+
+    ids = subscriber_ids(board_id, event_type)
+    if not ids:
+        return []
+    webhooks = Webhook.objects.filter(
+        id__in=ids, board_id=board_id, is_active=True, status='active',
+    )
+    return [webhook for webhook in webhooks if event_type in (webhook.events or ())]
+
+
+def invalidate_board(board_id):
+    """Drop every process's cached index for ``board_id``."""
+    if not board_id:
+        return
+
+    def _bump():
+        bump_version_token(VERSION_KEY.format(board_id=board_id))
+        with _lock:
+            _indexes.pop(board_id, None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+@receiver(post_save, sender='webhooks.Webhook')
+def invalidate_on_webhook_save(sender, instance, created, update_fields=None, **kwargs):
+    # Stats and status writes name their update_fields and never touch the
+    # indexed ones. A webhook moved to another board is only dropped from the
+    # old board's copy on its next rebuild — harmless, since
+    # active_subscribers re-checks board_id.
+    if not created and update_fields is not None and not (INDEXED_FIELDS & set(update_fields)):
+        return
+    invalidate_board(instance.board_id)
+
+
+@receiver(post_delete, sender='webhooks.Webhook')
+def invalidate_on_webhook_delete(sender, instance, **kwargs):
+    invalidate_board(instance.board_id)
+
+
+@receiver(post_save, sender='kanban.Board')
+@receiver(post_delete, sender='kanban.Board')
+def invalidate_on_board_change(sender, instance, created=False, **kwargs):
+    # Only creation and deletion matter: they guard against a recycled board
+    # id picking up a dead board's cached subscriptions.
+    if created or kwargs.get('signal') is post_delete:
+        invalidate_board(instance.pk)
@@ -2,18 +2,17 @@
 Celery Tasks for Webhook Delivery
 Uses existing Celery infrastructure for async webhook processing
 """
-import requests
-import time
 import hmac
 import hashlib
 import json
 from datetime import timedelta
 from urllib.parse import urlparse
-from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from celery import shared_task
-from webhooks.models import Webhook, WebhookDelivery
-from webhooks.security import validate_webhook_target
+from webhooks.delivery import USER_AGENT, OutboundRequest, send, send_all
+from webhooks.models import WebhookDelivery
 
 
 # Host substring -> provider name, used when a webhook has no explicit provider set.
@@ -124,6 +123,204 @@ def _build_provider_payload(provider, event_type, data, cfg=None):
     return None
 
 
+# Cache lock marking a batched webhook's flush as already scheduled.
+BATCH_LOCK_KEY = 'webhook_batch_scheduled:{webhook_id}'
+# Cap on events coalesced into one batched POST; the rest go in the next one.
+MAX_BATCH_EVENTS = 100
+
+# Providers whose per-event body is a single chat message: the key holding the
+# text, and the longest message (in characters) the provider accepts. A batch
+# joins the messages, split over as many POSTs as that limit needs.
+_BATCH_TEXT_KEYS = {
+    'slack': ('text', 40000),
+    'googlechat': ('text', 4096),
+    'discord': ('content', 2000),
+    # Teams caps the whole card at 28 KB; leave room for multi-byte emoji.
+    'teams': ('text', 20000),
+}
+
+
+def _envelope(delivery):
+    """The standard PrizmAI envelope for one delivery."""
+    return {
+        'event': delivery.event_type,
+        'timestamp': delivery.created_at.isoformat(),
+        'delivery_id': delivery.id,
+        'data': delivery.payload
+    }
+
+
+def _build_batch_payloads(provider, deliveries, cfg=None):
+    """
+    Bodies for several deliveries to the same webhook, as ``(deliveries,
+    payload)`` pairs in send order, or None when the provider's format can't
+    carry more than one event (github, pagerduty).
+
+    The standard envelope carries the whole batch in one body; chat messages
+    are joined into as few bodies as the provider's length limit allows.
+    """
+    formatted = [
+        _build_provider_payload(provider, d.event_type, d.payload, cfg) for d in deliveries
+    ]
+    if all(body is None for body in formatted):
+        return [(deliveries, {
+            'event': 'batch',
+            'timestamp': timezone.now().isoformat(),
+            'events': [_envelope(d) for d in deliveries],
+        })]
+    if provider not in _BATCH_TEXT_KEYS:
+        return None
+    text_key, limit = _BATCH_TEXT_KEYS[provider]
+
+    groups, length = [[]], -1
+    for delivery, body in zip(deliveries, formatted):
+        added = len(body[text_key]) + 1   # the message plus its joining newline
+        if groups[-1] and length + added > limit:
+            groups.append([])
+            length = -1
+        groups[-1].append((delivery, body))
+        length += added
+
+    batches = []
+    for group in groups:
+        payload = group[0][1]
+        payload[text_key] = '\n'.join(body[text_key] for _, body in group)
+        batches.append(([delivery for delivery, _ in group], payload))
+    return batches
+
+
+def _signed_request(webhook, event_type, delivery_ref, payload):
+    """Headers, signature and body for a POST of ``payload`` to ``webhook``."""
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': USER_AGENT,
+        'X-Webhook-Event': event_type,
+        'X-Webhook-Delivery': delivery_ref,
+    }
+
+    # Add custom headers
+    if webhook.custom_headers:
+        headers.update(webhook.custom_headers)
+
+    # Serialise the payload exactly once so the bytes we sign are the bytes
+    # we send (avoids any divergence from requests' own JSON serialisation).
+    payload_bytes = json.dumps(payload).encode('utf-8')
+
+    # Add HMAC signature if secret is set
+    if webhook.secret:
+        signature = hmac.new(
+            webhook.secret.encode('utf-8'),
+            payload_bytes,
+            hashlib.sha256
+        ).hexdigest()
+        headers['X-Webhook-Signature'] = f'sha256={signature}'
+
+    return OutboundRequest(
+        webhook_id=webhook.id,
+        url=webhook.url,
+        body=payload_bytes,
+        headers=headers,
+        timeout=webhook.timeout_seconds,
+    )
+
+
+def _prepare(delivery):
+    """
+    The signed request for one delivery — formatted for the target provider
+    when we have a dedicated builder; otherwise the standard PrizmAI envelope.
+    """
+    webhook = delivery.webhook
+    provider = _resolve_provider(webhook)
+    payload = _build_provider_payload(
+        provider, delivery.event_type, delivery.payload, webhook.provider_config
+    )
+    if payload is None:
+        payload = _envelope(delivery)
+    return _signed_request(webhook, delivery.event_type, str(delivery.id), payload)
+
+
+def _fail_inactive(delivery):
+    """Mark the delivery failed if its webhook was deactivated since it was queued."""
+    webhook = delivery.webhook
+    if webhook.is_active and webhook.status != 'disabled':
+        return None
+    delivery.status = 'failed'
+    delivery.error_message = 'Webhook is inactive or disabled'
+    delivery.save()
+    return {'error': 'Webhook inactive'}
+
+
+def _fail_internal(delivery, exc):
+    # Any unexpected error (bad custom_headers type, HMAC failure,
+    # non-serialisable payload, etc.) must not leave the delivery in Pending.
+    delivery.status = 'failed'
+    delivery.error_message = f'Internal error: {type(exc).__name__}: {str(exc)[:400]}'
+    try:
+        delivery.save()
+    except Exception:
+        pass
+
+
+def _record(webhook, deliveries, outcome, is_retry=False):
+    """
+    Write ``outcome`` onto the deliveries sent in one request — a single
+    delivery, or every delivery in a batch — update the webhook's stats once,
+    and queue retries for eligible failures.
+    """
+    if outcome.error_kind == 'blocked':
+        # A blocked target is a permanent config error, so it is not retried.
+        error_message = ('Blocked target: ' + '; '.join(outcome.blocked_reasons))[:500]
+        result = {'error': 'blocked_target'}
+    elif outcome.error_kind == 'timeout':
+        error_message = f'Request timeout after {webhook.timeout_seconds}s'
+        result = {'error': 'timeout'}
+    elif outcome.error_kind:
+        error_message = outcome.error[:500]
+        result = {'error': outcome.error}
+    else:
+        error_message = '' if outcome.ok else f'HTTP {outcome.status_code}: {outcome.text[:200]}'
+        result = {
+            'success': outcome.ok,
+            'status_code': outcome.status_code,
+            'response_time_ms': outcome.response_time_ms
+        }
+
+    fields = ['status', 'error_message']
+    for delivery in deliveries:
+        delivery.status = 'success' if outcome.ok else 'failed'
+        delivery.error_message = error_message
+        if outcome.status_code is not None:
+            delivery.response_status_code = outcome.status_code
+            delivery.response_body = outcome.text[:1000]
+            delivery.response_time_ms = outcome.response_time_ms
+            delivery.delivered_at = timezone.now()
+    if outcome.status_code is not None:
+        fields += ['response_status_code', 'response_body', 'response_time_ms', 'delivered_at']
+    if len(deliveries) == 1:
+        deliveries[0].save()
+    else:
+        WebhookDelivery.objects.bulk_update(deliveries, fields)
+
+    if outcome.ok:
+        # On a retry, convert the earlier failure tick into a success: total
+        # stays the same.
+        webhook.increment_delivery_stats(success=True, is_retry=is_retry, count=len(deliveries))
+    elif not is_retry:
+        # Only count the first attempt; retries don't add to failed_deliveries.
+        webhook.increment_delivery_stats(success=False, count=len(deliveries))
+
+    if not outcome.ok and outcome.error_kind != 'blocked':
+        # Retry if eligible. Batched deliveries are retried one by one.
+        for delivery in deliveries:
+            if delivery.is_retriable():
+                retry_delivery.apply_async(
+                    args=[delivery.id],
+                    countdown=webhook.retry_delay_seconds
+                )
+
+    return result
+
+
 @shared_task(bind=True, max_retries=3)
 def deliver_webhook(self, delivery_id, is_retry=False):
     """
@@ -138,164 +335,171 @@ def deliver_webhook(self, delivery_id, is_retry=False):
     except WebhookDelivery.DoesNotExist:
         return {'error': 'Delivery not found'}
 
-    webhook = delivery.webhook
-
     # Check if webhook is still active
-    if not webhook.is_active or webhook.status == 'disabled':
-        delivery.status = 'failed'
-        delivery.error_message = 'Webhook is inactive or disabled'
-        delivery.save()
-        return {'error': 'Webhook inactive'}
+    inactive = _fail_inactive(delivery)
+    if inactive:
+        return inactive
 
     try:
-        # Prepare payload — format it for the target provider when we have a
-        # dedicated builder; otherwise send the standard PrizmAI envelope.
-        provider = _resolve_provider(webhook)
-        formatted = _build_provider_payload(
-            provider, delivery.event_type, delivery.payload, webhook.provider_config
-        )
-        if formatted is not None:
-            payload = formatted
-        else:
-            payload = {
-                'event': delivery.event_type,
-                'timestamp': delivery.created_at.isoformat(),
-                'delivery_id': delivery.id,
-                'data': delivery.payload
-            }
-
-        # Prepare headers
-        headers = {
-            'Content-Type': 'application/json',
-            'User-Agent': 'PrizmAI-Webhook/1.0',
-            'X-Webhook-Event': delivery.event_type,
-            'X-Webhook-Delivery': str(delivery.id),
-        }
+        outcome = send(_prepare(delivery))
+        return _record(delivery.webhook, [delivery], outcome, is_retry=is_retry)
+    except Exception as e:
+        _fail_internal(delivery, e)
+        raise  # Re-raise so Celery marks the task as FAILURE and logs the traceback
 
-        # Add custom headers
-        if webhook.custom_headers:
-            headers.update(webhook.custom_headers)
-
-        # Serialise the payload exactly once so the bytes we sign are the bytes
-        # we send (avoids any divergence from requests' own JSON serialisation).
-        payload_str = json.dumps(payload)
-        payload_bytes = payload_str.encode('utf-8')
-
-        # Add HMAC signature if secret is set
-        if webhook.secret:
-            signature = hmac.new(
-                webhook.secret.encode('utf-8'),
-                payload_bytes,
-                hashlib.sha256
-            ).hexdigest()
-            headers['X-Webhook-Signature'] = f'sha256={signature}'
-
-        # SSRF guard: refuse to deliver to internal/private targets. Re-checked
-        # here (after DNS resolution) as the authoritative enforcement point.
-        # A blocked target is a permanent config error, so it is not retried.
+
+def _deliver_many(deliveries):
+    """Send each delivery on its own, concurrently across endpoints."""
+    sendable, outbound, results = [], [], []
+    for delivery in deliveries:
+        inactive = _fail_inactive(delivery)
+        if inactive:
+            results.append(inactive)
+            continue
         try:
-            validate_webhook_target(webhook.url)
-        except ValidationError as exc:
-            delivery.status = 'failed'
-            delivery.error_message = ('Blocked target: ' + '; '.join(exc.messages))[:500]
-            delivery.save()
-            if not is_retry:
-                webhook.increment_delivery_stats(success=False)
-            return {'error': 'blocked_target'}
-
-        # Attempt delivery
-        start_time = time.time()
+            outbound.append(_prepare(delivery))
+        except Exception as e:
+            _fail_internal(delivery, e)
+            results.append({'error': f'Internal error: {type(e).__name__}'})
+            continue
+        sendable.append(delivery)
+
+    for delivery, outcome in zip(sendable, send_all(outbound)):
+        if isinstance(outcome, Exception):
+            _fail_internal(delivery, outcome)
+            results.append({'error': f'Internal error: {type(outcome).__name__}'})
+            continue
         try:
-            response = requests.post(
-                webhook.url,
-                data=payload_bytes,
-                headers=headers,
-                timeout=webhook.timeout_seconds,
-                allow_redirects=False,
-            )
+            results.append(_record(delivery.webhook, [delivery], outcome))
+        except Exception as e:
+            _fail_internal(delivery, e)
+            results.append({'error': f'Internal error: {type(e).__name__}'})
+    return results
 
-            response_time_ms = int((time.time() - start_time) * 1000)
 
-            # Update delivery record
-            delivery.response_status_code = response.status_code
-            delivery.response_body = response.text[:1000]
-            delivery.response_time_ms = response_time_ms
-            delivery.delivered_at = timezone.now()
+@shared_task
+def deliver_webhooks(delivery_ids):
+    """
+    Deliver one event to all of its subscribed webhooks
 
-            # Consider 2xx status codes as success
-            if 200 <= response.status_code < 300:
-                delivery.status = 'success'
-                if is_retry:
-                    # Convert the earlier failure tick into a success: total stays the same.
-                    webhook.increment_delivery_stats(success=True, is_retry=True)
-                else:
-                    webhook.increment_delivery_stats(success=True)
-            else:
-                delivery.status = 'failed'
-                delivery.error_message = f'HTTP {response.status_code}: {response.text[:200]}'
-                if not is_retry:
-                    # Only count the first attempt; retries don't add to failed_deliveries.
-                    webhook.increment_delivery_stats(success=False)
-
-                # Retry if eligible
-                if delivery.is_retriable():
-                    retry_delivery.apply_async(
-                        args=[delivery_id],
-                        countdown=webhook.retry_delay_seconds
-                    )
-
-            delivery.save()
-
-            return {
-                'success': delivery.status == 'success',
-                'status_code': response.status_code,
-                'response_time_ms': response_time_ms
-            }
-
-        except requests.exceptions.Timeout:
-            delivery.status = 'failed'
-            delivery.error_message = f'Request timeout after {webhook.timeout_seconds}s'
-            delivery.save()
-
-            if not is_retry:
-                webhook.increment_delivery_stats(success=False)
-
-            # Retry if eligible
-            if delivery.is_retriable():
-                retry_delivery.apply_async(
-                    args=[delivery_id],
-                    countdown=webhook.retry_delay_seconds
-                )
+    The requests go out concurrently on pooled keep-alive sessions (see
+    webhooks/delivery.py) instead of one Celery task per webhook. Deliveries
+    no longer pending (already sent by a requeued copy of this task) are
+    skipped.
+
+    Args:
+        delivery_ids: IDs of the WebhookDelivery rows to send
+    """
+    deliveries = list(
+        WebhookDelivery.objects.select_related('webhook')
+        .filter(id__in=delivery_ids, status='pending')
+    )
+    return _deliver_many(deliveries)
 
-            return {'error': 'timeout'}
 
-        except requests.exceptions.RequestException as e:
-            delivery.status = 'failed'
-            delivery.error_message = str(e)[:500]
-            delivery.save()
+def schedule_batch(webhook):
+    """
+    Queue a flush of ``webhook``'s pending deliveries at the end of its batch
+    window, unless one is already queued.
+    """
+    window = webhook.batch_window_seconds
+    if cache.add(BATCH_LOCK_KEY.format(webhook_id=webhook.id), True, window):
+        flush_webhook_batch.apply_async(args=[webhook.id], countdown=window)
 
-            if not is_retry:
-                webhook.increment_delivery_stats(success=False)
 
-            # Retry if eligible
-            if delivery.is_retriable():
-                retry_delivery.apply_async(
-                    args=[delivery_id],
-                    countdown=webhook.retry_delay_seconds
-                )
+@shared_task
+def flush_webhook_batch(webhook_id):
+    """
+    Send a batched webhook's pending deliveries as one request
 
-            return {'error': str(e)}
+    Args:
+        webhook_id: ID of the Webhook whose batch window has closed
+    """
+    # Events raised from here on schedule the next flush.
+    cache.delete(BATCH_LOCK_KEY.format(webhook_id=webhook_id))
+
+    # Claim the pending deliveries ('sent' = in flight) so an overlapping
+    # flush can't send them twice.
+    with transaction.atomic():
+        deliveries = list(
+            WebhookDelivery.objects.select_for_update().select_related('webhook')
+            .filter(webhook_id=webhook_id, status='pending')
+            .order_by('created_at', 'id')[:MAX_BATCH_EVENTS + 1]
+        )
+        more = len(deliveries) > MAX_BATCH_EVENTS
+        deliveries = deliveries[:MAX_BATCH_EVENTS]
+        WebhookDelivery.objects.filter(id__in=[d.id for d in deliveries]).update(status='sent')
+    if not deliveries:
+        return {'sent': 0}
+    if more:
+        flush_webhook_batch.delay(webhook_id)
+
+    webhook = deliveries[0].webhook
+    if not webhook.is_active or webhook.status == 'disabled':
+        WebhookDelivery.objects.filter(id__in=[d.id for d in deliveries]).update(
+            status='failed', error_message='Webhook is inactive or disabled'
+        )
+        return {'error': 'Webhook inactive'}
 
+    unsent = list(deliveries)
+    results = []
+    try:
+        batches = _build_batch_payloads(
+            _resolve_provider(webhook), deliveries, webhook.provider_config
+        )
+        if batches is None:
+            return {'sent': len(deliveries), 'results': _deliver_many(deliveries)}
+        # One after another, so chat messages arrive in order.
+        for batch, payload in batches:
+            outbound = _signed_request(
+                webhook, 'batch', ','.join(str(d.id) for d in batch), payload
+            )
+            results.append(_record(webhook, batch, send(outbound)))
+            unsent = unsent[len(batch):]
     except Exception as e:
-        # Catch-all: any unexpected error (bad custom_headers type, HMAC failure,
-        # non-serialisable payload, etc.) must not leave the delivery in Pending.
-        delivery.status = 'failed'
-        delivery.error_message = f'Internal error: {type(e).__name__}: {str(e)[:400]}'
-        try:
-            delivery.save()
-        except Exception:
-            pass
-        raise  # Re-raise so Celery marks the task as FAILURE and logs the traceback
+        for delivery in unsent:
+            _fail_internal(delivery, e)
+        raise
+    result = results[0] if len(results) == 1 else {'results': results}
+    result['sent'] = len(deliveries)
+    return result
+
+
+@shared_task
+def requeue_stuck_deliveries(minutes=15):
+    """
+    Requeue deliveries left 'pending' or 'sent' for more than ``minutes``
+    Runs periodically: a worker dying mid-flush leaves its claimed deliveries
+    'sent', and a lost deliver_webhooks or countdown flush task leaves them
+    'pending', with nothing else ever picking them up again. Delivery is at
+    least once: a delivery that was merely slow can be sent twice.
+
+    Args:
+        minutes: Age after which an unfinished delivery counts as stuck
+    """
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    stuck = WebhookDelivery.objects.filter(created_at__lt=cutoff)
+    reclaimed = stuck.filter(status='sent').update(status='pending')
+
+    immediate_ids, batched_webhook_ids = [], set()
+    for delivery_id, webhook_id, window in stuck.filter(status='pending').values_list(
+        'id', 'webhook_id', 'webhook__batch_window_seconds'
+    ):
+        if window > 0:
+            batched_webhook_ids.add(webhook_id)
+        else:
+            immediate_ids.append(delivery_id)
+
+    for start in range(0, len(immediate_ids), MAX_BATCH_EVENTS):
+        deliver_webhooks.delay(immediate_ids[start:start + MAX_BATCH_EVENTS])
+    for webhook_id in batched_webhook_ids:
+        flush_webhook_batch.delay(webhook_id)
+
+    return {
+        'requeued': len(immediate_ids),
+        'batches_flushed': len(batched_webhook_ids),
+        'reclaimed': reclaimed,
+    }
 
 
 @shared_task
@@ -505,21 +505,31 @@ def wiki_search(request):
         # Search wiki pages through the shared scope helper — workspace-scoped in
         # real mode, per-user (sandbox_owner) in demo so results never bleed
         # across demo users.
-        results['pages'] = WikiPage.objects.filter(
-            _wiki_scope_q(request),
-            is_published=True,
-        ).filter(
-            Q(title__icontains=query) |
-            Q(content__icontains=query)
-        )[:10]
+        # Pages and tasks are ranked by the full-text index when available
+        # (kanban/utils/search_index.py); the querysets keep the access rules.
+        from kanban.utils import search_index
+        pages = WikiPage.objects.filter(_wiki_scope_q(request), is_published=True)
+        active_ws = getattr(profile, 'active_workspace', None)
+        results['pages'] = search_index.ranked_objects(
+            pages, query, 'wiki', limit=10,
+            workspace_ids=[active_ws.pk] if active_ws else None,
+        )
+        if results['pages'] is None:
+            results['pages'] = pages.filter(
+                Q(title__icontains=query) |
+                Q(content__icontains=query)
+            )[:10]
 
         # Search tasks — limited to boards the user can access
-        results['tasks'] = Task.objects.filter(
-            column__board__in=user_boards
-        ).filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query)
-        )[:10]
+        tasks = Task.objects.filter(column__board__in=user_boards)
+        results['tasks'] = search_index.ranked_objects(
+            tasks, query, 'task', limit=10, board_ids=user_boards.values('id'),
+        )
+        if results['tasks'] is None:
+            results['tasks'] = tasks.filter(
+                Q(title__icontains=query) |
+                Q(description__icontains=query)
+            )[:10]
 
         # Search boards — limited to boards the user can access
         results['boards'] = user_boards.filter(name__icontains=query)[:10]